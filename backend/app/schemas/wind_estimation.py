@@ -37,6 +37,9 @@ class WindEstimationInput(BaseModel):
     project_id: Optional[UUID] = Field(None, description="プロジェクトID")
     session_name: Optional[str] = Field(None, description="セッション名")
     time_interval: Optional[int] = Field(None, description="時間間隔（秒）")
+    rolling_window: Optional[int] = Field(
+        None, description="移動ウィンドウ推定のウィンドウ長（秒）。指定すると時間変化する風を推定"
+    )
 
     class Config:
         use_enum_values = True
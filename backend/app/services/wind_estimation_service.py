@@ -17,6 +17,7 @@ from sqlalchemy.orm import Session
 from app.models.wind_data import WindDataPoint, WindEstimationResult
 from app.schemas.wind_estimation import WindEstimationInput
 from sailing_data_processor.wind_estimator import WindEstimator
+from sailing_data_processor.wind_estimator_improved import WindEstimatorImproved
 
 def estimate_wind(
     gps_data: bytes,
@@ -50,16 +51,26 @@ def estimate_wind(
         if df is None or df.empty:
             return {"error": "有効なGPSデータが見つかりません"}
         
-        # WindEstimatorを初期化
-        estimator = WindEstimator(boat_type=params.boat_type)
-        
-        # 風向風速を推定
-        wind_df = estimator.estimate_wind_from_single_boat(
-            gps_data=df,
-            min_tack_angle=params.min_tack_angle,
-            boat_type=params.boat_type,
-            use_bayesian=params.use_bayesian
-        )
+        if params.rolling_window:
+            # 移動ウィンドウで時間変化する風を推定（出力間隔は time_interval）
+            estimator = WindEstimatorImproved(boat_type=params.boat_type)
+            wind_df = estimator.estimate_wind_time_series(
+                gps_data=df,
+                window_seconds=params.rolling_window,
+                step_seconds=params.time_interval,
+                min_tack_angle=params.min_tack_angle
+            )
+        else:
+            # WindEstimatorを初期化
+            estimator = WindEstimator(boat_type=params.boat_type)
+            
+            # 風向風速を推定
+            wind_df = estimator.estimate_wind_from_single_boat(
+                gps_data=df,
+                min_tack_angle=params.min_tack_angle,
+                boat_type=params.boat_type,
+                use_bayesian=params.use_bayesian
+            )
         
         if wind_df is None or wind_df.empty:
             return {"error": "風向推定ができませんでした"}
@@ -141,23 +152,19 @@ def _create_wind_estimation_result(wind_df: pd.DataFrame, session_id: str) -> Di
     Dict[str, Any]
         APIレスポンス形式の風向推定結果
     """
-    # DataFrameから風データポイントを抽出
-    wind_data_points = []
+    # DataFrameから風データポイントを抽出（緯度経度が欠損している場合は0.0を使用）
+    def column(name: str, default: float) -> Any:
+        return wind_df[name] if name in wind_df.columns else default
     
-    for _, row in wind_df.iterrows():
-        # 緯度経度が欠損している場合は0.0を使用
-        lat = row.get('latitude', 0.0)
-        lon = row.get('longitude', 0.0)
-        
-        point = {
-            "timestamp": row['timestamp'],
-            "latitude": lat,
-            "longitude": lon,
-            "speed": row['wind_speed'],
-            "direction": row['wind_direction'],
-            "confidence": row.get('confidence', 1.0)
-        }
-        wind_data_points.append(point)
+    points_df = pd.DataFrame({
+        "timestamp": wind_df['timestamp'],
+        "latitude": column('latitude', 0.0),
+        "longitude": column('longitude', 0.0),
+        "speed": wind_df['wind_speed'],
+        "direction": wind_df['wind_direction'],
+        "confidence": column('confidence', 1.0)
+    })
+    wind_data_points = points_df.to_dict('records')
     
     # 平均値の計算
     avg_speed = wind_df['wind_speed'].mean()
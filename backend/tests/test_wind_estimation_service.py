@@ -78,3 +78,31 @@ def test_create_wind_estimation_result():
     assert result['session_id'] == session_id
     assert 10.5 <= result['average_speed'] <= 11.2
     assert 270.0 <= result['average_direction'] <= 275.0
+
+def test_estimate_wind_rolling_window():
+    """移動ウィンドウ指定時に時間変化する風の時系列を返すテスト"""
+    from app.services.wind_estimation_service import estimate_wind
+    
+    # 60秒ごとに左右にタックする1時間分の航跡（風向は1時間で10度→30度に変化）
+    t = np.arange(3600)
+    wind = 10.0 + 20.0 * t / 3600
+    side = np.where((t // 60) % 2 == 0, 1.0, -1.0)
+    progress = np.clip((t % 60) / 3.0, 0.0, 1.0)
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2023-01-01 12:00:00', periods=len(t), freq='s'),
+        'latitude': 35.0 + 1e-5 * t,
+        'longitude': 139.0 + 1e-5 * t,
+        'speed': np.where(t % 60 < 8, 3.5, 5.0),
+        'course': np.mod(wind + 45.0 * side * (2 * progress - 1), 360),
+    })
+    params = WindEstimationInput(
+        file_format=FileFormat.CSV, rolling_window=600, time_interval=300
+    )
+    
+    result = estimate_wind(df.to_csv(index=False).encode('utf-8'), params, uuid4(), None)
+    
+    assert 'error' not in result
+    assert len(result['wind_data']) == 12
+    directions = [point['direction'] for point in result['wind_data']]
+    assert directions[-1] - directions[0] > 10.0
+    assert all(0.0 <= point['confidence'] <= 1.0 for point in result['wind_data'])
@@ -294,8 +294,8 @@ def patched_update_with_boat_data(self, boats_data):
     Dict[str, Any]
         更新された風の場
     """
-    # データポイントをリセット
-    self.wind_data_points = []
+    # データポイントを集めてからまとめて置き換える
+    data_points = []
     
     # 各艇のデータを処理
     for boat_id, boat_df in boats_data.items():
@@ -330,7 +330,9 @@ def patched_update_with_boat_data(self, boats_data):
                 data_point['confidence'] = row['confidence']
             
             # データポイントを追加
-            self.wind_data_points.append(data_point)
+            data_points.append(data_point)
+    
+    self.wind_data_points = data_points
     
     # データポイントがなければダミーの風場を生成
     if not self.wind_data_points:
@@ -11,8 +11,14 @@ import datetime
 import logging
 import json
 import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Callable, Tuple
 
+from sailing_data_processor.utilities.memory_size import estimate_size
+from sailing_data_processor.analysis.disk_cache import DiskCacheTier, DEFAULT_DISK_CACHE_MAX_SIZE
+
 # デフォルトのキャッシュ設定
 DEFAULT_CACHE_MAX_SIZE = 10 * 1024 * 1024  # 10MB
 DEFAULT_CACHE_TTL = 3600  # 1時間（秒）
@@ -46,18 +52,11 @@ class CacheItem:
         self.access_count = 0
         self.expiration = expiration
         
-        # サイズを計算（指定がなければ概算）
+        # サイズを計算（指定がなければメモリ使用量から推定）
         if size_bytes is not None:
             self.size_bytes = size_bytes
         else:
-            # サイズの概算
-            try:
-                # JSONに変換してサイズを推定
-                json_str = json.dumps(value)
-                self.size_bytes = len(json_str.encode('utf-8'))
-            except (TypeError, OverflowError):
-                # JSONに変換できない場合はデフォルト値
-                self.size_bytes = 1024
+            self.size_bytes = estimate_size(value)
     
     def is_expired(self) -> bool:
         """
@@ -132,11 +131,19 @@ class AnalysisCache:
     分析結果キャッシュ管理クラス
     
     ブラウザストレージと連携し、分析結果のキャッシングを行います。
+    メモリ内キャッシュはアクセス順に並んだLRUで、取得・設定・削除はO(1)で行われます。
+    スレッドセーフで、キーのプレフィックスごとにヒット率を集計します。
+    
+    disk_cache_dir を指定すると、ローカルディスク上の第2層（DiskCacheTier）に書き込み、
+    メモリにない値はディスクから読み込んでメモリに昇格させます。
+    ディスク層は複数のワーカープロセスで共有できます。
     """
     
     def __init__(self, storage_interface=None, namespace: str = "analysis_cache",
                 max_size_bytes: int = DEFAULT_CACHE_MAX_SIZE,
-                default_ttl: int = DEFAULT_CACHE_TTL):
+                default_ttl: int = DEFAULT_CACHE_TTL,
+                disk_cache_dir: Optional[Union[str, Path]] = None,
+                disk_cache_max_bytes: int = DEFAULT_DISK_CACHE_MAX_SIZE):
         """
         初期化
         
@@ -150,6 +157,10 @@ class AnalysisCache:
             キャッシュの最大サイズ（バイト）
         default_ttl : int, optional
             デフォルトのキャッシュ有効期間（秒）
+        disk_cache_dir : str or Path, optional
+            ディスク層のディレクトリ（名前空間ごとのサブディレクトリを使用）、Noneの場合はメモリのみ
+        disk_cache_max_bytes : int, optional
+            ディスク層の最大サイズ（バイト）
         """
         self.logger = logging.getLogger(f"{__name__}.{namespace}")
         self.storage = storage_interface
@@ -158,14 +169,24 @@ class AnalysisCache:
         self.default_ttl = default_ttl
         self.storage_key_prefix = f"cache_{namespace}_"
         
-        # メモリ内キャッシュ
-        self.memory_cache: Dict[str, CacheItem] = {}
+        # メモリ内キャッシュ（先頭が最も長くアクセスされていないアイテム）
+        self.memory_cache: "OrderedDict[str, CacheItem]" = OrderedDict()
+        self._lock = threading.RLock()
         
         # キャッシュ状態
         self.current_size_bytes = 0
         self.hit_count = 0
         self.miss_count = 0
         self.eviction_count = 0
+        self.disk_hit_count = 0
+        
+        # ディスク層
+        self.disk_tier: Optional[DiskCacheTier] = None
+        if disk_cache_dir is not None:
+            self.disk_tier = DiskCacheTier(Path(disk_cache_dir) / namespace, max_size_bytes=disk_cache_max_bytes)
+        
+        # キープレフィックスごとのヒット・ミス数
+        self.prefix_stats: Dict[str, Dict[str, int]] = {}
         
         # 無効化設定
         self.invalidation_callbacks: List[Callable[[str], bool]] = []
@@ -222,42 +243,75 @@ class AnalysisCache:
         bool
             設定に成功したかどうか
         """
-        # 既存キーのチェック
-        if key in self.memory_cache and not overwrite:
-            return False
+        with self._lock:
+            # 既存キーのチェック
+            if key in self.memory_cache and not overwrite:
+                return False
+            
+            # 有効期限の計算
+            expiration = None
+            if ttl is not None:
+                expiration = time.time() + ttl
+            elif self.default_ttl is not None:
+                expiration = time.time() + self.default_ttl
+            
+            # キャッシュアイテムの作成
+            cache_item = CacheItem(key, value, metadata, expiration)
+            
+            # 既存アイテムを置き換える場合はそのサイズを差し引く
+            old_item = self.memory_cache.pop(key, None)
+            if old_item is not None:
+                self.current_size_bytes -= old_item.size_bytes
+            
+            # メモリキャッシュに保存（上限を超える場合は古いアイテムを削除）
+            self._insert_item(key, cache_item)
+            
+            # ストレージがあれば永続化
+            if self.storage:
+                try:
+                    storage_key = f"{self.storage_key_prefix}{key}"
+                    self.storage.save(storage_key, cache_item.to_dict())
+                except Exception as e:
+                    self.logger.warning(f"キャッシュアイテムの永続化に失敗しました: {e}")
         
-        # 有効期限の計算
-        expiration = None
-        if ttl is not None:
-            expiration = time.time() + ttl
-        elif self.default_ttl is not None:
-            expiration = time.time() + self.default_ttl
-        
-        # キャッシュアイテムの作成
-        cache_item = CacheItem(key, value, metadata, expiration)
-        
-        # キャッシュサイズが上限を超える場合、古いアイテムを削除
-        if key not in self.memory_cache:
-            new_size = self.current_size_bytes + cache_item.size_bytes
-            if new_size > self.max_size_bytes:
-                self._evict_items(cache_item.size_bytes)
-        else:
-            # 既存アイテムのサイズを差し引く
-            self.current_size_bytes -= self.memory_cache[key].size_bytes
+        # ディスク層にも書き込む（シリアライズに時間がかかるためロックの外で実行）
+        if self.disk_tier is not None:
+            self.disk_tier.put(key, value, cache_item.metadata, expiration, cache_item.created_at)
+        
+        return True
+    
+    def _insert_item(self, key: str, cache_item: CacheItem) -> None:
+        """
+        メモリキャッシュの末尾（最も新しい位置）にアイテムを追加
+        
+        Parameters:
+        -----------
+        key : str
+            キャッシュキー
+        cache_item : CacheItem
+            追加するキャッシュアイテム
+        """
+        if self.current_size_bytes + cache_item.size_bytes > self.max_size_bytes:
+            self._evict_items(cache_item.size_bytes)
         
-        # メモリキャッシュに保存
         self.memory_cache[key] = cache_item
         self.current_size_bytes += cache_item.size_bytes
+    
+    def _record_access(self, key: str, hit: bool) -> None:
+        """
+        ヒット・ミスを全体とキープレフィックスごとに記録
         
-        # ストレージがあれば永続化
-        if self.storage:
-            try:
-                storage_key = f"{self.storage_key_prefix}{key}"
-                self.storage.save(storage_key, cache_item.to_dict())
-            except Exception as e:
-                self.logger.warning(f"キャッシュアイテムの永続化に失敗しました: {e}")
-        
-        return True
+        キープレフィックスは最後の「_」より前の部分です
+        （compute_from_params で生成したキーではプレフィックスそのもの）。
+        """
+        prefix = key.rpartition('_')[0] or key
+        stats = self.prefix_stats.setdefault(prefix, {"hits": 0, "misses": 0})
+        if hit:
+            self.hit_count += 1
+            stats["hits"] += 1
+        else:
+            self.miss_count += 1
+            stats["misses"] += 1
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -275,51 +329,61 @@ class AnalysisCache:
         Any
             キャッシュされた値、存在しない場合はデフォルト値
         """
-        # メモリキャッシュをチェック
-        cache_item = self.memory_cache.get(key)
-        
-        # メモリキャッシュになければストレージをチェック
-        if cache_item is None and self.storage:
-            try:
-                storage_key = f"{self.storage_key_prefix}{key}"
-                item_dict = self.storage.load(storage_key)
-                if item_dict:
-                    cache_item = CacheItem.from_dict(item_dict)
-                    # メモリキャッシュにも追加
-                    self.memory_cache[key] = cache_item
-                    self.current_size_bytes += cache_item.size_bytes
-            except Exception as e:
-                self.logger.warning(f"ストレージからのキャッシュ読み込みに失敗しました: {e}")
-        
-        # キャッシュアイテムが見つかった場合
-        if cache_item:
-            # 期限切れチェック
-            if cache_item.is_expired():
-                # 期限切れの場合は削除
-                self.delete(key)
-                self.miss_count += 1
-                return default
+        with self._lock:
+            # メモリキャッシュをチェック
+            cache_item = self.memory_cache.get(key)
+            
+            # メモリキャッシュになければディスク層をチェックし、見つかればメモリに昇格
+            if cache_item is None and self.disk_tier is not None:
+                record = self.disk_tier.get(key)
+                if record is not None:
+                    cache_item = CacheItem.from_dict(record)
+                    self._insert_item(key, cache_item)
+                    self.disk_hit_count += 1
             
-            # 無効化条件のチェック
-            for callback in self.invalidation_callbacks:
+            # メモリキャッシュになければストレージをチェック
+            if cache_item is None and self.storage:
                 try:
-                    if callback(key):
-                        # 無効化条件に該当する場合は削除
-                        self.delete(key)
-                        self.miss_count += 1
-                        return default
+                    storage_key = f"{self.storage_key_prefix}{key}"
+                    item_dict = self.storage.load(storage_key)
+                    if item_dict:
+                        cache_item = CacheItem.from_dict(item_dict)
+                        # メモリキャッシュにも追加
+                        self._insert_item(key, cache_item)
                 except Exception as e:
-                    self.logger.warning(f"キャッシュ無効化コールバックでエラーが発生しました: {e}")
+                    self.logger.warning(f"ストレージからのキャッシュ読み込みに失敗しました: {e}")
             
-            # アクセス情報を更新
-            cache_item.update_access_time()
-            self.hit_count += 1
-            
-            return cache_item.value
-        else:
-            # キャッシュミス
-            self.miss_count += 1
-            return default
+            # キャッシュアイテムが見つかった場合
+            if cache_item:
+                # 期限切れチェック
+                if cache_item.is_expired():
+                    # 期限切れの場合は削除
+                    self.delete(key)
+                    self._record_access(key, False)
+                    return default
+                
+                # 無効化条件のチェック
+                for callback in self.invalidation_callbacks:
+                    try:
+                        if callback(key):
+                            # 無効化条件に該当する場合は削除
+                            self.delete(key)
+                            self._record_access(key, False)
+                            return default
+                    except Exception as e:
+                        self.logger.warning(f"キャッシュ無効化コールバックでエラーが発生しました: {e}")
+                
+                # アクセス情報を更新（最も新しい位置へ移動）
+                if key in self.memory_cache:
+                    self.memory_cache.move_to_end(key)
+                cache_item.update_access_time()
+                self._record_access(key, True)
+                
+                return cache_item.value
+            else:
+                # キャッシュミス
+                self._record_access(key, False)
+                return default
     
     def compute_if_absent(self, key: str, compute_func: Callable[[], Any], 
                         ttl: Optional[int] = None, metadata: Dict[str, Any] = None) -> Any:
@@ -414,20 +478,25 @@ class AnalysisCache:
         bool
             削除に成功したかどうか
         """
-        # メモリキャッシュから削除
-        if key in self.memory_cache:
-            # サイズを減算
-            self.current_size_bytes -= self.memory_cache[key].size_bytes
-            del self.memory_cache[key]
+        with self._lock:
+            # メモリキャッシュから削除
+            cache_item = self.memory_cache.pop(key, None)
+            if cache_item is not None:
+                # サイズを減算
+                self.current_size_bytes -= cache_item.size_bytes
+            
+            # ストレージからも削除
+            if self.storage:
+                try:
+                    storage_key = f"{self.storage_key_prefix}{key}"
+                    self.storage.delete(storage_key)
+                except Exception as e:
+                    self.logger.warning(f"ストレージからのキャッシュ削除に失敗しました: {e}")
+                    return False
         
-        # ストレージからも削除
-        if self.storage:
-            try:
-                storage_key = f"{self.storage_key_prefix}{key}"
-                self.storage.delete(storage_key)
-            except Exception as e:
-                self.logger.warning(f"ストレージからのキャッシュ削除に失敗しました: {e}")
-                return False
+        # ディスク層からも削除
+        if self.disk_tier is not None:
+            return self.disk_tier.delete(key)
         
         return True
     
@@ -440,19 +509,24 @@ class AnalysisCache:
         bool
             クリアに成功したかどうか
         """
-        # メモリキャッシュをクリア
-        self.memory_cache.clear()
-        self.current_size_bytes = 0
+        with self._lock:
+            # メモリキャッシュをクリア
+            self.memory_cache.clear()
+            self.current_size_bytes = 0
+            
+            # ストレージのキャッシュもクリア
+            if self.storage:
+                try:
+                    keys = self.storage.list_keys(self.storage_key_prefix)
+                    for key in keys:
+                        self.storage.delete(key)
+                except Exception as e:
+                    self.logger.warning(f"ストレージからのキャッシュクリアに失敗しました: {e}")
+                    return False
         
-        # ストレージのキャッシュもクリア
-        if self.storage:
-            try:
-                keys = self.storage.list_keys(self.storage_key_prefix)
-                for key in keys:
-                    self.storage.delete(key)
-            except Exception as e:
-                self.logger.warning(f"ストレージからのキャッシュクリアに失敗しました: {e}")
-                return False
+        # ディスク層もクリア
+        if self.disk_tier is not None:
+            return self.disk_tier.clear()
         
         return True
     
@@ -466,7 +540,8 @@ class AnalysisCache:
             キャッシュキーのリスト
         """
         # メモリキャッシュのキーを取得
-        memory_keys = set(self.memory_cache.keys())
+        with self._lock:
+            memory_keys = set(self.memory_cache.keys())
         
         # ストレージのキーも取得
         storage_keys = set()
@@ -478,8 +553,11 @@ class AnalysisCache:
             except Exception as e:
                 self.logger.warning(f"ストレージからのキー一覧取得に失敗しました: {e}")
         
-        # 両方のキーをマージ
-        return list(memory_keys.union(storage_keys))
+        # ディスク層のキーも取得
+        disk_keys = set(self.disk_tier.keys()) if self.disk_tier is not None else set()
+        
+        # すべてのキーをマージ
+        return list(memory_keys | storage_keys | disk_keys)
     
     def add_invalidation_callback(self, callback: Callable[[str], bool]) -> None:
         """
@@ -524,16 +602,21 @@ class AnalysisCache:
         deleted_count = 0
         current_time = time.time()
         
-        # 期限切れのアイテムを削除
-        expired_keys = []
-        for key, item in list(self.memory_cache.items()):
-            if item.expiration and current_time > item.expiration:
-                expired_keys.append(key)
+        with self._lock:
+            # 期限切れのアイテムを削除
+            expired_keys = []
+            for key, item in self.memory_cache.items():
+                if item.expiration and current_time > item.expiration:
+                    expired_keys.append(key)
+            
+            # 削除処理
+            for key in expired_keys:
+                self.delete(key)
+                deleted_count += 1
         
-        # 削除処理
-        for key in expired_keys:
-            self.delete(key)
-            deleted_count += 1
+        # ディスク層の期限切れエントリも削除
+        if self.disk_tier is not None:
+            deleted_count += self.disk_tier.cleanup_expired()
         
         return deleted_count
     
@@ -541,6 +624,10 @@ class AnalysisCache:
         """
         必要なスペースを確保するためにアイテムを削除
         
+        最も長くアクセスされていないアイテム（先頭）から順に削除します。
+        期限切れのアイテムは取得時と cleanup_expired() で削除されます。
+        ディスク層がある場合はメモリからのみ削除し、ディスク上の値は残します。
+        
         Parameters:
         -----------
         required_bytes : int
@@ -551,52 +638,28 @@ class AnalysisCache:
         int
             削除されたアイテム数
         """
-        if not self.memory_cache:
-            return 0
-        
-        # 最低でも必要スペースの20%を解放
-        target_bytes = max(required_bytes, self.max_size_bytes * 0.2)
-        freed_bytes = 0
-        evicted_count = 0
-        
-        # まず期限切れのアイテムを削除
-        expired_keys = []
-        current_time = time.time()
-        for key, item in self.memory_cache.items():
-            if item.expiration and current_time > item.expiration:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            freed_bytes += self.memory_cache[key].size_bytes
-            self.delete(key)
-            evicted_count += 1
-        
-        # 期限切れアイテムの削除だけで十分なら終了
-        if freed_bytes >= target_bytes:
+        with self._lock:
+            if not self.memory_cache:
+                return 0
+            
+            # 最低でも最大サイズの20%を解放
+            target_bytes = max(required_bytes, self.max_size_bytes * 0.2)
+            freed_bytes = 0
+            evicted_count = 0
+            
+            # 必要なスペースが確保できるまで先頭から削除
+            while self.memory_cache and freed_bytes < target_bytes:
+                if self.disk_tier is not None:
+                    key, item = self.memory_cache.popitem(last=False)
+                    self.current_size_bytes -= item.size_bytes
+                else:
+                    key, item = next(iter(self.memory_cache.items()))
+                    self.delete(key)
+                freed_bytes += item.size_bytes
+                evicted_count += 1
+            
             self.eviction_count += evicted_count
             return evicted_count
-        
-        # アクセス時刻でソート（古い順）
-        sorted_items = sorted(
-            self.memory_cache.items(),
-            key=lambda x: x[1].last_accessed_at
-        )
-        
-        # 必要なスペースが確保できるまで削除
-        for key, item in sorted_items:
-            # 既に削除されている可能性があるのでチェック
-            if key not in self.memory_cache:
-                continue
-                
-            freed_bytes += item.size_bytes
-            self.delete(key)
-            evicted_count += 1
-            
-            if freed_bytes >= target_bytes:
-                break
-        
-        self.eviction_count += evicted_count
-        return evicted_count
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """
@@ -607,20 +670,44 @@ class AnalysisCache:
         Dict[str, Any]
             統計情報の辞書
         """
-        total_requests = self.hit_count + self.miss_count
-        hit_rate = self.hit_count / total_requests if total_requests > 0 else 0
+        with self._lock:
+            total_requests = self.hit_count + self.miss_count
+            hit_rate = self.hit_count / total_requests if total_requests > 0 else 0
+            
+            return {
+                "namespace": self.namespace,
+                "item_count": len(self.memory_cache),
+                "current_size_bytes": self.current_size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+                "usage_percent": (self.current_size_bytes / self.max_size_bytes) * 100 if self.max_size_bytes > 0 else 0,
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "hit_rate": hit_rate,
+                "eviction_count": self.eviction_count,
+                "disk_hit_count": self.disk_hit_count,
+                "disk": self.disk_tier.get_stats() if self.disk_tier is not None else None,
+                "prefix_stats": self.get_prefix_stats()
+            }
+    
+    def get_prefix_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        キープレフィックスごとのヒット率を取得
         
-        return {
-            "namespace": self.namespace,
-            "item_count": len(self.memory_cache),
-            "current_size_bytes": self.current_size_bytes,
-            "max_size_bytes": self.max_size_bytes,
-            "usage_percent": (self.current_size_bytes / self.max_size_bytes) * 100 if self.max_size_bytes > 0 else 0,
-            "hit_count": self.hit_count,
-            "miss_count": self.miss_count,
-            "hit_rate": hit_rate,
-            "eviction_count": self.eviction_count
-        }
+        Returns:
+        --------
+        Dict[str, Dict[str, Any]]
+            プレフィックス → {"hits", "misses", "hit_rate"}
+        """
+        with self._lock:
+            result = {}
+            for prefix, stats in self.prefix_stats.items():
+                total = stats["hits"] + stats["misses"]
+                result[prefix] = {
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "hit_rate": stats["hits"] / total if total > 0 else 0
+                }
+            return result
     
     def save_cache_state(self) -> bool:
         """
@@ -684,8 +771,11 @@ class AnalysisCache:
                     
                     # 期限切れでなければメモリキャッシュに追加
                     if not cache_item.is_expired():
-                        self.memory_cache[key] = cache_item
-                        self.current_size_bytes += cache_item.size_bytes
+                        with self._lock:
+                            old_item = self.memory_cache.pop(key, None)
+                            if old_item is not None:
+                                self.current_size_bytes -= old_item.size_bytes
+                            self._insert_item(key, cache_item)
             
             # 統計情報の復元（ヒットカウントなど）
             stats_key = f"{self.storage_key_prefix}stats"
@@ -717,9 +807,10 @@ class AnalysisCache:
         """
         results = []
         
-        for key, item in self.memory_cache.items():
-            if key.startswith(prefix):
-                results.append((key, item.value, item.metadata))
+        with self._lock:
+            for key, item in self.memory_cache.items():
+                if key.startswith(prefix):
+                    results.append((key, item.value, item.metadata))
         
         return results
     
@@ -740,14 +831,20 @@ class AnalysisCache:
         invalidated_count = 0
         keys_to_delete = []
         
-        # 削除するキーを収集
-        for key in list(self.memory_cache.keys()):
-            if key.startswith(prefix):
-                keys_to_delete.append(key)
-        
-        # 削除実行
-        for key in keys_to_delete:
-            if self.delete(key):
-                invalidated_count += 1
+        with self._lock:
+            # 削除するキーを収集
+            for key in self.memory_cache.keys():
+                if key.startswith(prefix):
+                    keys_to_delete.append(key)
+            
+            # ディスク層にだけあるキーも対象にする
+            if self.disk_tier is not None:
+                memory_keys = set(keys_to_delete)
+                keys_to_delete.extend(key for key in self.disk_tier.keys(prefix) if key not in memory_keys)
+            
+            # 削除実行
+            for key in keys_to_delete:
+                if self.delete(key):
+                    invalidated_count += 1
         
         return invalidated_count
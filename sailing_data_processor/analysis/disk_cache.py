@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+分析結果キャッシュのディスク層モジュール
+
+AnalysisCache の第2層として、分析結果をローカルディスクに保存します。
+値はpickleで保存しますが、一定サイズ以上のNumPy配列（DataFrameの列ブロックや
+風の場のグリッドを含む）は別ファイルの .npy 形式に切り出し、読み込み時にメモリマップします。
+インデックスはSQLite（WALモード）で管理し、複数のワーカープロセスから同時に読み込めます。
+ペイロードは書き込み後に変更しないため、読み込み中のプロセスが他のプロセスの更新の影響を受けません。
+"""
+
+import os
+import json
+import time
+import uuid
+import pickle
+import shutil
+import sqlite3
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+import numpy as np
+
+# デフォルトのディスクキャッシュ設定
+DEFAULT_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024  # 1GB
+DEFAULT_MIN_MMAP_BYTES = 64 * 1024  # これより小さい配列はpickleに含める
+
+INDEX_FILE_NAME = "index.sqlite3"
+PAYLOAD_DIR_NAME = "payloads"
+VALUE_FILE_NAME = "value.pkl"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed_at REAL NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    expiration REAL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_last_accessed ON entries (last_accessed_at);
+"""
+
+
+def _close_connection(conn: sqlite3.Connection, pid: int) -> None:
+    """
+    接続を閉じる
+
+    forkした子プロセスが引き継いだ親プロセスの接続を閉じると、SQLiteが最後の接続とみなして
+    WALをチェックポイント・削除し、他のプロセスの読み込みが失敗するため、作成したプロセスでのみ閉じます。
+    """
+    if os.getpid() == pid:
+        conn.close()
+
+
+class _PayloadPickler(pickle.Pickler):
+    """大きなNumPy配列を .npy ファイルに切り出すPickler"""
+
+    def __init__(self, file, directory: Path, min_mmap_bytes: int):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.min_mmap_bytes = min_mmap_bytes
+        self.array_count = 0
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject or obj.nbytes < self.min_mmap_bytes:
+            return None
+
+        name = f"array_{self.array_count}.npy"
+        self.array_count += 1
+        np.save(self.directory / name, obj, allow_pickle=False)
+        return ("ndarray", name)
+
+
+class _PayloadUnpickler(pickle.Unpickler):
+    """切り出した配列をメモリマップで読み込むUnpickler"""
+
+    def __init__(self, file, directory: Path, mmap_mode: Optional[str]):
+        super().__init__(file)
+        self.directory = directory
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid: Any) -> Any:
+        kind, name = pid
+        if kind != "ndarray":
+            raise pickle.UnpicklingError(f"不明なペイロード参照です: {kind}")
+        return np.load(self.directory / name, mmap_mode=self.mmap_mode, allow_pickle=False)
+
+
+class DiskCacheTier:
+    """
+    分析結果キャッシュのディスク層
+
+    ディレクトリ構成:
+        index.sqlite3          キー → ペイロード・サイズ・アクセス時刻などのインデックス
+        payloads/<id>/         エントリごとのペイロード（value.pkl と array_<n>.npy）
+    """
+
+    def __init__(self, directory: Union[str, Path],
+                max_size_bytes: int = DEFAULT_DISK_CACHE_MAX_SIZE,
+                min_mmap_bytes: int = DEFAULT_MIN_MMAP_BYTES,
+                mmap_mode: Optional[str] = "c", timeout: float = 30.0):
+        """
+        初期化
+
+        Parameters:
+        -----------
+        directory : str or Path
+            キャッシュディレクトリ
+        max_size_bytes : int, optional
+            ディスク上の最大サイズ（バイト）
+        min_mmap_bytes : int, optional
+            別ファイルに切り出す配列の最小サイズ（バイト）
+        mmap_mode : str, optional
+            配列のメモリマップモード（"c"はコピーオンライト、Noneの場合は全て読み込む）
+        timeout : float, optional
+            インデックスのロック待ちのタイムアウト（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.payload_dir = self.directory / PAYLOAD_DIR_NAME
+        self.index_path = self.directory / INDEX_FILE_NAME
+        self.max_size_bytes = max_size_bytes
+        self.min_mmap_bytes = max(1, int(min_mmap_bytes))
+        self.mmap_mode = mmap_mode
+        self.timeout = timeout
+
+        self.payload_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+        self.eviction_count = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """インデックスへの接続（プロセスごとに作成）"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(str(self.index_path), timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            # sqlite3の接続は循環参照でGCまで残り、子プロセスに引き継がれることがあるため、破棄時に閉じる
+            self._finalizer = weakref.finalize(self, _close_connection, conn, self._conn_pid)
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        """書き込みトランザクション（他のプロセスの書き込みとは直列化される）"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _write_payload(self, value: Any) -> tuple:
+        """ペイロードを一時ディレクトリに書き込んでから公開し、(名前, サイズ) を返す"""
+        name = uuid.uuid4().hex
+        tmp_dir = self.payload_dir / f".tmp-{name}"
+        tmp_dir.mkdir()
+        try:
+            with open(tmp_dir / VALUE_FILE_NAME, "wb") as f:
+                _PayloadPickler(f, tmp_dir, self.min_mmap_bytes).dump(value)
+            size_bytes = sum(path.stat().st_size for path in tmp_dir.iterdir())
+            os.replace(tmp_dir, self.payload_dir / name)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return name, size_bytes
+
+    def _remove_payload(self, name: str) -> None:
+        """ペイロードを削除（メモリマップ中のプロセスがあってもPOSIXでは安全）"""
+        shutil.rmtree(self.payload_dir / name, ignore_errors=True)
+
+    def put(self, key: str, value: Any, metadata: Dict[str, Any] = None,
+           expiration: Optional[float] = None, created_at: Optional[float] = None) -> bool:
+        """
+        値をディスクに保存
+
+        Parameters:
+        -----------
+        key : str
+            キャッシュキー
+        value : Any
+            保存する値（pickle可能なオブジェクト）
+        metadata : Dict[str, Any], optional
+            メタデータ
+        expiration : float, optional
+            有効期限（UNIXタイムスタンプ）
+        created_at : float, optional
+            作成時刻（UNIXタイムスタンプ）
+
+        Returns:
+        --------
+        bool
+            保存に成功したかどうか
+        """
+        try:
+            name, size_bytes = self._write_payload(value)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, ValueError) as e:
+            self.logger.warning(f"ディスクキャッシュへの書き込みに失敗しました: {e}")
+            return False
+
+        now = time.time()
+        metadata_json = json.dumps(metadata or {}, default=str, ensure_ascii=False)
+
+        with self._lock:
+            try:
+                with self._transaction() as conn:
+                    row = conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key, payload, size_bytes, created_at, last_accessed_at, access_count, expiration, metadata) "
+                        "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                        (key, name, size_bytes, created_at or now, now, expiration, metadata_json)
+                    )
+                    evicted = self._evict(conn, exclude_key=key)
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュのインデックス更新に失敗しました: {e}")
+                self._remove_payload(name)
+                return False
+
+        # コミット後に古いペイロードを削除
+        if row is not None:
+            self._remove_payload(row[0])
+        for payload in evicted:
+            self._remove_payload(payload)
+
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, exclude_key: str) -> List[str]:
+        """最大サイズを超えた分を最終アクセスの古い順に削除し、削除したペイロード名を返す"""
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return []
+
+        evicted = []
+        rows = conn.execute(
+            "SELECT key, payload, size_bytes FROM entries WHERE key != ? ORDER BY last_accessed_at",
+            (exclude_key,)
+        )
+        for key, payload, size_bytes in rows.fetchall():
+            if total <= self.max_size_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            evicted.append(payload)
+            total -= size_bytes
+
+        self.eviction_count += len(evicted)
+        return evicted
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        ディスクから値を読み込み
+
+        Parameters:
+        -----------
+        key : str
+            キャッシュキー
+
+        Returns:
+        --------
+        Dict[str, Any] or None
+            CacheItem.from_dict に渡せる辞書（key, value, metadata, created_at,
+            last_accessed_at, access_count, expiration）。存在しない場合はNone
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT payload, created_at, access_count, expiration, metadata FROM entries WHERE key = ?",
+                    (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュのインデックス読み込みに失敗しました: {e}")
+                return None
+
+        if row is None:
+            return None
+
+        payload, created_at, access_count, expiration, metadata_json = row
+        payload_path = self.payload_dir / payload
+        try:
+            with open(payload_path / VALUE_FILE_NAME, "rb") as f:
+                value = _PayloadUnpickler(f, payload_path, self.mmap_mode).load()
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError, ImportError) as e:
+            # 他のプロセスが置き換え・削除した直後など
+            self.logger.debug(f"ディスクキャッシュのペイロード読み込みに失敗しました: {e}")
+            return None
+
+        now = time.time()
+        with self._lock:
+            try:
+                self._connection().execute(
+                    "UPDATE entries SET last_accessed_at = ?, access_count = access_count + 1 WHERE key = ?",
+                    (now, key)
+                )
+            except sqlite3.Error as e:
+                self.logger.debug(f"ディスクキャッシュのアクセス時刻の更新に失敗しました: {e}")
+
+        return {
+            "key": key,
+            "value": value,
+            "metadata": json.loads(metadata_json) if metadata_json else {},
+            "created_at": created_at,
+            "last_accessed_at": now,
+            "access_count": access_count + 1,
+            "expiration": expiration
+        }
+
+    def delete(self, key: str) -> bool:
+        """
+        ディスクから値を削除
+
+        Parameters:
+        -----------
+        key : str
+            キャッシュキー
+
+        Returns:
+        --------
+        bool
+            削除に成功したかどうか
+        """
+        with self._lock:
+            try:
+                with self._transaction() as conn:
+                    row = conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュからの削除に失敗しました: {e}")
+                return False
+
+        if row is not None:
+            self._remove_payload(row[0])
+        return True
+
+    def clear(self) -> bool:
+        """
+        すべてのエントリを削除
+
+        Returns:
+        --------
+        bool
+            クリアに成功したかどうか
+        """
+        with self._lock:
+            try:
+                with self._transaction() as conn:
+                    payloads = [row[0] for row in conn.execute("SELECT payload FROM entries").fetchall()]
+                    conn.execute("DELETE FROM entries")
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュのクリアに失敗しました: {e}")
+                return False
+
+        for payload in payloads:
+            self._remove_payload(payload)
+        return True
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """
+        キーの一覧を取得
+
+        Parameters:
+        -----------
+        prefix : str, optional
+            キーのプレフィックス
+
+        Returns:
+        --------
+        List[str]
+            キャッシュキーのリスト
+        """
+        with self._lock:
+            try:
+                rows = self._connection().execute("SELECT key FROM entries").fetchall()
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュのキー一覧取得に失敗しました: {e}")
+                return []
+        return [row[0] for row in rows if row[0].startswith(prefix)]
+
+    def cleanup_expired(self) -> int:
+        """
+        期限切れのエントリを削除
+
+        Returns:
+        --------
+        int
+            削除されたエントリ数
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                with self._transaction() as conn:
+                    rows = conn.execute(
+                        "SELECT payload FROM entries WHERE expiration IS NOT NULL AND expiration < ?", (now,)
+                    ).fetchall()
+                    conn.execute("DELETE FROM entries WHERE expiration IS NOT NULL AND expiration < ?", (now,))
+            except sqlite3.Error as e:
+                self.logger.warning(f"ディスクキャッシュの期限切れエントリ削除に失敗しました: {e}")
+                return 0
+
+        for row in rows:
+            self._remove_payload(row[0])
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        ディスク層の統計情報を取得
+
+        Returns:
+        --------
+        Dict[str, Any]
+            統計情報の辞書
+        """
+        with self._lock:
+            try:
+                count, total = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+                ).fetchone()
+            except sqlite3.Error:
+                count, total = 0, 0
+
+        return {
+            "directory": str(self.directory),
+            "item_count": count,
+            "current_size_bytes": total,
+            "max_size_bytes": self.max_size_bytes,
+            "eviction_count": self.eviction_count
+        }
+
+    def close(self) -> None:
+        """インデックスへの接続を閉じる"""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._finalizer = None
+            self._conn = None
+            self._conn_pid = None
@@ -19,6 +19,7 @@ from sailing_data_processor.strategy.strategy_detector_with_propagation import S
 from sailing_data_processor.strategy.points import StrategyPoint, WindShiftPoint, TackPoint, LaylinePoint
 from sailing_data_processor.analysis.analysis_parameters import ParametersManager, ParameterNamespace
 from sailing_data_processor.analysis.analysis_cache import AnalysisCache
+from sailing_data_processor.utilities.fingerprint import fingerprint_dataframe
 from sailing_data_processor.analysis.integrated_wind_estimator import IntegratedWindEstimator
 
 class IntegratedStrategyDetector:
@@ -901,6 +902,8 @@ class IntegratedStrategyDetector:
         """
         データフレームのハッシュ値を計算（キャッシュキー生成用）
         
+        全ての行・列の内容から計算したフィンガープリントを返します。
+        
         Parameters:
         -----------
         df : pd.DataFrame
@@ -911,38 +914,7 @@ class IntegratedStrategyDetector:
         str
             ハッシュ値
         """
-        import hashlib
-        import json
-        
-        # タイムスタンプでソートし、最初と最後の行および行数を使ってハッシュを作成
-        # （完全なデータハッシュではなく、近似的に同じデータかを判断）
-        
-        sorted_df = df.sort_values('timestamp').reset_index(drop=True)
-        
-        if len(sorted_df) == 0:
-            return "empty_df"
-        
-        # 最初と最後の行のみ使用
-        first_row = sorted_df.iloc[0].to_dict()
-        last_row = sorted_df.iloc[-1].to_dict()
-        
-        # timestamp を文字列に変換（ハッシュの安定性のため）
-        for row in [first_row, last_row]:
-            if 'timestamp' in row and hasattr(row['timestamp'], 'isoformat'):
-                row['timestamp'] = row['timestamp'].isoformat()
-        
-        # ハッシュの作成
-        hash_dict = {
-            'first_row': first_row,
-            'last_row': last_row,
-            'row_count': len(sorted_df),
-            'column_names': sorted(df.columns.tolist())
-        }
-        
-        hash_str = json.dumps(hash_dict, sort_keys=True)
-        hash_value = hashlib.md5(hash_str.encode('utf-8')).hexdigest()
-        
-        return hash_value
+        return fingerprint_dataframe(df)
     
     def _hash_course_data(self, course_data: Dict[str, Any]) -> str:
         """
@@ -16,6 +16,7 @@ import json
 import os
 
 # 内部モジュールのインポート
+from ..utilities.fingerprint import fingerprint
 from ..strategy.points import StrategyPoint, WindShiftPoint, TackPoint, LaylinePoint
 from .strategy_evaluator import StrategyEvaluator
 from .decision_points_analyzer import DecisionPointsAnalyzer
@@ -129,20 +130,20 @@ class PostRaceAnalyzer:
     def _generate_cache_key(self, track_data, wind_data, competitor_data, course_data):
         """キャッシュキーの生成"""
         # トラックデータのハッシュ値
-        track_hash = hash(tuple(track_data.index)) if isinstance(track_data, pd.DataFrame) else hash(str(track_data))
+        track_hash = fingerprint(track_data)
         
         # 風データのハッシュ値
-        wind_hash = hash(tuple(wind_data.index)) if isinstance(wind_data, pd.DataFrame) else hash(str(wind_data))
+        wind_hash = fingerprint(wind_data)
         
         # 競合データのハッシュ値（存在する場合）
         competitor_hash = 0
         if competitor_data is not None:
-            competitor_hash = hash(tuple(competitor_data.index)) if isinstance(competitor_data, pd.DataFrame) else hash(str(competitor_data))
+            competitor_hash = fingerprint(competitor_data)
         
         # コースデータのハッシュ値（存在する場合）
         course_hash = 0
         if course_data is not None:
-            course_hash = hash(str(course_data))
+            course_hash = fingerprint(course_data)
         
         # 解析レベルと組み合わせて最終キーを生成
         return f"{track_hash}_{wind_hash}_{competitor_hash}_{course_hash}_{self.analysis_level}"
@@ -7,6 +7,7 @@ GPSデータと風データから風向シフトを高精度に検出するた
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from typing import Dict, List, Tuple, Optional, Union, Any
 from datetime import datetime, timedelta
@@ -15,6 +16,8 @@ from scipy import signal
 from scipy.stats import circmean, circstd
 import warnings
 
+from sailing_data_processor.utilities.fingerprint import fingerprint
+
 class StatisticalShiftDetector:
     """
     統計的手法による風向シフト検出クラス
@@ -354,6 +357,9 @@ class MLShiftDetector:
     機械学習手法による風向シフト検出クラス
     """
     
+    # 各点の前後に使用するデータ点数
+    POINT_WINDOW = 5
+    
     def __init__(self, params):
         """初期化"""
         self.params = params
@@ -387,6 +393,15 @@ class MLShiftDetector:
                     'trend_change': 0.4,     # トレンド変化
                 }
                 
+                # 特徴量行列（列が特徴量名のDataFrame）の場合は一括計算
+                if isinstance(features, pd.DataFrame):
+                    prob = np.zeros(len(features))
+                    for feat_name, weight in weights.items():
+                        if feat_name in features.columns:
+                            prob = prob + features[feat_name].to_numpy(dtype=float) * weight
+                    with np.errstate(over='ignore'):
+                        return 1 / (1 + np.exp(-prob))
+                
                 # 結果格納用
                 probas = []
                 
@@ -413,56 +428,35 @@ class MLShiftDetector:
         # 時系列データとして処理
         df = wind_data.copy().sort_values('timestamp')
         
-        # 特徴量の抽出
-        features = self._extract_features(df)
-        
-        # 候補点の選定 (時間軸上でスライディングウィンドウを移動)
-        candidate_points = []
+        # 候補点の選定
         confidence_threshold = self.params.get("confidence_threshold", 0.6)
-        
-        for i in range(5, len(df) - 5):  # 両端のデータは除外
-            current_point = df.iloc[i]
-            
-            # 前後のデータウィンドウ
-            before_data = df.iloc[i-5:i]
-            after_data = df.iloc[i+1:i+6]
-            
-            if len(before_data) >= 3 and len(after_data) >= 3:
-                # 特徴量の計算
-                point_features = self._compute_point_features(current_point, before_data, after_data)
-                
-                # モデルによる予測
-                shift_probability = self.model.predict_proba([point_features])[0]
-                
-                # 閾値を超える確率の場合は候補点として記録
-                if shift_probability > confidence_threshold:
-                    candidate_points.append({
-                        'index': i,
-                        'timestamp': current_point['timestamp'],
-                        'probability': shift_probability,
-                        'features': point_features
-                    })
+        if self.params.get("batch_features", True):
+            candidate_points = self._find_candidates_batched(df, confidence_threshold)
+        else:
+            candidate_points = self._find_candidates_pointwise(df, confidence_threshold)
         
         # 近接した候補点をマージ
         merged_candidates = self._merge_close_candidates(candidate_points, df)
         
         # シフトポイントの作成
         shift_points = []
+        timestamps = pd.DatetimeIndex(df['timestamp'])
         
         for candidate in merged_candidates:
             idx = candidate['index']
             if idx > 0 and idx < len(df) - 1:
                 # 選定された点の情報
                 center_row = df.iloc[idx]
+                center_time = center_row['timestamp']
                 
-                # 前後のデータウィンドウ
-                time_before = center_row['timestamp'] - timedelta(minutes=3)
-                time_after = center_row['timestamp'] + timedelta(minutes=3)
+                # 前後3分間のデータウィンドウ（ソート済みのため二分探索で範囲を特定）
+                before_start = timestamps.searchsorted(center_time - timedelta(minutes=3), side='left')
+                before_end = timestamps.searchsorted(center_time, side='left')
+                after_start = timestamps.searchsorted(center_time, side='right')
+                after_end = timestamps.searchsorted(center_time + timedelta(minutes=3), side='right')
                 
-                data_before = df[(df['timestamp'] >= time_before) & 
-                               (df['timestamp'] < center_row['timestamp'])]
-                data_after = df[(df['timestamp'] > center_row['timestamp']) & 
-                              (df['timestamp'] <= time_after)]
+                data_before = df.iloc[before_start:before_end]
+                data_after = df.iloc[after_start:after_end]
                 
                 # 前後の風向平均
                 if len(data_before) >= 3 and len(data_after) >= 3:
@@ -494,6 +488,213 @@ class MLShiftDetector:
                         shift_points.append(shift_point)
         
         return shift_points
+    
+    def _find_candidates_batched(self, df: pd.DataFrame, confidence_threshold: float) -> List[Dict[str, Any]]:
+        """
+        全ての点の特徴量を一括計算し、1回の予測で候補点を選定
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            タイムスタンプでソートされた風データ
+        confidence_threshold : float
+            候補点とする確率の閾値
+            
+        Returns
+        -------
+        List[Dict[str, Any]]
+            候補点のリスト（index, timestamp, probability, features）
+        """
+        features = self._compute_window_features(df)
+        if features.empty:
+            return []
+        
+        probabilities = self.model.predict_proba(features)
+        selected = np.flatnonzero(probabilities > confidence_threshold)
+        if len(selected) == 0:
+            return []
+        
+        positions = features.index.to_numpy()[selected]
+        timestamps = df['timestamp'].iloc[positions]
+        records = features.iloc[selected].to_dict('records')
+        
+        return [
+            {
+                'index': int(position),
+                'timestamp': timestamp,
+                'probability': probability,
+                'features': record
+            }
+            for position, timestamp, probability, record
+            in zip(positions, timestamps, probabilities[selected], records)
+        ]
+    
+    def _compute_window_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        各点の前後ウィンドウ（前5点・後5点）の特徴量をスライディングウィンドウで一括計算
+        
+        _compute_point_features と同じ特徴量を、両端を除く全ての点について計算します。
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            タイムスタンプでソートされた風データ
+            
+        Returns
+        -------
+        pd.DataFrame
+            特徴量行列（インデックスは df 内の位置）
+        """
+        half = self.POINT_WINDOW
+        n = len(df)
+        centers = np.arange(half, n - half)
+        if len(centers) == 0:
+            return pd.DataFrame()
+        
+        # 前のウィンドウは [i-5, i)、後のウィンドウは [i+1, i+6)
+        before = centers - half
+        after = centers + 1
+        
+        directions = df['wind_direction'].to_numpy(dtype=float)
+        radians = np.radians(directions)
+        sin_windows = sliding_window_view(np.sin(radians), half)
+        cos_windows = sliding_window_view(np.cos(radians), half)
+        
+        def circular_stats(starts):
+            """ウィンドウごとの円周平均と円周標準偏差（度）"""
+            sin_mean = sin_windows[starts].mean(axis=1)
+            cos_mean = cos_windows[starts].mean(axis=1)
+            mean = (np.arctan2(sin_mean, cos_mean) % (2 * np.pi)) * 180 / np.pi
+            with np.errstate(divide='ignore', invalid='ignore'):
+                resultant = np.minimum(1.0, np.hypot(sin_mean, cos_mean))
+                std = np.sqrt(-2 * np.log(resultant)) * 180 / np.pi
+            return mean, std
+        
+        before_mean, before_std = circular_stats(before)
+        after_mean, after_std = circular_stats(after)
+        
+        # 変化量特徴量（-180〜180度）
+        dir_change = ((after_mean % 360 - before_mean % 360 + 180) % 360) - 180
+        dir_change_short = np.abs(dir_change) / 20.0
+        
+        # 標準偏差特徴量
+        dir_std_short = (before_std + after_std) / 30.0
+        
+        # 風速特徴量 (存在する場合)
+        if 'wind_speed' in df.columns:
+            speed_mean = df['wind_speed'].rolling(window=half, min_periods=1).mean().to_numpy(dtype=float)
+            before_speed = speed_mean[centers - 1]
+            after_speed = speed_mean[centers + half]
+            with np.errstate(invalid='ignore'):
+                speed_change = (after_speed - before_speed) / np.where(before_speed > 0.1, before_speed, 0.1)
+                speed_change = np.abs(speed_change)
+                speed_change = np.where(speed_change < 1.0, speed_change, 1.0)
+        else:
+            speed_change = np.zeros(len(centers))
+        
+        # トレンド特徴量（各ウィンドウの線形回帰の傾き）
+        trend_change = self._window_trend_change(df, directions, before, after)
+        
+        features = pd.DataFrame({
+            'dir_change_short': dir_change_short,
+            'dir_std_short': dir_std_short,
+            'speed_change': speed_change,
+            'trend_change': trend_change,
+            # 長期的な特徴量は短期的な特徴量で代用
+            'dir_std_long': dir_std_short,
+            'dir_change_long': dir_change_short,
+        }, index=centers)
+        
+        return features
+    
+    def _window_trend_change(self, df: pd.DataFrame, directions: np.ndarray,
+                             before: np.ndarray, after: np.ndarray) -> np.ndarray:
+        """前後ウィンドウの風向トレンド（傾き）の変化量を一括計算"""
+        half = self.POINT_WINDOW
+        
+        timestamps = pd.DatetimeIndex(df['timestamp'])
+        seconds = (timestamps - timestamps[0]).total_seconds().to_numpy(dtype=float)
+        x_windows = sliding_window_view(seconds, half)
+        y_windows = sliding_window_view(directions, half)
+        
+        def slopes(starts):
+            x = x_windows[starts]
+            y = y_windows[starts]
+            x_centered = x - x.mean(axis=1, keepdims=True)
+            y_centered = y - y.mean(axis=1, keepdims=True)
+            sxx = (x_centered ** 2).sum(axis=1)
+            sxy = (x_centered * y_centered).sum(axis=1)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = sxy / sxx
+            
+            # 風向が一定のウィンドウの傾きは0
+            constant = y.max(axis=1) == y.min(axis=1)
+            slope[constant] = 0.0
+            
+            # 時刻が全て同じウィンドウは個別にpolyfitで計算
+            for row in np.flatnonzero((sxx == 0) & ~constant & ~np.isnan(y).any(axis=1)):
+                try:
+                    slope[row] = np.polyfit(x[row], y[row], 1)[0]
+                except (np.linalg.LinAlgError, ValueError):
+                    slope[row] = np.nan
+            return slope
+        
+        slope_before = slopes(before)
+        slope_after = slopes(after)
+        
+        with np.errstate(invalid='ignore'):
+            trend_change = np.minimum(1.0, np.abs(slope_after - slope_before) * 10)
+        
+        # 計算できないウィンドウ（欠損値を含むなど）は0
+        return np.where(np.isnan(trend_change), 0.0, trend_change)
+    
+    def _find_candidates_pointwise(self, df: pd.DataFrame, confidence_threshold: float) -> List[Dict[str, Any]]:
+        """
+        点ごとに前後のウィンドウから特徴量を計算して候補点を選定（従来の処理）
+        
+        Parameters
+        ----------
+        df : pd.DataFrame
+            タイムスタンプでソートされた風データ
+        confidence_threshold : float
+            候補点とする確率の閾値
+            
+        Returns
+        -------
+        List[Dict[str, Any]]
+            候補点のリスト（index, timestamp, probability, features）
+        """
+        # 特徴量の抽出
+        features = self._extract_features(df)
+        
+        # 候補点の選定 (時間軸上でスライディングウィンドウを移動)
+        candidate_points = []
+        
+        for i in range(5, len(df) - 5):  # 両端のデータは除外
+            current_point = df.iloc[i]
+            
+            # 前後のデータウィンドウ
+            before_data = df.iloc[i-5:i]
+            after_data = df.iloc[i+1:i+6]
+            
+            if len(before_data) >= 3 and len(after_data) >= 3:
+                # 特徴量の計算
+                point_features = self._compute_point_features(current_point, before_data, after_data)
+                
+                # モデルによる予測
+                shift_probability = self.model.predict_proba([point_features])[0]
+                
+                # 閾値を超える確率の場合は候補点として記録
+                if shift_probability > confidence_threshold:
+                    candidate_points.append({
+                        'index': i,
+                        'timestamp': current_point['timestamp'],
+                        'probability': shift_probability,
+                        'features': point_features
+                    })
+        
+        return candidate_points
         
     def _extract_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """特徴量の抽出"""
@@ -975,6 +1176,7 @@ class WindShiftDetector:
             "noise_filter": kwargs.get("noise_filter", "kalman"),  # ノイズフィルタ
             "trend_detection": kwargs.get("trend_detection", True),  # トレンド検出
             "use_location_context": kwargs.get("use_location_context", False),  # 位置情報の活用
+            "batch_features": kwargs.get("batch_features", True),  # 特徴量の一括計算（機械学習手法）
         }
         
         # 感度による閾値調整
@@ -1365,18 +1567,8 @@ class WindShiftDetector:
             return pd.DataFrame()
     
     def _create_cache_key(self, data):
-        """キャッシュキーの作成"""
-        if isinstance(data, pd.DataFrame):
-            # データフレームの場合はサイズとタイムスタンプ範囲を使用
-            if 'timestamp' in data.columns and not data.empty:
-                min_time = data['timestamp'].min()
-                max_time = data['timestamp'].max()
-                return f"{self.method}_{len(data)}_{min_time}_{max_time}"
-            else:
-                return f"{self.method}_{len(data)}"
-        else:
-            # その他の場合はオブジェクトのIDを使用
-            return f"{self.method}_{id(data)}"
+        """キャッシュキーの作成（データの内容全体のフィンガープリントを使用）"""
+        return f"{self.method}_{fingerprint(data)}"
     
     def _join_nearest_track_data(self, wind_df, track_df):
         """風データに最も近いGPSトラックデータを結合"""
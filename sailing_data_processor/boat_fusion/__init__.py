@@ -6,3 +6,4 @@ sailing_data_processor.boat_fusion モジュール
 """
 
 from .boat_data_fusion_base import BoatDataFusionModel
+from .boat_data_fusion_history import EstimationHistory
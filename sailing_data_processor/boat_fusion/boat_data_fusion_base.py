@@ -11,7 +11,8 @@ from typing import Dict, List, Tuple, Optional, Union, Any
 from datetime import datetime, timedelta
 import math
 
-from .boat_data_fusion_integration import fuse_wind_estimates
+from .boat_data_fusion_history import EstimationHistory
+from .boat_data_fusion_integration import fuse_wind_estimates, fuse_wind_time_series
 from .boat_data_fusion_analysis import calc_boat_reliability
 from .boat_data_fusion_utils import bayesian_wind_integration, weighted_average_integration, update_time_change_model, create_spatiotemporal_wind_field, estimate_wind_field_at_time
 
@@ -40,8 +41,8 @@ class BoatDataFusionModel:
         # 艇タイプの辞書
         self.boat_types = {}
         
-        # 風向風速推定の履歴
-        self.estimation_history = []
+        # 風向風速推定の履歴（時刻順の列指向配列、最大100件）
+        self.estimation_history = EstimationHistory(max_entries=100)
         
         # 風向の時間変化モデル
         self.direction_time_change = 0.0  # 度/分
@@ -139,6 +140,25 @@ class BoatDataFusionModel:
         """
         return fuse_wind_estimates(self, boats_estimates, time_point)
     
+    def fuse_wind_time_series(self, boats_estimates: Dict[str, pd.DataFrame],
+                            time_points: List[datetime]) -> pd.DataFrame:
+        """
+        複数の時間点について複数艇からの風向風速推定を一括で融合
+        
+        Parameters:
+        -----------
+        boats_estimates : Dict[str, pd.DataFrame]
+            艇ID:風向風速推定DataFrameの辞書
+        time_points : List[datetime]
+            対象時間点のリスト
+            
+        Returns:
+        --------
+        pd.DataFrame
+            時間点ごとの融合された風向風速データと信頼度
+        """
+        return fuse_wind_time_series(self, boats_estimates, time_points)
+    
     def _bayesian_wind_integration(self, boat_data: List[Dict[str, Any]], 
                                  time_point: datetime) -> Dict[str, Any]:
         """
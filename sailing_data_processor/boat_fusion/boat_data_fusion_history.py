@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.boat_fusion.boat_data_fusion_history モジュール
+
+融合された風向風速推定の履歴を時刻順の列指向配列で保持するクラスを提供します。
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union, Any
+
+from ..utilities.track_kinematics import datetime_nanoseconds
+
+# 数値列の名前
+FLOAT_COLUMNS = ('wind_direction', 'wind_speed_knots', 'latitude', 'longitude')
+
+
+class EstimationHistory:
+    """
+    風向風速推定履歴の列指向コンテナ
+
+    時刻はint64ナノ秒、風向・風速・位置はfloat64の配列で、常に時刻順に並べて保持します。
+    従来のリスト形式の履歴と互換性があり、``append`` で辞書を追加し、
+    インデックスやスライス（``history[-5:]`` など）で辞書として取り出せます。
+    最大件数を超えた場合は最も古い時刻の推定から削除されます。
+
+    Parameters:
+    -----------
+    max_entries : int, optional
+        保持する最大件数（Noneの場合は無制限）
+    """
+
+    def __init__(self, max_entries: Optional[int] = 100):
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.clear()
+
+    def clear(self) -> None:
+        """全ての履歴を削除"""
+        self._time = np.empty(0, dtype=np.int64)
+        self._timestamps = np.empty(0, dtype=object)
+        self._floats = {name: np.empty(0, dtype=np.float64) for name in FLOAT_COLUMNS}
+
+    # ------------------------------------------------------------------
+    # 列へのアクセス
+    # ------------------------------------------------------------------
+
+    @property
+    def times_ns(self) -> np.ndarray:
+        """時刻（int64ナノ秒、昇順）"""
+        return self._time
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """追加時の時刻オブジェクト（object配列）"""
+        return self._timestamps
+
+    @property
+    def wind_direction(self) -> np.ndarray:
+        """風向（度）"""
+        return self._floats['wind_direction']
+
+    @property
+    def wind_speed(self) -> np.ndarray:
+        """風速（ノット）"""
+        return self._floats['wind_speed_knots']
+
+    @property
+    def latitude(self) -> np.ndarray:
+        """緯度（不明な場合はNaN）"""
+        return self._floats['latitude']
+
+    @property
+    def longitude(self) -> np.ndarray:
+        """経度（不明な場合はNaN）"""
+        return self._floats['longitude']
+
+    # ------------------------------------------------------------------
+    # 追加
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        推定を1件追加
+
+        Parameters:
+        -----------
+        entry : Dict[str, Any]
+            'timestamp', 'wind_direction', 'wind_speed_knots' と任意の
+            'latitude', 'longitude' を含む辞書
+        """
+        self.extend([entry['timestamp']],
+                    [entry['wind_direction']],
+                    [entry['wind_speed_knots']],
+                    [entry.get('latitude')],
+                    [entry.get('longitude')])
+
+    def extend(self, timestamps: Any, wind_directions: Any, wind_speeds: Any,
+               latitudes: Any = None, longitudes: Any = None) -> None:
+        """
+        推定を列単位でまとめて追加
+
+        同時刻の推定は既存の推定の後ろに並びます。
+
+        Parameters:
+        -----------
+        timestamps : Any
+            時刻のシーケンス
+        wind_directions : Any
+            風向（度）のシーケンス
+        wind_speeds : Any
+            風速（ノット）のシーケンス
+        latitudes : Any, optional
+            緯度のシーケンス（Noneの要素は位置不明として扱う）
+        longitudes : Any, optional
+            経度のシーケンス（Noneの要素は位置不明として扱う）
+        """
+        timestamps = np.asarray(list(timestamps), dtype=object)
+        count = len(timestamps)
+        if count == 0:
+            return
+
+        def column(values):
+            if values is None:
+                return np.full(count, np.nan)
+            values = np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+            if len(values) != count:
+                raise ValueError("all columns must have the same length")
+            return values
+
+        new_time, _ = datetime_nanoseconds(timestamps)
+        new_floats = {
+            'wind_direction': column(wind_directions),
+            'wind_speed_knots': column(wind_speeds),
+            'latitude': column(latitudes),
+            'longitude': column(longitudes),
+        }
+
+        # 安定ソートで新しい推定を時刻順に並べてから挿入位置を求める
+        order = np.argsort(new_time, kind='stable')
+        new_time = new_time[order]
+        positions = np.searchsorted(self._time, new_time, side='right')
+
+        self._time = np.insert(self._time, positions, new_time)
+        self._timestamps = np.insert(self._timestamps, positions, timestamps[order])
+        self._floats = {
+            name: np.insert(self._floats[name], positions, new_floats[name][order])
+            for name in FLOAT_COLUMNS
+        }
+
+        # 最大件数を超えた分は古い時刻から削除
+        if self.max_entries is not None and len(self._time) > self.max_entries:
+            keep = slice(len(self._time) - self.max_entries, None)
+            self._time = self._time[keep]
+            self._timestamps = self._timestamps[keep]
+            self._floats = {name: values[keep] for name, values in self._floats.items()}
+
+    # ------------------------------------------------------------------
+    # リスト互換のアクセス
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._time)
+
+    def _record(self, position: int) -> Dict[str, Any]:
+        record = {'timestamp': self._timestamps[position]}
+        for name in ('wind_direction', 'wind_speed_knots'):
+            record[name] = float(self._floats[name][position])
+        for name in ('latitude', 'longitude'):
+            value = self._floats[name][position]
+            record[name] = None if np.isnan(value) else float(value)
+        return record
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(key, slice):
+            return [self._record(i) for i in range(*key.indices(len(self)))]
+        position = int(key)
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("history index out of range")
+        return self._record(position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._record(position)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        履歴をDataFrameとして取得
+
+        Returns:
+        --------
+        pd.DataFrame
+            timestamp, wind_direction, wind_speed_knots, latitude, longitude 列を持つDataFrame
+        """
+        data = {'timestamp': self._timestamps}
+        data.update({name: values.copy() for name, values in self._floats.items()})
+        return pd.DataFrame(data)
@@ -11,6 +11,9 @@ from typing import Dict, List, Tuple, Optional, Union, Any
 from datetime import datetime, timedelta
 import math
 
+from ..utilities.track_kinematics import datetime_nanoseconds
+from .boat_data_fusion_kernels import fuse_wind_matrices
+
 def fuse_wind_estimates(model, boats_estimates: Dict[str, pd.DataFrame], 
                       time_point: datetime = None) -> Optional[Dict[str, Any]]:
     """
@@ -93,18 +96,141 @@ def fuse_wind_estimates(model, boats_estimates: Dict[str, pd.DataFrame],
     # ベイズ更新を使用した風向風速の統合
     integrated_estimate = model._bayesian_wind_integration(boat_data, time_point)
     
-    # 履歴に追加
+    # 履歴に追加（最大件数を超えた古いエントリは履歴側で削除される）
     model.estimation_history.append({
         'timestamp': time_point,
         'wind_direction': integrated_estimate['wind_direction'],
-        'wind_speed_knots': integrated_estimate['wind_speed']
+        'wind_speed_knots': integrated_estimate['wind_speed'],
+        'latitude': integrated_estimate['latitude'],
+        'longitude': integrated_estimate['longitude']
     })
     
-    # 履歴が長すぎる場合は古いエントリを削除
-    if len(model.estimation_history) > 100:
-        model.estimation_history = model.estimation_history[-100:]
-    
     # 時間変化モデルの更新
     model._update_time_change_model()
     
     return integrated_estimate
+
+def fuse_wind_time_series(model, boats_estimates: Dict[str, pd.DataFrame],
+                          time_points: List[datetime], max_gap_seconds: float = 60.0) -> pd.DataFrame:
+    """
+    複数の時間点について複数艇からの風向風速推定を一括で融合
+    
+    各艇の時間点に最も近い推定を (時間点数, 艇数) の行列にまとめ、全時間点の統合を一度に計算します。
+    各艇の信頼性係数は処理開始時点の履歴で1回だけ計算し、融合結果はまとめて履歴に追加した後、
+    時間変化モデルを1回更新します。
+    
+    Parameters:
+    -----------
+    model : BoatDataFusionModel
+        モデルインスタンス
+    boats_estimates : Dict[str, pd.DataFrame]
+        艇ID:風向風速推定DataFrameの辞書
+    time_points : List[datetime]
+        対象時間点のリスト
+    max_gap_seconds : float
+        使用する推定と時間点の最大時間差（秒）
+        
+    Returns:
+    --------
+    pd.DataFrame
+        時間点ごとの融合結果（timestamp, wind_direction, wind_speed, confidence, direction_std,
+        speed_std, latitude, longitude, boat_count 列）。使用できる推定がない時間点は含まない
+    """
+    columns = ['timestamp', 'wind_direction', 'wind_speed', 'confidence', 'direction_std',
+               'speed_std', 'latitude', 'longitude', 'boat_count']
+    
+    time_points = list(time_points)
+    boats = [(boat_id, df) for boat_id, df in (boats_estimates or {}).items()
+             if 'timestamp' in df.columns and not df.empty]
+    if not time_points or not boats:
+        return pd.DataFrame(columns=columns)
+    
+    query_ns, _ = datetime_nanoseconds(time_points)
+    shape = (len(time_points), len(boats))
+    matrices = {name: np.full(shape, np.nan)
+                for name in ('wind_direction', 'wind_speed_knots', 'weight', 'latitude', 'longitude')}
+    mask = np.zeros(shape, dtype=bool)
+    boat_times = np.zeros(shape, dtype=np.int64)
+    boat_timestamps = np.empty(shape, dtype=object)
+    
+    for b, (boat_id, df) in enumerate(boats):
+        # 各時間点に最も近い推定の行を探す
+        times, _ = datetime_nanoseconds(df['timestamp'])
+        order = np.argsort(times, kind='stable')
+        sorted_times = times[order]
+        last = len(sorted_times) - 1
+        position = np.searchsorted(sorted_times, query_ns, side='left')
+        left = np.clip(position - 1, 0, last)
+        right = np.clip(position, 0, last)
+        nearest = np.where(np.abs(query_ns - sorted_times[right]) < np.abs(query_ns - sorted_times[left]),
+                           right, left)
+        rows = order[nearest]
+        within = np.abs(query_ns - times[rows]) <= max_gap_seconds * 1e9
+        
+        confidence = (df['confidence'].to_numpy(dtype=np.float64) if 'confidence' in df.columns
+                      else np.full(len(df), 0.7))
+        reliability = model.calc_boat_reliability(boat_id, df)
+        
+        matrices['weight'][within, b] = confidence[rows[within]] * reliability
+        for name in ('wind_direction', 'wind_speed_knots', 'latitude', 'longitude'):
+            if name in df.columns:
+                matrices[name][within, b] = df[name].to_numpy(dtype=np.float64)[rows[within]]
+        mask[:, b] = within
+        boat_times[:, b] = times[rows]
+        boat_timestamps[:, b] = df['timestamp'].to_numpy(dtype=object)[rows]
+    
+    # 事前分布の平均（指定がない場合は最初にベイズ統合する時間点の先頭の艇の推定値を使用）
+    counts = mask.sum(axis=1)
+    bayesian_rows = np.flatnonzero(counts >= 3)
+    if len(bayesian_rows) > 0:
+        first_row = bayesian_rows[0]
+        first_boat = np.argmax(mask[first_row])
+        if model.wind_dir_prior_mean is None:
+            model.wind_dir_prior_mean = matrices['wind_direction'][first_row, first_boat]
+        if model.wind_speed_prior_mean is None:
+            model.wind_speed_prior_mean = matrices['wind_speed_knots'][first_row, first_boat]
+    
+    prior_direction = np.nan if model.wind_dir_prior_mean is None else model.wind_dir_prior_mean
+    prior_speed = np.nan if model.wind_speed_prior_mean is None else model.wind_speed_prior_mean
+    
+    fused = fuse_wind_matrices(matrices['wind_direction'], matrices['wind_speed_knots'], matrices['weight'],
+                               prior_direction, prior_speed, mask=mask,
+                               latitudes=matrices['latitude'], longitudes=matrices['longitude'])
+    
+    # 重み付き平均の時間点は艇の推定時刻の中央値を時刻とする
+    boat_count = fused['boat_count']
+    timestamps = np.empty(len(time_points), dtype=object)
+    timestamps[:] = time_points
+    average_rows = ~fused['bayesian'] & (boat_count > 0)
+    if average_rows.any():
+        ranked = np.where(mask, boat_times, np.iinfo(np.int64).max)
+        median_boat = np.argsort(ranked, axis=1, kind='stable')[np.arange(len(time_points)),
+                                                                np.minimum(boat_count // 2, len(boats) - 1)]
+        median_time = boat_timestamps[np.arange(len(time_points)), median_boat]
+        timestamps[average_rows] = median_time[average_rows]
+    
+    fused_rows = boat_count > 0
+    result = pd.DataFrame({
+        'timestamp': timestamps[fused_rows],
+        'wind_direction': fused['wind_direction'][fused_rows],
+        'wind_speed': fused['wind_speed'][fused_rows],
+        'confidence': fused['confidence'][fused_rows],
+        'direction_std': fused['direction_std'][fused_rows],
+        'speed_std': fused['speed_std'][fused_rows],
+        'latitude': fused['latitude'][fused_rows],
+        'longitude': fused['longitude'][fused_rows],
+        'boat_count': boat_count[fused_rows]
+    }, columns=columns)
+    
+    # 履歴にまとめて追加し、時間変化モデルを更新
+    if len(result) > 0:
+        history_times = np.empty(len(time_points), dtype=object)
+        history_times[:] = time_points
+        model.estimation_history.extend(history_times[fused_rows],
+                                        result['wind_direction'].to_numpy(),
+                                        result['wind_speed'].to_numpy(),
+                                        result['latitude'].to_numpy(),
+                                        result['longitude'].to_numpy())
+        model._update_time_change_model()
+    
+    return result
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.boat_fusion.boat_data_fusion_kernels モジュール
+
+船舶データ融合の配列演算カーネルを提供します。
+各カーネルは (時間点数, 艇数) の行列を受け取り、艇方向に集約して時間点ごとの結果を一括で計算します。
+1次元の配列は1時間点分の艇データとして扱います。
+"""
+
+import warnings
+import numpy as np
+from typing import Dict, Optional, Any
+
+# 事前確率の重み
+PRIOR_WEIGHT = 0.3
+
+# ベイズ統合に必要な最小艇数（これ未満は重み付き平均）
+MIN_BAYESIAN_BOATS = 3
+
+
+def _as_matrix(values: Any) -> np.ndarray:
+    return np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+
+def _prepare(directions: Any, speeds: Any, weights: Any,
+             mask: Optional[Any] = None) -> Dict[str, np.ndarray]:
+    """入力を行列に揃え、欠損した艇を重み0・値0にした配列を作成"""
+    directions = _as_matrix(directions)
+    speeds = _as_matrix(speeds)
+    weights = np.broadcast_to(_as_matrix(weights), directions.shape)
+
+    valid = np.isfinite(directions) & np.isfinite(speeds) & np.isfinite(weights)
+    if mask is not None:
+        valid &= np.broadcast_to(np.atleast_2d(np.asarray(mask, dtype=bool)), directions.shape)
+
+    return {
+        'direction': np.where(valid, directions, 0.0),
+        'speed': np.where(valid, speeds, 0.0),
+        'weight': np.where(valid, weights, 0.0),
+        'mask': valid,
+        'count': valid.sum(axis=1),
+    }
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """分母が0の要素をNaNにする除算"""
+    denominator = np.asarray(denominator, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / np.where(denominator != 0, denominator, 1.0), np.nan)
+
+
+def _weighted_sin_cos(prepared: Dict[str, np.ndarray]):
+    """重み付きのsin/cos平均（重みの合計が0の行は単純平均）"""
+    radians = np.radians(prepared['direction'])
+    sin = np.where(prepared['mask'], np.sin(radians), 0.0)
+    cos = np.where(prepared['mask'], np.cos(radians), 0.0)
+    weight = prepared['weight']
+    weight_sum = weight.sum(axis=1)
+
+    weighted = weight_sum != 0
+    mean_sin = np.where(weighted, _safe_divide((weight * sin).sum(axis=1), weight_sum),
+                        _safe_divide(sin.sum(axis=1), prepared['count']))
+    mean_cos = np.where(weighted, _safe_divide((weight * cos).sum(axis=1), weight_sum),
+                        _safe_divide(cos.sum(axis=1), prepared['count']))
+    return mean_sin, mean_cos
+
+
+def _direction_deviation(prepared: Dict[str, np.ndarray], direction: np.ndarray) -> np.ndarray:
+    """各艇の風向と統合風向の差（循環性を考慮、度）"""
+    diff = np.abs((prepared['direction'] - direction[:, np.newaxis] + 180) % 360 - 180)
+    return np.where(prepared['mask'], diff, 0.0)
+
+
+def weighted_positions(latitudes: Any, longitudes: Any, weights: Any,
+                       mask: Optional[Any] = None):
+    """
+    重み付き平均による位置の統合
+
+    Parameters:
+    -----------
+    latitudes : array-like
+        緯度の行列（位置不明はNaN）
+    longitudes : array-like
+        経度の行列（位置不明はNaN）
+    weights : array-like
+        重みの行列
+    mask : array-like, optional
+        有効な艇を示す真偽値の行列
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        時間点ごとの緯度・経度（有効な位置がない行はNaN）
+    """
+    latitudes = _as_matrix(latitudes)
+    longitudes = _as_matrix(longitudes)
+    weights = np.broadcast_to(_as_matrix(weights), latitudes.shape)
+
+    valid = np.isfinite(latitudes) & np.isfinite(longitudes) & np.isfinite(weights)
+    if mask is not None:
+        valid &= np.broadcast_to(np.atleast_2d(np.asarray(mask, dtype=bool)), latitudes.shape)
+
+    weight = np.where(valid, weights, 0.0)
+    total = weight.sum(axis=1)
+    positive = total > 0
+    latitude = np.where(positive, _safe_divide((weight * np.where(valid, latitudes, 0.0)).sum(axis=1), total), np.nan)
+    longitude = np.where(positive, _safe_divide((weight * np.where(valid, longitudes, 0.0)).sum(axis=1), total), np.nan)
+    return latitude, longitude
+
+
+def weighted_average_kernel(directions: Any, speeds: Any, weights: Any,
+                            mask: Optional[Any] = None) -> Dict[str, np.ndarray]:
+    """
+    単純な重み付き平均による風向風速の統合（時間点ごとに一括計算）
+
+    Parameters:
+    -----------
+    directions : array-like
+        風向（度）の行列 (時間点数, 艇数)
+    speeds : array-like
+        風速（ノット）の行列
+    weights : array-like
+        各艇の重みの行列
+    mask : array-like, optional
+        有効な艇を示す真偽値の行列（NaNを含む艇は自動的に除外）
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        wind_direction, wind_speed, confidence, direction_std, speed_std, boat_count の配列
+        （有効な艇がない行はNaN）
+    """
+    prepared = _prepare(directions, speeds, weights, mask)
+    weight = prepared['weight']
+    count = prepared['count']
+    weight_sum = weight.sum(axis=1)
+    weighted = weight_sum != 0
+
+    mean_sin, mean_cos = _weighted_sin_cos(prepared)
+    direction = np.degrees(np.arctan2(mean_sin, mean_cos)) % 360
+    speed = np.where(weighted, _safe_divide((weight * prepared['speed']).sum(axis=1), weight_sum),
+                     _safe_divide(prepared['speed'].sum(axis=1), count))
+
+    # 信頼度（艇数と重みの平均に基づく）
+    average_weight = _safe_divide(weight_sum, count)
+    confidence = np.minimum(0.9, 0.4 + 0.1 * count + 0.4 * average_weight)
+
+    # 標準偏差（重みの合計が0の行は正規化しない）
+    dir_var = (weight * _direction_deviation(prepared, direction) ** 2).sum(axis=1)
+    speed_dev = np.where(prepared['mask'], prepared['speed'] - speed[:, np.newaxis], 0.0)
+    speed_var = (weight * speed_dev ** 2).sum(axis=1)
+    dir_var = np.where(weighted, _safe_divide(dir_var, weight_sum), dir_var)
+    speed_var = np.where(weighted, _safe_divide(speed_var, weight_sum), speed_var)
+
+    empty = count == 0
+    return {
+        'wind_direction': np.where(empty, np.nan, direction),
+        'wind_speed': np.where(empty, np.nan, speed),
+        'confidence': np.where(empty, np.nan, confidence),
+        'direction_std': np.where(empty, np.nan, np.sqrt(dir_var)),
+        'speed_std': np.where(empty, np.nan, np.sqrt(speed_var)),
+        'boat_count': count,
+    }
+
+
+def bayesian_fusion_kernel(directions: Any, speeds: Any, weights: Any,
+                           prior_direction: Any, prior_speed: Any,
+                           mask: Optional[Any] = None,
+                           prior_weight: float = PRIOR_WEIGHT) -> Dict[str, np.ndarray]:
+    """
+    ベイズ更新を使用した風向風速の統合（時間点ごとに一括計算）
+
+    風向は事前分布とのsin/cos成分の混合、風速は中央値からの偏差で重みを下げた
+    ロバスト平均と事前分布の混合で統合します。艇数による分岐は行わないため、
+    艇数が少ない行の扱いは呼び出し側（:func:`fuse_wind_matrices`）で決めます。
+
+    Parameters:
+    -----------
+    directions : array-like
+        風向（度）の行列 (時間点数, 艇数)
+    speeds : array-like
+        風速（ノット）の行列
+    weights : array-like
+        各艇の重みの行列
+    prior_direction : float or array-like
+        風向の事前確率平均（度、時間点ごとに指定可能）
+    prior_speed : float or array-like
+        風速の事前確率平均（ノット、時間点ごとに指定可能）
+    mask : array-like, optional
+        有効な艇を示す真偽値の行列（NaNを含む艇は自動的に除外）
+    prior_weight : float
+        事前確率の重み
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        wind_direction, wind_speed, confidence, direction_std, speed_std, boat_count の配列
+        （有効な艇がない行はNaN）
+    """
+    prepared = _prepare(directions, speeds, weights, mask)
+    valid = prepared['mask']
+    weight = prepared['weight']
+    speeds = prepared['speed']
+    count = prepared['count']
+    shape = count.shape
+
+    # 1. 風向の統合（事前分布とsin/cos成分で混合）
+    prior_direction = np.broadcast_to(np.asarray(prior_direction, dtype=np.float64), shape)
+    prior_radians = np.radians(prior_direction)
+    mean_sin, mean_cos = _weighted_sin_cos(prepared)
+    posterior_sin = np.sin(prior_radians) * prior_weight + mean_sin * (1 - prior_weight)
+    posterior_cos = np.cos(prior_radians) * prior_weight + mean_cos * (1 - prior_weight)
+    direction = np.degrees(np.arctan2(posterior_sin, posterior_cos)) % 360
+
+    weight_sum = weight.sum(axis=1)
+    dir_var = _safe_divide((weight * _direction_deviation(prepared, direction) ** 2).sum(axis=1), weight_sum)
+    dir_var = np.where(weight_sum != 0, dir_var, 0.0)
+    dir_std = np.sqrt(dir_var)
+    dir_uncertainty = np.minimum(1.0, dir_std / 90.0)
+
+    # 2. 風速の統合（中央値からの偏差に基づくロバスト重み）
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(np.where(valid, speeds, np.nan), axis=1)
+    deviations = np.where(valid, np.abs(speeds - median[:, np.newaxis]), 0.0)
+    max_deviation = deviations.max(axis=1) if deviations.shape[1] > 0 else np.zeros(shape)
+    max_deviation = np.where(max_deviation == 0, 1.0, max_deviation)
+
+    robust = np.maximum(0.1, weight * (1 - deviations / max_deviation[:, np.newaxis]))
+    robust = np.where(valid, robust, 0.0)
+    robust_sum = robust.sum(axis=1)
+    weighted_speed = _safe_divide((robust * speeds).sum(axis=1), robust_sum)
+
+    prior_speed = np.broadcast_to(np.asarray(prior_speed, dtype=np.float64), shape)
+    speed = prior_speed * prior_weight + weighted_speed * (1 - prior_weight)
+
+    speed_dev = np.where(valid, speeds - speed[:, np.newaxis], 0.0)
+    speed_std = np.sqrt(_safe_divide((robust * speed_dev ** 2).sum(axis=1), robust_sum))
+    speed_uncertainty = np.minimum(1.0, speed_std / (speed * 0.5 + 0.1))
+
+    # 3. 信頼度（観測数による向上と不確実性による低下）
+    base_confidence = 0.5 + np.minimum(0.2, 0.05 * count)
+    confidence = base_confidence * (1 - 0.6 * dir_uncertainty) * (1 - 0.4 * speed_uncertainty)
+
+    empty = count == 0
+    return {
+        'wind_direction': np.where(empty, np.nan, direction),
+        'wind_speed': np.where(empty, np.nan, speed),
+        'confidence': np.where(empty, np.nan, confidence),
+        'direction_std': np.where(empty, np.nan, dir_std),
+        'speed_std': np.where(empty, np.nan, speed_std),
+        'boat_count': count,
+    }
+
+
+def fuse_wind_matrices(directions: Any, speeds: Any, weights: Any,
+                       prior_direction: Any, prior_speed: Any,
+                       mask: Optional[Any] = None,
+                       latitudes: Optional[Any] = None,
+                       longitudes: Optional[Any] = None) -> Dict[str, np.ndarray]:
+    """
+    艇数に応じてベイズ統合と重み付き平均を切り替えた風向風速の統合
+
+    有効な艇が3艇以上の行はベイズ統合、それ未満の行は重み付き平均を使用します。
+
+    Parameters:
+    -----------
+    directions : array-like
+        風向（度）の行列 (時間点数, 艇数)
+    speeds : array-like
+        風速（ノット）の行列
+    weights : array-like
+        各艇の重みの行列
+    prior_direction : float or array-like
+        風向の事前確率平均（度）
+    prior_speed : float or array-like
+        風速の事前確率平均（ノット）
+    mask : array-like, optional
+        有効な艇を示す真偽値の行列
+    latitudes : array-like, optional
+        緯度の行列（位置不明はNaN）
+    longitudes : array-like, optional
+        経度の行列（位置不明はNaN）
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        wind_direction, wind_speed, confidence, direction_std, speed_std, boat_count,
+        latitude, longitude, bayesian（ベイズ統合を使用した行）の配列
+    """
+    bayesian = bayesian_fusion_kernel(directions, speeds, weights, prior_direction, prior_speed, mask)
+    average = weighted_average_kernel(directions, speeds, weights, mask)
+    use_bayesian = bayesian['boat_count'] >= MIN_BAYESIAN_BOATS
+
+    fused = {
+        name: np.where(use_bayesian, bayesian[name], average[name])
+        for name in ('wind_direction', 'wind_speed', 'confidence', 'direction_std', 'speed_std')
+    }
+    fused['boat_count'] = bayesian['boat_count']
+    fused['bayesian'] = use_bayesian
+
+    shape = _as_matrix(directions).shape
+    if latitudes is not None and longitudes is not None:
+        valid = np.isfinite(_as_matrix(directions)) & np.isfinite(_as_matrix(speeds))
+        if mask is not None:
+            valid &= np.broadcast_to(np.atleast_2d(np.asarray(mask, dtype=bool)), shape)
+        fused['latitude'], fused['longitude'] = weighted_positions(latitudes, longitudes, weights, valid)
+    else:
+        fused['latitude'] = np.full(shape[0], np.nan)
+        fused['longitude'] = np.full(shape[0], np.nan)
+
+    return fused
+
+
+def project_history(history_times_ns: np.ndarray, history_directions: np.ndarray,
+                    history_speeds: np.ndarray, query_times_ns: np.ndarray,
+                    direction_change: float, direction_change_std: float,
+                    speed_change: float, speed_change_std: float,
+                    max_gap_minutes: float = 30.0) -> Dict[str, np.ndarray]:
+    """
+    各時間点に最も近い履歴を時間変化モデルで投影（全時間点を一括計算）
+
+    Parameters:
+    -----------
+    history_times_ns : np.ndarray
+        履歴の時刻（int64ナノ秒、昇順）
+    history_directions : np.ndarray
+        履歴の風向（度）
+    history_speeds : np.ndarray
+        履歴の風速（ノット）
+    query_times_ns : np.ndarray
+        対象時間点（int64ナノ秒）
+    direction_change, direction_change_std : float
+        風向の時間変化率（度/分）とその標準偏差
+    speed_change, speed_change_std : float
+        風速の時間変化率（ノット/分）とその標準偏差
+    max_gap_minutes : float
+        使用する履歴との最大時間差（分）
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        valid（近い履歴がある時間点）, wind_direction, wind_speed, confidence の配列
+    """
+    history_times_ns = np.asarray(history_times_ns, dtype=np.int64)
+    query_times_ns = np.asarray(query_times_ns, dtype=np.int64)
+    count = len(query_times_ns)
+
+    if len(history_times_ns) == 0:
+        empty = np.full(count, np.nan)
+        return {'valid': np.zeros(count, dtype=bool), 'wind_direction': empty,
+                'wind_speed': empty.copy(), 'confidence': empty.copy()}
+
+    # 前後の履歴のうち近い方（等距離なら古い方、同時刻は先頭の履歴）を選ぶ
+    last = len(history_times_ns) - 1
+    position = np.searchsorted(history_times_ns, query_times_ns, side='left')
+    left = np.clip(position - 1, 0, last)
+    right = np.clip(position, 0, last)
+    left_gap = np.abs(query_times_ns - history_times_ns[left])
+    right_gap = np.abs(query_times_ns - history_times_ns[right])
+    closest = np.where(right_gap < left_gap, right, left)
+    closest = np.searchsorted(history_times_ns, history_times_ns[closest], side='left')
+
+    # 時間差（分、対象時間点 - 履歴）
+    minutes = (query_times_ns - history_times_ns[closest]) / 60e9
+    valid = np.abs(minutes) <= max_gap_minutes
+
+    base_direction = np.asarray(history_directions, dtype=np.float64)[closest]
+    base_speed = np.asarray(history_speeds, dtype=np.float64)[closest]
+
+    # 時間変化モデルによる補正
+    direction = (base_direction + direction_change * minutes) % 360
+    speed = np.maximum(0, base_speed + speed_change * minutes)
+
+    # 時間変化の不確実性
+    direction_uncertainty = np.minimum(1.0, np.abs(minutes) * direction_change_std / 30)
+    speed_uncertainty = np.minimum(1.0, np.abs(minutes) * speed_change_std / (base_speed * 0.2 + 0.1))
+    confidence = np.maximum(0.1, 0.8 - 0.4 * direction_uncertainty - 0.4 * speed_uncertainty)
+
+    return {'valid': valid, 'wind_direction': direction, 'wind_speed': speed, 'confidence': confidence}
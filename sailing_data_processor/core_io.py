@@ -13,10 +13,12 @@ import io
 import math
 import os
 import gc
-from geopy.distance import geodesic
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Union, Any
 
+from .utilities.track_kinematics import compute_track_kinematics
+from .utilities.time_sync import estimate_time_offset_xcorr, estimate_fleet_offsets
+
 
 class SailingDataIO:
     """セーリングデータI/Oクラス"""
@@ -222,14 +224,19 @@ class SailingDataIO:
         
         return result
     
-    def process_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def process_data(self, df: pd.DataFrame, distance_method: str = 'vincenty') -> pd.DataFrame:
         """
         GPSデータを処理し、速度・コース・距離を計算する
         
+        計算は utilities.track_kinematics の列単位エンジンで一括実行する。
+        
         Parameters:
         -----------
         df : pd.DataFrame
             GPSデータ
+        distance_method : str
+            距離計算方式 ('vincenty': WGS84楕円体、geopy.geodesicとの差1mm未満 /
+            'haversine': 球面近似、誤差最大約0.5%)
             
         Returns:
         --------
@@ -248,43 +255,14 @@ class SailingDataIO:
         
         df = df.sort_values('time').reset_index(drop=True)
         
-        # 速度と距離の計算
-        df['speed'] = 0.0
-        df['course'] = 0.0
-        df['distance'] = 0.0
-        
-        for i in range(1, len(df)):
-            # 距離計算（測地線距離）
-            dist = geodesic(
-                (df.loc[i-1, 'lat'], df.loc[i-1, 'lon']),
-                (df.loc[i, 'lat'], df.loc[i, 'lon'])
-            ).meters
-            
-            # 時間差計算
-            time_diff = (df.loc[i, 'time'] - df.loc[i-1, 'time']).total_seconds()
-            
-            # 速度計算（ノット）
-            if time_diff > 0:
-                speed_mps = dist / time_diff
-                df.loc[i, 'speed'] = speed_mps * 1.94384  # m/s to knots
-            
-            # コース計算（真方位）
-            lat1, lon1 = math.radians(df.loc[i-1, 'lat']), math.radians(df.loc[i-1, 'lon'])
-            lat2, lon2 = math.radians(df.loc[i, 'lat']), math.radians(df.loc[i, 'lon'])
-            
-            dlon = lon2 - lon1
-            y = math.sin(dlon) * math.cos(lat2)
-            x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-            course = math.degrees(math.atan2(y, x))
-            df.loc[i, 'course'] = (course + 360) % 360
-            
-            # 累積距離
-            df.loc[i, 'distance'] = df.loc[i-1, 'distance'] + dist
-        
-        # 最初のポイントの値を設定
-        if len(df) > 1:
-            df.loc[0, 'speed'] = df.loc[1, 'speed']
-            df.loc[0, 'course'] = df.loc[1, 'course']
+        # 速度・コース・累積距離の一括計算
+        kinematics = compute_track_kinematics(
+            df['lat'].to_numpy(), df['lon'].to_numpy(), df['time'],
+            method=distance_method
+        )
+        df['speed'] = kinematics['speed']
+        df['course'] = kinematics['course']
+        df['distance'] = kinematics['distance']
         
         return df
     
@@ -309,7 +287,25 @@ class SailingDataIO:
             df_copy['time'] = df_copy['time'] + pd.Timedelta(seconds=offset_seconds)
         return df_copy
     
-    def estimate_time_offset(self, df1: pd.DataFrame, df2: pd.DataFrame, max_offset: float = 300) -> float:
+    def _get_time_and_course(self, df: pd.DataFrame) -> Tuple[pd.Series, np.ndarray]:
+        """時刻とコースの列を取得する（コースがなければ位置から計算）（内部メソッド）"""
+        time_col = 'time' if 'time' in df.columns else 'timestamp'
+        df_sorted = df.sort_values(time_col)
+        
+        if 'course' in df_sorted.columns:
+            courses = df_sorted['course'].to_numpy(dtype=np.float64)
+        else:
+            lat_col = 'lat' if 'lat' in df_sorted.columns else 'latitude'
+            lon_col = 'lon' if 'lon' in df_sorted.columns else 'longitude'
+            courses = compute_track_kinematics(
+                df_sorted[lat_col].to_numpy(), df_sorted[lon_col].to_numpy(),
+                df_sorted[time_col], method='haversine'
+            )['course']
+        
+        return df_sorted[time_col], courses
+    
+    def estimate_time_offset(self, df1: pd.DataFrame, df2: pd.DataFrame, max_offset: float = 300,
+                             method: str = 'fft', resolution: float = 0.5) -> float:
         """
         2つのGPSデータ間の時間オフセットを推定する
         
@@ -319,12 +315,25 @@ class SailingDataIO:
             比較するGPSデータ
         max_offset : float
             最大オフセット（秒）
+        method : str
+            推定方式 ('fft': コースのsin/cos特徴量のFFT相互相関（サブ秒精度）/
+            'grid': 5秒刻みのオフセット候補ごとに merge_asof で相関を計算する従来方式)
+        resolution : float
+            'fft' 方式のリサンプリング間隔（秒）
             
         Returns:
         --------
         float
             推定された時間オフセット（秒）
         """
+        if method == 'fft':
+            times1, courses1 = self._get_time_and_course(df1)
+            times2, courses2 = self._get_time_and_course(df2)
+            return estimate_time_offset_xcorr(times1, courses1, times2, courses2,
+                                              max_offset=max_offset, resolution=resolution)
+        if method != 'grid':
+            raise ValueError(f"Unsupported offset estimation method: {method}")
+        
         # コース相関に基づくオフセット推定
         correlations = []
         offsets = np.arange(-max_offset, max_offset + 1, 5)
@@ -355,10 +364,22 @@ class SailingDataIO:
             return offsets[best_offset_idx]
         return 0
     
-    def sync_boat_data(self) -> Dict[str, pd.DataFrame]:
+    def sync_boat_data(self, method: str = 'fft', max_offset: float = 300,
+                       parallel: bool = False, max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
         複数艇のGPSデータを同期する
         
+        Parameters:
+        -----------
+        method : str
+            オフセット推定方式 ('fft' または 'grid')
+        max_offset : float
+            最大オフセット（秒）
+        parallel : bool
+            艇ごとの推定を並列実行するかどうか（'fft' 方式のみ、大規模フリート向け）
+        max_workers : Optional[int]
+            並列実行時のワーカー数（None: 自動）
+        
         Returns:
         --------
         Dict[str, pd.DataFrame]
@@ -372,12 +393,21 @@ class SailingDataIO:
         reference_df = self.boat_data[reference_boat]
         
         synced_data = {reference_boat: reference_df}
+        other_boats = {boat_id: df for boat_id, df in self.boat_data.items() if boat_id != reference_boat}
+        
+        if method == 'fft':
+            # 基準艇のスペクトルを一度だけ計算し、全艇で共有する
+            ref_times, ref_courses = self._get_time_and_course(reference_df)
+            tracks = {boat_id: self._get_time_and_course(df) for boat_id, df in other_boats.items()}
+            offsets = estimate_fleet_offsets(ref_times, ref_courses, tracks, max_offset=max_offset,
+                                             max_workers=max_workers if parallel else 1)
+        else:
+            offsets = {boat_id: self.estimate_time_offset(reference_df, df, max_offset=max_offset, method=method)
+                       for boat_id, df in other_boats.items()}
         
         # 他の艇のデータを基準艇に同期
-        for boat_id, df in self.boat_data.items():
-            if boat_id != reference_boat:
-                offset = self.estimate_time_offset(reference_df, df)
-                synced_data[boat_id] = self.adjust_time(df, offset)
+        for boat_id, df in other_boats.items():
+            synced_data[boat_id] = self.adjust_time(df, offsets[boat_id])
         
         self.synced_data = synced_data
         return synced_data
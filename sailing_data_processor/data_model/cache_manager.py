@@ -5,13 +5,17 @@ sailing_data_processor.data_model.cache_manager
 キャッシング機能を提供するモジュール
 """
 
+from collections import OrderedDict
 from functools import wraps
-import hashlib
 import inspect
+import threading
 from typing import Callable, Any, Dict, Tuple, TypeVar, Union, Optional
 import time
 import warnings
 
+from sailing_data_processor.utilities.fingerprint import fingerprint
+from sailing_data_processor.utilities.memory_size import estimate_size
+
 # 型変数の定義
 R = TypeVar('R')  # 戻り値の型
 
@@ -19,6 +23,9 @@ def hash_args(*args, **kwargs) -> str:
     """
     引数からハッシュ値を生成
     
+    DataFrame・Series・NumPy配列は内容そのものからハッシュを計算します
+    （str() の省略表示による衝突を避けるため）。
+    
     Parameters
     ----------
     *args : Any
@@ -31,25 +38,19 @@ def hash_args(*args, **kwargs) -> str:
     str
         ハッシュ値（16進数文字列）
     """
-    hash_obj = hashlib.md5()
-    
-    # 位置引数のハッシュ
-    for arg in args:
-        hash_obj.update(str(arg).encode('utf-8'))
-    
-    # キーワード引数のハッシュ（ソートして順序を一定に）
-    for key in sorted(kwargs.keys()):
-        hash_obj.update(f"{key}:{kwargs[key]}".encode('utf-8'))
-        
-    return hash_obj.hexdigest()
+    return fingerprint((args, kwargs))
 
 class CacheManager:
     """
     アプリケーション全体で使用するキャッシュマネージャ
     シングルトンパターンで実装
+    
+    名前付きキャッシュはそれぞれアクセス順に並んだLRU（OrderedDict）で、
+    取得・追加・削除はO(1)で行われます。スレッドセーフで、
+    キャッシュごとにヒット率と推定メモリ使用量を集計します。
     """
     _instance = None
-    _caches: Dict[str, Dict[str, Any]] = {}
+    _caches: Dict[str, 'OrderedDict[str, Dict[str, Any]]'] = {}
     _stats: Dict[str, Dict[str, int]] = {}
     
     def __new__(cls):
@@ -58,8 +59,21 @@ class CacheManager:
             cls._instance = super(CacheManager, cls).__new__(cls)
             cls._instance._caches = {}
             cls._instance._stats = {}
+            cls._instance._lock = threading.RLock()
         return cls._instance
     
+    @staticmethod
+    def _empty_stats(max_size: int = 0) -> Dict[str, int]:
+        """初期状態の統計情報"""
+        return {
+            'hits': 0,
+            'misses': 0,
+            'size': 0,
+            'max_size': max_size,
+            'bytes': 0,
+            'evictions': 0
+        }
+    
     def get_cache(self, name: str) -> Dict[str, Any]:
         """
         名前付きキャッシュを取得
@@ -72,17 +86,13 @@ class CacheManager:
         Returns
         -------
         Dict[str, Any]
-            キャッシュ辞書
+            キャッシュ辞書（OrderedDict、先頭が最も長く使われていないエントリ）
         """
-        if name not in self._caches:
-            self._caches[name] = {}
-            self._stats[name] = {
-                'hits': 0,
-                'misses': 0,
-                'size': 0,
-                'max_size': 0
-            }
-        return self._caches[name]
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = OrderedDict()
+                self._stats[name] = self._empty_stats()
+            return self._caches[name]
     
     def clear_cache(self, name: str = None) -> None:
         """
@@ -93,19 +103,16 @@ class CacheManager:
         name : str, optional
             キャッシュの名前、Noneの場合は全キャッシュをクリア
         """
-        if name is None:
-            self._caches.clear()
-            self._stats.clear()
-        elif name in self._caches:
-            self._caches[name].clear()
-            if name in self._stats:
-                # ヒット数とミス数も完全にリセット
-                self._stats[name] = {
-                    'hits': 0,
-                    'misses': 0,
-                    'size': 0,
-                    'max_size': self._stats[name].get('max_size', 0)
-                }
+        with self._lock:
+            # デコレート済みの関数がキャッシュ辞書を参照しているため、辞書自体は残して中身を空にする
+            names = list(self._caches) if name is None else [name]
+            for cache_name in names:
+                if cache_name in self._caches:
+                    self._caches[cache_name].clear()
+                    # ヒット数とミス数も完全にリセット
+                    self._stats[cache_name] = self._empty_stats(
+                        self._stats.get(cache_name, {}).get('max_size', 0)
+                    )
     
     def get_stats(self, name: str = None) -> Dict[str, Any]:
         """
@@ -121,27 +128,37 @@ class CacheManager:
         Dict[str, Any]
             統計情報を含む辞書
         """
-        if name is None:
-            all_stats = {}
-            for cache_name, stats in self._stats.items():
-                all_stats[cache_name] = stats.copy()
+        with self._lock:
+            if name is None:
+                all_stats = {}
+                for cache_name, stats in self._stats.items():
+                    all_stats[cache_name] = stats.copy()
+                    if stats['hits'] + stats['misses'] > 0:
+                        all_stats[cache_name]['hit_ratio'] = stats['hits'] / (stats['hits'] + stats['misses'])
+                    else:
+                        all_stats[cache_name]['hit_ratio'] = 0
+                return all_stats
+            
+            elif name in self._stats:
+                stats = self._stats[name].copy()
                 if stats['hits'] + stats['misses'] > 0:
-                    all_stats[cache_name]['hit_ratio'] = stats['hits'] / (stats['hits'] + stats['misses'])
+                    stats['hit_ratio'] = stats['hits'] / (stats['hits'] + stats['misses'])
                 else:
-                    all_stats[cache_name]['hit_ratio'] = 0
-            return all_stats
-        
-        elif name in self._stats:
-            stats = self._stats[name].copy()
-            if stats['hits'] + stats['misses'] > 0:
-                stats['hit_ratio'] = stats['hits'] / (stats['hits'] + stats['misses'])
-            else:
-                stats['hit_ratio'] = 0
-            return stats
-        
-        return {}
+                    stats['hit_ratio'] = 0
+                return stats
+            
+            return {}
+    
+    def _remove_entry(self, cache_name: str, key: str) -> None:
+        """エントリを削除して統計情報を更新（ロック取得済みで呼び出す）"""
+        entry = self._caches[cache_name].pop(key, None)
+        if entry is not None:
+            stats = self._stats[cache_name]
+            stats['size'] -= 1
+            stats['bytes'] -= entry.get('size_bytes', 0)
     
-    def cached(self, cache_name: str, max_size: int = 128, ttl: Optional[float] = None) -> Callable:
+    def cached(self, cache_name: str, max_size: int = 128, ttl: Optional[float] = None,
+               max_bytes: Optional[int] = None) -> Callable:
         """
         関数の結果をキャッシュするデコレータ
         
@@ -153,6 +170,8 @@ class CacheManager:
             キャッシュの最大サイズ、デフォルトは128
         ttl : float, optional
             キャッシュエントリの有効期間（秒）、Noneの場合は無期限
+        max_bytes : int, optional
+            キャッシュの推定メモリ使用量の上限（バイト）、Noneの場合は無制限
             
         Returns
         -------
@@ -164,7 +183,8 @@ class CacheManager:
             cache = self.get_cache(cache_name)
             
             # 統計情報の最大サイズを更新
-            self._stats[cache_name]['max_size'] = max(self._stats[cache_name]['max_size'], max_size)
+            with self._lock:
+                self._stats[cache_name]['max_size'] = max(self._stats[cache_name]['max_size'], max_size)
             
             @wraps(func)
             def wrapper(*args, **kwargs) -> R:
@@ -172,51 +192,48 @@ class CacheManager:
                 # キャッシュキーの生成
                 key = hash_args(*args, **kwargs)
                 
-                # キャッシュにヒットしたかチェック
-                cache_hit = False
-                # ミスをカウントしたかどうかを追跡
-                miss_counted = False
-                
-                if key in cache:
-                    entry = cache[key]
+                with self._lock:
+                    stats = self._stats[cache_name]
+                    entry = cache.get(key)
                     
-                    # TTLが設定されている場合は有効期限をチェック
-                    if ttl is not None and time.time() - entry['timestamp'] > ttl:
-                        # TTLが切れた場合はキャッシュから削除
-                        del cache[key]
-                        self._stats[cache_name]['size'] -= 1
-                        # TTLが切れた場合はミスとしてカウント
-                        self._stats[cache_name]['misses'] += 1
-                        miss_counted = True  # ミスをカウントしたことをマーク
-                    else:
-                        # 有効なキャッシュヒット
-                        cache_hit = True
-                        # ヒット数をカウント
-                        self._stats[cache_name]['hits'] += 1
-                        # キャッシュからの結果を返す
-                        return entry['result']
-                
-                # キャッシュミスのカウント（まだカウントされていない場合のみ）
-                if not cache_hit and not miss_counted:
-                    self._stats[cache_name]['misses'] += 1
+                    if entry is not None:
+                        # TTLが設定されている場合は有効期限をチェック
+                        if ttl is not None and time.time() - entry['timestamp'] > ttl:
+                            # TTLが切れた場合はキャッシュから削除し、ミスとしてカウント
+                            self._remove_entry(cache_name, key)
+                        else:
+                            # 有効なキャッシュヒット（最も新しい位置へ移動）
+                            cache.move_to_end(key)
+                            stats['hits'] += 1
+                            return entry['result']
+                    
+                    # キャッシュミスのカウント
+                    stats['misses'] += 1
                 
-                # 関数を実行し、結果を取得
+                # 関数を実行し、結果を取得（ロックの外で実行）
                 result = func(*args, **kwargs)
+                size_bytes = estimate_size(result)
                 
-                # キャッシュサイズ管理（LRU方式）
-                if len(cache) >= max_size:
-                    # 最も古いアイテムを削除
-                    # 注意: これはシンプルなLRU実装です。本格的なLRUにはOrderedDictを使用するべき
-                    oldest_key = min(cache.keys(), key=lambda k: cache[k]['timestamp'] if 'timestamp' in cache[k] else 0)
-                    del cache[oldest_key]
-                    self._stats[cache_name]['size'] -= 1
-                
-                # 結果をキャッシュに保存
-                cache[key] = {
-                    'result': result,
-                    'timestamp': time.time()
-                }
-                self._stats[cache_name]['size'] += 1
+                with self._lock:
+                    # 並行して同じキーが保存されていた場合は置き換える
+                    self._remove_entry(cache_name, key)
+                    
+                    # 結果をキャッシュに保存
+                    cache[key] = {
+                        'result': result,
+                        'timestamp': time.time(),
+                        'size_bytes': size_bytes
+                    }
+                    stats = self._stats[cache_name]
+                    stats['size'] += 1
+                    stats['bytes'] += size_bytes
+                    
+                    # キャッシュサイズ管理（LRU方式、先頭から削除）
+                    while len(cache) > max_size or (
+                            max_bytes is not None and stats['bytes'] > max_bytes and len(cache) > 1):
+                        oldest_key = next(iter(cache))
+                        self._remove_entry(cache_name, oldest_key)
+                        stats['evictions'] += 1
                 
                 return result
             
@@ -247,7 +264,8 @@ class CacheManager:
 cache_manager = CacheManager()
 
 # 便利なデコレータ
-def cached(cache_name: str = None, max_size: int = 128, ttl: Optional[float] = None) -> Callable:
+def cached(cache_name: str = None, max_size: int = 128, ttl: Optional[float] = None,
+           max_bytes: Optional[int] = None) -> Callable:
     """
     関数の結果をキャッシュするデコレータ（グローバルマネージャを使用）
     
@@ -259,6 +277,8 @@ def cached(cache_name: str = None, max_size: int = 128, ttl: Optional[float] = N
         キャッシュの最大サイズ、デフォルトは128
     ttl : float, optional
         キャッシュエントリの有効期間（秒）、Noneの場合は無期限
+    max_bytes : int, optional
+        キャッシュの推定メモリ使用量の上限（バイト）、Noneの場合は無制限
         
     Returns
     -------
@@ -269,7 +289,7 @@ def cached(cache_name: str = None, max_size: int = 128, ttl: Optional[float] = N
         nonlocal cache_name
         if cache_name is None:
             cache_name = func.__name__
-        return cache_manager.cached(cache_name, max_size, ttl)(func)
+        return cache_manager.cached(cache_name, max_size, ttl, max_bytes)(func)
     
     return decorator
 
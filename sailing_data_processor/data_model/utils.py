@@ -14,6 +14,7 @@ import warnings
 from .container import (
     DataContainer, GPSDataContainer, WindDataContainer, StrategyPointContainer
 )
+from ..utilities.track_kinematics import haversine_distances
 
 def convert_to_gps_container(data: pd.DataFrame, validate: bool = True) -> GPSDataContainer:
     """
@@ -278,33 +279,11 @@ def find_nearest_wind_data(
     if not wind_data_containers:
         return None
     
-    best_container = None
-    min_distance = float('inf')
-    
-    # Math_utils.pyのhaversine_distanceをインポートして使うべきだが、
-    # このモジュールでは独立性を保つために簡略実装
-    def haversine_distance(lat1, lon1, lat2, lon2):
-        """2点間のヘイバーサイン距離（キロメートル）"""
-        R = 6371.0  # 地球の半径（km）
-        
-        # ラジアンに変換
-        lat1_rad = np.radians(lat1)
-        lon1_rad = np.radians(lon1)
-        lat2_rad = np.radians(lat2)
-        lon2_rad = np.radians(lon2)
-        
-        # 差分
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        # ヘイバーサイン公式
-        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-        
-        return R * c
-    
+    # 位置情報を持つコンテナを抽出
+    candidates = []
+    lats = []
+    lons = []
     for container in wind_data_containers:
-        # 位置の差
         position = container.data.get('position', {})
         wind_lat = position.get('latitude', container.latitude if hasattr(container, 'latitude') else None)
         wind_lon = position.get('longitude', container.longitude if hasattr(container, 'longitude') else None)
@@ -312,24 +291,28 @@ def find_nearest_wind_data(
         if wind_lat is None or wind_lon is None:
             continue
         
-        # 位置の距離
-        space_distance = haversine_distance(target_lat, target_lon, wind_lat, wind_lon)
-        
-        # 時間の差（秒）
-        time_diff = abs((target_time - container.timestamp).total_seconds())
-        
-        # 正規化（位置の重みを大きく）
-        normalized_space = space_distance / 100.0  # 100kmで1.0
-        normalized_time = time_diff / 3600.0       # 1時間で1.0
-        
-        # 距離の計算（位置と時間の加重和）
-        distance = 0.8 * normalized_space + 0.2 * normalized_time
-        
-        if distance < min_distance:
-            min_distance = distance
-            best_container = container
+        candidates.append(container)
+        lats.append(wind_lat)
+        lons.append(wind_lon)
+    
+    if not candidates:
+        return None
     
-    return best_container
+    # 1回の問い合わせでは空間インデックスの構築コストが線形走査を上回るため、
+    # 全候補の距離を配列で一括計算する
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    space_distance = haversine_distances(np.full(len(lats), target_lat), np.full(len(lons), target_lon),
+                                         lats, lons) / 1000.0
+    time_diff = np.array([abs((target_time - c.timestamp).total_seconds()) for c in candidates])
+    
+    # 正規化（位置の重みを大きく）
+    normalized_space = space_distance / 100.0  # 100kmで1.0
+    normalized_time = time_diff / 3600.0       # 1時間で1.0
+    
+    # 距離の計算（位置と時間の加重和）、同値の場合はリスト内で先のコンテナを優先
+    scores = 0.8 * normalized_space + 0.2 * normalized_time
+    return candidates[int(np.argmin(scores))]
 
 def preprocess_gps_data(
         df: pd.DataFrame,
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.importers.columnar_payload
+
+プロセス間でDataFrameを受け渡すための列指向ペイロードを提供するモジュール
+
+pyarrowが利用できる場合はArrow IPCストリームのバイト列に、
+利用できない場合は列ごとのNumPy配列に変換します。
+どちらもDataFrame自体をpickleするより小さく、高速に転送できます。
+"""
+
+from typing import Dict, Any
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def encode_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    DataFrameを列指向ペイロードに変換
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        変換するDataFrame
+
+    Returns
+    -------
+    Dict[str, Any]
+        ペイロード（'format' が 'arrow' または 'numpy'）
+    """
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa_ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return {'format': 'arrow', 'data': sink.getvalue().to_pybytes()}
+        except (pa.ArrowException, TypeError, ValueError):
+            # 型の混在した列などArrowに変換できない場合はNumPy形式を使用
+            pass
+
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            tz = series.dt.tz
+            if tz is not None:
+                series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+            columns.append((name, 'datetime', series.to_numpy(), tz))
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            columns.append((name, 'array', series.to_numpy(), None))
+        else:
+            columns.append((name, 'object', series.to_numpy(dtype=object), None))
+
+    return {'format': 'numpy', 'columns': columns}
+
+
+def decode_dataframe(payload: Dict[str, Any]) -> pd.DataFrame:
+    """
+    列指向ペイロードからDataFrameを復元
+
+    Parameters
+    ----------
+    payload : Dict[str, Any]
+        encode_dataframe で作成したペイロード
+
+    Returns
+    -------
+    pd.DataFrame
+        復元したDataFrame
+    """
+    if payload['format'] == 'arrow':
+        return pa_ipc.open_stream(payload['data']).read_all().to_pandas()
+
+    data = {}
+    for name, kind, values, tz in payload['columns']:
+        series = pd.Series(values)
+        if kind == 'datetime' and tz is not None:
+            series = series.dt.tz_localize('UTC').dt.tz_convert(tz)
+        data[name] = series
+
+    return pd.DataFrame(data)
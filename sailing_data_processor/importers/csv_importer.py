@@ -13,7 +13,14 @@ import os
 import csv
 import re
 
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 from .base_importer import BaseImporter
+from .csv_schema_cache import CSVSchema, schema_cache
 from sailing_data_processor.data_model.container import GPSDataContainer
 
 # 列マッピングの自動提案用パターン定義
@@ -133,6 +140,19 @@ class CSVImporter(BaseImporter):
         
         if 'skiprows' not in self.config:
             self.config['skiprows'] = 0
+        
+        # 高速読み込み（スキーマ推定のキャッシュと型指定付きのチャンク読み込み）の設定
+        if 'fast_mode' not in self.config:
+            self.config['fast_mode'] = False
+        
+        if 'chunk_size' not in self.config:
+            self.config['chunk_size'] = 100000
+        
+        if 'csv_engine' not in self.config:
+            self.config['csv_engine'] = 'c'
+        
+        if 'sample_rows' not in self.config:
+            self.config['sample_rows'] = 1000
     
     def can_import(self, file_path: Union[str, Path, BinaryIO, TextIO]) -> bool:
         """
@@ -274,6 +294,12 @@ class CSVImporter(BaseImporter):
             self.errors.append("CSVファイルとして認識できません")
             return None
         
+        if self.config['fast_mode']:
+            container = self._import_fast(file_path, metadata)
+            if container is not None or self.errors:
+                return container
+            # 高速読み込みできない場合は通常の読み込みに戻る
+        
         try:
             # CSVファイルの読み込み
             df = self._read_csv_file(file_path)
@@ -343,20 +369,7 @@ class CSVImporter(BaseImporter):
         """
         try:
             # 読み込みオプションの設定
-            read_options = {
-                'delimiter': self.config['delimiter'],
-                'encoding': self.config['encoding'],
-                'skiprows': self.config['skiprows'],
-                'on_bad_lines': 'warn'  # 不正な行があっても警告のみ
-            }
-            
-            # ヘッダー行の設定
-            if 'header_row' in self.config:
-                read_options['header'] = self.config['header_row']
-            
-            # スキップする行の設定
-            if 'skip_rows' in self.config and self.config['skip_rows'] is not None:
-                read_options['skiprows'] = self.config['skip_rows']
+            read_options = self._build_read_options()
             
             # ファイルの読み込み方法を決定
             if isinstance(file_path, (str, Path)):
@@ -423,6 +436,219 @@ class CSVImporter(BaseImporter):
             self.errors.append(f"CSVファイルの読み込みに失敗しました: {e}")
             return None
     
+    def _build_read_options(self) -> Dict[str, Any]:
+        """
+        設定からread_csvの読み込みオプションを作成
+        
+        Returns
+        -------
+        Dict[str, Any]
+            read_csvに渡すオプション
+        """
+        read_options = {
+            'delimiter': self.config['delimiter'],
+            'encoding': self.config['encoding'],
+            'skiprows': self.config['skiprows'],
+            'on_bad_lines': 'warn'  # 不正な行があっても警告のみ
+        }
+        
+        # ヘッダー行の設定
+        if 'header_row' in self.config:
+            read_options['header'] = self.config['header_row']
+        
+        # スキップする行の設定
+        if 'skip_rows' in self.config and self.config['skip_rows'] is not None:
+            read_options['skiprows'] = self.config['skip_rows']
+        
+        return read_options
+    
+    def _import_fast(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                     metadata: Optional[Dict[str, Any]] = None) -> Optional[GPSDataContainer]:
+        """
+        スキーマのキャッシュと型指定付きのチャンク読み込みでCSVをインポート
+        
+        ヘッダーのシグネチャが同じファイルのスキーマ（列マッピング、dtype、
+        タイムスタンプ形式）はキャッシュから再利用し、推定を省略します。
+        推定した型と合わない値があった場合はキャッシュを破棄し、
+        エラーを追加せずにNoneを返します（呼び出し側で通常の読み込みに戻る）。
+        
+        Parameters
+        ----------
+        file_path : Union[str, Path, BinaryIO, TextIO]
+            インポート対象ファイルのパスまたはファイルオブジェクト
+        metadata : Optional[Dict[str, Any]], optional
+            メタデータ
+            
+        Returns
+        -------
+        Optional[GPSDataContainer]
+            インポートしたデータのコンテナ
+        """
+        if not isinstance(file_path, (str, Path)) and not hasattr(file_path, 'seek'):
+            self.warnings.append("シークできないファイルのため高速読み込みを使用しません")
+            return None
+        
+        pos = file_path.tell() if not isinstance(file_path, (str, Path)) else None
+        read_options = self._build_read_options()
+        key = None
+        
+        try:
+            # ヘッダーのみ読み込んでシグネチャを作成
+            header = self._read_csv_part(file_path, read_options, nrows=0)
+            key = self._schema_signature(list(header.columns))
+            
+            schema = schema_cache.get(key)
+            cache_hit = schema is not None
+            if schema is None:
+                sample = self._read_csv_part(file_path, read_options, nrows=self.config['sample_rows'])
+                stripped = [col.strip() if isinstance(col, str) else col for col in sample.columns]
+                mapping = self._merge_suggested_mapping(dict(self.config['column_mapping']), stripped)
+                schema = CSVSchema.infer(sample, mapping, self.config.get('date_format'))
+                schema_cache.put(key, schema)
+            
+            df = self._read_with_schema(file_path, read_options, schema)
+        
+        except (ValueError, TypeError) as e:
+            # 推定した型と合わない値がある場合
+            if key is not None:
+                schema_cache.invalidate(key)
+            self.warnings.append(f"高速読み込みに失敗したため通常の読み込みを使用します: {e}")
+            return None
+        
+        except Exception as e:
+            self.errors.append(f"CSVファイルの読み込みに失敗しました: {e}")
+            return None
+        
+        finally:
+            if pos is not None:
+                file_path.seek(pos)
+        
+        if len(df) == 0:
+            self.errors.append("CSVファイルにデータがありません")
+            return None
+        
+        # 必須列が揃っているか確認
+        required_columns = ['timestamp', 'latitude', 'longitude']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            schema_cache.invalidate(key)
+            self.errors.append(f"必須列がマッピングされていません: {', '.join(missing_columns)}")
+            return None
+        
+        if metadata is None:
+            metadata = {}
+        
+        metadata.update({
+            'csv_info': {
+                'columns': [col.strip() if isinstance(col, str) else col for col in schema.columns],
+                'rows': len(df),
+                'delimiter': self.config.get('delimiter', ','),
+                'encoding': self.config.get('encoding', 'utf-8'),
+                'timestamp_format': schema.timestamp_format or schema.timestamp_kind,
+                'schema_cache_hit': cache_hit
+            }
+        })
+        
+        # 変換できなかったタイムスタンプの処理
+        null_timestamps = int(df['timestamp'].isnull().sum())
+        if null_timestamps > 0:
+            self.warnings.append(f"{null_timestamps}行のタイムスタンプを変換できませんでした")
+            if null_timestamps / len(df) > 0.95:
+                schema_cache.invalidate(key)
+                self.errors.append("タイムスタンプの変換に失敗したレコードが多すぎます")
+                return None
+            df = df.dropna(subset=['timestamp'])
+        
+        df = df.sort_values('timestamp').reset_index(drop=True)
+        
+        if 'boat_name' not in metadata:
+            metadata['boat_name'] = self.get_file_name(file_path)
+        
+        if 'source' not in metadata:
+            metadata['source'] = 'csv_import'
+        
+        if 'original_columns' not in metadata:
+            metadata['original_columns'] = list(df.columns)
+        
+        return GPSDataContainer(df, metadata)
+    
+    def _read_csv_part(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                       read_options: Dict[str, Any], nrows: int) -> pd.DataFrame:
+        """ファイルの先頭から指定行数を読み込む（ファイルオブジェクトは先頭に戻す）"""
+        if not isinstance(file_path, (str, Path)):
+            file_path.seek(0)
+        return pd.read_csv(file_path, nrows=nrows, **read_options)
+    
+    def _schema_signature(self, columns: List[Any]) -> Tuple:
+        """スキーマキャッシュのキー（ヘッダーと読み込みに影響する設定）"""
+        return (
+            tuple(columns),
+            self.config['delimiter'],
+            self.config['encoding'],
+            self.config.get('header_row'),
+            str(self.config.get('skip_rows') if self.config.get('skip_rows') is not None else self.config['skiprows']),
+            tuple(sorted(self.config['column_mapping'].items())),
+            self.config.get('auto_detect_columns', False),
+            self.config.get('date_format')
+        )
+    
+    def _read_with_schema(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                          read_options: Dict[str, Any], schema: CSVSchema) -> pd.DataFrame:
+        """
+        スキーマのdtypeを指定してファイル全体を読み込む
+        
+        csv_engine が 'pyarrow' でpyarrowが利用できる場合は一括で、
+        それ以外はchunk_size行ずつ読み込んで結合します。
+        """
+        if not isinstance(file_path, (str, Path)):
+            file_path.seek(0)
+        
+        if self.config['csv_engine'] == 'pyarrow':
+            if PYARROW_AVAILABLE:
+                options = dict(read_options)
+                options.pop('on_bad_lines', None)
+                # 文字列の列はpyarrowの型推定に任せる
+                dtypes = {col: dtype for col, dtype in schema.dtypes.items() if dtype != 'object'}
+                df = pd.read_csv(file_path, engine='pyarrow', dtype=dtypes, **options)
+                return schema.apply(df)
+            self.warnings.append("pyarrowが利用できないため標準のCSVエンジンを使用します")
+        
+        chunks = [
+            schema.apply(chunk)
+            for chunk in pd.read_csv(file_path, dtype=schema.dtypes,
+                                     chunksize=max(1, int(self.config['chunk_size'])), **read_options)
+        ]
+        if not chunks:
+            return pd.DataFrame(columns=[schema.rename.get(col, col) for col in schema.columns])
+        return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    
+    def _merge_suggested_mapping(self, column_mapping: Dict[str, str], columns: List[str]) -> Dict[str, str]:
+        """
+        自動マッピングの提案を列マッピングにマージ
+        
+        Parameters
+        ----------
+        column_mapping : Dict[str, str]
+            マージ先の列マッピング（ターゲット列: ソース列）
+        columns : List[str]
+            入力ファイルの列名リスト
+            
+        Returns
+        -------
+        Dict[str, str]
+            マージ後の列マッピング
+        """
+        # 自動マッピングのフラグがあれば自動マッピングを試行
+        if self.config.get('auto_detect_columns', False) or not column_mapping:
+            suggested_mapping = self.suggest_column_mapping(columns)
+            
+            # 既存のマッピングと提案されたマッピングをマージ
+            for target, source in suggested_mapping.items():
+                if target not in column_mapping or column_mapping[target] not in columns:
+                    column_mapping[target] = source
+        
+        return column_mapping
+    
     def _apply_column_mapping(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
         """
         列マッピングを適用
@@ -438,16 +664,7 @@ class CSVImporter(BaseImporter):
             マッピング後のDataFrame（失敗した場合はNone）
         """
         try:
-            column_mapping = self.config['column_mapping']
-            
-            # 自動マッピングのフラグがあれば自動マッピングを試行
-            if self.config.get('auto_detect_columns', False) or not column_mapping:
-                suggested_mapping = self.suggest_column_mapping(df.columns)
-                
-                # 既存のマッピングと提案されたマッピングをマージ
-                for target, source in suggested_mapping.items():
-                    if target not in column_mapping or column_mapping[target] not in df.columns:
-                        column_mapping[target] = source
+            column_mapping = self._merge_suggested_mapping(self.config['column_mapping'], list(df.columns))
             
             # マッピングに存在するカラムだけを適用
             rename_dict = {}
@@ -492,6 +709,9 @@ class CSVImporter(BaseImporter):
         try:
             # タイムスタンプがdatetimeでない場合は変換
             if df['timestamp'].dtype == 'object':
+                # 文字列として変換する前の値（UNIXタイムスタンプの判定に使用）
+                original_timestamps = df['timestamp']
+                
                 # 指定された日付フォーマットがあれば使用
                 date_format = self.config.get('date_format')
                 
@@ -572,8 +792,9 @@ class CSVImporter(BaseImporter):
                                 continue
                 
                 # タイムスタンプが数値の場合（UNIXタイムスタンプなど）
+                # 変換後のdatetime列ではなく元の値で判定する（datetime列を数値化するとナノ秒の整数になる）
                 try:
-                    numeric_timestamps = pd.to_numeric(df['timestamp'], errors='coerce')
+                    numeric_timestamps = pd.to_numeric(original_timestamps, errors='coerce')
                     if numeric_timestamps.notnull().all():
                         # 数値の大きさでUNIXタイムスタンプかミリ秒タイムスタンプかを判断
                         try:
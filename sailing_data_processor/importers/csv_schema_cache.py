@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.importers.csv_schema_cache
+
+CSV高速読み込み用のスキーマ推定とキャッシュを提供するモジュール
+
+サンプル行から列マッピング、列ごとのdtype、タイムスタンプの形式を一度だけ推定し、
+ヘッダーのシグネチャ（列名・区切り文字・エンコーディングなど）ごとにキャッシュします。
+同じスキーマのロガーファイルを続けて読み込む場合は推定を省略できます。
+"""
+
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+
+import pandas as pd
+
+# 高精度が必要な数値列（それ以外の数値列はfloat32で読み込む）
+FLOAT64_COLUMNS = {'latitude', 'longitude'}
+
+# タイムスタンプ形式の候補（サンプルをすべて解釈できた最初の形式を採用）
+TIMESTAMP_FORMATS = [
+    # ISO形式
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f%z',
+    # 時刻付き
+    '%Y/%m/%d %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S',
+    # 日本の形式
+    '%Y年%m月%d日%H時%M分%S秒', '%Y年%m月%d日',
+    # 日付のみ
+    '%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y'
+]
+
+
+def infer_timestamp_format(sample: pd.Series) -> Tuple[str, Optional[str]]:
+    """
+    サンプル値からタイムスタンプの解釈方法を推定
+
+    Parameters
+    ----------
+    sample : pd.Series
+        タイムスタンプ列のサンプル
+
+    Returns
+    -------
+    Tuple[str, Optional[str]]
+        (種類, 形式)。種類は 'format'（strftime形式）、'unix_s'、'unix_ms'、
+        'infer'（pandasの自動推定）のいずれか
+    """
+    values = sample.dropna()
+    if len(values) == 0:
+        return 'infer', None
+
+    # 数値の場合はUNIXタイムスタンプ
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.notnull().all():
+        return ('unix_ms', None) if (numeric > 1e10).any() else ('unix_s', None)
+
+    values = values.astype(str).str.strip()
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+        except (ValueError, TypeError):
+            continue
+        if parsed.notnull().all():
+            return 'format', fmt
+
+    # 混在したISO形式（pandas 2.0以降）
+    try:
+        if pd.to_datetime(values, format='ISO8601', errors='coerce').notnull().all():
+            return 'format', 'ISO8601'
+    except (ValueError, TypeError):
+        pass
+
+    return 'infer', None
+
+
+def parse_timestamps(values: pd.Series, kind: str, fmt: Optional[str] = None) -> pd.Series:
+    """
+    推定した方法でタイムスタンプ列を変換（解釈できない値はNaT）
+
+    Parameters
+    ----------
+    values : pd.Series
+        変換する列
+    kind : str
+        infer_timestamp_format の種類
+    fmt : Optional[str]
+        strftime形式（kind が 'format' の場合）
+
+    Returns
+    -------
+    pd.Series
+        変換後の列
+    """
+    if kind == 'unix_ms':
+        return pd.to_datetime(pd.to_numeric(values, errors='coerce'), unit='ms', errors='coerce')
+    if kind == 'unix_s':
+        return pd.to_datetime(pd.to_numeric(values, errors='coerce'), unit='s', errors='coerce')
+    if kind == 'format':
+        if values.dtype == object:
+            values = values.str.strip()
+        return pd.to_datetime(values, format=fmt, errors='coerce')
+    return pd.to_datetime(values, errors='coerce')
+
+
+class CSVSchema:
+    """
+    CSVファイルの読み込みスキーマ
+
+    Parameters
+    ----------
+    columns : List[str]
+        ファイル上の列名（ヘッダーそのまま）
+    rename : Dict[str, str]
+        ファイル上の列名 → 読み込み後の列名
+    dtypes : Dict[str, str]
+        ファイル上の列名 → read_csv に渡すdtype
+    timestamp_kind : str
+        タイムスタンプの解釈方法
+    timestamp_format : Optional[str]
+        タイムスタンプのstrftime形式
+    """
+
+    def __init__(self, columns: List[str], rename: Dict[str, str], dtypes: Dict[str, str],
+                 timestamp_kind: str, timestamp_format: Optional[str] = None):
+        self.columns = columns
+        self.rename = rename
+        self.dtypes = dtypes
+        self.timestamp_kind = timestamp_kind
+        self.timestamp_format = timestamp_format
+
+    @classmethod
+    def infer(cls, sample: pd.DataFrame, mapping: Dict[str, str],
+              date_format: Optional[str] = None) -> 'CSVSchema':
+        """
+        サンプル行と列マッピングからスキーマを推定
+
+        Parameters
+        ----------
+        sample : pd.DataFrame
+            デフォルトのdtypeで読み込んだサンプル行（列名はヘッダーそのまま）
+        mapping : Dict[str, str]
+            ターゲット列 → 列名（前後の空白を除いた列名）
+        date_format : Optional[str]
+            指定されたタイムスタンプ形式
+
+        Returns
+        -------
+        CSVSchema
+            推定したスキーマ
+        """
+        columns = list(sample.columns)
+        targets = {source: target for target, source in mapping.items()}
+
+        rename = {}
+        dtypes = {}
+        timestamp_column = None
+        for column in columns:
+            name = column.strip() if isinstance(column, str) else column
+            name = targets.get(name, name)
+            if name != column:
+                rename[column] = name
+
+            if name == 'timestamp':
+                timestamp_column = column
+            elif pd.api.types.is_numeric_dtype(sample[column]) and not pd.api.types.is_bool_dtype(sample[column]):
+                dtypes[column] = 'float64' if name in FLOAT64_COLUMNS else 'float32'
+
+        if date_format:
+            kind, fmt = 'format', date_format
+        elif timestamp_column is not None:
+            kind, fmt = infer_timestamp_format(sample[timestamp_column])
+        else:
+            kind, fmt = 'infer', None
+
+        if timestamp_column is not None:
+            dtypes[timestamp_column] = 'float64' if kind in ('unix_s', 'unix_ms') else 'object'
+
+        return cls(columns, rename, dtypes, kind, fmt)
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        読み込んだチャンクに列名の変更とタイムスタンプの変換を適用
+
+        空でないタイムスタンプが推定した形式で解釈できない場合は、行を失わないよう
+        ValueErrorを送出します（呼び出し側で通常の読み込みに戻る）。
+        """
+        chunk = chunk.rename(columns=self.rename)
+        if 'timestamp' in chunk.columns:
+            raw = chunk['timestamp']
+            parsed = parse_timestamps(raw, self.timestamp_kind, self.timestamp_format)
+            unparsed = int((parsed.isna() & raw.notna()).sum())
+            if unparsed:
+                raise ValueError(f"{unparsed}行のタイムスタンプが推定した形式と一致しません")
+            chunk['timestamp'] = parsed
+        return chunk
+
+
+class CSVSchemaCache:
+    """
+    ヘッダーのシグネチャごとのCSVスキーマのLRUキャッシュ
+
+    Parameters
+    ----------
+    max_entries : int
+        最大エントリ数
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Optional[CSVSchema]:
+        """スキーマを取得（見つからない場合はNone）"""
+        with self._lock:
+            schema = self._entries.get(key)
+            if schema is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return schema
+
+    def put(self, key: Any, schema: CSVSchema) -> None:
+        """スキーマを登録し、上限を超えた分を古い順に削除"""
+        with self._lock:
+            self._entries[key] = schema
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        """指定したシグネチャのスキーマを破棄"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全エントリを破棄"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+
+# インポーター間で共有するスキーマキャッシュ
+schema_cache = CSVSchemaCache()
@@ -5,7 +5,7 @@ sailing_data_processor.importers.gpx_importer
 GPXファイルからGPSデータをインポートするモジュール
 """
 
-from typing import Dict, List, Any, Optional, Union, BinaryIO, TextIO, Set
+from typing import Dict, List, Any, Optional, Union, BinaryIO, TextIO, Set, Iterator
 import pandas as pd
 from pathlib import Path
 import io
@@ -15,6 +15,7 @@ import re
 import xml.etree.ElementTree as ET
 
 from .base_importer import BaseImporter
+from .gpx_stream_reader import GPXStreamReader
 from sailing_data_processor.data_model.container import GPSDataContainer
 
 
@@ -44,6 +45,13 @@ class GPXImporter(BaseImporter):
         if 'include_waypoints' not in self.config:
             self.config['include_waypoints'] = False
             
+        # ストリーミング読み込み（iterparse）の設定
+        if 'streaming' not in self.config:
+            self.config['streaming'] = False
+            
+        if 'chunk_size' not in self.config:
+            self.config['chunk_size'] = 50000
+            
         # 名前空間定義
         self.ns = {
             'gpx': 'http://www.topografix.com/GPX/1/1',
@@ -130,6 +138,9 @@ class GPXImporter(BaseImporter):
             self.errors.append("GPXファイルとして認識できません")
             return None
         
+        if self.config['streaming']:
+            return self._import_streaming(file_path, metadata)
+        
         try:
             # ファイルをパース
             root = self._parse_gpx_file(file_path)
@@ -180,6 +191,152 @@ class GPXImporter(BaseImporter):
             self.errors.append(f"GPXファイルの読み込みに失敗しました: {e}")
             return None
     
+    def iter_import(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                    chunk_size: Optional[int] = None,
+                    metadata: Optional[Dict[str, Any]] = None) -> Iterator[GPSDataContainer]:
+        """
+        GPXをストリーミングで読み込み、チャンクごとのコンテナを順に返す
+        
+        ファイル全体をメモリに読み込まず、処理済みの要素を破棄しながら
+        最大 chunk_size ポイントずつコンテナを作成します。
+        各コンテナのメタデータには chunk_index と、その時点までに読み込んだ
+        GPXのヘッダー情報（バージョン、作成者、名前など）が含まれます。
+        
+        Parameters
+        ----------
+        file_path : Union[str, Path, BinaryIO, TextIO]
+            インポート対象ファイルのパスまたはファイルオブジェクト
+        chunk_size : Optional[int], optional
+            1つのコンテナに含めるポイント数（Noneの場合は設定値）
+        metadata : Optional[Dict[str, Any]], optional
+            メタデータ
+            
+        Yields
+        ------
+        GPSDataContainer
+            チャンクごとのデータコンテナ
+        """
+        self.clear_messages()
+        
+        if not self.can_import(file_path):
+            self.errors.append("GPXファイルとして認識できません")
+            return
+        
+        reader = self._create_stream_reader(chunk_size)
+        base_metadata = self._prepare_stream_metadata(file_path, metadata)
+        
+        try:
+            for chunk_index, df in enumerate(self._iter_stream_frames(reader, file_path)):
+                chunk_metadata = dict(base_metadata)
+                chunk_metadata['chunk_index'] = chunk_index
+                for key, value in reader.info.items():
+                    if key not in chunk_metadata:
+                        chunk_metadata[key] = value
+                
+                yield GPSDataContainer(df, chunk_metadata)
+        
+        except ET.ParseError as e:
+            self.errors.append(f"GPXファイルのパースに失敗しました: {e}")
+        
+        self._add_stream_warnings(reader)
+    
+    def _import_streaming(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                          metadata: Optional[Dict[str, Any]] = None) -> Optional[GPSDataContainer]:
+        """
+        ストリーミング読み込みで1つのコンテナを作成
+        
+        Parameters
+        ----------
+        file_path : Union[str, Path, BinaryIO, TextIO]
+            インポート対象ファイルのパスまたはファイルオブジェクト
+        metadata : Optional[Dict[str, Any]], optional
+            メタデータ
+            
+        Returns
+        -------
+        Optional[GPSDataContainer]
+            インポートしたデータのコンテナ（失敗した場合はNone）
+        """
+        reader = self._create_stream_reader()
+        metadata = self._prepare_stream_metadata(file_path, metadata)
+        
+        try:
+            frames = list(self._iter_stream_frames(reader, file_path))
+        except ET.ParseError as e:
+            self.errors.append(f"GPXファイルのパースに失敗しました: {e}")
+            return None
+        except Exception as e:
+            self.errors.append(f"GPXファイルの読み込みに失敗しました: {e}")
+            return None
+        
+        self._add_stream_warnings(reader)
+        
+        if not frames:
+            self.errors.append("GPXファイルにポイントデータが見つかりません")
+            return None
+        
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        del frames
+        
+        # GPXファイルの情報をメタデータに追加
+        for key, value in reader.info.items():
+            if key not in metadata:
+                metadata[key] = value
+        
+        return GPSDataContainer(df, metadata)
+    
+    def _create_stream_reader(self, chunk_size: Optional[int] = None) -> GPXStreamReader:
+        """設定からストリーミングリーダーを作成"""
+        return GPXStreamReader(
+            chunk_size or self.config['chunk_size'],
+            self.supported_extensions,
+            include_extensions=self.config['include_extensions'],
+            prefer_trkpt=self.config['prefer_trkpt'],
+            include_waypoints=self.config['include_waypoints']
+        )
+    
+    def _prepare_stream_metadata(self, file_path: Union[str, Path, BinaryIO, TextIO], 
+                                 metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """ストリーミング読み込み用のメタデータを準備"""
+        metadata = dict(metadata) if metadata else {}
+        
+        if 'boat_name' not in metadata:
+            metadata['boat_name'] = self.get_file_name(file_path)
+        
+        if 'source' not in metadata:
+            metadata['source'] = 'gpx_import'
+        
+        return metadata
+    
+    def _iter_stream_frames(self, reader: GPXStreamReader, 
+                            file_path: Union[str, Path, BinaryIO, TextIO]) -> Iterator[pd.DataFrame]:
+        """
+        ファイルを先頭から読み込み、チャンクごとのDataFrameを返す
+        
+        ファイルオブジェクトの場合は読み込み後に元の位置に戻します。
+        """
+        if isinstance(file_path, (str, Path)):
+            yield from reader.iter_frames(str(file_path))
+            return
+        
+        pos = None
+        if hasattr(file_path, 'tell') and hasattr(file_path, 'seek'):
+            pos = file_path.tell()
+            file_path.seek(0)
+        
+        try:
+            yield from reader.iter_frames(file_path)
+        finally:
+            if pos is not None:
+                file_path.seek(pos)
+    
+    def _add_stream_warnings(self, reader: GPXStreamReader) -> None:
+        """ストリーミング読み込みで除外したポイントを警告に追加"""
+        if reader.skipped_points:
+            self.warnings.append(f"緯度・経度を解析できないポイントを{reader.skipped_points}件スキップしました")
+        if reader.invalid_timestamps:
+            self.warnings.append(f"タイムスタンプを解析できないポイントを{reader.invalid_timestamps}件スキップしました")
+    
     def _parse_gpx_file(self, file_path: Union[str, Path, BinaryIO, TextIO]) -> Optional[ET.Element]:
         """
         GPXファイルをパースしてルート要素を返す
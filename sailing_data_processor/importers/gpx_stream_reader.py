@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.importers.gpx_stream_reader
+
+GPXファイルをストリーミングで読み込むモジュール
+
+ET.iterparse で要素を順に読み込み、処理済みの要素はツリーから取り除きます。
+ポイントのデータは事前に確保した型付きのカラムバッファに書き込み、
+バッファが一杯になるたびにDataFrameとして出力するため、
+メモリ使用量はファイルサイズではなくチャンクサイズに比例します。
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+# Garmin TrackPointExtension の名前空間（同名の拡張データより優先する）
+GARMIN_TPX_NAMESPACES = {
+    'http://www.garmin.com/xmlschemas/TrackPointExtension/v1',
+    'http://www.garmin.com/xmlschemas/TrackPointExtension/v2',
+}
+
+# ポイント要素と親要素の組み合わせ
+POINT_PARENTS = {
+    'trkpt': 'trkseg',
+    'rtept': 'rte',
+    'wpt': 'gpx',
+}
+
+POINT_TYPES = {
+    'trkpt': 'trackpoint',
+    'rtept': 'routepoint',
+    'wpt': 'waypoint',
+}
+
+# 文字列のカラム（数値以外）
+TEXT_COLUMNS = ['name', 'description', 'track_name', 'route_name']
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    """'{namespace}local' 形式のタグを (名前空間, ローカル名) に分割"""
+    if tag[:1] == '{':
+        namespace, _, local = tag[1:].partition('}')
+        return namespace, local
+    return '', tag
+
+
+class GPXColumnBuffer:
+    """
+    ポイントデータを格納する固定長のカラムバッファ
+
+    数値はfloat64、タイムスタンプと文字列はobjectの配列に格納します。
+    値が一度も書き込まれなかった任意カラムはDataFrameに含めません。
+
+    Parameters
+    ----------
+    capacity : int
+        バッファに格納できるポイント数
+    numeric_columns : List[str]
+        緯度・経度以外の数値カラム（高度、拡張データ）
+    """
+
+    def __init__(self, capacity: int, numeric_columns: List[str]):
+        self.capacity = capacity
+        self.numeric_columns = ['latitude', 'longitude'] + list(numeric_columns)
+        self.numeric = {col: np.full(capacity, np.nan) for col in self.numeric_columns}
+        self.text = {col: np.empty(capacity, dtype=object) for col in TEXT_COLUMNS}
+        self.times = np.empty(capacity, dtype=object)
+        self.point_types = np.empty(capacity, dtype=object)
+        self.size = 0
+        self._seen = set()
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.capacity
+
+    def begin_row(self, point_type: str, lat: float, lon: float) -> int:
+        """次の行を初期化して行番号を返す"""
+        row = self.size
+        for values in self.numeric.values():
+            values[row] = np.nan
+        for values in self.text.values():
+            values[row] = None
+        self.times[row] = None
+        self.point_types[row] = point_type
+        self.numeric['latitude'][row] = lat
+        self.numeric['longitude'][row] = lon
+        return row
+
+    def set_number(self, column: str, row: int, value: float) -> None:
+        self.numeric[column][row] = value
+        self._seen.add(column)
+
+    def set_text(self, column: str, row: int, value: str) -> None:
+        self.text[column][row] = value
+        self._seen.add(column)
+
+    def commit_row(self) -> None:
+        """begin_row で初期化した行を確定"""
+        self.size += 1
+
+    def to_dataframe(self) -> Tuple[pd.DataFrame, int]:
+        """
+        格納したポイントをDataFrameに変換してバッファを空にする
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, int]
+            DataFrameと、タイムスタンプを解釈できずに除外したポイント数
+        """
+        n = self.size
+        timestamps, invalid = _convert_timestamps(self.times[:n])
+
+        data = {
+            'timestamp': timestamps,
+            'latitude': self.numeric['latitude'][:n].copy(),
+            'longitude': self.numeric['longitude'][:n].copy(),
+            'point_type': self.point_types[:n].copy(),
+        }
+        for col in self.numeric_columns[2:]:
+            if col in self._seen:
+                data[col] = self.numeric[col][:n].copy()
+        for col in TEXT_COLUMNS:
+            if col in self._seen:
+                data[col] = self.text[col][:n].copy()
+
+        df = pd.DataFrame(data)
+        if invalid.any():
+            df = df[~invalid].reset_index(drop=True)
+
+        self.clear()
+        return df, int(invalid.sum())
+
+    def clear(self) -> None:
+        """バッファを空にする（参照を残さないようにobject配列もクリア）"""
+        n = self.size
+        self.times[:n] = None
+        self.point_types[:n] = None
+        for values in self.text.values():
+            values[:n] = None
+        self.size = 0
+        self._seen = set()
+
+
+def _convert_timestamps(values: np.ndarray) -> Tuple[pd.Series, np.ndarray]:
+    """
+    タイムスタンプ文字列の配列をまとめて変換
+
+    時刻がないポイントには現在時刻を使用し、解釈できない時刻のポイントは除外対象とします。
+    """
+    raw = pd.Series(values, dtype=object)
+    converted = pd.to_datetime(raw, errors='coerce')
+    if not pd.api.types.is_datetime64_any_dtype(converted):
+        # 異なるタイムゾーンが混在する場合はUTCに揃える
+        converted = pd.to_datetime(raw, errors='coerce', utc=True)
+
+    missing = raw.isna().to_numpy()
+    invalid = converted.isna().to_numpy() & ~missing
+    if missing.any():
+        converted = converted.copy()
+        converted[missing] = pd.Timestamp.now(tz=converted.dt.tz)
+
+    return converted, invalid
+
+
+class GPXStreamReader:
+    """
+    iterparse によるGPXのストリーミングリーダー
+
+    ポイントの選択規則は GPXImporter と同じです（prefer_trkpt が有効な場合、
+    トラックポイントがあればルートポイントとウェイポイントは使用しない）。
+    GPXではウェイポイントとルートがトラックより前に置かれるため、
+    prefer_trkpt が有効な場合はそれらを最初のトラックポイントが現れるまで保持します。
+    トラック名は各ポイントが属するトラックの名前を track_name に設定します。
+
+    Parameters
+    ----------
+    chunk_size : int
+        1つのDataFrameに含めるポイント数の上限
+    supported_extensions : Dict[str, List[str]]
+        拡張データのカラム名と要素名のパターン（GPXImporter.supported_extensions）
+    include_extensions : bool
+        拡張データを読み込むかどうか
+    prefer_trkpt : bool
+        トラックポイントを優先するかどうか
+    include_waypoints : bool
+        ウェイポイントを含めるかどうか
+    """
+
+    def __init__(self, chunk_size: int, supported_extensions: Dict[str, List[str]],
+                 include_extensions: bool = True, prefer_trkpt: bool = True,
+                 include_waypoints: bool = False):
+        self.chunk_size = max(int(chunk_size), 1)
+        self.include_extensions = include_extensions
+        self.prefer_trkpt = prefer_trkpt
+        self.include_waypoints = include_waypoints
+
+        # 拡張要素のローカル名 → (カラム名, 優先順位)
+        self.extension_fields: Dict[str, Tuple[str, int]] = {}
+        for column, patterns in supported_extensions.items():
+            for rank, pattern in enumerate(patterns):
+                local = pattern.split(':')[-1]
+                if local not in self.extension_fields:
+                    self.extension_fields[local] = (column, rank)
+        self.numeric_columns = ['elevation'] + list(supported_extensions.keys())
+
+        self.info: Dict[str, Any] = {}
+        self.skipped_points = 0
+        self.invalid_timestamps = 0
+        self.trackpoint_count = 0
+
+    def iter_frames(self, source: Any) -> Iterator[pd.DataFrame]:
+        """
+        GPXを読み込み、ポイントデータをチャンクごとのDataFrameとして返す
+
+        Parameters
+        ----------
+        source : Any
+            ファイルパスまたはファイルオブジェクト（バイト列のままパースする）
+
+        Yields
+        ------
+        pd.DataFrame
+            最大 chunk_size 行のポイントデータ
+        """
+        self.info = {}
+        self.skipped_points = 0
+        self.invalid_timestamps = 0
+        self.trackpoint_count = 0
+
+        main = GPXColumnBuffer(self.chunk_size, self.numeric_columns)
+        # prefer_trkpt の場合、トラックポイントが現れるまでルート・ウェイポイントを保持
+        deferred = GPXColumnBuffer(self.chunk_size, self.numeric_columns) if self.prefer_trkpt else main
+        deferred_frames: List[pd.DataFrame] = []
+
+        tracks: List[Dict[str, Any]] = []
+        routes: List[Dict[str, Any]] = []
+        waypoints_count = 0
+
+        stack: List[ET.Element] = []
+        locals_: List[str] = []
+        buffer: Optional[GPXColumnBuffer] = None
+        row = -1
+        point_element: Optional[ET.Element] = None
+        point_valid = False
+        extension_depth = 0
+        extension_ranks: Dict[str, int] = {}
+        track_name: Optional[str] = None
+        route_name: Optional[str] = None
+
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            namespace, local = _split_tag(elem.tag)
+
+            if event == 'start':
+                parent_local = locals_[-1] if locals_ else None
+                stack.append(elem)
+                locals_.append(local)
+
+                if parent_local is None:
+                    self.info['gpx_version'] = elem.attrib.get('version', 'unknown')
+                    self.info['creator'] = elem.attrib.get('creator', 'unknown')
+                elif local in POINT_PARENTS and POINT_PARENTS[local] == parent_local:
+                    point_element = elem
+                    point_valid = False
+                    extension_ranks = {}
+
+                    if local == 'trkpt':
+                        tracks[-1]['points'] += 1
+                        self.trackpoint_count += 1
+                        if self.trackpoint_count == 1 and deferred is not main:
+                            # トラックポイントがあるのでルート・ウェイポイントは使用しない
+                            deferred_frames = []
+                            deferred.clear()
+                        buffer = main
+                    else:
+                        if local == 'rtept':
+                            routes[-1]['points'] += 1
+                        else:
+                            waypoints_count += 1
+                        use = local == 'rtept' or self.include_waypoints
+                        if self.prefer_trkpt and self.trackpoint_count:
+                            use = False
+                        buffer = deferred if use else None
+
+                    if buffer is not None:
+                        try:
+                            lat = float(elem.attrib.get('lat'))
+                            lon = float(elem.attrib.get('lon'))
+                            row = buffer.begin_row(POINT_TYPES[local], lat, lon)
+                            point_valid = True
+                        except (TypeError, ValueError):
+                            self.skipped_points += 1
+                elif local == 'trk' and parent_local == 'gpx':
+                    tracks.append({'segments': 0, 'points': 0})
+                    track_name = None
+                elif local == 'trkseg' and parent_local == 'trk':
+                    tracks[-1]['segments'] += 1
+                elif local == 'rte' and parent_local == 'gpx':
+                    routes.append({'points': 0})
+                    route_name = None
+                elif local == 'extensions' and point_element is not None:
+                    extension_depth = len(stack)
+                continue
+
+            # end イベント
+            stack.pop()
+            locals_.pop()
+            parent = stack[-1] if stack else None
+            parent_local = locals_[-1] if locals_ else None
+            text = elem.text.strip() if elem.text else ''
+
+            if elem is point_element:
+                if point_valid:
+                    if local == 'trkpt' and track_name:
+                        buffer.set_text('track_name', row, track_name)
+                    elif local == 'rtept' and route_name:
+                        buffer.set_text('route_name', row, route_name)
+                    buffer.commit_row()
+
+                    if buffer.full:
+                        df, invalid = buffer.to_dataframe()
+                        self.invalid_timestamps += invalid
+                        if buffer is main:
+                            yield df
+                        else:
+                            deferred_frames.append(df)
+
+                point_element = None
+                point_valid = False
+                parent.remove(elem)
+                continue
+
+            if point_element is not None:
+                if point_valid and text:
+                    if parent is point_element:
+                        self._set_point_field(buffer, row, local, text)
+                    elif extension_depth and len(stack) >= extension_depth and self.include_extensions:
+                        self._set_extension(buffer, row, namespace, local, text, extension_ranks)
+                if local == 'extensions' and parent is point_element:
+                    extension_depth = 0
+                continue
+
+            if text:
+                if parent_local == 'metadata':
+                    if local == 'name':
+                        self.info['name'] = text
+                    elif local == 'desc':
+                        self.info['description'] = text
+                    elif local == 'time':
+                        self.info['created'] = text
+                elif parent_local == 'author' and local == 'name' and len(locals_) == 3:
+                    self.info['author'] = text
+                elif parent_local == 'trk':
+                    if local == 'name':
+                        tracks[-1]['name'] = track_name = text
+                    elif local == 'desc':
+                        tracks[-1]['description'] = text
+                    elif local == 'type':
+                        tracks[-1]['type'] = text
+                elif parent_local == 'rte':
+                    if local == 'name':
+                        routes[-1]['name'] = route_name = text
+                    elif local == 'desc':
+                        routes[-1]['description'] = text
+
+            # 処理済みの要素をツリーから取り除く
+            if parent is not None and local in ('trkseg', 'trk', 'rte', 'metadata'):
+                parent.remove(elem)
+
+        if main.size:
+            df, invalid = main.to_dataframe()
+            self.invalid_timestamps += invalid
+            yield df
+
+        if deferred is not main and not self.trackpoint_count:
+            for df in deferred_frames:
+                yield df
+            if deferred.size:
+                df, invalid = deferred.to_dataframe()
+                self.invalid_timestamps += invalid
+                yield df
+
+        if tracks:
+            self.info['tracks'] = tracks
+        if routes:
+            self.info['routes'] = routes
+        if waypoints_count:
+            self.info['waypoints_count'] = waypoints_count
+
+    def _set_point_field(self, buffer: GPXColumnBuffer, row: int, local: str, text: str) -> None:
+        """ポイント直下の要素（時刻・高度・名前・説明）を書き込む"""
+        if local == 'time':
+            buffer.times[row] = text
+        elif local == 'ele':
+            try:
+                buffer.set_number('elevation', row, float(text))
+            except ValueError:
+                pass
+        elif local == 'name':
+            buffer.set_text('name', row, text)
+        elif local == 'desc':
+            buffer.set_text('description', row, text)
+
+    def _set_extension(self, buffer: GPXColumnBuffer, row: int, namespace: str, local: str,
+                       text: str, ranks: Dict[str, int]) -> None:
+        """拡張データを書き込む（Garmin拡張 > パターンの順で優先）"""
+        field = self.extension_fields.get(local)
+        if field is None:
+            return
+        column, rank = field
+        if namespace in GARMIN_TPX_NAMESPACES:
+            rank = -1
+        if column in ranks and ranks[column] <= rank:
+            return
+        try:
+            value = float(text)
+        except ValueError:
+            return
+        buffer.set_number(column, row, value)
+        ranks[column] = rank
@@ -12,6 +12,9 @@ import os
 import tempfile
 import shutil
 import concurrent.futures
+import multiprocessing
+import threading
+import queue
 import time
 import psutil
 import gc
@@ -20,12 +23,55 @@ from tqdm import tqdm
 
 from .importer_factory import ImporterFactory
 from .base_importer import BaseImporter
+from .columnar_payload import encode_dataframe, decode_dataframe
 from sailing_data_processor.data_model.container import GPSDataContainer
 
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# キャンセルされたファイルに記録するメッセージ
+CANCELLED_MESSAGE = "バッチ処理がキャンセルされたため処理されませんでした"
+
+
+def _import_file_in_worker(file_path: str, metadata: Dict[str, Any], config: Dict[str, Any],
+                           events: Any = None, cancel_event: Any = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[str], List[str]]:
+    """
+    ワーカープロセスで単一ファイルをインポート
+    
+    コンテナはそのまま返さず、データを列指向ペイロードに変換して返します。
+    
+    Parameters
+    ----------
+    file_path : str
+        インポート対象ファイルのパス
+    metadata : Dict[str, Any]
+        メタデータ
+    config : Dict[str, Any]
+        バッチインポート設定（pickle可能なもののみ）
+    events : Any, optional
+        処理開始を通知するキュー
+    cancel_event : Any, optional
+        キャンセルを通知するイベント
+        
+    Returns
+    -------
+    Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[str], List[str]]
+        (データのペイロード, コンテナのメタデータ, エラーリスト, 警告リスト)のタプル
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        return None, None, [CANCELLED_MESSAGE], []
+    
+    importer = OptimizedBatchImporter(config)
+    if events is not None:
+        events.put(('start', importer._get_file_name(file_path)))
+    
+    container, errors, warnings = importer._import_single_file(file_path, metadata)
+    if container is None:
+        return None, None, errors, warnings
+    
+    return encode_dataframe(container.data), dict(container.metadata), errors, warnings
+
 
 class BatchProcessStatus:
     """
@@ -45,6 +91,7 @@ class BatchProcessStatus:
         self.warning_count = 0
         self.start_time = time.time()
         self.processing_files = set()
+        self.cancelled = False
     
     def start_file(self, file_name: str) -> None:
         """
@@ -115,7 +162,8 @@ class BatchProcessStatus:
             "elapsed_time": elapsed_time,
             "files_per_second": files_per_second,
             "eta": eta,
-            "processing_files": list(self.processing_files)
+            "processing_files": list(self.processing_files),
+            "cancelled": self.cancelled
         }
 
 
@@ -299,6 +347,22 @@ class OptimizedBatchImporter:
         self.chunk_size = self.config.get('chunk_size', 10)  # 一度に処理するファイル数
         self.auto_adaptive = self.config.get('auto_adaptive', True)  # 自動適応モード
         self.progress_callback = self.config.get('progress_callback')  # 進捗コールバック
+        self.executor = self.config.get('executor', 'thread')  # 並列処理の方式（'thread' または 'process'）
+        self._cancel_event = threading.Event()
+    
+    def cancel(self) -> None:
+        """
+        実行中のバッチインポートをキャンセル
+        
+        未着手のファイルは処理せず失敗として記録します。
+        処理中のファイルはそのファイルの処理が終わるまで待ちます。
+        """
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """キャンセルが要求されたかどうか"""
+        return self._cancel_event.is_set()
     
     def import_files(self, file_paths: List[Union[str, Path, BinaryIO, TextIO]],
                     metadata: Optional[Dict[str, Any]] = None,
@@ -324,6 +388,7 @@ class OptimizedBatchImporter:
         if progress_callback:
             self.progress_callback = progress_callback
         
+        self._cancel_event.clear()
         result = OptimizedBatchImportResult()
         
         # ファイルが存在しない場合は空の結果を返す
@@ -367,6 +432,7 @@ class OptimizedBatchImporter:
             "initial_memory_percent": init_memory_percent,
             "cpu_count": cpu_count,
             "parallel_enabled": self.parallel,
+            "executor": self.executor,
             "max_workers": self.max_workers,
             "max_memory_percent": self.max_memory_percent,
             "file_count": len(file_paths),
@@ -376,9 +442,17 @@ class OptimizedBatchImporter:
         # ファイルをチャンクに分割
         file_chunks = [file_paths[i:i+self.chunk_size] for i in range(0, len(file_paths), self.chunk_size)]
         
+        # プロセスプールはバッチ全体で共有する
+        pool = None
+        if self.parallel and self.executor == 'process':
+            pool = self._create_process_pool()
+        
         try:
             # チャンクごとに処理
             for chunk_index, chunk in enumerate(file_chunks):
+                if self.cancelled:
+                    break
+                
                 # メモリ使用状況を記録
                 current_memory_percent = psutil.virtual_memory().percent
                 performance_metrics["memory_usage"].append(current_memory_percent)
@@ -398,7 +472,9 @@ class OptimizedBatchImporter:
                     self.progress_callback(progress)
                 
                 # 並列処理の場合
-                if self.parallel and len(chunk) > 1:
+                if pool is not None:
+                    self._process_chunk_process(pool, chunk, metadata, result, status)
+                elif self.parallel and len(chunk) > 1:
                     self._process_chunk_parallel(chunk, metadata, result, status)
                 else:
                     # 逐次処理の場合
@@ -416,6 +492,20 @@ class OptimizedBatchImporter:
                 result.add_failure(file_name, [f"バッチ処理エラーにより処理されませんでした: {e}"])
         
         finally:
+            if pool is not None:
+                pool['executor'].shutdown(wait=True, cancel_futures=True)
+                pool['manager'].shutdown()
+            
+            # キャンセルされた場合は未処理のファイルを失敗としてマーク
+            if self.cancelled:
+                status.cancelled = True
+                for file in file_paths:
+                    file_name = self._get_file_name(file)
+                    if file_name not in result.successful and file_name not in result.failed:
+                        result.add_failure(file_name, [CANCELLED_MESSAGE])
+                        status.complete_file(file_name, False, False)
+            performance_metrics["cancelled"] = self.cancelled
+            
             # 最終のパフォーマンスメトリクスを記録
             performance_metrics["end_time"] = time.time()
             performance_metrics["total_duration"] = performance_metrics["end_time"] - performance_metrics["start_time"]
@@ -465,6 +555,14 @@ class OptimizedBatchImporter:
             for future in concurrent.futures.as_completed(future_to_file):
                 file_path, file_name = future_to_file[future]
                 
+                if self.cancelled:
+                    # 未着手のファイルを取り消す
+                    for pending in future_to_file:
+                        pending.cancel()
+                
+                if future.cancelled():
+                    continue
+                
                 try:
                     container, errors, warnings = future.result()
                     
@@ -487,6 +585,132 @@ class OptimizedBatchImporter:
                 if self.progress_callback:
                     self.progress_callback(status.get_progress())
     
+    def _create_process_pool(self) -> Dict[str, Any]:
+        """
+        プロセスプールと、ワーカーとの通信用のキュー・イベントを作成
+        
+        Returns
+        -------
+        Dict[str, Any]
+            'executor'、'manager'、'events'、'cancel_event' を含む辞書
+        """
+        manager = multiprocessing.Manager()
+        return {
+            'executor': concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers),
+            'manager': manager,
+            'events': manager.Queue(),
+            'cancel_event': manager.Event()
+        }
+    
+    def _worker_config(self) -> Dict[str, Any]:
+        """ワーカープロセスに渡す設定（コールバックなどpickleできない値を除く）"""
+        return {key: value for key, value in self.config.items() if not callable(value)}
+    
+    def _process_chunk_process(self, pool: Dict[str, Any],
+                               chunk: List[Union[str, Path, BinaryIO, TextIO]],
+                               metadata: Dict[str, Any],
+                               result: OptimizedBatchImportResult,
+                               status: BatchProcessStatus) -> None:
+        """
+        チャンクをプロセスプールで並列処理
+        
+        ワーカーにはファイルパスを渡し、列指向ペイロードで結果を受け取ります。
+        ワーカーの処理開始はキューで受け取り、進捗に反映します。
+        ファイルオブジェクトはプロセス間で渡せないため、このプロセスで処理します。
+        
+        Parameters
+        ----------
+        pool : Dict[str, Any]
+            _create_process_pool で作成したプロセスプール
+        chunk : List[Union[str, Path, BinaryIO, TextIO]]
+            処理するファイルのチャンク
+        metadata : Dict[str, Any]
+            メタデータ
+        result : OptimizedBatchImportResult
+            結果オブジェクト
+        status : BatchProcessStatus
+            処理状態
+        """
+        paths = [file_path for file_path in chunk if isinstance(file_path, (str, Path))]
+        file_objects = [file_path for file_path in chunk if not isinstance(file_path, (str, Path))]
+        
+        config = self._worker_config()
+        future_to_file = {}
+        for file_path in paths:
+            future = pool['executor'].submit(_import_file_in_worker, str(file_path), metadata, config,
+                                             pool['events'], pool['cancel_event'])
+            future_to_file[future] = self._get_file_name(file_path)
+        
+        completed = set()
+        pending = set(future_to_file)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=0.1,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            
+            # ワーカーからの処理開始の通知を反映
+            if self._drain_worker_events(pool['events'], status, completed) and self.progress_callback:
+                self.progress_callback(status.get_progress())
+            
+            if self.cancelled and not pool['cancel_event'].is_set():
+                pool['cancel_event'].set()
+                for future in pending:
+                    future.cancel()
+            
+            for future in done:
+                file_name = future_to_file[future]
+                completed.add(file_name)
+                
+                if future.cancelled():
+                    result.add_failure(file_name, [CANCELLED_MESSAGE])
+                    status.complete_file(file_name, False, False)
+                    continue
+                
+                try:
+                    payload, container_metadata, errors, warnings = future.result()
+                    
+                    if payload is not None:
+                        container = GPSDataContainer(decode_dataframe(payload), container_metadata)
+                        result.add_success(file_name, container)
+                        status.complete_file(file_name, True, bool(warnings))
+                    else:
+                        result.add_failure(file_name, errors)
+                        status.complete_file(file_name, False, bool(warnings))
+                    
+                    if warnings:
+                        result.add_warning(file_name, warnings)
+                
+                except Exception as e:
+                    logger.error(f"ファイル {file_name} の処理中にエラーが発生: {e}")
+                    result.add_failure(file_name, [f"処理中に例外が発生: {str(e)}"])
+                    status.complete_file(file_name, False, False)
+                
+                # 進捗状況の通知
+                if self.progress_callback:
+                    self.progress_callback(status.get_progress())
+        
+        if file_objects:
+            self._process_chunk_sequential(file_objects, metadata, result, status)
+    
+    def _drain_worker_events(self, events: Any, status: BatchProcessStatus, completed: set) -> bool:
+        """
+        ワーカーからの通知を処理状態に反映
+        
+        Returns
+        -------
+        bool
+            処理状態が更新された場合はTrue
+        """
+        updated = False
+        while True:
+            try:
+                event, file_name = events.get_nowait()
+            except queue.Empty:
+                return updated
+            
+            if event == 'start' and file_name not in completed:
+                status.start_file(file_name)
+                updated = True
+    
     def _process_chunk_sequential(self, chunk: List[Union[str, Path, BinaryIO, TextIO]],
                                  metadata: Dict[str, Any],
                                  result: OptimizedBatchImportResult,
@@ -506,6 +730,9 @@ class OptimizedBatchImporter:
             処理状態
         """
         for file_path in chunk:
+            if self.cancelled:
+                break
+            
             file_name = self._get_file_name(file_path)
             status.start_file(file_name)
             
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+セーリング戦略分析システム - 等時線（アイソクローン）ルート最適化エンジン
+
+出発点から一定時間ごとに到達可能な点の集合（等時線）を、全候補進路について
+配列演算で一括展開し、時間変化する風の場の上で目標地点への最短時間ルートを求めます。
+同じ空間ハッシュセルに先に到達した点がある候補は劣後するとみなして枝刈りします。
+"""
+
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Optional, Any
+
+from scipy.spatial import cKDTree
+
+from .utilities.track_kinematics import EARTH_RADIUS_M, haversine_distances, initial_bearings
+
+# ノット → m/s 変換係数
+KNOTS_TO_MPS = 0.51444
+
+
+class WindFieldSampler:
+    """
+    経過時間と位置から風向風速を取得するサンプラー
+
+    固定の風の場、またはWindFieldInterpolatorによる時間変化する風の場に対応します。
+    補間器を使う場合は経過時間を time_resolution 秒単位に丸めた時刻の風の場を一度だけ補間し、
+    以降は再利用します。位置は最も近いグリッドポイントの値を使用し、グリッド範囲外はNaNになります。
+
+    Parameters:
+    -----------
+    wind_field : Dict[str, Any], optional
+        固定の風の場（補間器が使えない場合のフォールバックを兼ねる）
+    interpolator : WindFieldInterpolator, optional
+        時間変化する風の場の補間器
+    start_time : datetime, optional
+        経過時間0に対応する時刻（補間器を使う場合に必要）
+    time_resolution : float
+        補間器から風の場を取得する時間間隔（秒）
+    resolution : int, optional
+        補間する風の場の解像度
+    """
+
+    def __init__(self, wind_field: Optional[Dict[str, Any]] = None, interpolator: Any = None,
+                 start_time: Optional[datetime] = None, time_resolution: float = 300.0,
+                 resolution: Optional[int] = None):
+        if wind_field is None and (interpolator is None or start_time is None):
+            raise ValueError("風の場、または補間器と開始時刻が必要です")
+
+        self.wind_field = wind_field
+        self.interpolator = interpolator
+        self.start_time = start_time
+        self.time_resolution = float(time_resolution)
+        self.resolution = resolution
+        self._fields = {}
+
+    @property
+    def is_time_varying(self) -> bool:
+        """風の場が経過時間によって変化するか"""
+        return self.interpolator is not None and self.start_time is not None
+
+    def __getstate__(self):
+        # グリッドのKD木は復元後に再構築する（プロセス間で渡す場合の転送量を抑える）
+        state = self.__dict__.copy()
+        state['_fields'] = {}
+        return state
+
+    def _compile(self, wind_field: Dict[str, Any]) -> Dict[str, Any]:
+        lat_grid = np.asarray(wind_field['lat_grid'], dtype=float).ravel()
+        lon_grid = np.asarray(wind_field['lon_grid'], dtype=float).ravel()
+        return {
+            'tree': cKDTree(np.column_stack([lat_grid, lon_grid])),
+            'bounds': (lat_grid.min(), lat_grid.max(), lon_grid.min(), lon_grid.max()),
+            'wind_direction': np.asarray(wind_field['wind_direction'], dtype=float).ravel(),
+            'wind_speed': np.asarray(wind_field['wind_speed'], dtype=float).ravel()
+        }
+
+    def _field_at(self, elapsed_seconds: float) -> Optional[Dict[str, Any]]:
+        bucket = int(round(elapsed_seconds / self.time_resolution)) if self.is_time_varying else 0
+        if bucket not in self._fields:
+            wind_field = None
+            if self.is_time_varying:
+                target_time = self.start_time + timedelta(seconds=bucket * self.time_resolution)
+                wind_field = self.interpolator.interpolate_wind_field(target_time, resolution=self.resolution)
+            if wind_field is None:
+                wind_field = self.wind_field
+            self._fields[bucket] = self._compile(wind_field) if wind_field is not None else None
+        return self._fields[bucket]
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray,
+               elapsed_seconds: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数の位置の風向風速を取得
+
+        Parameters:
+        -----------
+        lats, lons : np.ndarray
+            位置の緯度・経度
+        elapsed_seconds : float
+            開始時刻からの経過時間（秒）
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (風向, 風速) - 風の場の範囲外はNaN
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        field = self._field_at(elapsed_seconds)
+        if field is None or len(lats) == 0:
+            return np.full(lats.shape, np.nan), np.full(lats.shape, np.nan)
+
+        min_lat, max_lat, min_lon, max_lon = field['bounds']
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        _, nearest = field['tree'].query(np.column_stack([lats, lons]))
+        nearest = np.minimum(nearest, len(field['wind_speed']) - 1)
+        return (np.where(inside, field['wind_direction'][nearest], np.nan),
+                np.where(inside, field['wind_speed'][nearest], np.nan))
+
+
+class IsochroneRouter:
+    """
+    等時線法による最短時間ルート探索
+
+    各ステップで等時線上の全点から全候補進路（風に対する角度 heading_step 度刻み）へ
+    1タイムステップ分だけ進めた候補を配列演算で生成し、空間ハッシュで枝刈りして次の等時線とします。
+    目標地点へ直接到達できる点が現れた時点で探索を終了し、経路を逆にたどります。
+
+    Parameters:
+    -----------
+    polar_table : PolarTable
+        艇速参照テーブル（boat_speed(wind_speed, wind_angle) を持つもの）
+    wind_sampler : WindFieldSampler
+        風向風速のサンプラー
+    time_step : float, optional
+        等時線の時間間隔（秒）、Noneの場合は区間距離から自動決定
+    heading_step : float
+        候補進路の角度間隔（度）
+    max_front_size : int
+        等時線に保持する最大点数
+    cell_size : float, optional
+        枝刈りに使う空間ハッシュのセルサイズ（メートル）、Noneの場合は1ステップの最大移動距離の1/4
+    tack_penalty : float
+        タック/ジャイブ1回あたりの損失時間（秒）
+    arrival_radius : float
+        目標到達とみなす距離（メートル）
+    max_steps : int
+        等時線の最大ステップ数
+    """
+
+    def __init__(self, polar_table: Any, wind_sampler: WindFieldSampler,
+                 time_step: Optional[float] = None, heading_step: float = 5.0,
+                 max_front_size: int = 400, cell_size: Optional[float] = None,
+                 tack_penalty: float = 10.0, arrival_radius: float = 50.0,
+                 max_steps: int = 500):
+        self.polar_table = polar_table
+        self.wind_sampler = wind_sampler
+        self.time_step = time_step
+        self.heading_step = heading_step
+        self.max_front_size = max_front_size
+        self.cell_size = cell_size
+        self.tack_penalty = tack_penalty
+        self.arrival_radius = arrival_radius
+        self.max_steps = max_steps
+
+        # 風に対する候補角度（右舷側が正、0度は含めない）
+        twa = np.arange(heading_step, 180.0 + heading_step / 2, heading_step)
+        twa = twa[twa <= 180.0]
+        self._signed_twa = np.concatenate([-twa[::-1], twa[twa < 180.0]])
+        self._max_boat_speed = float(np.max(polar_table.table)) if hasattr(polar_table, 'table') else None
+
+    def _boat_speed(self, wind_speeds: np.ndarray, twa: np.ndarray) -> np.ndarray:
+        return self.polar_table.boat_speed(wind_speeds, np.minimum(np.abs(twa), 180.0))
+
+    def _auto_time_step(self, distance: float) -> float:
+        # 直線距離を最高艇速で進む時間の1/30程度（5秒〜10分）
+        max_speed = (self._max_boat_speed or 5.0) * KNOTS_TO_MPS
+        return float(np.clip(distance / max(max_speed, 0.1) / 30.0, 5.0, 600.0))
+
+    def route(self, start_lat: float, start_lon: float, target_lat: float, target_lon: float,
+              start_offset: float = 0.0) -> Dict[str, Any]:
+        """
+        出発地点から目標地点までの最短時間ルートを計算
+
+        Parameters:
+        -----------
+        start_lat, start_lon : float
+            出発地点の緯度・経度
+        target_lat, target_lon : float
+            目標地点の緯度・経度
+        start_offset : float
+            出発時刻の風のサンプラー基準時刻からの経過時間（秒）
+
+        Returns:
+        --------
+        Dict[str, Any]
+            最適パス情報（find_optimal_path と同じキーに 'engine' と 'reached' を追加）。
+            'time' は出発時刻からの経過時間
+        """
+        direct_distance = float(haversine_distances(start_lat, start_lon, target_lat, target_lon))
+        time_step = self.time_step or self._auto_time_step(direct_distance)
+        max_speed = (self._max_boat_speed or 5.0) * KNOTS_TO_MPS
+        cell_size = self.cell_size or max(max_speed * time_step / 4.0, 1.0)
+
+        # 出発点を原点とする局所平面座標（空間ハッシュ用）
+        cos_lat0 = np.cos(np.radians(start_lat))
+
+        def cell_keys(lats, lons):
+            x = np.radians(lons - start_lon) * EARTH_RADIUS_M * cos_lat0
+            y = np.radians(lats - start_lat) * EARTH_RADIUS_M
+            ix = np.floor(x / cell_size).astype(np.int64)
+            iy = np.floor(y / cell_size).astype(np.int64)
+            return ix * (1 << 32) + iy
+
+        # 等時線の履歴（各ステップの点の配列）
+        front = {
+            'lat': np.array([start_lat], dtype=float),
+            'lon': np.array([start_lon], dtype=float),
+            'parent': np.array([-1]),
+            'side': np.array([0]),
+        }
+        history = []
+        visited = cell_keys(front['lat'], front['lon'])
+        finish = None
+
+        for step in range(self.max_steps):
+            elapsed = step * time_step
+            wind_dir, wind_speed = self.wind_sampler.sample(front['lat'], front['lon'], start_offset + elapsed)
+            front['wind_direction'] = wind_dir
+            front['wind_speed'] = wind_speed
+            front['course'] = np.full(len(wind_dir), np.nan)
+            front['speed'] = np.zeros(len(wind_dir))
+            history.append(front)
+
+            valid = np.isfinite(wind_dir) & np.isfinite(wind_speed)
+            if not valid.any():
+                break
+
+            # 目標へ直接到達できる点の判定
+            distances = haversine_distances(front['lat'], front['lon'], target_lat, target_lon)
+            bearings = initial_bearings(front['lat'], front['lon'], target_lat, target_lon)
+            direct_twa = ((bearings - wind_dir + 180) % 360) - 180
+            direct_speed = np.zeros(len(wind_dir))
+            direct_speed[valid] = self._boat_speed(wind_speed[valid], direct_twa[valid]) * KNOTS_TO_MPS
+            direct_side = np.sign(direct_twa)
+            penalty = np.where((front['side'] != 0) & (direct_side != front['side']), self.tack_penalty, 0.0)
+            remaining = np.maximum(distances - self.arrival_radius, 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                finish_time = np.where(remaining == 0, 0.0,
+                                       np.where(direct_speed > 0, remaining / direct_speed + penalty, np.inf))
+            finish_time[~valid & (remaining > 0)] = np.inf
+            best = int(np.argmin(finish_time))
+            if finish_time[best] <= time_step:
+                front['course'][best] = bearings[best]
+                front['speed'][best] = direct_speed[best] / KNOTS_TO_MPS
+                finish = (best, elapsed + float(finish_time[best]), int(direct_side[best]))
+                break
+
+            # 全点×全候補進路の展開
+            source = np.flatnonzero(valid)
+            headings = (wind_dir[source, None] + self._signed_twa[None, :]) % 360
+            speeds = self._boat_speed(wind_speed[source, None], self._signed_twa[None, :])
+            sides = np.broadcast_to(np.sign(self._signed_twa), headings.shape)
+            parent_sides = front['side'][source, None]
+            sail_time = np.where((parent_sides != 0) & (sides != parent_sides),
+                                 max(time_step - self.tack_penalty, 0.0), time_step)
+            moves = speeds * KNOTS_TO_MPS * sail_time
+
+            heading_rad = np.radians(headings)
+            lat_rad = np.radians(front['lat'][source, None])
+            new_lats = front['lat'][source, None] + np.degrees(moves * np.cos(heading_rad) / EARTH_RADIUS_M)
+            new_lons = front['lon'][source, None] + np.degrees(
+                moves * np.sin(heading_rad) / (EARTH_RADIUS_M * np.cos(lat_rad)))
+
+            parents = np.broadcast_to(source[:, None], headings.shape).ravel()
+            candidates = {
+                'lat': new_lats.ravel(), 'lon': new_lons.ravel(),
+                'heading': headings.ravel(), 'speed': speeds.ravel(), 'side': sides.ravel()
+            }
+            moving = moves.ravel() > 0
+
+            # 空間ハッシュによる枝刈り: 各セルで目標に最も近い点のみ残し、
+            # 以前の等時線で到達済みのセルに入った点は劣後するため除外
+            keys = cell_keys(candidates['lat'], candidates['lon'])
+            remaining_distance = haversine_distances(candidates['lat'], candidates['lon'], target_lat, target_lon)
+            order = np.lexsort((remaining_distance, keys))
+            order = order[moving[order]]
+            unique_keys, first = np.unique(keys[order], return_index=True)
+            keep = order[first]
+            keep = keep[~np.isin(unique_keys, visited, assume_unique=True)]
+            if len(keep) == 0:
+                break
+            if len(keep) > self.max_front_size:
+                keep = keep[np.argsort(remaining_distance[keep], kind='stable')[:self.max_front_size]]
+            visited = np.union1d(visited, keys[keep])
+
+            front = {
+                'lat': candidates['lat'][keep],
+                'lon': candidates['lon'][keep],
+                'parent': parents[keep],
+                'side': candidates['side'][keep].astype(int),
+                'heading': candidates['heading'][keep],
+                'boat_speed': candidates['speed'][keep],
+            }
+
+        return self._build_result(history, finish, time_step, target_lat, target_lon)
+
+    def _build_result(self, history: List[Dict[str, np.ndarray]], finish: Optional[Tuple[int, float, int]],
+                      time_step: float, target_lat: float, target_lon: float) -> Dict[str, Any]:
+        """等時線の履歴から経路を逆にたどって結果を作成"""
+        reached = finish is not None
+        if reached:
+            index, total_time, final_side = finish
+            last_step = len(history) - 1
+        else:
+            # 到達できなかった場合は目標に最も近い点までの経路
+            last_step = len(history) - 1
+            last = history[last_step]
+            index = int(np.argmin(haversine_distances(last['lat'], last['lon'], target_lat, target_lon)))
+            total_time = last_step * time_step
+            final_side = None
+
+        # 経路を逆にたどる（各点の進路・艇速はその点から出た区間の値）
+        chain = []
+        step = last_step
+        while step >= 0 and index >= 0:
+            chain.append((step, index))
+            index = int(history[step]['parent'][index])
+            step -= 1
+        chain.reverse()
+
+        path_points = []
+        sides = []
+        for position, (step, index) in enumerate(chain):
+            node = history[step]
+            if position + 1 < len(chain):
+                next_node = history[chain[position + 1][0]]
+                next_index = chain[position + 1][1]
+                course = float(next_node['heading'][next_index])
+                speed = float(next_node['boat_speed'][next_index])
+                side = int(next_node['side'][next_index])
+            elif reached:
+                course = float(node['course'][index])
+                speed = float(node['speed'][index])
+                side = final_side
+            else:
+                course = float(initial_bearings(node['lat'][index], node['lon'][index], target_lat, target_lon))
+                speed = 0.0
+                side = sides[-1] if sides else 0
+
+            wind_direction = float(node['wind_direction'][index])
+            twa = abs(((course - wind_direction + 180) % 360) - 180)
+            path_points.append({
+                'lat': float(node['lat'][index]),
+                'lon': float(node['lon'][index]),
+                'course': course,
+                'speed': speed,
+                'time': step * time_step,
+                'wind_direction': wind_direction,
+                'wind_speed': float(node['wind_speed'][index]),
+                'is_upwind': bool(twa < 90)
+            })
+            sides.append(side)
+
+        # 進路の左右（タック）が切り替わる点をタック/ジャイブ地点とする
+        tack_points = [
+            {
+                'lat': path_points[i]['lat'],
+                'lon': path_points[i]['lon'],
+                'time': path_points[i]['time'],
+                'is_upwind': path_points[i]['is_upwind']
+            }
+            for i in range(1, len(path_points))
+            if sides[i] != 0 and sides[i - 1] != 0 and sides[i] != sides[i - 1]
+        ]
+
+        # 最終点は目標地点（find_optimal_path と同じ扱い）
+        if path_points:
+            last_point = path_points[-1].copy()
+            last_point['lat'] = target_lat
+            last_point['lon'] = target_lon
+            last_point['time'] = total_time
+            path_points.append(last_point)
+
+        lats = np.array([p['lat'] for p in path_points])
+        lons = np.array([p['lon'] for p in path_points])
+        total_distance = float(np.sum(haversine_distances(lats[:-1], lons[:-1], lats[1:], lons[1:]))) \
+            if len(path_points) > 1 else 0.0
+        avg_speed = total_distance / (total_time * KNOTS_TO_MPS) if total_time > 0 else 0
+
+        return {
+            'path_points': path_points,
+            'tack_points': tack_points,
+            'total_distance': total_distance,
+            'total_time': total_time,
+            'avg_speed': avg_speed,
+            'tack_count': len(tack_points),
+            'engine': 'isochrone',
+            'reached': reached
+        }
+
+
+def route_leg(router: IsochroneRouter, leg: Tuple[float, float, float, float]) -> Dict[str, Any]:
+    """プロセスプールから呼び出すためのレグ単位のルート計算"""
+    return router.route(*leg)
@@ -16,13 +16,19 @@ from typing import Dict, List, Tuple, Optional, Union, Any
 from geopy.distance import geodesic
 import matplotlib.pyplot as plt
 import multiprocessing
+import time
+from collections import OrderedDict
 from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 import warnings
 
+from scipy.spatial import cKDTree
+
 # 内部モジュールのインポート (sailing_data_processor パッケージ内)
 try:
     from .utilities.math_utils import normalize_angle, angle_difference
+    from .utilities.track_kinematics import initial_bearings, vincenty_distances
+    from .isochrone_router import IsochroneRouter, WindFieldSampler, route_leg
 except ImportError:
     # スタンドアロン実行の場合はこちらを使用
     def normalize_angle(angle):
@@ -34,6 +40,250 @@ except ImportError:
         return ((angle1 - angle2 + 180) % 360) - 180
 
 
+class PolarTable:
+    """
+    ポーラーデータを密な規則格子に展開した艇速参照テーブル
+    
+    ポーラーデータ（風向角×風速）を一度だけ等間隔の格子に双線形補間で展開し、
+    参照時は格子番号を算術計算で求めて補間します（スカラー・配列どちらにも対応）。
+    元の格子点が展開先の格子上にある場合、補間結果は元のポーラーでの双線形補間と一致します。
+    あわせて風速ごとの風上・風下の最適VMG角度テーブルを事前計算します。
+    
+    Parameters:
+    -----------
+    polar_data : pd.DataFrame
+        ポーラーデータ（インデックス: 風向角、カラム: 風速）
+    angle_step : float
+        風向角方向の格子間隔（度）
+    speed_step : float
+        風速方向の格子間隔（ノット）
+    """
+    
+    def __init__(self, polar_data: pd.DataFrame, angle_step: float = 1.0, speed_step: float = 0.5):
+        angles = pd.to_numeric(pd.Series(polar_data.index), errors='coerce').to_numpy(dtype=float)
+        speeds = pd.to_numeric(pd.Series(polar_data.columns), errors='coerce').to_numpy(dtype=float)
+        values = polar_data.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        
+        # 数値に変換できない行・列を除外して昇順に並べ替え
+        valid_angles = np.isfinite(angles)
+        valid_speeds = np.isfinite(speeds)
+        angles, speeds = angles[valid_angles], speeds[valid_speeds]
+        values = values[np.ix_(valid_angles, valid_speeds)]
+        angle_order = np.argsort(angles, kind='stable')
+        speed_order = np.argsort(speeds, kind='stable')
+        angles, speeds = angles[angle_order], speeds[speed_order]
+        values = np.nan_to_num(values[np.ix_(angle_order, speed_order)], nan=0.0)
+        
+        if len(angles) == 0 or len(speeds) == 0:
+            raise ValueError("ポーラーデータに有効な風向角・風速がありません")
+        
+        # 元のポーラーの格子点（品質レポート・互換用）
+        self.polar_angles = angles
+        self.polar_speeds = speeds
+        
+        # 密な規則格子に展開
+        self.angle_grid = self._regular_grid(angles, angle_step)
+        self.speed_grid = self._regular_grid(speeds, speed_step)
+        self.angle_step = self.angle_grid[1] - self.angle_grid[0]
+        self.speed_step = self.speed_grid[1] - self.speed_grid[0]
+        grid_angles, grid_speeds = np.meshgrid(self.angle_grid, self.speed_grid, indexing='ij')
+        self.table = self._bilinear(angles, speeds, values, grid_angles, grid_speeds)
+        
+        # 最適VMG角度テーブル（密な風速格子ごと、1度刻み）
+        search_angles = np.arange(0.0, 181.0)
+        search_speeds = self.boat_speed(self.speed_grid[:, None], search_angles[None, :])
+        
+        upwind = search_angles <= 90
+        upwind_vmg = search_speeds[:, upwind] * np.cos(np.radians(search_angles[upwind]))
+        best = np.argmax(upwind_vmg, axis=1)
+        self.upwind_angles = search_angles[upwind][best]
+        self.upwind_vmg = upwind_vmg[np.arange(len(best)), best]
+        
+        downwind = search_angles > 90
+        downwind_vmg = search_speeds[:, downwind] * np.cos(np.radians(180 - search_angles[downwind]))
+        best = np.argmax(downwind_vmg, axis=1)
+        self.downwind_angles = search_angles[downwind][best]
+        self.downwind_vmg = downwind_vmg[np.arange(len(best)), best]
+    
+    @staticmethod
+    def _regular_grid(nodes: np.ndarray, step: float) -> np.ndarray:
+        """元の格子点の範囲をカバーする等間隔格子（最低2点）"""
+        lower, upper = float(nodes[0]), float(nodes[-1])
+        if upper <= lower:
+            return np.array([lower, lower + step])
+        count = int(np.ceil((upper - lower) / step - 1e-9)) + 1
+        return np.linspace(lower, upper, count)
+    
+    @staticmethod
+    def _bilinear(xs: np.ndarray, ys: np.ndarray, values: np.ndarray,
+                  x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """不等間隔格子上の双線形補間（範囲外は端の値）"""
+        def weights(nodes, points):
+            points = np.clip(points, nodes[0], nodes[-1])
+            if len(nodes) == 1:
+                index = np.zeros(points.shape, dtype=int)
+                return index, index, np.zeros(points.shape)
+            lower = np.clip(np.searchsorted(nodes, points, side='right') - 1, 0, len(nodes) - 2)
+            ratio = (points - nodes[lower]) / (nodes[lower + 1] - nodes[lower])
+            return lower, lower + 1, ratio
+        
+        x0, x1, tx = weights(xs, np.asarray(x, dtype=float))
+        y0, y1, ty = weights(ys, np.asarray(y, dtype=float))
+        v0 = values[x0, y0] * (1 - ty) + values[x0, y1] * ty
+        v1 = values[x1, y0] * (1 - ty) + values[x1, y1] * ty
+        return v0 * (1 - tx) + v1 * tx
+    
+    def boat_speed(self, wind_speed: Any, wind_angle: Any) -> np.ndarray:
+        """
+        艇速を補間（風向角は0-180度に正規化済みであること）
+        
+        Parameters:
+        -----------
+        wind_speed : float or np.ndarray
+            風速（ノット）
+        wind_angle : float or np.ndarray
+            風向角（度）
+            
+        Returns:
+        --------
+        np.ndarray
+            艇速（ノット）、入力をブロードキャストした形状
+        """
+        fa = (np.clip(wind_angle, self.angle_grid[0], self.angle_grid[-1]) - self.angle_grid[0]) / self.angle_step
+        fs = (np.clip(wind_speed, self.speed_grid[0], self.speed_grid[-1]) - self.speed_grid[0]) / self.speed_step
+        ia = np.minimum(np.floor(fa).astype(int), len(self.angle_grid) - 2)
+        js = np.minimum(np.floor(fs).astype(int), len(self.speed_grid) - 2)
+        ta = fa - ia
+        ts = fs - js
+        
+        table = self.table
+        v0 = table[ia, js] * (1 - ts) + table[ia, js + 1] * ts
+        v1 = table[ia + 1, js] * (1 - ts) + table[ia + 1, js + 1] * ts
+        return v0 * (1 - ta) + v1 * ta
+    
+    def optimal(self, wind_speed: Any, upwind: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        風速に対する最適風向角と最大VMGを取得（風速方向は線形補間、範囲外は端の値）
+        
+        Parameters:
+        -----------
+        wind_speed : float or np.ndarray
+            風速（ノット）
+        upwind : bool
+            True: 風上向き、False: 風下向き
+            
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (最適風向角, 最大VMG)
+        """
+        angles = self.upwind_angles if upwind else self.downwind_angles
+        vmgs = self.upwind_vmg if upwind else self.downwind_vmg
+        return (np.interp(wind_speed, self.speed_grid, angles),
+                np.interp(wind_speed, self.speed_grid, vmgs))
+    
+    def optimal_by_wind_speed(self, upwind: bool = True) -> Dict[float, Tuple[float, float]]:
+        """元のポーラーの風速ごとの (最適風向角, 最大VMG) の辞書"""
+        angles, vmgs = self.optimal(self.polar_speeds, upwind)
+        return {float(ws): (float(angle), float(vmg))
+                for ws, angle, vmg in zip(self.polar_speeds, angles, vmgs)}
+
+
+class VMGCache:
+    """
+    最適VMG計算結果の上限付きLRU/TTLキャッシュ
+    
+    エントリ数が上限を超えると最も長く参照されていないものから削除し、
+    TTLを過ぎたエントリは参照時に破棄します。ヒット・ミス・削除の回数を記録します。
+    
+    Parameters:
+    -----------
+    max_entries : int
+        最大エントリ数
+    ttl : float, optional
+        エントリの有効期間（秒）、Noneの場合は期限なし
+    """
+    
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 600.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._entries = OrderedDict()  # キー: (登録時刻, 値)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+    
+    def configure(self, max_entries: int = None, ttl: Optional[float] = None) -> None:
+        """上限エントリ数とTTLを変更（超過分はその場で削除）"""
+        if max_entries is not None:
+            self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._evict()
+    
+    def get(self, key: Any) -> Any:
+        """
+        キャッシュから値を取得（見つからないか期限切れの場合はNone）
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: Any, value: Any) -> None:
+        """値を登録し、上限を超えた分を古い順に削除"""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        self._evict()
+    
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """全エントリを無効化"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+    
+    def invalidate_boat(self, boat_type: str) -> None:
+        """指定艇種のエントリを無効化"""
+        keys = [key for key in self._entries if key[0] == boat_type]
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+
+
 class OptimalVMGCalculator:
     """最適VMG計算エンジン - 風向風速データを基に最適セーリング戦略を計算"""
     
@@ -43,20 +293,36 @@ class OptimalVMGCalculator:
         self.boat_types = {}
         # 風向風速データ
         self.wind_field = None
+        # 時間変化する風の場の補間器（等時線ルート探索用）とその基準時刻
+        self.wind_interpolator = None
+        self.wind_start_time = None
         # 計算結果キャッシュ
-        self.vmg_cache = {}
+        self.vmg_cache = VMGCache()
+        # 風の場のグリッド点の空間インデックス（一括計算用）
+        self._wind_grid_index = None
         # 標準艇種をロード
         self._load_standard_boat_types()
         # 計算設定
         self.config = {
             'use_parallel': True,  # 並列計算を使用するか
             'cache_results': True,  # 計算結果をキャッシュするか
+            'cache_max_entries': 10000,  # キャッシュの最大エントリ数
+            'cache_ttl': 600.0,  # キャッシュの有効期間（秒、Noneで期限なし）
+            'cache_spatial_resolution': 10.0,  # キャッシュキーの位置の量子化間隔（メートル）
+            'cache_angle_resolution': 1.0,  # キャッシュキーの目標方位の量子化間隔（度）
             'max_workers': max(1, multiprocessing.cpu_count() - 1),  # 並列計算の最大ワーカー数
             'path_resolution': 200,  # パス計算の解像度（メートル）
             'min_distance': 50,  # 目標到達判定距離（メートル）
             'safety_margin': 50.0,  # 安全マージン（メートル）
-            'use_vectorization': True  # ベクトル化計算を使用するか
+            'use_vectorization': True,  # ベクトル化計算を使用するか
+            'route_engine': 'greedy',  # ルート計算エンジン（'greedy' または 'isochrone'）
+            'isochrone_time_step': None,  # 等時線の時間間隔（秒、Noneで自動）
+            'isochrone_heading_step': 5.0,  # 等時線の候補進路の角度間隔（度）
+            'isochrone_max_front': 400,  # 等時線に保持する最大点数
+            'tack_penalty': 10.0,  # タック/ジャイブ1回あたりの損失時間（秒）
+            'wind_time_resolution': 300.0  # 補間器から風の場を取得する時間間隔（秒）
         }
+        self.vmg_cache.configure(self.config['cache_max_entries'], self.config['cache_ttl'])
     
     def update_config(self, **kwargs):
         """
@@ -72,6 +338,9 @@ class OptimalVMGCalculator:
                 self.config[key] = value
             else:
                 warnings.warn(f"未知の設定キー: {key}")
+        
+        if 'cache_max_entries' in kwargs or 'cache_ttl' in kwargs:
+            self.vmg_cache.configure(self.config['cache_max_entries'], self.config['cache_ttl'])
     
     def load_polar_data(self, boat_type: str, file_path: str) -> bool:
         """
@@ -113,21 +382,11 @@ class OptimalVMGCalculator:
             # 列名も数値型に変換
             polar_data.columns = pd.to_numeric(polar_data.columns, errors='coerce')
             
-            # 最適VMG値を計算（事前計算）
-            upwind_optimal = self._calculate_optimal_vmg_angles(polar_data, upwind=True)
-            downwind_optimal = self._calculate_optimal_vmg_angles(polar_data, upwind=False)
+            # 艇種データを登録（参照テーブルと最適VMG値を事前計算）
+            self.boat_types[boat_type] = self._compile_boat_data(boat_type, polar_data)
             
-            # 艇種データを登録
-            self.boat_types[boat_type] = {
-                'display_name': boat_type,
-                'polar_data': polar_data,
-                'upwind_optimal': upwind_optimal,
-                'downwind_optimal': downwind_optimal
-            }
-            
-            # VMGキャッシュをクリア
-            if boat_type in self.vmg_cache:
-                del self.vmg_cache[boat_type]
+            # この艇種のVMGキャッシュを無効化
+            self.vmg_cache.invalidate_boat(boat_type)
             
             return True
             
@@ -145,8 +404,83 @@ class OptimalVMGCalculator:
             風向風速データ（WindFieldInterpolator から取得したもの）
         """
         self.wind_field = wind_field
-        # キャッシュをクリア
-        self.vmg_cache = {}
+        # キャッシュを無効化
+        self.vmg_cache.clear()
+    
+    def set_wind_interpolator(self, interpolator: Any, start_time: datetime) -> None:
+        """
+        時間変化する風の場を設定（等時線ルート探索で使用）
+        
+        Parameters:
+        -----------
+        interpolator : WindFieldInterpolator
+            風の場の補間器
+        start_time : datetime
+            コース全体の出発時刻
+        """
+        self.wind_interpolator = interpolator
+        self.wind_start_time = start_time
+    
+    def create_isochrone_router(self, boat_type: str) -> IsochroneRouter:
+        """
+        現在の風の場と設定から等時線ルート探索エンジンを作成
+        
+        Parameters:
+        -----------
+        boat_type : str
+            艇種の識別子
+            
+        Returns:
+        --------
+        IsochroneRouter
+            ルート探索エンジン
+        """
+        if boat_type not in self.boat_types:
+            raise ValueError(f"未知の艇種: {boat_type}")
+        
+        if self.wind_field is None and self.wind_interpolator is None:
+            raise ValueError("風向風速データが設定されていません")
+        
+        sampler = WindFieldSampler(
+            wind_field=self.wind_field,
+            interpolator=self.wind_interpolator,
+            start_time=self.wind_start_time,
+            time_resolution=self.config['wind_time_resolution']
+        )
+        return IsochroneRouter(
+            self._get_polar_table(boat_type),
+            sampler,
+            time_step=self.config['isochrone_time_step'],
+            heading_step=self.config['isochrone_heading_step'],
+            max_front_size=self.config['isochrone_max_front'],
+            tack_penalty=self.config['tack_penalty'],
+            arrival_radius=self.config['min_distance']
+        )
+    
+    def find_isochrone_path(self, boat_type: str, start_lat: float, start_lon: float,
+                          target_lat: float, target_lon: float,
+                          start_offset: float = 0.0) -> Dict[str, Any]:
+        """
+        等時線法で出発地点から目標地点までの最短時間パスを見つける
+        
+        Parameters:
+        -----------
+        boat_type : str
+            艇種の識別子
+        start_lat, start_lon : float
+            出発地点の緯度・経度
+        target_lat, target_lon : float
+            目標地点の緯度・経度
+        start_offset : float
+            出発時刻の風の場の基準時刻からの経過時間（秒）
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            最適パス情報（find_optimal_path と同じ形式）
+        """
+        router = self.create_isochrone_router(boat_type)
+        return router.route(start_lat, start_lon, target_lat, target_lon, start_offset)
     
     def calculate_optimal_vmg(self, boat_type: str, lat: float, lon: float, 
                             target_lat: float, target_lon: float) -> Dict[str, Any]:
@@ -173,20 +507,22 @@ class OptimalVMGCalculator:
         if self.wind_field is None:
             raise ValueError("風向風速データが設定されていません")
         
-        # キャッシュキーを生成
+        # 目標地点への方位を計算
+        target_bearing = self._calculate_bearing(lat, lon, target_lat, target_lon)
+        
+        # 位置と目標方位を量子化したキャッシュキーを生成
+        # （最適進路は位置の風と目標方位で決まるため、距離と到達時間はヒット時に再計算）
         if self.config['cache_results']:
-            cache_key = f"{boat_type}_{lat:.6f}_{lon:.6f}_{target_lat:.6f}_{target_lon:.6f}"
-            if cache_key in self.vmg_cache:
-                return self.vmg_cache[cache_key]
+            cache_key = self._vmg_cache_key(boat_type, lat, lon, target_bearing)
+            cached = self.vmg_cache.get(cache_key)
+            if cached is not None:
+                return self._with_eta(cached, lat, lon, target_lat, target_lon)
         
         # 地点の風向風速を取得
         wind_info = self._get_wind_at_position(lat, lon)
         if wind_info is None:
             return None
         
-        # 目標地点への方位を計算
-        target_bearing = self._calculate_bearing(lat, lon, target_lat, target_lon)
-        
         # 風向と目標方位の相対角度
         relative_angle = self._angle_difference(target_bearing, wind_info['direction'])
         
@@ -268,10 +604,6 @@ class OptimalVMGCalculator:
                 optimal_course = opposite_course
                 vmg = opposite_vmg
         
-        # 距離と到達時間の推定
-        distance = geodesic((lat, lon), (target_lat, target_lon)).meters
-        eta_seconds = 0 if vmg <= 0 else distance / (vmg * 0.51444)  # ノットをm/sに変換
-        
         # 結果を整理
         result = {
             'optimal_course': optimal_course,
@@ -280,15 +612,38 @@ class OptimalVMGCalculator:
             'is_upwind': is_upwind,
             'is_direct': is_direct,
             'tack_needed': tack_needed,
-            'eta_seconds': eta_seconds,
-            'distance_meters': distance,
             'wind_info': wind_info
         }
         
         # キャッシュに保存
         if self.config['cache_results']:
-            self.vmg_cache[cache_key] = result
+            self.vmg_cache.put(cache_key, result)
         
+        return self._with_eta(result, lat, lon, target_lat, target_lon)
+    
+    def _vmg_cache_key(self, boat_type: str, lat: float, lon: float,
+                       target_bearing: float) -> Tuple[Any, ...]:
+        """
+        VMGキャッシュのキーを生成（位置はメートル単位、目標方位は度単位で量子化）
+        """
+        spatial = self.config['cache_spatial_resolution'] / 111320.0  # メートルを緯度に換算
+        angle = self.config['cache_angle_resolution']
+        lon_scale = max(math.cos(math.radians(lat)), 1e-6)
+        return (boat_type,
+                int(round(lat / spatial)),
+                int(round(lon * lon_scale / spatial)),
+                int(round(target_bearing / angle)) % int(round(360 / angle)))
+    
+    def _with_eta(self, result: Dict[str, Any], lat: float, lon: float,
+                  target_lat: float, target_lon: float) -> Dict[str, Any]:
+        """最適VMG情報に目標までの距離と到達時間の推定を加える"""
+        distance = geodesic((lat, lon), (target_lat, target_lon)).meters
+        vmg = result['vmg']
+        eta_seconds = 0 if vmg <= 0 else distance / (vmg * 0.51444)  # ノットをm/sに変換
+        
+        result = dict(result)
+        result['eta_seconds'] = eta_seconds
+        result['distance_meters'] = distance
         return result
     
     def find_optimal_path(self, boat_type: str, start_lat: float, start_lon: float,
@@ -424,7 +779,8 @@ class OptimalVMGCalculator:
         }
     
     def calculate_optimal_route_for_course(self, boat_type: str, 
-                                         waypoints: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                         waypoints: List[Dict[str, Any]],
+                                         engine: Optional[str] = None) -> Dict[str, Any]:
         """
         指定されたコース（ウェイポイントリスト）に対する最適戦略を計算
         
@@ -434,16 +790,21 @@ class OptimalVMGCalculator:
             艇種の識別子
         waypoints : List[Dict[str, Any]]
             コースのウェイポイントリスト
+        engine : str, optional
+            ルート計算エンジン（'greedy' または 'isochrone'）、指定がない場合は設定値を使用
             
         Returns:
         --------
         Dict[str, Any]
             最適戦略情報（レッグごとの戦略、推定所要時間など）
         """
+        if engine is None:
+            engine = self.config['route_engine']
+        
         if boat_type not in self.boat_types:
             raise ValueError(f"未知の艇種: {boat_type}")
             
-        if self.wind_field is None:
+        if self.wind_field is None and not (engine == 'isochrone' and self.wind_interpolator is not None):
             raise ValueError("風向風速データが設定されていません")
             
         if len(waypoints) < 2:
@@ -452,7 +813,12 @@ class OptimalVMGCalculator:
         # 並列処理を使用するかどうか
         use_parallel = self.config['use_parallel'] and len(waypoints) > 2
         
-        if use_parallel:
+        if engine == 'isochrone':
+            # 等時線法でレッグごとの最短時間パスを計算
+            legs = [(waypoints[i]['lat'], waypoints[i]['lon'], waypoints[i + 1]['lat'], waypoints[i + 1]['lon'])
+                    for i in range(len(waypoints) - 1)]
+            path_results = self._calculate_isochrone_legs(boat_type, legs, use_parallel)
+        elif use_parallel:
             # 並列処理のためのデータを準備
             start_points = []
             end_points = []
@@ -556,35 +922,8 @@ class OptimalVMGCalculator:
             if wind_angle > 180:
                 wind_angle = 360 - wind_angle
                 
-            # ポーラーデータから艇速を補間
-            polar_data = self.boat_types[boat_type]['polar_data']
-            
-            # 風速値の確認と正規化
-            wind_speed_str = str(wind_speed)
-            if wind_speed_str not in polar_data.columns:
-                # 風速列が見つからない場合は近い値を使用
-                cols = sorted([float(col) for col in polar_data.columns if str(col).replace('.', '').isdigit()])
-                
-                # 範囲外の場合は最も近い値を使用
-                if wind_speed <= cols[0]:
-                    wind_speed = cols[0]
-                elif wind_speed >= cols[-1]:
-                    wind_speed = cols[-1]
-                else:
-                    # 最も近い値を見つける
-                    for i in range(len(cols) - 1):
-                        if cols[i] <= wind_speed <= cols[i + 1]:
-                            # 近い方を使用
-                            if (wind_speed - cols[i]) < (cols[i + 1] - wind_speed):
-                                wind_speed = cols[i]
-                            else:
-                                wind_speed = cols[i + 1]
-                            break
-                
-                # 更新された風速の文字列表現を使用
-                wind_speed_str = str(wind_speed)
-            
-            return self._interpolate_boat_speed(polar_data, wind_speed, wind_angle)
+            # 事前計算した参照テーブルから艇速を補間
+            return float(self._get_polar_table(boat_type).boat_speed(wind_speed, wind_angle))
         except Exception as e:
             # エラーが発生した場合は単純な推定値を返す
             # 風速に比例し、風向角に応じた係数を掛ける
@@ -826,62 +1165,8 @@ class OptimalVMGCalculator:
         angles = np.abs(wind_angles) % 360
         angles = np.where(angles > 180, 360 - angles, angles)
         
-        # ポーラーデータを取得
-        polar_data = self.boat_types[boat_type]['polar_data']
-        
-        # インデックスとカラムをNumPy配列に変換
-        twa_indices = np.array([float(twa) for twa in polar_data.index])
-        tws_columns = np.array([float(tws) for tws in polar_data.columns])
-        
-        # 結果配列を初期化
-        boat_speeds = np.zeros_like(wind_speeds, dtype=float)
-        
-        # 各ポイントに対して処理
-        for i in range(len(wind_speeds)):
-            ws = wind_speeds[i]
-            wa = angles[i]
-            
-            # 範囲チェック
-            ws = max(min(ws, tws_columns.max()), tws_columns.min())
-            wa = max(min(wa, twa_indices.max()), twa_indices.min())
-            
-            # 最近接点のインデックスを見つける
-            twa_idx = np.abs(twa_indices - wa).argmin()
-            tws_idx = np.abs(tws_columns - ws).argmin()
-            
-            # 4つの最近接点のインデックスを取得
-            twa_lower_idx = np.where(twa_indices <= wa)[0][-1] if np.any(twa_indices <= wa) else 0
-            twa_upper_idx = np.where(twa_indices >= wa)[0][0] if np.any(twa_indices >= wa) else len(twa_indices)-1
-            tws_lower_idx = np.where(tws_columns <= ws)[0][-1] if np.any(tws_columns <= ws) else 0
-            tws_upper_idx = np.where(tws_columns >= ws)[0][0] if np.any(tws_columns >= ws) else len(tws_columns)-1
-            
-            # 同じ点の場合は直接値を使用
-            if twa_lower_idx == twa_upper_idx and tws_lower_idx == tws_upper_idx:
-                boat_speeds[i] = float(polar_data.iloc[twa_lower_idx, tws_lower_idx])
-                continue
-            
-            # 双線形補間のための4点
-            twa_lower = twa_indices[twa_lower_idx]
-            twa_upper = twa_indices[twa_upper_idx]
-            tws_lower = tws_columns[tws_lower_idx]
-            tws_upper = tws_columns[tws_upper_idx]
-            
-            # 双線形補間の重み
-            alpha = (wa - twa_lower) / (twa_upper - twa_lower) if twa_upper != twa_lower else 0
-            beta = (ws - tws_lower) / (tws_upper - tws_lower) if tws_upper != tws_lower else 0
-            
-            # 4点の値
-            v00 = float(polar_data.iloc[twa_lower_idx, tws_lower_idx])
-            v01 = float(polar_data.iloc[twa_lower_idx, tws_upper_idx])
-            v10 = float(polar_data.iloc[twa_upper_idx, tws_lower_idx])
-            v11 = float(polar_data.iloc[twa_upper_idx, tws_upper_idx])
-            
-            # 双線形補間
-            v0 = v00 * (1 - beta) + v01 * beta
-            v1 = v10 * (1 - beta) + v11 * beta
-            boat_speeds[i] = v0 * (1 - alpha) + v1 * alpha
-        
-        return boat_speeds
+        # 事前計算した参照テーブルで一括補間
+        return self._get_polar_table(boat_type).boat_speed(np.asarray(wind_speeds, dtype=float), angles)
     
     def batch_calculate_optimal_vmg(self, boat_type: str, points: np.ndarray, 
                                  target_lat: float, target_lon: float) -> List[Dict[str, Any]]:
@@ -908,19 +1193,71 @@ class OptimalVMGCalculator:
         if self.wind_field is None:
             raise ValueError("風向風速データが設定されていません")
         
-        # 結果を格納するリスト
-        results = []
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        lats, lons = points[:, 0], points[:, 1]
+        polar_table = self._get_polar_table(boat_type)
+        
+        # 各地点の風向風速（グリッド範囲外はNaN）
+        wind_dirs, wind_speeds, wind_confs = self._get_wind_at_positions(lats, lons)
+        inside = np.isfinite(wind_dirs)
+        wind_speeds = np.where(inside, wind_speeds, 0.0)
+        
+        # 目標地点への方位と風向との相対角度
+        target_bearings = initial_bearings(lats, lons, target_lat, target_lon)
+        relative = ((target_bearings - wind_dirs + 180) % 360) - 180
+        abs_relative = np.abs(relative)
+        starboard = relative > 0
+        
+        # 風上・風下・直接（リーチング）の判定と最適TWA
+        is_direct = abs_relative < 45
+        is_downwind = abs_relative > 135
+        is_upwind = ~is_direct & ~is_downwind
+        upwind_twa, _ = polar_table.optimal(wind_speeds, upwind=True)
+        downwind_twa, _ = polar_table.optimal(wind_speeds, upwind=False)
+        optimal_twa = np.where(is_direct, abs_relative, np.where(is_downwind, downwind_twa, upwind_twa))
+        boat_speeds = polar_table.boat_speed(wind_speeds, np.where(inside, optimal_twa, 0.0))
+        
+        # 最適コースと反対タック（ジャイブ）のコース
+        courses = (wind_dirs + np.where(starboard, optimal_twa, -optimal_twa)) % 360
+        opposite_offset = np.where(is_downwind, 180 - optimal_twa, optimal_twa)
+        opposite_courses = (wind_dirs + np.where(starboard == is_downwind, opposite_offset, -opposite_offset)) % 360
+        
+        def course_vmg(course):
+            diff = np.abs(((course - target_bearings + 180) % 360) - 180)
+            return boat_speeds * np.cos(np.radians(diff))
+        
+        vmgs = course_vmg(courses)
+        opposite_vmgs = course_vmg(opposite_courses)
+        tack_needed = ~is_direct & (opposite_vmgs > vmgs)
+        courses = np.where(is_direct, target_bearings, np.where(tack_needed, opposite_courses, courses))
+        vmgs = np.where(is_direct, boat_speeds, np.where(tack_needed, opposite_vmgs, vmgs))
         
-        # 各ポイントに対して計算
-        for point in points:
-            lat, lon = point
-            
-            # 通常のVMG計算を使用
-            result = self.calculate_optimal_vmg(
-                boat_type, lat, lon, target_lat, target_lon
-            )
+        # 距離と到達時間の推定
+        distances = vincenty_distances(lats, lons, np.full(len(lats), target_lat), np.full(len(lons), target_lon))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            etas = np.where(vmgs > 0, distances / (vmgs * 0.51444), 0.0)  # ノットをm/sに変換
+        
+        results = []
+        for i in range(len(points)):
+            if not inside[i]:
+                results.append(None)
+                continue
             
-            results.append(result)
+            results.append({
+                'optimal_course': float(courses[i]),
+                'boat_speed': float(boat_speeds[i]),
+                'vmg': float(vmgs[i]),
+                'is_upwind': bool(is_upwind[i]),
+                'is_direct': bool(is_direct[i]),
+                'tack_needed': bool(tack_needed[i]),
+                'eta_seconds': float(etas[i]),
+                'distance_meters': float(distances[i]),
+                'wind_info': {
+                    'direction': float(wind_dirs[i]),
+                    'speed': float(wind_speeds[i]),
+                    'confidence': float(wind_confs[i])
+                }
+            })
         
         return results
     
@@ -975,6 +1312,51 @@ class OptimalVMGCalculator:
         
         return results
     
+    def _calculate_isochrone_legs(self, boat_type: str, legs: List[Tuple[float, float, float, float]],
+                                use_parallel: bool) -> List[Dict[str, Any]]:
+        """
+        等時線法で各レッグの最短時間パスを計算
+        
+        風の場が時間変化する場合は前のレッグの到達時刻から次のレッグを計算するため逐次処理、
+        固定の風の場の場合はレッグが独立なので max_workers 個のプロセスで並列処理します。
+        
+        Parameters:
+        -----------
+        boat_type : str
+            艇種の識別子
+        legs : List[Tuple[float, float, float, float]]
+            各レッグの (開始緯度, 開始経度, 目標緯度, 目標経度)
+        use_parallel : bool
+            並列処理を使用するか
+            
+        Returns:
+        --------
+        List[Dict[str, Any]]
+            各レッグの最適パス情報
+        """
+        router = self.create_isochrone_router(boat_type)
+        
+        if router.wind_sampler.is_time_varying:
+            results = []
+            elapsed = 0.0
+            for leg in legs:
+                path = router.route(*leg, start_offset=elapsed)
+                elapsed += path['total_time']
+                results.append(path)
+            return results
+        
+        # 使用するCPUコア数
+        num_cores = min(self.config['max_workers'], len(legs))
+        
+        if use_parallel and num_cores > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=num_cores) as executor:
+                    return list(executor.map(partial(route_leg, router), legs))
+            except Exception as e:
+                warnings.warn(f"並列ルート計算に失敗したため逐次処理で計算します: {e}")
+        
+        return [router.route(*leg) for leg in legs]
+    
     # ----- 安全チェックと評価メソッド -----
     
     def get_calculation_quality_report(self) -> Dict[str, Any]:
@@ -1029,6 +1411,7 @@ class OptimalVMGCalculator:
             'available_boat_types': len(self.boat_types),
             'has_wind_field': self.wind_field is not None,
             'vmg_cache_size': len(self.vmg_cache),
+            'vmg_cache': self.vmg_cache.get_stats(),
             'calculation_engine_version': '1.0.0'
         }
         
@@ -1273,6 +1656,60 @@ class OptimalVMGCalculator:
         # 90度未満なら風上、90度以上なら風下と判断
         return relative_angle < 90
     
+    def _compile_boat_data(self, display_name: str, polar_data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        ポーラーデータから艇種データを作成（参照テーブルと最適VMG値を事前計算）
+        
+        Parameters:
+        -----------
+        display_name : str
+            表示名
+        polar_data : pd.DataFrame
+            ポーラーデータ
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            艇種データ
+        """
+        polar_table = PolarTable(polar_data)
+        return {
+            'display_name': display_name,
+            'polar_data': polar_data,
+            'polar_table': polar_table,
+            'upwind_optimal': polar_table.optimal_by_wind_speed(upwind=True),
+            'downwind_optimal': polar_table.optimal_by_wind_speed(upwind=False)
+        }
+    
+    def _get_polar_table(self, boat_type: str) -> PolarTable:
+        """
+        艇種の参照テーブルを取得（外部から登録された艇種は初回参照時に作成）
+        
+        Parameters:
+        -----------
+        boat_type : str
+            艇種の識別子
+            
+        Returns:
+        --------
+        PolarTable
+            参照テーブル
+        """
+        if boat_type not in self.boat_types:
+            raise ValueError(f"未知の艇種: {boat_type}")
+        
+        boat_data = self.boat_types[boat_type]
+        if 'polar_table' not in boat_data:
+            boat_data['polar_table'] = PolarTable(boat_data['polar_data'])
+        return boat_data['polar_table']
+    
+    def _polar_table_for(self, polar_data: pd.DataFrame) -> PolarTable:
+        """ポーラーデータに対応する登録済みの参照テーブル（未登録の場合は作成）"""
+        for boat_data in self.boat_types.values():
+            if boat_data.get('polar_data') is polar_data and 'polar_table' in boat_data:
+                return boat_data['polar_table']
+        return PolarTable(polar_data)
+    
     def _get_optimal_twa(self, boat_type: str, wind_speed: float, 
                        upwind: bool = True) -> Tuple[float, float]:
         """
@@ -1295,41 +1732,9 @@ class OptimalVMGCalculator:
         if boat_type not in self.boat_types:
             raise ValueError(f"未知の艇種: {boat_type}")
         
-        boat_data = self.boat_types[boat_type]
-        optimal_data = boat_data['upwind_optimal'] if upwind else boat_data['downwind_optimal']
-        
-        # 風速値を丸めて最も近い既知の風速を見つける
-        wind_speeds = sorted(optimal_data.keys())
-        if not wind_speeds:
-            # デフォルト値を返す - VMG値も実際の値にする
-            default_angle = 45.0 if upwind else 150.0
-            default_vmg = 3.0  # 適切なデフォルトVMG値
-            return default_angle, default_vmg
-        
-        if wind_speed <= wind_speeds[0]:
-            return optimal_data[wind_speeds[0]]
-        
-        if wind_speed >= wind_speeds[-1]:
-            return optimal_data[wind_speeds[-1]]
-        
-        # 風速を補間
-        for i in range(len(wind_speeds) - 1):
-            if wind_speeds[i] <= wind_speed <= wind_speeds[i + 1]:
-                low_speed = wind_speeds[i]
-                high_speed = wind_speeds[i + 1]
-                
-                low_angle, low_vmg = optimal_data[low_speed]
-                high_angle, high_vmg = optimal_data[high_speed]
-                
-                # 線形補間
-                ratio = (wind_speed - low_speed) / (high_speed - low_speed)
-                angle = low_angle + ratio * (high_angle - low_angle)
-                vmg = low_vmg + ratio * (high_vmg - low_vmg)
-                
-                return angle, vmg
-        
-        # 通常ここには到達しないはず
-        return 45.0 if upwind else 150.0, 0.0
+        # 事前計算した最適VMG角度テーブルを風速で補間
+        angle, vmg = self._get_polar_table(boat_type).optimal(wind_speed, upwind)
+        return float(angle), float(vmg)
     
     def _calculate_optimal_vmg_angles(self, polar_data: pd.DataFrame, 
                                     upwind: bool = True) -> Dict[float, Tuple[float, float]]:
@@ -1348,45 +1753,7 @@ class OptimalVMGCalculator:
         Dict[float, Tuple[float, float]]
             風速 -> (最適風向角, 最大VMG) の辞書
         """
-        result = {}
-        
-        # 各風速に対して最適角度を計算
-        for wind_speed in polar_data.columns:
-            try:
-                wind_speed_float = float(wind_speed)
-            except ValueError:
-                continue  # 風速に変換できない列はスキップ
-            
-            # 角度範囲（風上または風下）
-            angle_range = range(0, 91) if upwind else range(91, 181)
-            
-            max_vmg = -1.0  # 負の値から始めて必ず更新されるようにする
-            optimal_angle = 30.0 if upwind else 140.0  # デフォルト値を設定
-            
-            for angle in angle_range:
-                try:
-                    # その角度の艇速を取得
-                    boat_speed = self._get_value_from_polar(polar_data, angle, wind_speed_float)
-                    
-                    # VMGを計算
-                    vmg = boat_speed * math.cos(math.radians(angle)) if upwind else boat_speed * math.cos(math.radians(180 - angle))
-                    
-                    if vmg > max_vmg:
-                        max_vmg = vmg
-                        optimal_angle = angle
-                except Exception as e:
-                    # エラーが発生した場合はログに記録
-                    print(f"VMG計算エラー - 角度: {angle}, 風速: {wind_speed_float}, エラー: {str(e)}")
-                    continue
-            
-            # VMGが計算できなかった場合はデフォルト値を設定
-            if max_vmg < 0:
-                max_vmg = 1.0  # 適切なデフォルト値
-                print(f"警告: 風速{wind_speed_float}における最適VMGが計算できませんでした。デフォルト値を使用します。")
-            
-            result[wind_speed_float] = (optimal_angle, max_vmg)
-        
-        return result
+        return self._polar_table_for(polar_data).optimal_by_wind_speed(upwind)
     
     def _get_value_from_polar(self, polar_data: pd.DataFrame, angle: float, 
                             wind_speed: float) -> float:
@@ -1407,106 +1774,7 @@ class OptimalVMGCalculator:
         float
             艇速（ノット）
         """
-        # インデックスに角度が含まれているか確認
-        angle_found = False
-        for idx in polar_data.index:
-            try:
-                if float(idx) == angle:
-                    angle_found = True
-                    break
-            except:
-                continue
-                
-        if angle_found:
-            # 該当する角度が見つかった場合
-            wind_col = str(wind_speed)
-            if wind_col in polar_data.columns:
-                return float(polar_data.loc[angle, wind_col])
-            else:
-                # 風速列が見つからない場合は補間
-                cols = sorted([float(col) for col in polar_data.columns])
-                for i in range(len(cols) - 1):
-                    if cols[i] <= wind_speed <= cols[i + 1]:
-                        ratio = (wind_speed - cols[i]) / (cols[i + 1] - cols[i])
-                        v1 = float(polar_data.loc[angle, str(cols[i])])
-                        v2 = float(polar_data.loc[angle, str(cols[i + 1])])
-                        return v1 + ratio * (v2 - v1)
-                
-                # 範囲外の場合は最も近い値を使用
-                if wind_speed < cols[0]:
-                    return float(polar_data.loc[angle, str(cols[0])])
-                else:
-                    return float(polar_data.loc[angle, str(cols[-1])])
-        
-        # 角度も補間する必要がある場合
-        angles = sorted([float(ang) for ang in polar_data.index])
-        
-        # 最も近い2つの角度インデックスを見つける
-        ang_lower = None
-        ang_upper = None
-        
-        for i in range(len(angles) - 1):
-            if angles[i] <= angle <= angles[i + 1]:
-                ang_lower = angles[i]
-                ang_upper = angles[i + 1]
-                break
-        
-        # 範囲外の場合
-        if ang_lower is None or ang_upper is None:
-            if angle < angles[0]:
-                ang_lower = ang_upper = angles[0]
-            else:
-                ang_lower = ang_upper = angles[-1]
-        
-        # 該当する風速列を見つける
-        cols = sorted([float(col) for col in polar_data.columns])
-        ws_lower = None
-        ws_upper = None
-        
-        for i in range(len(cols) - 1):
-            if cols[i] <= wind_speed <= cols[i + 1]:
-                ws_lower = cols[i]
-                ws_upper = cols[i + 1]
-                break
-        
-        # 範囲外の場合
-        if ws_lower is None or ws_upper is None:
-            if wind_speed < cols[0]:
-                ws_lower = ws_upper = cols[0]
-            else:
-                ws_lower = ws_upper = cols[-1]
-        
-        # 4点の値を取得
-        try:
-            v00 = float(polar_data.loc[ang_lower, str(ws_lower)])
-            v01 = float(polar_data.loc[ang_lower, str(ws_upper)])
-            v10 = float(polar_data.loc[ang_upper, str(ws_lower)])
-            v11 = float(polar_data.loc[ang_upper, str(ws_upper)])
-            
-            # 双線形補間
-            if ang_lower == ang_upper:
-                # 角度の補間不要
-                if ws_lower == ws_upper:
-                    return v00
-                else:
-                    ratio = (wind_speed - ws_lower) / (ws_upper - ws_lower)
-                    return v00 + ratio * (v01 - v00)
-            elif ws_lower == ws_upper:
-                # 風速の補間不要
-                ratio = (angle - ang_lower) / (ang_upper - ang_lower)
-                return v00 + ratio * (v10 - v00)
-            else:
-                # 双線形補間
-                ratio_ang = (angle - ang_lower) / (ang_upper - ang_lower)
-                ratio_ws = (wind_speed - ws_lower) / (ws_upper - ws_lower)
-                
-                v0 = v00 * (1 - ratio_ws) + v01 * ratio_ws
-                v1 = v10 * (1 - ratio_ws) + v11 * ratio_ws
-                
-                return v0 * (1 - ratio_ang) + v1 * ratio_ang
-        except:
-            # 計算に失敗した場合は最も近い値を返す
-            return float(polar_data.loc[angles[0], str(cols[0])])
+        return float(self._polar_table_for(polar_data).boat_speed(wind_speed, angle))
     
     def _interpolate_boat_speed(self, polar_data: pd.DataFrame, 
                               wind_speed: float, wind_angle: float) -> float:
@@ -1527,60 +1795,7 @@ class OptimalVMGCalculator:
         float
             補間された艇速（ノット）
         """
-        try:
-            # ポーラーデータの角度と風速を取得
-            angles = [float(a) for a in polar_data.index]
-            speeds = [float(s) for s in polar_data.columns]
-            
-            # 風向角が範囲外の場合
-            if wind_angle < min(angles):
-                wind_angle = min(angles)
-            elif wind_angle > max(angles):
-                wind_angle = max(angles)
-            
-            # 風速が範囲外の場合
-            if wind_speed < min(speeds):
-                wind_speed = min(speeds)
-            elif wind_speed > max(speeds):
-                wind_speed = max(speeds)
-            
-            # 補間用の4つの点（2x2グリッド）を見つける
-            angle_idx = np.searchsorted(angles, wind_angle)
-            if angle_idx == 0:
-                angle_idx = 1
-            elif angle_idx == len(angles):
-                angle_idx = len(angles) - 1
-                
-            speed_idx = np.searchsorted(speeds, wind_speed)
-            if speed_idx == 0:
-                speed_idx = 1
-            elif speed_idx == len(speeds):
-                speed_idx = len(speeds) - 1
-            
-            # 4点の座標
-            angle_low = angles[angle_idx - 1]
-            angle_high = angles[angle_idx]
-            speed_low = speeds[speed_idx - 1]
-            speed_high = speeds[speed_idx]
-            
-            # 4点の艇速値
-            v11 = float(polar_data.loc[angle_low, str(speed_low)])
-            v12 = float(polar_data.loc[angle_low, str(speed_high)])
-            v21 = float(polar_data.loc[angle_high, str(speed_low)])
-            v22 = float(polar_data.loc[angle_high, str(speed_high)])
-            
-            # 双線形補間
-            angle_ratio = (wind_angle - angle_low) / (angle_high - angle_low)
-            speed_ratio = (wind_speed - speed_low) / (speed_high - speed_low)
-            
-            v1 = v11 * (1 - angle_ratio) + v21 * angle_ratio
-            v2 = v12 * (1 - angle_ratio) + v22 * angle_ratio
-            
-            return v1 * (1 - speed_ratio) + v2 * speed_ratio
-            
-        except Exception as e:
-            # エラーが発生した場合は、より堅牢な方法で補間
-            return self._get_value_from_polar(polar_data, wind_angle, wind_speed)
+        return float(self._polar_table_for(polar_data).boat_speed(wind_speed, wind_angle))
     
     def _get_wind_at_position(self, lat: float, lon: float) -> Optional[Dict[str, float]]:
         """
@@ -1631,6 +1846,46 @@ class OptimalVMGCalculator:
             print(f"風データ取得エラー: {e}")
             return None
     
+    def _get_wind_at_positions(self, lats: np.ndarray,
+                               lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        複数の位置の風向風速を一括取得（最も近いグリッドポイントの値）
+        
+        Parameters:
+        -----------
+        lats, lons : np.ndarray
+            位置の緯度・経度の配列
+            
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            (風向, 風速, 信頼度) - グリッド範囲外の位置はNaN
+        """
+        lat_grid = np.asarray(self.wind_field['lat_grid'], dtype=float)
+        lon_grid = np.asarray(self.wind_field['lon_grid'], dtype=float)
+        wind_directions = np.asarray(self.wind_field['wind_direction'], dtype=float)
+        wind_speeds = np.asarray(self.wind_field['wind_speed'], dtype=float)
+        confidence = np.asarray(self.wind_field.get('confidence', np.ones_like(wind_directions) * 0.8), dtype=float)
+        
+        # グリッド点のKD木は風の場ごとに一度だけ構築
+        if self._wind_grid_index is None or self._wind_grid_index[0] is not self.wind_field:
+            tree = cKDTree(np.column_stack([lat_grid.ravel(), lon_grid.ravel()]))
+            self._wind_grid_index = (self.wind_field, tree)
+        tree = self._wind_grid_index[1]
+        
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        inside = ((lats >= lat_grid.min()) & (lats <= lat_grid.max()) &
+                  (lons >= lon_grid.min()) & (lons <= lon_grid.max()))
+        
+        _, nearest = tree.query(np.column_stack([lats, lons]))
+        nearest = np.minimum(nearest, lat_grid.size - 1)
+        
+        def lookup(values):
+            return np.where(inside, values.ravel()[nearest], np.nan)
+        
+        return lookup(wind_directions), lookup(wind_speeds), lookup(confidence)
+    
     def _calculate_bearing(self, lat1: float, lon1: float, 
                          lat2: float, lon2: float) -> float:
         """
@@ -1801,14 +2056,5 @@ class OptimalVMGCalculator:
                         ws_val = float(ws_str)
                         df.at[angle, ws_str] = max(0.5, ws_val * 0.2 * reduction_factor)
             
-            # 最適VMG値を計算
-            upwind_optimal = self._calculate_optimal_vmg_angles(df, upwind=True)
-            downwind_optimal = self._calculate_optimal_vmg_angles(df, upwind=False)
-            
-            # 艇種データを登録
-            self.boat_types[boat_id] = {
-                'display_name': display_name,
-                'polar_data': df,
-                'upwind_optimal': upwind_optimal,
-                'downwind_optimal': downwind_optimal
-            }
+            # 艇種データを登録（参照テーブルと最適VMG値を事前計算）
+            self.boat_types[boat_id] = self._compile_boat_data(display_name, df)
@@ -18,6 +18,8 @@ from ..data_model import (
     DataContainer, GPSDataContainer, WindDataContainer, 
     cached, memoize
 )
+from ..wind import maneuver_kernel
+from ..utilities.track_kinematics import datetime_nanoseconds
 
 class OptimizedWindEstimator(OriginalWindEstimator):
     """
@@ -100,161 +102,95 @@ class OptimizedWindEstimator(OriginalWindEstimator):
         df_subset.sort_values('timestamp', inplace=True)
         df_subset.reset_index(drop=True, inplace=True)
         
-        # NumPy配列に変換して高速化（メモリ効率のため、一度に一つの配列だけを作成）
-        timestamps = df_subset['timestamp'].values
-        courses = df_subset[course_col].values
-        speeds = df_subset[speed_col].values
-        
-        # 方位の差分を一括計算（ベクトル化）- メモリ効率のために関数を単純化
-        # 角度差分を連続して計算（リストコンプリヘンションを避ける）
-        bearing_changes = np.zeros_like(courses)
-        for i in range(1, len(courses)):
-            # 角度差を計算（-180〜180度の範囲）
-            diff = ((courses[i] - courses[i-1] + 180) % 360) - 180
-            bearing_changes[i] = diff
-        
-        # 速度の変化率を計算（メモリ効率のために最小限の操作）
-        speed_ratios = np.ones_like(speeds)  # 1で初期化（デフォルト値）
-        
-        # 変化率を直接計算（安全なゼロ除算）
-        for i in range(1, len(speeds)):
-            prev_speed = speeds[i-1]
-            if prev_speed > 0.01:  # 除算が安全かチェック
-                speed_ratios[i] = speeds[i] / prev_speed
-            else:
-                speed_ratios[i] = 1.0  # デフォルト値
-        
-        # 極端な値を除外（インプレース操作）
-        speed_ratios[speed_ratios > 5] = 1
+        # NumPy配列に変換して高速化
+        timestamps_ns, _ = datetime_nanoseconds(df_subset['timestamp'])
+        courses = df_subset[course_col].to_numpy(dtype=float)
+        speeds = df_subset[speed_col].to_numpy(dtype=float)
+        n_points = len(courses)
+        
+        # 方位の差分を一括計算（-180〜180度の範囲、先頭は0）
+        bearing_changes = maneuver_kernel.heading_deltas(courses)
+        
+        # 速度の変化率を計算（安全なゼロ除算、極端な値は除外）
+        speed_ratios = np.ones_like(speeds)
+        prev_speeds = speeds[:-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            speed_ratios[1:] = np.where(prev_speeds > 0.01, speeds[1:] / prev_speeds, 1.0)
+            speed_ratios[speed_ratios > 5] = 1
         
         # 小さなウィンドウサイズを使用（パフォーマンス向上）
         window_size = min(self.params.get("maneuver_window_size", 7), 7)
         min_angle_change = self.params.get("min_tack_angle_change", 30)
         
-        # 移動ウィンドウでの方位変化の合計を計算（より効率的に）
-        bearing_change_sum = np.zeros_like(bearing_changes)
+        # 移動ウィンドウでの方位変化の合計を累積和で計算
+        half_window = window_size // 2
+        window_starts, window_ends = maneuver_kernel.window_bounds(n_points, half_window, half_window)
+        bearing_change_sum, _ = maneuver_kernel.window_sums(
+            bearing_changes, window_starts, window_ends, skipna=False
+        )
         
-        # 効率的な移動窓の実装
-        for i in range(len(bearing_changes)):
-            # 小さなウィンドウの端を計算
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(bearing_changes), i + window_size // 2 + 1)
-            
-            # 合計のみを計算
-            window_sum = 0
-            for j in range(start_idx, end_idx):
-                window_sum += bearing_changes[j]
-            
-            bearing_change_sum[i] = window_sum
+        # 方向転換の検出（左右どちらの旋回でも累積変化がmin_angle_changeを超える区間）
+        with np.errstate(invalid='ignore'):
+            starts, ends = maneuver_kernel.flag_segments(np.abs(bearing_change_sum) > min_angle_change)
+        if len(starts) == 0:
+            return pd.DataFrame()
         
-        # 方向転換の検出（累積変化がmin_angle_changeを超える場合）
-        is_maneuver = bearing_change_sum > min_angle_change
+        # 方位変化が最大の地点（絶対値）と速度低下が最大の地点
+        max_change_idx = maneuver_kernel.segment_argmax(np.abs(bearing_changes), starts, ends)
+        min_ratio_idx = maneuver_kernel.segment_argmin(speed_ratios, starts, ends)
+        has_speed_drop = speed_ratios[min_ratio_idx] < 0.9
         
-        # 連続する方向転換を1つのイベントとしてグループ化
-        # メモリ効率のための最適化されたグループ化ロジック
-        maneuver_groups = np.zeros_like(is_maneuver, dtype=np.int32)
-        group_id = 0
+        # 方位変化と速度低下が近接し、速度低下が先の場合は中間点を中心とする
+        speed_drop_first = (
+            has_speed_drop &
+            (np.abs(max_change_idx - min_ratio_idx) <= 5) &
+            (timestamps_ns[max_change_idx] > timestamps_ns[min_ratio_idx])
+        )
+        central_idx = np.where(speed_drop_first, (max_change_idx + min_ratio_idx) // 2, max_change_idx)
         
-        for i in range(1, len(is_maneuver)):
-            if is_maneuver[i] != is_maneuver[i-1]:
-                group_id += 1
-            maneuver_groups[i] = group_id
+        # 端すぎる場合はスキップ（データ不足でエラーになるのを防止）
+        central_idx = central_idx[(central_idx >= 5) & (central_idx < n_points - 5)]
+        if len(central_idx) == 0:
+            return pd.DataFrame()
         
-        # 方向転換グループごとに最適な転換点を見つける
-        maneuver_points = []
+        # 前後のウィンドウ（前後8点）
+        before_start = np.maximum(0, central_idx - 8)
+        before_end = central_idx
+        after_start = central_idx + 1
+        after_end = np.minimum(n_points, central_idx + 9)
         
-        # メモリ効率のための辞書作成を避け、ループを一度だけ実行
-        # マニューバーの位置とタイプを検出
-        for group_id in range(np.max(maneuver_groups) + 1):
-            # 現在のグループの全インデックスを取得
-            indices = np.where((maneuver_groups == group_id) & is_maneuver)[0]
-            
-            if len(indices) == 0:
-                continue
-            
-            # 方位変化が最大の地点（絶対値）
-            max_change_idx = indices[np.argmax(np.abs(bearing_changes[indices]))]
-            
-            # 速度低下の検出（0.9未満のポイントがあるか）
-            speed_drop_indices = indices[speed_ratios[indices] < 0.9]
-            has_speed_drop = len(speed_drop_indices) > 0
-            
-            # 中心インデックスの決定
-            central_idx = max_change_idx
-            
-            if has_speed_drop:
-                # 速度減少の最大ポイント
-                min_ratio_idx = indices[np.argmin(speed_ratios[indices])]
-                
-                # 方位変化と速度変化の両方がある場合の処理
-                idx_diff = abs(max_change_idx - min_ratio_idx)
-                
-                if idx_diff <= 5:  # 近接イベントの場合
-                    t1 = timestamps[max_change_idx]
-                    t2 = timestamps[min_ratio_idx]
-                    
-                    if t1 <= t2:
-                        # 通常は方位変化が先
-                        central_idx = max_change_idx
-                    else:
-                        # 速度低下が先の場合、中間点を選択
-                        central_idx = (max_change_idx + min_ratio_idx) // 2
-            
-            # 端すぎる場合はスキップ（データ不足でエラーになるのを防止）
-            if central_idx < 5 or central_idx >= len(timestamps) - 5:
-                continue
-            
-            # 緯度・経度の取得（必要な時だけDF参照してメモリ効率向上）
-            lat = df_subset.iloc[central_idx]['latitude']
-            lon = df_subset.iloc[central_idx]['longitude']
-            ts = timestamps[central_idx]
-            
-            # 前後のウィンドウ（サイズを小さくして効率化）
-            before_start = max(0, central_idx - 8)
-            before_end = central_idx
-            after_start = central_idx + 1
-            after_end = min(len(timestamps), central_idx + 9)
-            
-            # 前後の平均方位と速度
-            before_bearing = np.mean(courses[before_start:before_end])
-            after_bearing = np.mean(courses[after_start:after_end])
-            bearing_change = self._calculate_angle_difference(after_bearing, before_bearing)
-            
-            speed_before = np.mean(speeds[before_start:before_end])
-            speed_after = np.mean(speeds[after_start:after_end])
-            speed_ratio = speed_after / max(0.1, speed_before)  # 安全な除算
-            
-            # マニューバー時間を計算（値が有効な場合のみ）
-            if after_start < len(timestamps) and before_end > 0 and before_end < len(timestamps):
-                maneuver_duration = (timestamps[after_start] - timestamps[before_end - 1]).total_seconds()
-            else:
-                # 安全なフォールバック
-                maneuver_duration = 0.0
-            
-            # 結果が有効な場合のみ追加
-            if abs(bearing_change) >= min_angle_change:
-                # マニューバーエントリーの作成
-                maneuver_entry = {
-                    'timestamp': ts,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'before_bearing': before_bearing,
-                    'after_bearing': after_bearing,
-                    'bearing_change': bearing_change,
-                    'speed_before': speed_before,
-                    'speed_after': speed_after,
-                    'speed_ratio': speed_ratio,
-                    'maneuver_duration': maneuver_duration,
-                    'maneuver_type': 'unknown'  # 初期値
-                }
-                
-                maneuver_points.append(maneuver_entry)
-        
-        # 結果をデータフレームに変換
-        if not maneuver_points:
-            return pd.DataFrame()  # 空の結果
-            
-        result_df = pd.DataFrame(maneuver_points)
+        # 前後の平均方位（円周平均）と速度
+        before_bearing, _ = maneuver_kernel.window_circular_means(courses, before_start, before_end)
+        after_bearing, _ = maneuver_kernel.window_circular_means(courses, after_start, after_end)
+        bearing_change = maneuver_kernel.angle_difference(after_bearing, before_bearing)
+        
+        speed_before = maneuver_kernel.window_means(speeds, before_start, before_end)
+        speed_after = maneuver_kernel.window_means(speeds, after_start, after_end)
+        speed_ratio = speed_after / np.maximum(0.1, speed_before)  # 安全な除算
+        
+        # マニューバー時間を計算
+        maneuver_duration = (timestamps_ns[after_start] - timestamps_ns[before_end - 1]) / 1e9
+        
+        # 結果が有効な場合のみ追加
+        valid = np.abs(bearing_change) >= min_angle_change
+        if not valid.any():
+            return pd.DataFrame()
+        
+        central_idx = central_idx[valid]
+        central = df_subset.iloc[central_idx].reset_index(drop=True)
+        result_df = pd.DataFrame({
+            'timestamp': central['timestamp'],
+            'latitude': central['latitude'],
+            'longitude': central['longitude'],
+            'before_bearing': before_bearing[valid],
+            'after_bearing': after_bearing[valid],
+            'bearing_change': bearing_change[valid],
+            'speed_before': speed_before[valid],
+            'speed_after': speed_after[valid],
+            'speed_ratio': speed_ratio[valid],
+            'maneuver_duration': maneuver_duration[valid],
+            'maneuver_type': 'unknown'  # 初期値
+        })
         
         # フィルタリング基準を取得
         min_duration = self.params.get("min_maneuver_duration", 1.0)
@@ -369,11 +305,11 @@ class OptimizedWindEstimator(OriginalWindEstimator):
         
         # 各マニューバーを分類（ベクトル化）
         # 風向に対する相対角度を計算（ベクトル化）
-        result_df['before_rel_wind'] = result_df['before_bearing'].apply(
-            lambda bearing: self._calculate_angle_difference(bearing, wind_direction)
+        result_df['before_rel_wind'] = maneuver_kernel.angle_difference(
+            result_df['before_bearing'].to_numpy(dtype=float), wind_direction
         )
-        result_df['after_rel_wind'] = result_df['after_bearing'].apply(
-            lambda bearing: self._calculate_angle_difference(bearing, wind_direction)
+        result_df['after_rel_wind'] = maneuver_kernel.angle_difference(
+            result_df['after_bearing'].to_numpy(dtype=float), wind_direction
         )
         
         # 風上/風下判定の閾値
@@ -350,14 +350,13 @@ class OptimizedWindFieldFusionSystem(WindFieldFusionSystem):
         """
         風データポイントを融合して風の場を生成（最適化版）
         """
-        if not self.wind_data_points:
+        if len(self.observations) == 0:
             return
         
         # データポイント数の確認と調整（最適化）
-        if len(self.wind_data_points) > self.max_points_per_fusion:
+        if len(self.observations) > self.max_points_per_fusion:
             # データポイントが多すぎる場合、最新のデータを優先
-            sorted_data = sorted(self.wind_data_points, key=lambda x: x['timestamp'])
-            self.wind_data_points = sorted_data[-self.max_points_per_fusion:]
+            self.observations.keep_latest(self.max_points_per_fusion)
         
         # 以降は親クラスの処理を呼び出す
         super().fuse_wind_data()
@@ -421,7 +420,7 @@ class OptimizedWindFieldFusionSystem(WindFieldFusionSystem):
             pass  # psutilが使用できない場合
         
         # データ量に基づく調整
-        data_points_count = len(self.wind_data_points)
+        data_points_count = len(self.observations)
         
         if data_points_count > 500:
             # 大量データでは解像度を下げる
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.project.container_store
+
+GPSデータコンテナの永続化バックエンドを提供するモジュール
+
+データ本体は列指向バイナリ形式（Parquet / Arrow IPC）で保存し、
+コンテナのメタデータはサイドカーJSON（<session_id>.meta.json）に保存します。
+従来のJSON形式（<session_id>.json）の読み込みにも対応します。
+"""
+
+from typing import List, Optional, Union
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+
+import pandas as pd
+
+from sailing_data_processor.data_model.container import GPSDataContainer
+from sailing_data_processor.project.exceptions import ProjectStorageError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# GPSDataContainerの必須カラム（列の射影時にも必ず読み込む）
+REQUIRED_COLUMNS = ['timestamp', 'latitude', 'longitude']
+
+
+def resolve_columns(available: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    読み込むカラムのリストを決定
+
+    必須カラムを先頭に追加し、データに存在しないカラムは除外します。
+
+    Parameters
+    ----------
+    available : List[str]
+        データに存在するカラム
+    columns : Optional[List[str]]
+        要求されたカラム（Noneの場合は全カラム）
+
+    Returns
+    -------
+    Optional[List[str]]
+        読み込むカラム（Noneの場合は全カラム）
+    """
+    if columns is None:
+        return None
+
+    requested = REQUIRED_COLUMNS + [col for col in columns if col not in REQUIRED_COLUMNS]
+    return [col for col in requested if col in available]
+
+
+class ContainerStore:
+    """
+    コンテナ永続化バックエンドの基底クラス
+
+    属性
+    -----
+    name : str
+        バックエンド名
+    extension : str
+        データファイルの拡張子
+    """
+
+    name = 'base'
+    extension = ''
+
+    def data_file(self, directory: Union[str, Path], session_id: str) -> Path:
+        """
+        セッションのデータファイルパスを取得
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            データディレクトリ
+        session_id : str
+            セッションID
+
+        Returns
+        -------
+        Path
+            データファイルのパス
+        """
+        return Path(directory) / f"{session_id}{self.extension}"
+
+    @staticmethod
+    def sidecar_file(data_file: Union[str, Path]) -> Path:
+        """
+        データファイルに対応するメタデータサイドカーのパスを取得
+
+        Parameters
+        ----------
+        data_file : Union[str, Path]
+            データファイルのパス
+
+        Returns
+        -------
+        Path
+            サイドカーファイルのパス
+        """
+        data_file = Path(data_file)
+        return data_file.with_name(f"{data_file.stem}.meta.json")
+
+    def save(self, container: GPSDataContainer, data_file: Union[str, Path]) -> None:
+        """
+        コンテナを保存
+
+        Parameters
+        ----------
+        container : GPSDataContainer
+            保存するコンテナ
+        data_file : Union[str, Path]
+            保存先のデータファイル
+        """
+        raise NotImplementedError
+
+    def load(self, data_file: Union[str, Path],
+             columns: Optional[List[str]] = None) -> GPSDataContainer:
+        """
+        コンテナを読み込み
+
+        Parameters
+        ----------
+        data_file : Union[str, Path]
+            データファイル
+        columns : Optional[List[str]], optional
+            読み込むカラム（必須カラムは常に含む）, by default None（全カラム）
+
+        Returns
+        -------
+        GPSDataContainer
+            読み込まれたコンテナ
+        """
+        raise NotImplementedError
+
+    def delete(self, data_file: Union[str, Path]) -> None:
+        """
+        データファイルとサイドカーを削除
+
+        Parameters
+        ----------
+        data_file : Union[str, Path]
+            データファイル
+        """
+        for path in (Path(data_file), self.sidecar_file(data_file)):
+            if path.exists():
+                path.unlink()
+
+
+class JSONContainerStore(ContainerStore):
+    """
+    従来のJSON形式のバックエンド
+
+    データとメタデータを1つのJSONファイル（GPSDataContainer.to_dict形式）に保存します。
+    """
+
+    name = 'json'
+    extension = '.json'
+
+    def save(self, container: GPSDataContainer, data_file: Union[str, Path]) -> None:
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump(container.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+
+    def load(self, data_file: Union[str, Path],
+             columns: Optional[List[str]] = None) -> GPSDataContainer:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            data_dict = json.load(f)
+
+        if data_dict.get('type') != 'GPSDataContainer':
+            raise ProjectStorageError(f"不正なデータ形式: {data_dict.get('type')}")
+
+        # DataFrameの復元
+        df = pd.DataFrame(data_dict['data'])
+
+        selected = resolve_columns(list(df.columns), columns)
+        if selected is not None:
+            df = df[selected]
+
+        # タイムスタンプの復元
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+        return GPSDataContainer(df, data_dict['metadata'])
+
+
+class ArrowContainerStore(ContainerStore):
+    """
+    列指向バイナリ形式（Parquet / Arrow IPC）のバックエンド
+
+    データ本体は列指向ファイルに、メタデータはサイドカーJSONに保存します。
+    読み込みはメモリマップを使用し、指定したカラムのみを読み込むことができます。
+
+    Parameters
+    ----------
+    file_format : str, optional
+        'parquet' または 'arrow'（Arrow IPCファイル形式）, by default 'parquet'
+    compression : Optional[str], optional
+        圧縮方式, by default 'zstd'（Parquet）/ None（Arrow IPC）
+    """
+
+    FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+    def __init__(self, file_format: str = 'parquet', compression: Optional[str] = 'zstd'):
+        if not PYARROW_AVAILABLE:
+            raise ProjectStorageError("列指向バックエンドには pyarrow が必要です")
+        if file_format not in self.FORMATS:
+            raise ProjectStorageError(f"未対応のファイル形式です: {file_format}")
+
+        self.name = file_format
+        self.extension = self.FORMATS[file_format]
+        self.file_format = file_format
+        self.compression = compression if file_format == 'parquet' else None
+
+    def save(self, container: GPSDataContainer, data_file: Union[str, Path]) -> None:
+        data_file = Path(data_file)
+        df = container.data
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        if self.file_format == 'parquet':
+            pq.write_table(table, data_file, compression=self.compression)
+        else:
+            with pa.OSFile(str(data_file), 'wb') as sink:
+                with pa_ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        sidecar = {
+            'type': container.__class__.__name__,
+            'format': self.file_format,
+            'columns': list(df.columns),
+            'row_count': len(df),
+            'saved_at': datetime.now().isoformat(),
+            'metadata': container.metadata
+        }
+        with open(self.sidecar_file(data_file), 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False, indent=2, default=str)
+
+    def load(self, data_file: Union[str, Path],
+             columns: Optional[List[str]] = None) -> GPSDataContainer:
+        data_file = Path(data_file)
+
+        sidecar_path = self.sidecar_file(data_file)
+        sidecar = {}
+        if sidecar_path.exists():
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+
+        if self.file_format == 'parquet':
+            available = pq.read_schema(data_file).names
+            table = pq.read_table(data_file, columns=resolve_columns(available, columns),
+                                  memory_map=True)
+        else:
+            with pa.memory_map(str(data_file), 'r') as source:
+                table = pa_ipc.open_file(source).read_all()
+            selected = resolve_columns(table.column_names, columns)
+            if selected is not None:
+                table = table.select(selected)
+
+        return GPSDataContainer(table.to_pandas(), sidecar.get('metadata', {}))
+
+
+def create_container_store(backend: Optional[str] = None) -> ContainerStore:
+    """
+    バックエンド名からコンテナストアを作成
+
+    Parameters
+    ----------
+    backend : Optional[str], optional
+        'parquet', 'arrow', 'json' のいずれか, by default None
+        （pyarrowが利用可能なら 'parquet'、そうでなければ 'json'）
+
+    Returns
+    -------
+    ContainerStore
+        コンテナストア
+    """
+    if backend is None:
+        backend = 'parquet' if PYARROW_AVAILABLE else 'json'
+
+    if backend == 'json':
+        return JSONContainerStore()
+    if backend in ArrowContainerStore.FORMATS:
+        return ArrowContainerStore(backend)
+
+    raise ProjectStorageError(f"未対応のコンテナバックエンドです: {backend}")
+
+
+def container_store_for_file(data_file: Union[str, Path]) -> ContainerStore:
+    """
+    データファイルの拡張子から読み込み用のコンテナストアを選択
+
+    Parameters
+    ----------
+    data_file : Union[str, Path]
+        データファイル
+
+    Returns
+    -------
+    ContainerStore
+        コンテナストア
+    """
+    suffix = Path(data_file).suffix.lower()
+    for backend, extension in ArrowContainerStore.FORMATS.items():
+        if suffix == extension:
+            return create_container_store(backend)
+    return JSONContainerStore()
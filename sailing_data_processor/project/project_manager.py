@@ -14,6 +14,8 @@ from pathlib import Path
 import uuid
 
 from sailing_data_processor.data_model.container import GPSDataContainer
+from sailing_data_processor.project.container_store import create_container_store, container_store_for_file
+from sailing_data_processor.search.search_index import SearchIndex
 
 
 class Project:
@@ -458,9 +460,15 @@ class ProjectManager:
         self.state_path = self.base_path / "states"
         self.results_path = self.base_path / "results"
         
+        # コンテナ保存バックエンド（pyarrowが利用可能ならParquet）
+        self.container_store = create_container_store()
+        
         # ディレクトリの作成
         self._create_directories()
         
+        # 検索インデックス（スナップショットとジャーナルから復元）
+        self.search_index = SearchIndex(self.base_path / "search_index.json")
+        
         # プロジェクトとセッションのキャッシュ
         self.projects = {}
         self.sessions = {}
@@ -559,6 +567,19 @@ class ProjectManager:
                         logging.info(f"セッションを読み込みました: {session.name} ({session.session_id})")
                 except Exception as e:
                     logging.error(f"セッションファイルの読み込みに失敗しました {session_file}: {e}")
+        
+        self._sync_search_index()
+    
+    def _sync_search_index(self) -> None:
+        """
+        検索インデックスを読み込んだプロジェクト・セッションと同期
+        
+        変更のあったオブジェクトのみ再登録し、変更があればスナップショットを保存します。
+        """
+        changed = (self.search_index.sync('project', self.projects.values()) +
+                   self.search_index.sync('session', self.sessions.values()))
+        if changed:
+            self.search_index.save()
     
     def create_project(self, name: str, description: str = "", 
                        tags: List[str] = None, metadata: Dict[str, Any] = None) -> Project:
@@ -653,6 +674,7 @@ class ProjectManager:
                 project_file.unlink()
             
             del self.projects[project_id]
+            self.search_index.remove('project', project_id)
             return True
         return False
     
@@ -740,8 +762,8 @@ class ProjectManager:
             
             # 関連するデータファイルの削除
             if delete_data:
-                if session.data_file and Path(session.data_file).exists():
-                    Path(session.data_file).unlink()
+                if session.data_file:
+                    container_store_for_file(session.data_file).delete(session.data_file)
                 if session.state_file and Path(session.state_file).exists():
                     Path(session.state_file).unlink()
             
@@ -757,6 +779,7 @@ class ProjectManager:
                     self._save_project(project)
             
             del self.sessions[session_id]
+            self.search_index.remove('session', session_id)
             return True
         return False
     
@@ -832,12 +855,13 @@ class ProjectManager:
             return False
         
         # データファイルを作成
-        data_file = self.data_path / f"{session_id}.json"
+        data_file = self.container_store.data_file(self.data_path, session_id)
         
         try:
-            # データをJSON形式で保存
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(container.to_dict(), f, ensure_ascii=False, indent=2)
+            # データを保存（以前の形式のファイルが残っていれば削除）
+            self.container_store.save(container, data_file)
+            if session.data_file and Path(session.data_file) != data_file:
+                container_store_for_file(session.data_file).delete(session.data_file)
             
             # セッションにデータファイルを設定
             session.set_data(str(data_file))
@@ -872,25 +896,8 @@ class ProjectManager:
             return None
         
         try:
-            # JSONデータを読み込み
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # データコンテナを再構築
-            from sailing_data_processor.data_model.container import DataContainer, GPSDataContainer
-            
-            if data.get('type') == 'GPSDataContainer':
-                # DataFrameの復元
-                import pandas as pd
-                df = pd.DataFrame(data['data'])
-                
-                # タイムスタンプの復元
-                if 'timestamp' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                
-                return GPSDataContainer(df, data['metadata'])
-            
-            return None
+            # ファイル形式に応じたバックエンドで読み込み
+            return container_store_for_file(data_file).load(data_file)
         except Exception as e:
             print(f"Failed to load container from session: {e}")
             return None
@@ -1169,6 +1176,9 @@ class ProjectManager:
         """
         project_file = self.projects_path / f"{project.project_id}.json"
         
+        # 検索インデックスはメモリ内のキャッシュに合わせて更新
+        self.search_index.index_project(project)
+        
         try:
             with open(project_file, 'w', encoding='utf-8') as f:
                 json.dump(project.to_dict(), f, ensure_ascii=False, indent=2)
@@ -1191,6 +1201,9 @@ class ProjectManager:
         """
         session_file = self.sessions_path / f"{session.session_id}.json"
         
+        # 検索インデックスはメモリ内のキャッシュに合わせて更新
+        self.search_index.index_session(session)
+        
         try:
             with open(session_file, 'w', encoding='utf-8') as f:
                 json.dump(session.to_dict(), f, ensure_ascii=False, indent=2)
@@ -17,6 +17,10 @@ import pandas as pd
 
 from sailing_data_processor.data_model.container import GPSDataContainer
 from sailing_data_processor.project.project_model import Project, Session, AnalysisResult
+from sailing_data_processor.project.container_store import (
+    JSONContainerStore, create_container_store, container_store_for_file, resolve_columns
+)
+from sailing_data_processor.search.search_index import SearchIndex
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -54,9 +58,17 @@ class ProjectStorage:
         セッションのキャッシュ（ID -> Sessionオブジェクト）
     results : Dict[str, AnalysisResult]
         分析結果のキャッシュ（ID -> AnalysisResultオブジェクト）
+    container_store : ContainerStore
+        GPSデータコンテナの保存に使用するバックエンド
+    migrate_json_containers : bool
+        読み込み時に従来のJSON形式のコンテナを現在のバックエンドへ移行するかどうか
+    search_index : SearchIndex
+        プロジェクト・セッション・分析結果の転置インデックス（保存・削除時に更新）
     """
     
-    def __init__(self, base_path: Union[str, Path] = "projects_data"):
+    def __init__(self, base_path: Union[str, Path] = "projects_data",
+                 container_backend: Optional[str] = None,
+                 migrate_json_containers: bool = True):
         """
         プロジェクトストレージの初期化
         
@@ -64,6 +76,11 @@ class ProjectStorage:
         ----------
         base_path : Union[str, Path], optional
             データを保存するベースディレクトリ, by default "projects_data"
+        container_backend : Optional[str], optional
+            コンテナの保存形式（'parquet', 'arrow', 'json'）, by default None
+            （pyarrowが利用可能なら 'parquet'）
+        migrate_json_containers : bool, optional
+            従来のJSON形式のコンテナを読み込み時に移行するかどうか, by default True
         """
         self.base_path = Path(base_path)
         self.projects_path = self.base_path / "projects"
@@ -72,6 +89,13 @@ class ProjectStorage:
         self.data_path = self.base_path / "data"
         self.state_path = self.base_path / "states"
         
+        # コンテナ保存バックエンド
+        self.container_store = create_container_store(container_backend)
+        self.migrate_json_containers = migrate_json_containers
+        
+        # 検索インデックス（スナップショットとジャーナルから復元）
+        self.search_index = SearchIndex(self.base_path / "search_index.json")
+        
         # キャッシュの初期化
         self.projects = {}
         self.sessions = {}
@@ -100,6 +124,19 @@ class ProjectStorage:
         self._load_projects()
         self._load_sessions()
         self._load_results()
+        self._sync_search_index()
+    
+    def _sync_search_index(self) -> None:
+        """
+        検索インデックスを読み込んだデータと同期
+        
+        変更のあったオブジェクトのみ再登録し、変更があればスナップショットを保存します。
+        """
+        changed = (self.search_index.sync('project', self.projects.values()) +
+                   self.search_index.sync('session', self.sessions.values()) +
+                   self.search_index.sync('result', self.results.values()))
+        if changed:
+            self.search_index.save()
     
     def _load_projects(self) -> None:
         """
@@ -175,8 +212,9 @@ class ProjectStorage:
             with open(project_file, 'w', encoding='utf-8') as f:
                 json.dump(project.to_dict(), f, ensure_ascii=False, indent=2)
             
-            # キャッシュを更新
+            # キャッシュと検索インデックスを更新
             self.projects[project.project_id] = project
+            self.search_index.index_project(project)
             
             return True
         except Exception as e:
@@ -203,8 +241,9 @@ class ProjectStorage:
             with open(session_file, 'w', encoding='utf-8') as f:
                 json.dump(session.to_dict(), f, ensure_ascii=False, indent=2)
             
-            # キャッシュを更新
+            # キャッシュと検索インデックスを更新
             self.sessions[session.session_id] = session
+            self.search_index.index_session(session)
             
             return True
         except Exception as e:
@@ -231,8 +270,9 @@ class ProjectStorage:
             with open(result_file, 'w', encoding='utf-8') as f:
                 json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
             
-            # キャッシュを更新
+            # キャッシュと検索インデックスを更新
             self.results[result.result_id] = result
+            self.search_index.index_result(result)
             
             return True
         except Exception as e:
@@ -261,14 +301,26 @@ class ProjectStorage:
             logger.error(f"セッション {session_id} が見つかりません")
             return False
         
-        data_file = self.data_path / f"{session_id}.json"
+        store = self.container_store
+        data_file = store.data_file(self.data_path, session_id)
         
         try:
-            # コンテナデータをJSON形式で保存
-            data_dict = container.to_dict()
+            try:
+                store.save(container, data_file)
+            except Exception as e:
+                if isinstance(store, JSONContainerStore):
+                    raise
+                # 列指向形式に変換できないデータ（混在型の列など）はJSONで保存
+                logger.warning(f"{store.name}形式での保存に失敗したためJSON形式で保存します: {e}")
+                store.delete(data_file)
+                store = JSONContainerStore()
+                data_file = store.data_file(self.data_path, session_id)
+                store.save(container, data_file)
             
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(data_dict, f, ensure_ascii=False, indent=2)
+            # 以前の形式のデータファイルが残っていれば削除
+            previous_file = Path(session.data_file) if session.data_file else None
+            if previous_file and previous_file != data_file:
+                container_store_for_file(previous_file).delete(previous_file)
             
             # セッションにデータファイルへの参照を設定
             session.set_data(str(data_file))
@@ -279,14 +331,20 @@ class ProjectStorage:
             logger.error(f"GPSデータコンテナの保存に失敗しました: {e}")
             return False
     
-    def load_container(self, session_id: str) -> Optional[GPSDataContainer]:
+    def load_container(self, session_id: str,
+                       columns: Optional[List[str]] = None) -> Optional[GPSDataContainer]:
         """
         セッションに関連付けられたGPSデータコンテナを読み込み
         
+        従来のJSON形式で保存されたコンテナは、migrate_json_containers が有効な場合、
+        読み込み時に現在のバックエンドの形式へ移行されます。
+        
         Parameters
         ----------
         session_id : str
             セッションID
+        columns : Optional[List[str]], optional
+            読み込むカラム（timestamp, latitude, longitude は常に含む）, by default None（全カラム）
             
         Returns
         -------
@@ -306,22 +364,20 @@ class ProjectStorage:
             return None
         
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data_dict = json.load(f)
+            store = container_store_for_file(data_file)
             
-            # コンテナの復元
-            if data_dict.get('type') == 'GPSDataContainer':
-                # DataFrameの復元
-                df = pd.DataFrame(data_dict['data'])
-                
-                # タイムスタンプの復元
-                if 'timestamp' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                
-                return GPSDataContainer(df, data_dict['metadata'])
+            if (self.migrate_json_containers and isinstance(store, JSONContainerStore)
+                    and not isinstance(self.container_store, JSONContainerStore)):
+                # 全カラムを読み込んで移行し、必要なカラムのみを返す
+                container = store.load(data_file)
+                if self.save_container(container, session_id):
+                    logger.info(f"セッション {session_id} のデータを{self.container_store.name}形式に移行しました")
+                if columns is not None:
+                    selected = resolve_columns(list(container.data.columns), columns)
+                    container = GPSDataContainer(container.data[selected], container.metadata)
+                return container
             
-            logger.error(f"不正なデータ形式: {data_dict.get('type')}")
-            return None
+            return store.load(data_file, columns=columns)
         except Exception as e:
             logger.error(f"GPSデータコンテナの読み込みに失敗しました: {e}")
             return None
@@ -593,9 +649,10 @@ class ProjectStorage:
             if project_file.exists():
                 project_file.unlink()
             
-            # キャッシュから削除
+            # キャッシュと検索インデックスから削除
             if project_id in self.projects:
                 del self.projects[project_id]
+            self.search_index.remove('project', project_id)
             
             return True
         except Exception as e:
@@ -628,9 +685,7 @@ class ProjectStorage:
             # 関連するデータファイルの削除
             if delete_data:
                 if session.data_file:
-                    data_file = Path(session.data_file)
-                    if data_file.exists():
-                        data_file.unlink()
+                    container_store_for_file(session.data_file).delete(session.data_file)
                 
                 if session.state_file:
                     state_file = Path(session.state_file)
@@ -652,9 +707,10 @@ class ProjectStorage:
                     project.remove_session(session_id)
                     self.save_project(project)
             
-            # キャッシュから削除
+            # キャッシュと検索インデックスから削除
             if session_id in self.sessions:
                 del self.sessions[session_id]
+            self.search_index.remove('session', session_id)
             
             return True
         except Exception as e:
@@ -693,9 +749,10 @@ class ProjectStorage:
                     session.remove_analysis_result(result_id)
                     self.save_session(session)
             
-            # キャッシュから削除
+            # キャッシュと検索インデックスから削除
             if result_id in self.results:
                 del self.results[result_id]
+            self.search_index.remove('result', result_id)
             
             return True
         except Exception as e:
@@ -926,6 +983,7 @@ class ProjectStorage:
         ----------
         query : str, optional
             検索クエリ（セッション名と説明に対して）, by default ""
+            すべてのトークンに一致（英数字は前方一致）するセッションを返します
         tags : List[str], optional
             フィルタリングするタグのリスト, by default None
         categories : List[str], optional
@@ -936,25 +994,12 @@ class ProjectStorage:
         List[Session]
             検索結果のセッションリスト
         """
-        query = query.lower()
-        sessions = self.get_sessions()
-        results = []
-        
-        for session in sessions:
-            # クエリによる検索
-            match_query = (not query) or (
-                query in session.name.lower() or
-                query in session.description.lower()
-            )
-            
-            # タグによるフィルタリング
-            match_tags = (not tags) or all(tag in session.tags for tag in tags)
-            
-            # カテゴリによるフィルタリング
-            match_category = (not categories) or session.category in categories
-            
-            if match_query and match_tags and match_category:
-                results.append(session)
+        hits = self.search_index.search(
+            query or "", kind='session', tags=tags,
+            attributes={'category': categories} if categories else None,
+            fields=['name', 'description'], require_all_terms=True
+        )
+        results = [self.sessions[hit['id']] for hit in hits if hit['id'] in self.sessions]
         
         return sorted(results, key=lambda s: s.name)
     
@@ -1122,40 +1167,13 @@ class ProjectStorage:
         List[Project]
             マッチするプロジェクトのリスト
         """
-        # すべてのプロジェクトを取得
-        all_projects = list(self.projects.values())
-        results = []
-        
         # クエリがなく、タグもない場合はすべてのプロジェクトを返す
         if not query and not tags:
-            return all_projects
-        
-        # クエリで検索
-        if query:
-            query = query.lower()
-            for project in all_projects:
-                # 名前または説明文に部分一致するものを追加
-                project_name = project.name.lower() if project.name else ""
-                project_desc = project.description.lower() if project.description else ""
-                
-                if query in project_name or query in project_desc:
-                    results.append(project)
-        else:
-            # クエリがない場合は全プロジェクトを対象にする
-            results = all_projects
-        
-        # タグで検索
-        if tags:
-            tag_results = []
-            
-            for project in results:
-                # プロジェクトにタグリストがなければ空リストとして扱う
-                project_tags = project.tags if project.tags else []
-                
-                # タグのいずれかが一致する場合に含める
-                if any(tag in project_tags for tag in tags):
-                    tag_results.append(project)
-            
-            results = tag_results
-        
-        return results
+            return list(self.projects.values())
+        
+        # 名前・説明文のトークン一致とタグ（いずれか一致）で検索
+        hits = self.search_index.search(
+            query or "", kind='project', tags=tags, match_all_tags=False,
+            fields=['name', 'description'], require_all_terms=True
+        )
+        return [self.projects[hit['id']] for hit in hits if hit['id'] in self.projects]
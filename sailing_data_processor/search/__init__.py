@@ -4,3 +4,8 @@ sailing_data_processor.search
 
 プロジェクトやセッションの検索機能を提供するモジュール
 """
+
+from sailing_data_processor.search.search_index import SearchIndex, tokenize_text
+from sailing_data_processor.search.search_engine import SearchEngine
+
+__all__ = ['SearchIndex', 'SearchEngine', 'tokenize_text']
@@ -10,6 +10,7 @@ import re
 from datetime import datetime, timedelta
 
 from sailing_data_processor.project.project_model import Project, Session, AnalysisResult
+from sailing_data_processor.search.search_index import SearchIndex, tokenize_text
 
 
 class SearchEngine:
@@ -17,11 +18,19 @@ class SearchEngine:
     検索エンジンクラス
     
     プロジェクト、セッション、分析結果などのデータを検索するための機能を提供します。
+    
+    Parameters
+    ----------
+    index : Optional[SearchIndex], optional
+        転置インデックス, by default None
+        指定した場合、クエリの照合とスコア計算はインデックスで行い、
+        全件に対する部分一致の走査を行いません。
     """
     
-    def __init__(self):
+    def __init__(self, index: Optional[SearchIndex] = None):
         """初期化"""
         self.stopwords = {'の', 'に', 'は', 'を', 'が', 'と', 'で', 'た', 'から'}
+        self.index = index
         
     def tokenize(self, text: str) -> List[str]:
         """
@@ -81,6 +90,26 @@ class SearchEngine:
         
         return score
     
+    def _index_matches(self, kind: str, query: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        インデックスでクエリに一致するドキュメントを取得
+        
+        Parameters
+        ----------
+        kind : str
+            ドキュメントの種類
+        query : str
+            検索クエリ
+            
+        Returns
+        -------
+        Optional[Dict[str, Dict[str, Any]]]
+            ID: 検索ヒットの辞書（インデックスがない場合やクエリが空の場合はNone）
+        """
+        if self.index is None or not tokenize_text(query, for_query=True):
+            return None
+        return {hit['id']: hit for hit in self.index.search(query, kind=kind)}
+    
     def search_projects(self, 
                        projects: List[Project], 
                        query: str, 
@@ -110,7 +139,15 @@ class SearchEngine:
         # クエリをトークン化
         tokens = self.tokenize(query)
         
+        # インデックスがあれば一致するIDのみを対象にする
+        matches = self._index_matches('project', query)
+        if matches is not None:
+            tokens = []  # スコアはインデックスで計算済み
+        
         for project in projects:
+            if matches is not None and project.project_id not in matches:
+                continue
+            
             # 初期スコアは0
             relevance = 0.0
             
@@ -147,6 +184,12 @@ class SearchEngine:
                     if project_date > end_date:
                         continue
             
+            if matches is not None:
+                hit = matches[project.project_id]
+                results.append({'project': project, 'relevance': hit['score'],
+                                'matched_in': hit['matched_in']})
+                continue
+            
             # 検索クエリが空の場合や関連性スコアが0より大きい場合に結果に追加
             if not tokens or relevance > 0:
                 results.append({
@@ -195,7 +238,15 @@ class SearchEngine:
         # クエリをトークン化
         tokens = self.tokenize(query)
         
+        # インデックスがあれば一致するIDのみを対象にする
+        matches = self._index_matches('session', query)
+        if matches is not None:
+            tokens = []  # スコアはインデックスで計算済み
+        
         for session in sessions:
+            if matches is not None and session.session_id not in matches:
+                continue
+            
             # 初期スコアは0
             relevance = 0.0
             
@@ -236,6 +287,12 @@ class SearchEngine:
                     if session_date > end_date:
                         continue
             
+            if matches is not None:
+                hit = matches[session.session_id]
+                results.append({'session': session, 'relevance': hit['score'],
+                                'matched_in': hit['matched_in']})
+                continue
+            
             # 検索クエリが空の場合や関連性スコアが0より大きい場合に結果に追加
             if not tokens or relevance > 0:
                 results.append({
@@ -281,7 +338,15 @@ class SearchEngine:
         # クエリをトークン化
         tokens = self.tokenize(query)
         
+        # インデックスがあれば一致するIDのみを対象にする
+        matches = self._index_matches('result', query)
+        if matches is not None:
+            tokens = []  # スコアはインデックスで計算済み
+        
         for result in results:
+            if matches is not None and result.result_id not in matches:
+                continue
+            
             # 初期スコアは0
             relevance = 0.0
             
@@ -322,6 +387,12 @@ class SearchEngine:
                     if result_date > end_date:
                         continue
             
+            if matches is not None:
+                hit = matches[result.result_id]
+                search_results.append({'result': result, 'relevance': hit['score'],
+                                       'matched_in': hit['matched_in']})
+                continue
+            
             # 検索クエリが空の場合や関連性スコアが0より大きい場合に結果に追加
             if not tokens or relevance > 0:
                 search_results.append({
@@ -0,0 +1,634 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.search.search_index
+
+プロジェクト・セッション・分析結果の永続転置インデックスを提供するモジュール
+
+- 日本語を考慮したトークン化（漢字・かなの連続部分は文字uni-gram/bi-gramに分割）
+- フィールド重み付きのBM25スコアリング
+- タグ・属性（カテゴリ、結果タイプなど）のポスティングと日付の範囲検索
+- 差分ジャーナル（追記型ログ）による永続化と定期的なスナップショットへの圧縮
+"""
+
+from typing import Dict, List, Any, Optional, Union, Set, Iterable, Tuple
+import os
+import re
+import json
+import math
+import bisect
+import logging
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 漢字・ひらがな・カタカナ（々・ー を含む）
+_CJK_CHARS = '\u3005\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff'
+_CJK_RUN = re.compile(f'[{_CJK_CHARS}]+')
+_TOKEN_RUN = re.compile(f'[{_CJK_CHARS}]+|[^{_CJK_CHARS}\\s]+')
+_NON_WORD = re.compile(r'[^\w]|_')
+
+# 検索対象外とする語
+STOPWORDS = {
+    'の', 'に', 'は', 'を', 'が', 'と', 'で', 'た', 'から',
+    'a', 'an', 'the', 'and', 'or', 'of', 'is', 'are', 'to', 'for'
+}
+
+# フィールドごとの重み（SearchEngineの従来の重み付けと同じ）
+FIELD_WEIGHTS = {
+    'name': 2.0,
+    'description': 1.0,
+    'result_type': 1.5,
+    'metadata': 0.5
+}
+
+# 前方一致のみでマッチした語の重み（従来の部分一致スコアに相当）
+PREFIX_MATCH_WEIGHT = 0.5
+
+
+def tokenize_text(text: str, for_query: bool = False) -> List[str]:
+    """
+    日本語を考慮してテキストをトークン化
+
+    英数字は空白・記号で区切った単語、漢字・かなの連続部分は文字bi-gramに分割します。
+    インデックス用には1文字のuni-gramも生成するため、1文字のクエリにも一致します。
+
+    Parameters
+    ----------
+    text : str
+        トークン化するテキスト
+    for_query : bool, optional
+        クエリ用のトークン化かどうか, by default False
+
+    Returns
+    -------
+    List[str]
+        トークンのリスト（重複を含む）
+    """
+    if not text:
+        return []
+
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    text = _NON_WORD.sub(' ', text)
+
+    tokens = []
+    for run in _TOKEN_RUN.findall(text):
+        if run in STOPWORDS:
+            continue
+
+        if not _CJK_RUN.fullmatch(run):
+            tokens.append(run)
+            continue
+
+        if len(run) == 1:
+            tokens.append(run)
+            continue
+
+        if not for_query:
+            tokens.extend(ch for ch in run if ch not in STOPWORDS)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+
+    return tokens
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    """日時（ISO文字列またはdatetime）をUNIX秒に変換"""
+    if value is None or value == '':
+        return None
+    try:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return datetime.fromisoformat(str(value)).timestamp()
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _metadata_text(metadata: Dict[str, Any]) -> str:
+    """メタデータの文字列値を連結"""
+    return ' '.join(value for value in (metadata or {}).values() if isinstance(value, str))
+
+
+class SearchIndex:
+    """
+    永続転置インデックスクラス
+
+    ドキュメントは (種類, ID) で識別され、追加・削除は差分として即座に反映されます。
+    path を指定した場合、変更はジャーナル（<path>.log）に追記され、
+    compact_threshold 件ごとにスナップショット（<path>）へ圧縮されます。
+
+    Parameters
+    ----------
+    path : Optional[Union[str, Path]], optional
+        スナップショットファイルのパス, by default None（メモリ上のみ）
+    k1 : float, optional
+        BM25のパラメータk1, by default 1.2
+    b : float, optional
+        BM25のパラメータb, by default 0.75
+    compact_threshold : int, optional
+        スナップショットへ圧縮するジャーナル件数, by default 1000
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 k1: float = 1.2, b: float = 0.75, compact_threshold: int = 1000):
+        self.path = Path(path) if path else None
+        self.journal_path = self.path.with_name(self.path.name + '.log') if self.path else None
+        self.k1 = k1
+        self.b = b
+        self.compact_threshold = compact_threshold
+
+        self._clear()
+
+        if self.path:
+            self.load()
+
+    def _clear(self) -> None:
+        """インデックスを空にする"""
+        self._documents = {}      # key -> 登録レコード
+        self._postings = {}       # term -> {key: {field: tf}}
+        self._doc_terms = {}      # key -> set(term)
+        self._doc_lengths = {}    # key -> 重み付き文書長
+        self._total_length = 0.0
+        self._kinds = {}          # kind -> set(key)
+        self._tags = {}           # tag -> set(key)
+        self._attributes = {}     # (name, value) -> set(key)
+        self._dates = []          # [(timestamp, key)] 昇順
+        self._vocabulary = []     # 前方一致用のソート済み語彙
+        self._journal_count = 0
+
+    @staticmethod
+    def _key(kind: str, doc_id: str) -> str:
+        return f"{kind}:{doc_id}"
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, item: Tuple[str, str]) -> bool:
+        kind, doc_id = item
+        return self._key(kind, doc_id) in self._documents
+
+    def ids(self, kind: str) -> Set[str]:
+        """
+        指定した種類のドキュメントIDを取得
+
+        Parameters
+        ----------
+        kind : str
+            ドキュメントの種類
+
+        Returns
+        -------
+        Set[str]
+            ドキュメントIDの集合
+        """
+        prefix_len = len(kind) + 1
+        return {key[prefix_len:] for key in self._kinds.get(kind, set())}
+
+    def get_record(self, kind: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """登録済みのレコードを取得"""
+        return self._documents.get(self._key(kind, doc_id))
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+
+    def add(self, kind: str, doc_id: str, fields: Dict[str, str],
+            tags: Optional[Iterable[str]] = None, date: Any = None,
+            attributes: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        ドキュメントを追加（既存の場合は置き換え）
+
+        Parameters
+        ----------
+        kind : str
+            ドキュメントの種類（'project', 'session', 'result' など）
+        doc_id : str
+            ドキュメントID
+        fields : Dict[str, str]
+            フィールド名 -> テキスト
+        tags : Optional[Iterable[str]], optional
+            タグ, by default None
+        date : Any, optional
+            日付（ISO文字列またはdatetime）, by default None
+        attributes : Optional[Dict[str, Any]], optional
+            完全一致でフィルタする属性, by default None
+
+        Returns
+        -------
+        bool
+            インデックスが変更された場合True
+        """
+        record = {
+            'kind': kind,
+            'id': doc_id,
+            'fields': {name: text or '' for name, text in fields.items()},
+            'tags': sorted(set(tags or [])),
+            'date': date.isoformat() if isinstance(date, datetime) else date,
+            'attributes': {name: value for name, value in (attributes or {}).items() if value is not None}
+        }
+
+        if self._documents.get(self._key(kind, doc_id)) == record:
+            return False
+
+        self._apply_add(record)
+        self._journal({'op': 'add', 'record': record})
+        return True
+
+    def remove(self, kind: str, doc_id: str) -> bool:
+        """
+        ドキュメントを削除
+
+        Parameters
+        ----------
+        kind : str
+            ドキュメントの種類
+        doc_id : str
+            ドキュメントID
+
+        Returns
+        -------
+        bool
+            削除した場合True
+        """
+        if not self._apply_remove(self._key(kind, doc_id)):
+            return False
+        self._journal({'op': 'remove', 'kind': kind, 'id': doc_id})
+        return True
+
+    def _apply_add(self, record: Dict[str, Any]) -> None:
+        key = self._key(record['kind'], record['id'])
+        self._apply_remove(key)
+
+        self._documents[key] = record
+        self._kinds.setdefault(record['kind'], set()).add(key)
+
+        length = 0.0
+        terms = set()
+        for field, text in record['fields'].items():
+            tokens = tokenize_text(text)
+            length += FIELD_WEIGHTS.get(field, 1.0) * len(tokens)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                field_counts = postings.setdefault(key, {})
+                field_counts[field] = field_counts.get(field, 0) + 1
+                terms.add(token)
+
+        self._doc_terms[key] = terms
+        self._doc_lengths[key] = length
+        self._total_length += length
+
+        for tag in record['tags']:
+            self._tags.setdefault(tag, set()).add(key)
+        for name, value in record['attributes'].items():
+            self._attributes.setdefault((name, value), set()).add(key)
+
+        timestamp = _to_timestamp(record['date'])
+        if timestamp is not None:
+            bisect.insort(self._dates, (timestamp, key))
+
+    def _apply_remove(self, key: str) -> bool:
+        record = self._documents.pop(key, None)
+        if record is None:
+            return False
+
+        self._kinds[record['kind']].discard(key)
+
+        for term in self._doc_terms.pop(key, set()):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                index = bisect.bisect_left(self._vocabulary, term)
+                if index < len(self._vocabulary) and self._vocabulary[index] == term:
+                    del self._vocabulary[index]
+
+        self._total_length -= self._doc_lengths.pop(key, 0.0)
+
+        for tag in record['tags']:
+            self._discard(self._tags, tag, key)
+        for name, value in record['attributes'].items():
+            self._discard(self._attributes, (name, value), key)
+
+        timestamp = _to_timestamp(record['date'])
+        if timestamp is not None:
+            index = bisect.bisect_left(self._dates, (timestamp, key))
+            if index < len(self._dates) and self._dates[index] == (timestamp, key):
+                del self._dates[index]
+
+        return True
+
+    @staticmethod
+    def _discard(mapping: Dict[Any, Set[str]], name: Any, key: str) -> None:
+        keys = mapping.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del mapping[name]
+
+    # ------------------------------------------------------------------
+    # モデルオブジェクトの登録
+    # ------------------------------------------------------------------
+
+    def index_project(self, project: Any) -> bool:
+        """プロジェクトを登録"""
+        return self.add('project', project.project_id, {
+            'name': project.name,
+            'description': project.description,
+            'metadata': _metadata_text(project.metadata)
+        }, tags=project.tags, date=project.created_at,
+            attributes={'category': getattr(project, 'category', None)})
+
+    def index_session(self, session: Any) -> bool:
+        """セッションを登録（日付はイベント日、なければ作成日）"""
+        event_date = session.metadata.get('event_date') if session.metadata else None
+        date = event_date if _to_timestamp(event_date) is not None else session.created_at
+        return self.add('session', session.session_id, {
+            'name': session.name,
+            'description': session.description,
+            'metadata': _metadata_text(session.metadata)
+        }, tags=session.tags, date=date,
+            attributes={'category': getattr(session, 'category', None),
+                        'status': getattr(session, 'status', None)})
+
+    def index_result(self, result: Any) -> bool:
+        """分析結果を登録"""
+        return self.add('result', result.result_id, {
+            'name': result.name,
+            'description': result.description,
+            'result_type': result.result_type,
+            'metadata': _metadata_text(result.metadata)
+        }, tags=getattr(result, 'tags', None), date=result.created_at,
+            attributes={'result_type': result.result_type,
+                        'session_id': getattr(result, 'session_id', None)})
+
+    def sync(self, kind: str, objects: Iterable[Any]) -> int:
+        """
+        指定した種類のドキュメントをオブジェクト一覧と同期
+
+        変更のあったオブジェクトのみ再登録し、存在しないドキュメントは削除します。
+
+        Parameters
+        ----------
+        kind : str
+            'project', 'session', 'result' のいずれか
+        objects : Iterable[Any]
+            現在のオブジェクト一覧
+
+        Returns
+        -------
+        int
+            変更されたドキュメント数
+        """
+        indexer = {'project': self.index_project,
+                   'session': self.index_session,
+                   'result': self.index_result}[kind]
+        id_attr = {'project': 'project_id', 'session': 'session_id', 'result': 'result_id'}[kind]
+
+        changed = 0
+        current = set()
+        for obj in objects:
+            current.add(getattr(obj, id_attr))
+            if indexer(obj):
+                changed += 1
+
+        for doc_id in self.ids(kind) - current:
+            self.remove(kind, doc_id)
+            changed += 1
+
+        return changed
+
+    # ------------------------------------------------------------------
+    # 検索
+    # ------------------------------------------------------------------
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        """クエリトークンを (語, 重み) のリストに展開"""
+        expansions = []
+        if token in self._postings:
+            expansions.append((token, 1.0))
+
+        if prefix and len(token) >= 2 and not _CJK_RUN.fullmatch(token):
+            start = bisect.bisect_right(self._vocabulary, token)
+            for term in self._vocabulary[start:start + 100]:
+                if not term.startswith(token):
+                    break
+                expansions.append((term, PREFIX_MATCH_WEIGHT))
+
+        return expansions
+
+    def _filter_candidates(self, kind: Optional[str], tags: Optional[List[str]], match_all_tags: bool,
+                           date_range: Optional[Dict[str, Any]],
+                           attributes: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """フィルタ条件に一致するキー集合を取得（条件がなければNone）"""
+        candidates = None
+
+        def intersect(keys: Set[str]) -> None:
+            nonlocal candidates
+            candidates = set(keys) if candidates is None else candidates & keys
+
+        if kind is not None:
+            intersect(self._kinds.get(kind, set()))
+
+        if tags:
+            tag_sets = [self._tags.get(tag, set()) for tag in tags]
+            if match_all_tags:
+                for keys in sorted(tag_sets, key=len):
+                    intersect(keys)
+            else:
+                intersect(set().union(*tag_sets))
+
+        for name, values in (attributes or {}).items():
+            if values is None:
+                continue
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            intersect(set().union(*(self._attributes.get((name, value), set()) for value in values)))
+
+        if date_range:
+            start = _to_timestamp(date_range.get('start'))
+            end = _to_timestamp(date_range.get('end'))
+            low = 0 if start is None else bisect.bisect_left(self._dates, (start, ''))
+            high = len(self._dates) if end is None else bisect.bisect_right(self._dates, (end, '\uffff'))
+            intersect({key for _, key in self._dates[low:high]})
+
+        return candidates
+
+    def search(self, query: str = '', kind: Optional[str] = None,
+               tags: Optional[List[str]] = None, match_all_tags: bool = True,
+               date_range: Optional[Dict[str, Any]] = None,
+               attributes: Optional[Dict[str, Any]] = None,
+               fields: Optional[List[str]] = None,
+               require_all_terms: bool = False, prefix: bool = True,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        インデックスを検索
+
+        Parameters
+        ----------
+        query : str, optional
+            検索クエリ, by default ''（フィルタ条件のみ）
+        kind : Optional[str], optional
+            ドキュメントの種類, by default None（すべて）
+        tags : Optional[List[str]], optional
+            タグによるフィルタ, by default None
+        match_all_tags : bool, optional
+            すべてのタグを含むものに限定するか（Falseの場合はいずれか）, by default True
+        date_range : Optional[Dict[str, Any]], optional
+            日付範囲（'start'と'end'のキーを持つ辞書）, by default None
+        attributes : Optional[Dict[str, Any]], optional
+            属性によるフィルタ（値のリストはいずれかに一致）, by default None
+        fields : Optional[List[str]], optional
+            クエリを照合するフィールド, by default None（すべて）
+        require_all_terms : bool, optional
+            すべてのクエリトークンに一致するものに限定するか, by default False
+        prefix : bool, optional
+            英数字トークンの前方一致を許可するか, by default True
+        limit : Optional[int], optional
+            返す件数の上限, by default None
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            'kind', 'id', 'score', 'matched_in' を含む辞書のリスト（スコア降順）
+        """
+        candidates = self._filter_candidates(kind, tags, match_all_tags, date_range, attributes)
+        tokens = list(dict.fromkeys(tokenize_text(query, for_query=True)))
+
+        if not tokens:
+            keys = candidates if candidates is not None else set(self._documents)
+            hits = [self._hit(key, 0.0, {}) for key in sorted(keys)]
+            return hits[:limit] if limit is not None else hits
+
+        n_docs = max(len(self._documents), 1)
+        avg_length = (self._total_length / n_docs) or 1.0
+        field_filter = set(fields) if fields else None
+
+        scores = {}
+        matched_fields = {}
+        matched_tokens = {}
+
+        for token in tokens:
+            token_scores = {}
+            for term, weight in self._expand(token, prefix):
+                postings = self._postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+
+                for key, field_counts in postings.items():
+                    if candidates is not None and key not in candidates:
+                        continue
+
+                    tf = 0.0
+                    for field, count in field_counts.items():
+                        if field_filter is None or field in field_filter:
+                            tf += FIELD_WEIGHTS.get(field, 1.0) * count
+                            matched_fields.setdefault(key, set()).add(field)
+                    if tf == 0.0:
+                        continue
+
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                    score = weight * idf * tf * (self.k1 + 1) / (tf + norm)
+                    if score > token_scores.get(key, 0.0):
+                        token_scores[key] = score
+
+            for key, score in token_scores.items():
+                scores[key] = scores.get(key, 0.0) + score
+                matched_tokens[key] = matched_tokens.get(key, 0) + 1
+
+        if require_all_terms:
+            scores = {key: score for key, score in scores.items() if matched_tokens[key] == len(tokens)}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        return [self._hit(key, score, matched_fields.get(key, set())) for key, score in ranked]
+
+    def _hit(self, key: str, score: float, fields: Set[str]) -> Dict[str, Any]:
+        record = self._documents[key]
+        return {
+            'kind': record['kind'],
+            'id': record['id'],
+            'score': score,
+            'matched_in': {field: field in fields for field in record['fields']}
+        }
+
+    # ------------------------------------------------------------------
+    # 永続化
+    # ------------------------------------------------------------------
+
+    def _journal(self, entry: Dict[str, Any]) -> None:
+        if not self.journal_path:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._journal_count += 1
+            if self._journal_count >= self.compact_threshold:
+                self.save()
+        except OSError as e:
+            logger.error(f"検索インデックスのジャーナル書き込みに失敗しました: {e}")
+
+    def save(self) -> bool:
+        """
+        スナップショットを保存し、ジャーナルを空にする
+
+        Returns
+        -------
+        bool
+            保存に成功した場合True
+        """
+        if not self.path:
+            return False
+
+        try:
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'documents': list(self._documents.values())}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_count = 0
+            return True
+        except OSError as e:
+            logger.error(f"検索インデックスの保存に失敗しました: {e}")
+            return False
+
+    def load(self) -> None:
+        """スナップショットとジャーナルからインデックスを復元"""
+        self._clear()
+        if not self.path:
+            return
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                for record in snapshot.get('documents', []):
+                    self._apply_add(record)
+            except (OSError, ValueError) as e:
+                logger.error(f"検索インデックスの読み込みに失敗しました: {e}")
+                self._clear()
+
+        if self.journal_path.exists():
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # 書き込み途中で中断された行は無視
+                            continue
+                        if entry.get('op') == 'add':
+                            self._apply_add(entry['record'])
+                        elif entry.get('op') == 'remove':
+                            self._apply_remove(self._key(entry['kind'], entry['id']))
+                        self._journal_count += 1
+            except OSError as e:
+                logger.error(f"検索インデックスのジャーナル読み込みに失敗しました: {e}")
@@ -1160,6 +1160,26 @@ class SessionManager:
         if not self.project_manager:
             return []
         
+        # 検索インデックスがあれば、クエリ・タグ・日付範囲はインデックスで絞り込む
+        search_index = getattr(self.project_manager, 'search_index', None)
+        if search_index is not None:
+            hits = search_index.search(
+                query or "", kind='session', tags=tags,
+                date_range={'start': start_date, 'end': end_date} if (start_date or end_date) else None,
+                fields=['name', 'description'], require_all_terms=True
+            )
+            session_ids = [hit['id'] for hit in hits]
+            if not location:
+                return session_ids
+            
+            matching_sessions = []
+            for session_id in session_ids:
+                session = self.project_manager.get_session(session_id)
+                session_location = session.metadata.get("location", "") if session else ""
+                if location.lower() in session_location.lower():
+                    matching_sessions.append(session_id)
+            return matching_sessions
+        
         all_sessions = self.project_manager.get_all_sessions()
         matching_sessions = []
         
@@ -18,6 +18,9 @@ from functools import lru_cache
 # 内部モジュールのインポート
 from sailing_data_processor.strategy.strategy_detector_with_propagation import StrategyDetectorWithPropagation
 from sailing_data_processor.strategy.points import StrategyPoint, WindShiftPoint, TackPoint, LaylinePoint
+from sailing_data_processor.strategy.point_deduplication import (
+    deduplicate_shift_points, deduplicate_tack_points, deduplicate_laylines
+)
 from sailing_data_processor.optimized_wind_field_fusion_system import OptimizedWindFieldFusionSystem
 
 class OptimizedStrategyDetector(StrategyDetectorWithPropagation):
@@ -288,53 +291,20 @@ class OptimizedStrategyDetector(StrategyDetectorWithPropagation):
         if len(shift_points) <= 1:
             return shift_points
         
-        # 最適化: 空間インデックスを使用して検索を高速化
+        # 最適化: 時間窓と空間ハッシュで近傍のポイントのみ比較
         if self.optimization_config['batch_processing']:
             return self._batch_filter_duplicate_points(shift_points)
         
-        # 通常のフィルタリング処理（個別比較）
-        filtered_points = []
-        sorted_points = sorted(shift_points, key=lambda p: self._normalize_to_timestamp(p.time_estimate))
-        
-        for point in sorted_points:
-            is_duplicate = False
-            
-            for existing in filtered_points:
-                # 位置的に近いか（300m以内）
-                position_close = self._calculate_distance(
-                    point.position[0], point.position[1],
-                    existing.position[0], existing.position[1]
-                ) < 300
-                
-                # 時間的に近いか（5分以内）
-                time_diff = self._get_time_difference_seconds(point.time_estimate, existing.time_estimate)
-                time_close = time_diff < 300
-                
-                # シフト角度が類似しているか（15度以内）
-                angle_similar = abs(self._calculate_angle_difference(
-                    point.shift_angle, existing.shift_angle
-                )) < 15
-                
-                # 重複条件
-                if position_close and time_close and angle_similar:
-                    # 信頼度が高い方を保持
-                    if point.shift_probability > existing.shift_probability:
-                        # 既存ポイントを置き換え
-                        filtered_points.remove(existing)
-                        filtered_points.append(point)
-                    
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_points.append(point)
-        
-        return filtered_points
+        # 親クラスの実装を使用
+        return super()._filter_duplicate_shift_points(shift_points)
     
     def _batch_filter_duplicate_points(self, points: List[Union[WindShiftPoint, TackPoint, LaylinePoint]]) -> List[Union[WindShiftPoint, TackPoint, LaylinePoint]]:
         """
         ポイントをバッチ処理でフィルタリング（高速化版）
         
+        重複の判定と残すポイントは親クラス（StrategyDetectorWithPropagation）の
+        貪欲法と同じで、バッチ処理の有無によって結果は変わりません。
+        
         Parameters:
         -----------
         points : List[Union[WindShiftPoint, TackPoint, LaylinePoint]]
@@ -348,94 +318,18 @@ class OptimizedStrategyDetector(StrategyDetectorWithPropagation):
         if len(points) <= 1:
             return points
         
-        # ポイントの種類を判断
+        # 判定条件は親クラスの貪欲法と共通（距離計算と時刻の変換はキャッシュ付きの実装を使用）
         point_type = type(points[0])
-        
-        # バッチ処理のためのNumPy配列を準備
-        positions = np.array([(p.position[0], p.position[1]) for p in points])
-        timestamps = np.array([self._normalize_to_timestamp(p.time_estimate) for p in points])
-        
-        # ポイント種類に応じた特徴量を取得
         if point_type == WindShiftPoint:
-            features = np.array([p.shift_angle for p in points])
-            qualities = np.array([p.shift_probability for p in points])
-            feature_thresh = 15  # 角度差15度以内は類似
-            
+            return deduplicate_shift_points(points, time_of=self._normalize_to_timestamp,
+                                            distance=self._calculate_distance)
         elif point_type == TackPoint:
-            features = np.array([p.vmg_gain for p in points])
-            qualities = np.array([p.vmg_gain for p in points])
-            feature_thresh = 0.05  # VMG利得の差5%以内は類似
-            
+            return deduplicate_tack_points(points, distance=self._calculate_distance)
         elif point_type == LaylinePoint:
-            features = np.array([p.mark_distance for p in points])
-            qualities = np.array([p.confidence for p in points])
-            feature_thresh = 100  # 距離差100m以内は類似
-            
-        else:
-            # 未知のポイント型は通常処理で
-            return self._filter_duplicate_shift_points(points)
-        
-        # グループ分けの結果（各ポイントの所属グループID）
-        group_ids = np.zeros(len(points), dtype=int)
-        next_group_id = 1
-        
-        # すべてのポイントをグループ化
-        for i in range(len(points)):
-            # すでにグループ割り当て済みならスキップ
-            if group_ids[i] > 0:
-                continue
-            
-            # このポイントの新しいグループを作成
-            group_ids[i] = next_group_id
-            
-            # このポイントと近いポイントを同じグループに
-            for j in range(i + 1, len(points)):
-                if group_ids[j] > 0:
-                    continue
-                
-                # 位置的に近いか
-                lat1, lon1 = positions[i]
-                lat2, lon2 = positions[j]
-                
-                # 距離計算の高速化（キャッシュ使用）
-                cache_key = (lat1, lon1, lat2, lon2)
-                if cache_key in self.distance_cache:
-                    distance = self.distance_cache[cache_key]
-                else:
-                    distance = self._calculate_distance(lat1, lon1, lat2, lon2)
-                    self.distance_cache[cache_key] = distance
-                
-                position_close = distance < 300
-                
-                # 時間的に近いか
-                time_diff = abs(timestamps[i] - timestamps[j])
-                time_close = time_diff < 300  # 5分以内
-                
-                # 特徴量が類似しているか
-                feature_diff = abs(features[i] - features[j])
-                feature_similar = feature_diff < feature_thresh
-                
-                # 重複条件に合致する場合、同じグループに割り当て
-                if position_close and (time_close or feature_similar):
-                    group_ids[j] = next_group_id
-            
-            # 次のグループIDを準備
-            next_group_id += 1
-        
-        # 各グループから最高品質のポイントを選択
-        filtered_points = []
-        
-        for group_id in range(1, next_group_id):
-            group_indices = np.where(group_ids == group_id)[0]
-            
-            if len(group_indices) == 0:
-                continue
-            
-            # グループ内で最高品質のポイントを選択
-            best_idx = group_indices[np.argmax(qualities[group_indices])]
-            filtered_points.append(points[best_idx])
+            return deduplicate_laylines(points, distance=self._calculate_distance)
         
-        return filtered_points
+        # 未知のポイント型はそのまま返す
+        return list(points)
     
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+戦略ポイントの重複除去エンジン
+
+ポイントを時間窓と空間ハッシュのセルでバケットに分け、各ポイントは近傍のバケットに
+残っているポイントとだけ比較します。判定は従来の貪欲法（残したポイントを先頭から順に比較し、
+最初に重複と判定されたポイントについて品質の高い方を残す。置き換えたポイントはリストの末尾に移る）
+と同じで、比較の回数だけを減らします。
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from sailing_data_processor.strategy.strategy_detector_utils import (
+    normalize_to_timestamp, angle_difference, calculate_distance
+)
+
+# 緯度1度あたりの距離（メートル）
+METERS_PER_DEGREE = 6371000 * math.pi / 180
+
+
+class SpatialHashDeduplicator:
+    """
+    時間窓と空間ハッシュのセルによる近傍比較で重複を除去する
+
+    セルの大きさは判定距離以上に取るため、判定距離以内のポイントは必ず隣接する
+    3x3のセル（時間窓を使う場合は前後の時間窓を含む3x3x3のバケット）に含まれます。
+    位置や時刻が欠損したポイントはどのポイントとも比較されません（従来の判定でも距離・時間差がNaNになり重複とならない）。
+
+    Parameters:
+    -----------
+    radius : float
+        重複とみなす最大距離（メートル）
+    time_window : float, optional
+        重複とみなす最大時間差（秒）、Noneの場合は時間で区切らない
+    """
+
+    def __init__(self, radius: float, time_window: Optional[float] = None):
+        self.radius = float(radius)
+        self.time_window = time_window
+
+    def deduplicate(self, points: Sequence[Any],
+                    is_duplicate: Callable[[int, int], bool],
+                    prefer: Callable[[int, int], bool],
+                    times: Optional[Sequence[float]] = None,
+                    groups: Optional[Sequence[Any]] = None) -> List[Any]:
+        """
+        貪欲法で重複を除去します
+
+        Parameters:
+        -----------
+        points : Sequence[Any]
+            処理する順に並べたポイント（position 属性に (緯度, 経度) を持つもの）
+        is_duplicate : Callable[[int, int], bool]
+            (新しいポイントの番号, 残しているポイントの番号) が重複かどうか
+        prefer : Callable[[int, int], bool]
+            重複した場合に新しいポイントで置き換えるかどうか
+        times : Sequence[float], optional
+            各ポイントの時刻（秒）、time_window を使う場合に必要
+        groups : Sequence[Any], optional
+            各ポイントのグループ（同じグループ同士のみ比較する）
+
+        Returns:
+        --------
+        List[Any]
+            残ったポイント（従来の貪欲法と同じ順序）
+        """
+        count = len(points)
+        if count <= 1:
+            return list(points)
+
+        lats = np.full(count, np.nan)
+        lons = np.full(count, np.nan)
+        for i, point in enumerate(points):
+            try:
+                lats[i] = float(point.position[0])
+                lons[i] = float(point.position[1])
+            except (AttributeError, IndexError, TypeError, ValueError):
+                pass
+
+        # セルの大きさ（経度方向は最も高緯度のポイントでも判定距離以上になるようにする）
+        lat_step = max(self.radius / METERS_PER_DEGREE, 1e-12)
+        finite_lats = np.abs(lats[np.isfinite(lats)])
+        max_lat = min(float(finite_lats.max()) + lat_step if len(finite_lats) else 0.0, 89.9)
+        lon_step = max(lat_step / math.cos(math.radians(max_lat)), 1e-12)
+
+        cell_lat = np.floor(lats / lat_step)
+        cell_lon = np.floor(lons / lon_step)
+        valid = np.isfinite(cell_lat) & np.isfinite(cell_lon)
+
+        use_time = self.time_window is not None and self.time_window > 0
+        if use_time:
+            time_values = np.asarray(times, dtype=np.float64)
+            cell_time = np.floor(time_values / self.time_window)
+            valid &= np.isfinite(cell_time)
+        else:
+            cell_time = np.zeros(count)
+
+        buckets: Dict[tuple, Dict[int, int]] = {}
+        kept: Dict[int, int] = {}  # 追加順の通し番号 → ポイントの番号（辞書の順序が残したリストの順序）
+        keys = [None] * count
+        next_id = 0
+
+        time_offsets = (-1, 0, 1) if use_time else (0,)
+
+        for i in range(count):
+            if not valid[i]:
+                # 比較対象にならないポイントはそのまま残す
+                kept[next_id] = i
+                next_id += 1
+                continue
+
+            group = groups[i] if groups is not None else None
+            t, a, b = int(cell_time[i]), int(cell_lat[i]), int(cell_lon[i])
+
+            # 近傍バケットの候補を残したリストの順に比較
+            candidates = []
+            for dt in time_offsets:
+                for da in (-1, 0, 1):
+                    for db in (-1, 0, 1):
+                        bucket = buckets.get((group, t + dt, a + da, b + db))
+                        if bucket:
+                            candidates.extend(bucket.items())
+            candidates.sort()
+
+            duplicate = False
+            for kept_id, j in candidates:
+                if is_duplicate(i, j):
+                    if prefer(i, j):
+                        # 既存のポイントを削除し、新しいポイントを末尾に追加
+                        del buckets[keys[j]][kept_id]
+                        del kept[kept_id]
+                        self._add(buckets, kept, keys, i, (group, t, a, b), next_id)
+                        next_id += 1
+                    duplicate = True
+                    break
+
+            if not duplicate:
+                self._add(buckets, kept, keys, i, (group, t, a, b), next_id)
+                next_id += 1
+
+        return [points[i] for i in kept.values()]
+
+    @staticmethod
+    def _add(buckets: Dict[tuple, Dict[int, int]], kept: Dict[int, int], keys: List[Any],
+             index: int, key: tuple, kept_id: int) -> None:
+        buckets.setdefault(key, {})[kept_id] = index
+        kept[kept_id] = index
+        keys[index] = key
+
+
+def deduplicate_shift_points(shift_points: Sequence[Any],
+                             time_of: Callable[[Any], float] = normalize_to_timestamp,
+                             distance: Callable[..., float] = calculate_distance) -> List[Any]:
+    """
+    重複する風向変化ポイントを除去（300m以内・5分以内・角度差15度未満）
+
+    時刻順に処理し、重複した場合はシフト確率の高い方を残します。
+
+    Parameters:
+    -----------
+    shift_points : Sequence[WindShiftPoint]
+        変化ポイントリスト
+    time_of : Callable
+        time_estimate を秒に変換する関数
+    distance : Callable
+        2点間の距離（メートル）を返す関数
+
+    Returns:
+    --------
+    List[WindShiftPoint]
+        フィルタリング後の変化ポイント
+    """
+    if len(shift_points) <= 1:
+        return list(shift_points)
+
+    times = [time_of(p.time_estimate) for p in shift_points]
+    order = sorted(range(len(shift_points)), key=lambda i: times[i])
+    points = [shift_points[i] for i in order]
+    times = [times[i] for i in order]
+
+    def is_duplicate(i, j):
+        p, e = points[i], points[j]
+        return (distance(p.position[0], p.position[1], e.position[0], e.position[1]) < 300 and
+                abs(times[i] - times[j]) < 300 and
+                abs(angle_difference(p.shift_angle, e.shift_angle)) < 15)
+
+    return SpatialHashDeduplicator(300, time_window=300).deduplicate(
+        points, is_duplicate,
+        lambda i, j: points[i].shift_probability > points[j].shift_probability,
+        times=times
+    )
+
+
+def deduplicate_tack_points(tack_points: Sequence[Any],
+                            distance: Callable[..., float] = calculate_distance) -> List[Any]:
+    """
+    重複するタックポイントを除去（200m以内・VMG利得の差0.05未満）
+
+    入力順に処理し、重複した場合はVMG利得の大きい方を残します。
+    """
+    if len(tack_points) <= 1:
+        return list(tack_points)
+
+    points = list(tack_points)
+
+    def is_duplicate(i, j):
+        p, e = points[i], points[j]
+        return (distance(p.position[0], p.position[1], e.position[0], e.position[1]) < 200 and
+                abs(p.vmg_gain - e.vmg_gain) < 0.05)
+
+    return SpatialHashDeduplicator(200).deduplicate(
+        points, is_duplicate, lambda i, j: points[i].vmg_gain > points[j].vmg_gain
+    )
+
+
+def deduplicate_laylines(layline_points: Sequence[Any],
+                         distance: Callable[..., float] = calculate_distance) -> List[Any]:
+    """
+    重複するレイラインポイントを除去（同じマーク向けで300m以内）
+
+    入力順に処理し、重複した場合は確信度の高い方を残します。
+    """
+    if len(layline_points) <= 1:
+        return list(layline_points)
+
+    points = list(layline_points)
+    marks = [getattr(p, 'mark_id', None) for p in points]
+    try:
+        # マークIDでバケットを分ける（ハッシュできないIDは全て同じグループで比較）
+        for mark in marks:
+            hash(mark)
+    except TypeError:
+        marks = None
+
+    def is_duplicate(i, j):
+        p, e = points[i], points[j]
+        return (p.mark_id == e.mark_id and
+                distance(p.position[0], p.position[1], e.position[0], e.position[1]) < 300)
+
+    return SpatialHashDeduplicator(300).deduplicate(
+        points, is_duplicate, lambda i, j: points[i].confidence > points[j].confidence,
+        groups=marks
+    )
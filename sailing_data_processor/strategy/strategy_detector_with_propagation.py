@@ -21,6 +21,9 @@ from sailing_data_processor.strategy.strategy_detector_utils import (
     normalize_to_timestamp, get_time_difference_seconds, 
     angle_difference, calculate_distance
 )
+from sailing_data_processor.strategy.point_deduplication import (
+    deduplicate_shift_points, deduplicate_tack_points, deduplicate_laylines
+)
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -272,49 +275,8 @@ class StrategyDetectorWithPropagation(StrategyDetector):
         List[WindShiftPoint]
             フィルタリング後の変化ポイント
         """
-        if len(shift_points) <= 1:
-            return shift_points
-        
-        filtered_points = []
-        sorted_points = sorted(shift_points, 
-                              key=lambda p: normalize_to_timestamp(p.time_estimate))
-        
-        for point in sorted_points:
-            is_duplicate = False
-            
-            for existing in filtered_points:
-                # 位置が近い（300m以内）
-                position_close = calculate_distance(
-                    point.position[0], point.position[1],
-                    existing.position[0], existing.position[1]
-                ) < 300
-                
-                # 時間が近い（5分以内）
-                time_diff = get_time_difference_seconds(
-                    point.time_estimate, existing.time_estimate
-                )
-                time_close = time_diff < 300
-                
-                # 角度が類似（15度以内）
-                angle_similar = abs(angle_difference(
-                    point.shift_angle, existing.shift_angle
-                )) < 15
-                
-                # 重複判定
-                if position_close and time_close and angle_similar:
-                    # 確信度が高い方を優先
-                    if point.shift_probability > existing.shift_probability:
-                        # 既の変化ポイントの置き換え
-                        filtered_points.remove(existing)
-                        filtered_points.append(point)
-                    
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_points.append(point)
-        
-        return filtered_points
+        # 時間窓と空間ハッシュで近傍のポイントのみ比較
+        return deduplicate_shift_points(shift_points)
     
     def _calculate_strategic_score(self, maneuver_type: str, 
                                  before_tack_type: str, 
@@ -495,37 +457,7 @@ class StrategyDetectorWithPropagation(StrategyDetector):
         List[TackPoint]
             フィルタリング後のタックポイント
         """
-        # 基本的に _filter_duplicate_shift_points と同様
-        if len(tack_points) <= 1:
-            return tack_points
-        
-        filtered_points = []
-        for point in tack_points:
-            is_duplicate = False
-            
-            for existing in filtered_points:
-                # 位置が近い
-                position_close = calculate_distance(
-                    point.position[0], point.position[1],
-                    existing.position[0], existing.position[1]
-                ) < 200  # タックはより詳細に
-                
-                # VMG利得が類似している
-                vmg_similar = abs(point.vmg_gain - existing.vmg_gain) < 0.05
-                
-                if position_close and vmg_similar:
-                    # VMG利得が大きい方を優先
-                    if point.vmg_gain > existing.vmg_gain:
-                        filtered_points.remove(existing)
-                        filtered_points.append(point)
-                    
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_points.append(point)
-        
-        return filtered_points
+        return deduplicate_tack_points(tack_points)
     
     def _filter_duplicate_laylines(self, layline_points: List[LaylinePoint]) -> List[LaylinePoint]:
         """
@@ -541,34 +473,4 @@ class StrategyDetectorWithPropagation(StrategyDetector):
         List[LaylinePoint]
             フィルタリング後のレイラインポイント
         """
-        # 基本的に _filter_duplicate_shift_points と同様
-        if len(layline_points) <= 1:
-            return layline_points
-        
-        filtered_points = []
-        for point in layline_points:
-            is_duplicate = False
-            
-            for existing in filtered_points:
-                # 同じマーク向け
-                same_mark = point.mark_id == existing.mark_id
-                
-                # 位置が近い
-                position_close = calculate_distance(
-                    point.position[0], point.position[1],
-                    existing.position[0], existing.position[1]
-                ) < 300
-                
-                if same_mark and position_close:
-                    # 確信度が高い方を優先
-                    if point.confidence > existing.confidence:
-                        filtered_points.remove(existing)
-                        filtered_points.append(point)
-                    
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_points.append(point)
-        
-        return filtered_points
\ No newline at end of file
+        return deduplicate_laylines(layline_points)
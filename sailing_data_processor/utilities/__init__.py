@@ -11,10 +11,32 @@ __version__ = '1.0.0'
 # よく使用される数学ユーティリティ関数をインポート
 from .math_utils import normalize_angle, angle_difference, average_angle, angle_dispersion
 
+# トラック運動量（距離・速度・コース）の一括計算エンジン
+from .track_kinematics import compute_track_kinematics, haversine_distances, vincenty_distances, initial_bearings, datetime_nanoseconds
+
+# 風データポイントの近傍検索用の地理空間インデックス
+from .spatial_index import GeoSpatialIndex, RecordSpatialIndex
+
+# キャッシュキー用のデータフィンガープリント
+from .fingerprint import fingerprint, fingerprint_dataframe
+
+# キャッシュ値のメモリ使用量の推定
+from .memory_size import estimate_size
+
 # エクスポートするシンボル
 __all__ = [
     'normalize_angle',
     'angle_difference',
     'average_angle',
-    'angle_dispersion'
+    'angle_dispersion',
+    'compute_track_kinematics',
+    'haversine_distances',
+    'vincenty_distances',
+    'initial_bearings',
+    'datetime_nanoseconds',
+    'GeoSpatialIndex',
+    'RecordSpatialIndex',
+    'fingerprint',
+    'fingerprint_dataframe',
+    'estimate_size'
 ]
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+データのフィンガープリント - キャッシュキー生成用
+
+DataFrame・Series・NumPy配列の内容そのものからハッシュ値を計算します。
+数値・日時の列はメモリ上のバッファを直接ハッシュし、文字列などのobject列は
+pandasのベクトル化されたハッシュ（hash_pandas_object）で行ごとのハッシュに変換してから集約します。
+xxhashが利用できる場合はxxh3_128を、利用できない場合はblake2b（128ビット）を使用します。
+
+値の直接の書き換え（df.loc[i, col] = value など）も必ず反映されるよう、結果はメモ化せず
+呼び出しごとに全ての列を走査します。
+"""
+import hashlib
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+def _new_hasher():
+    """ハッシュオブジェクトを作成"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _update_with_array(hasher, values: np.ndarray) -> None:
+    """配列のdtype・形状・バッファをハッシュに追加"""
+    values = np.ascontiguousarray(values)
+    hasher.update(f"{values.dtype.str}{values.shape}".encode('utf-8'))
+    hasher.update(values.reshape(-1).view(np.uint8))
+
+
+def _update_with_series(hasher, series: pd.Series) -> None:
+    """Series（列）の内容をハッシュに追加"""
+    dtype = series.dtype
+    hasher.update(str(dtype).encode('utf-8'))
+
+    if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+        # タイムゾーン付きもUTCのint64として扱う（タイムゾーン名はdtypeの文字列に含まれる）
+        _update_with_array(hasher, series.array.asi8 if hasattr(series.array, 'asi8') else series.to_numpy().view('i8'))
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'biufc':
+        _update_with_array(hasher, series.to_numpy())
+    else:
+        # object・カテゴリなどは値ごとのハッシュ（欠損値も区別される）
+        hashed = pd.util.hash_pandas_object(series, index=False, categorize=True)
+        _update_with_array(hasher, hashed.to_numpy())
+
+
+def fingerprint_dataframe(df: pd.DataFrame) -> str:
+    """
+    DataFrameのフィンガープリントを計算（インデックス・列名・dtype・値から）
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        対象のDataFrame
+
+    Returns:
+    --------
+    str
+        128ビットのハッシュ値（16進数文字列）
+    """
+    hasher = _new_hasher()
+    hasher.update(f"DataFrame{df.shape}".encode('utf-8'))
+    hasher.update(repr(list(df.columns)).encode('utf-8'))
+    _update_with_series(hasher, df.index.to_series(index=pd.RangeIndex(len(df.index))))
+    for position in range(df.shape[1]):
+        _update_with_series(hasher, df.iloc[:, position])
+    return hasher.hexdigest()
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    任意のオブジェクトのフィンガープリントを計算
+
+    DataFrame・Series・NumPy配列は内容から、辞書・リスト・タプルは要素から再帰的に計算し、
+    それ以外のオブジェクトは型名とrepr()から計算します。
+
+    Parameters:
+    -----------
+    obj : Any
+        対象のオブジェクト
+
+    Returns:
+    --------
+    str
+        128ビットのハッシュ値（16進数文字列）
+    """
+    hasher = _new_hasher()
+    _update_with_object(hasher, obj)
+    return hasher.hexdigest()
+
+
+def _update_with_object(hasher, obj: Any) -> None:
+    """オブジェクトの内容をハッシュに追加"""
+    if isinstance(obj, pd.DataFrame):
+        hasher.update(b'df:')
+        hasher.update(fingerprint_dataframe(obj).encode('ascii'))
+    elif isinstance(obj, pd.Series):
+        hasher.update(f"series:{obj.name!r}".encode('utf-8'))
+        _update_with_series(hasher, obj.index.to_series(index=pd.RangeIndex(len(obj.index))))
+        _update_with_series(hasher, obj)
+    elif isinstance(obj, np.ndarray):
+        hasher.update(b'ndarray:')
+        if obj.dtype.kind == 'O':
+            _update_with_array(hasher, pd.util.hash_array(obj.ravel()))
+            hasher.update(repr(obj.shape).encode('utf-8'))
+        else:
+            _update_with_array(hasher, obj)
+    elif isinstance(obj, dict):
+        hasher.update(f"dict{len(obj)}:".encode('utf-8'))
+        for key in sorted(obj, key=repr):
+            hasher.update(repr(key).encode('utf-8'))
+            _update_with_object(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}{len(obj)}:".encode('utf-8'))
+        for item in obj:
+            _update_with_object(hasher, item)
+    else:
+        hasher.update(f"{type(obj).__module__}.{type(obj).__qualname__}:{obj!r};".encode('utf-8'))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+キャッシュ値のメモリ使用量の推定
+
+DataFrame・Seriesは memory_usage(deep=True)、NumPy配列は nbytes から、
+辞書・リスト・タプル・集合は要素を再帰的にたどって推定します。
+JSONへの変換を伴わないため、大きな分析結果でも高速に計算できます。
+"""
+import sys
+from typing import Any, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+# 再帰的にたどる要素数の上限（超えた分は平均サイズから推定）
+MAX_SAMPLED_ITEMS = 1000
+
+
+def estimate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """
+    値のメモリ使用量を推定
+
+    Parameters:
+    -----------
+    value : Any
+        対象の値
+
+    Returns:
+    --------
+    int
+        推定サイズ（バイト）
+    """
+    if _seen is None:
+        _seen = set()
+
+    # 共有・循環参照されているオブジェクトは一度だけ数える
+    obj_id = id(value)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'O':
+            return int(value.nbytes) + _estimate_items(value.ravel().tolist(), _seen)
+        return int(value.nbytes)
+
+    if isinstance(value, dict):
+        size = sys.getsizeof(value)
+        items = list(value.items())
+        return size + _estimate_items([k for k, _ in items], _seen) + _estimate_items([v for _, v in items], _seen)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + _estimate_items(list(value), _seen)
+
+    try:
+        return sys.getsizeof(value)
+    except TypeError:
+        return 64
+
+
+def _estimate_items(items: list, seen: Set[int]) -> int:
+    """要素のサイズの合計（多い場合は先頭の要素から外挿）"""
+    count = len(items)
+    if count <= MAX_SAMPLED_ITEMS:
+        return sum(estimate_size(item, seen) for item in items)
+
+    sampled = sum(estimate_size(item, seen) for item in items[:MAX_SAMPLED_ITEMS])
+    return int(sampled * count / MAX_SAMPLED_ITEMS)
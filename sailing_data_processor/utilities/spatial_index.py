@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+地理空間インデックス - セーリングデータ処理用
+
+緯度・経度を単位球上の3次元座標に射影し、scipyのKD木で近傍点を検索します。
+単位球上の弦の長さは大円距離と単調な関係にあるため、近傍の順位はHaversine距離と一致し、
+距離は弦の長さから厳密に復元できます。
+
+新しいデータ点は未構築バッファに追加され、一定数を超えた時点でKD木を再構築するため、
+風データが逐次到着する場合でも挿入は償却O(log n)、検索はKD木とバッファの併用で行います。
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict, List, Tuple, Optional, Any, Sequence
+
+# 地球の半径（メートル）
+EARTH_RADIUS_M = 6371000.0
+
+
+def to_unit_vectors(lats: Any, lons: Any) -> np.ndarray:
+    """
+    緯度・経度を単位球上の3次元座標に変換します
+
+    Parameters:
+    -----------
+    lats, lons : array-like
+        緯度・経度（度）
+
+    Returns:
+    --------
+    np.ndarray
+        (n, 3) の座標配列（欠損はNaN）
+    """
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64).ravel())
+    lon_rad = np.radians(np.asarray(lons, dtype=np.float64).ravel())
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack([cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)])
+
+
+def chord_to_distance(chord: np.ndarray) -> np.ndarray:
+    """単位球上の弦の長さを大円距離（メートル）に変換します"""
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+
+def distance_to_chord(distance: float) -> float:
+    """大円距離（メートル）を単位球上の弦の長さに変換します"""
+    angle = min(distance / EARTH_RADIUS_M, np.pi)
+    return 2.0 * np.sin(angle / 2.0)
+
+
+class GeoSpatialIndex:
+    """
+    逐次挿入に対応した地理空間インデックス
+
+    点のインデックスは挿入順の通し番号です。位置が欠損（NaN）の点も番号を消費しますが、
+    検索結果には含まれません。
+
+    Parameters:
+    -----------
+    lats, lons : array-like, optional
+        初期データの緯度・経度（度）
+    rebuild_ratio : float
+        KD木のサイズに対する未構築バッファの割合がこれを超えたら再構築
+    min_rebuild_size : int
+        再構築を行う未構築バッファの最小サイズ（これ以下は総当たりで検索）
+    """
+
+    def __init__(self, lats: Any = None, lons: Any = None,
+                 rebuild_ratio: float = 0.25, min_rebuild_size: int = 64):
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild_size = min_rebuild_size
+
+        self._xyz = np.empty((0, 3), dtype=np.float64)
+        self._size = 0
+        self._tree = None
+        self._tree_ids = np.empty(0, dtype=np.int64)
+        self._pending = np.empty(0, dtype=np.int64)
+
+        if lats is not None and lons is not None:
+            self.insert(lats, lons)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, lats: Any, lons: Any) -> np.ndarray:
+        """
+        点を追加します
+
+        Parameters:
+        -----------
+        lats, lons : array-like
+            緯度・経度（度）
+
+        Returns:
+        --------
+        np.ndarray
+            追加した点の通し番号
+        """
+        xyz = to_unit_vectors(lats, lons)
+        count = len(xyz)
+        ids = np.arange(self._size, self._size + count, dtype=np.int64)
+        if count == 0:
+            return ids
+
+        # 容量を倍々で確保して追加のコピーを償却する
+        if self._size + count > len(self._xyz):
+            capacity = max(self._size + count, 2 * len(self._xyz), 16)
+            grown = np.empty((capacity, 3), dtype=np.float64)
+            grown[:self._size] = self._xyz[:self._size]
+            self._xyz = grown
+        self._xyz[self._size:self._size + count] = xyz
+        self._size += count
+
+        valid = np.isfinite(xyz).all(axis=1)
+        self._pending = np.concatenate([self._pending, ids[valid]])
+
+        if len(self._pending) > max(self.min_rebuild_size, self.rebuild_ratio * len(self._tree_ids)):
+            self.rebuild()
+        return ids
+
+    def rebuild(self) -> None:
+        """未構築バッファを含めてKD木を再構築します"""
+        ids = np.concatenate([self._tree_ids, self._pending])
+        self._tree_ids = ids
+        self._tree = cKDTree(self._xyz[ids]) if len(ids) else None
+        self._pending = np.empty(0, dtype=np.int64)
+
+    def query(self, lats: Any, lons: Any, k: int = 1,
+              max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数の位置について近傍k点をまとめて検索します
+
+        Parameters:
+        -----------
+        lats, lons : array-like
+            検索位置の緯度・経度（度）
+        k : int
+            取得する近傍点の数
+        max_distance : float, optional
+            検索する最大距離（メートル）
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (距離[メートル], 通し番号) - いずれも (検索位置数, k) の配列。
+            該当する点がない列は距離がinf、番号が-1
+        """
+        queries = to_unit_vectors(lats, lons)
+        m = len(queries)
+        distances = np.full((m, k), np.inf)
+        indices = np.full((m, k), -1, dtype=np.int64)
+        if m == 0 or k <= 0:
+            return distances, indices
+
+        bound = np.inf if max_distance is None else distance_to_chord(max_distance)
+        finite = np.isfinite(queries).all(axis=1)
+        q = queries[finite]
+
+        chords = []
+        ids = []
+
+        if self._tree is not None:
+            k_tree = min(k, len(self._tree_ids))
+            tree_chords, tree_pos = self._tree.query(q, k=k_tree, distance_upper_bound=bound)
+            tree_chords = np.asarray(tree_chords).reshape(len(q), k_tree)
+            tree_pos = np.asarray(tree_pos).reshape(len(q), k_tree)
+            found = tree_pos < len(self._tree_ids)
+            chords.append(np.where(found, tree_chords, np.inf))
+            ids.append(np.where(found, self._tree_ids[np.minimum(tree_pos, len(self._tree_ids) - 1)], -1))
+
+        if len(self._pending):
+            # 未構築バッファは総当たりで検索（サイズは再構築の閾値で抑えられている）
+            diff = q[:, None, :] - self._xyz[self._pending][None, :, :]
+            buffer_chords = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+            buffer_chords[buffer_chords > bound] = np.inf
+            chords.append(buffer_chords)
+            ids.append(np.broadcast_to(self._pending, buffer_chords.shape))
+
+        if not chords:
+            return distances, indices
+
+        all_chords = np.concatenate(chords, axis=1)
+        all_ids = np.concatenate(ids, axis=1)
+        take = min(k, all_chords.shape[1])
+        order = np.argsort(all_chords, axis=1, kind='stable')[:, :take]
+        best_chords = np.take_along_axis(all_chords, order, axis=1)
+        best_ids = np.take_along_axis(all_ids, order, axis=1)
+        best_ids[~np.isfinite(best_chords)] = -1
+
+        distances[finite, :take] = np.where(best_ids >= 0, chord_to_distance(best_chords), np.inf)
+        indices[finite, :take] = best_ids
+        return distances, indices
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_distance: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        1つの位置について近傍点を検索します
+
+        Returns:
+        --------
+        List[Tuple[int, float]]
+            (通し番号, 距離[メートル]) のリスト（近い順）
+        """
+        distances, indices = self.query([lat], [lon], k, max_distance)
+        return [(int(i), float(d)) for i, d in zip(indices[0], distances[0]) if i >= 0]
+
+
+class RecordSpatialIndex:
+    """
+    辞書レコードのリストに追従する空間インデックス
+
+    同じリストに末尾追加されたレコードは差分のみ挿入し、
+    別のリストが渡された場合や既存レコードが入れ替わった場合は再構築します。
+
+    Parameters:
+    -----------
+    lat_key, lon_key : str
+        緯度・経度のキー
+    """
+
+    def __init__(self, lat_key: str = 'latitude', lon_key: str = 'longitude'):
+        self.lat_key = lat_key
+        self.lon_key = lon_key
+        self.index = GeoSpatialIndex()
+        self._records = None
+        self._count = 0
+        self._first = None
+        self._last = None
+
+    def _coordinates(self, records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        lats = np.full(len(records), np.nan)
+        lons = np.full(len(records), np.nan)
+        for i, record in enumerate(records):
+            try:
+                lats[i] = float(record[self.lat_key])
+                lons[i] = float(record[self.lon_key])
+            except (KeyError, TypeError, ValueError):
+                # 位置情報がないレコードは検索対象外
+                lats[i] = lons[i] = np.nan
+        return lats, lons
+
+    def sync(self, records: Sequence[Dict[str, Any]]) -> GeoSpatialIndex:
+        """
+        レコードのリストとインデックスを同期します
+
+        Parameters:
+        -----------
+        records : Sequence[Dict[str, Any]]
+            緯度・経度を含むレコードのリスト
+
+        Returns:
+        --------
+        GeoSpatialIndex
+            同期済みのインデックス（通し番号はリストの位置に対応）
+        """
+        unchanged = (records is self._records and len(records) >= self._count and
+                     (self._count == 0 or (records[0] is self._first and
+                                           records[self._count - 1] is self._last)))
+        if not unchanged:
+            self.index = GeoSpatialIndex()
+            self._count = 0
+
+        if len(records) > self._count:
+            self.index.insert(*self._coordinates(records[self._count:]))
+
+        self._records = records
+        self._count = len(records)
+        self._first = records[0] if records else None
+        self._last = records[-1] if records else None
+        return self.index
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+複数艇の時刻同期ユーティリティ - セーリングデータ処理用
+
+コースを単位円上の複素特徴量 exp(i·course)（= cos + i·sin）として共通の時間グリッドに
+一度だけリサンプリングし、FFTによる正規化相互相関で2艇間の時刻オフセットを推定します。
+相関ピークを放物線補間することで、グリッド間隔より細かい（サブ秒の）オフセットを求めます。
+"""
+import numpy as np
+import pandas as pd
+from scipy import fft as sp_fft
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Optional, Any
+
+from .track_kinematics import datetime_nanoseconds
+
+# 相関を採用する最小重複サンプル数（従来の merge_asof 方式の「10点超」に相当）
+MIN_OVERLAP_SAMPLES = 10
+
+
+def to_epoch_seconds(times: Any) -> np.ndarray:
+    """
+    時刻の配列をUNIX秒（float64）に変換します
+
+    Parameters:
+    -----------
+    times : array-like
+        時刻（datetime系、または秒単位の数値）
+
+    Returns:
+    --------
+    np.ndarray
+        UNIX秒の配列（欠損はNaN）
+    """
+    if isinstance(times, (pd.Series, np.ndarray)) and pd.api.types.is_numeric_dtype(times):
+        return np.asarray(times, dtype=np.float64)
+
+    nanoseconds, missing = datetime_nanoseconds(times)
+    seconds = nanoseconds.astype(np.float64) / 1e9
+    seconds[missing] = np.nan
+    return seconds
+
+
+def resample_course_features(times_s: np.ndarray, courses: np.ndarray,
+                             grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    コースを複素特徴量 exp(i·course) として時間グリッド上に線形補間します
+
+    Parameters:
+    -----------
+    times_s : np.ndarray
+        観測時刻（秒）
+    courses : np.ndarray
+        コース（度）
+    grid : np.ndarray
+        リサンプリング先の時間グリッド（秒、等間隔）
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (複素特徴量, 有効マスク[0/1]) - トラックの時間範囲外は0
+    """
+    valid = np.isfinite(times_s) & np.isfinite(courses)
+    times_s = times_s[valid]
+    courses = courses[valid]
+
+    features = np.zeros(len(grid), dtype=np.complex128)
+    mask = np.zeros(len(grid), dtype=np.float64)
+    if len(times_s) < 2:
+        return features, mask
+
+    order = np.argsort(times_s, kind='stable')
+    times_s = times_s[order]
+    radians = np.radians(courses[order])
+
+    inside = (grid >= times_s[0]) & (grid <= times_s[-1])
+    grid_inside = grid[inside]
+    features[inside] = (np.interp(grid_inside, times_s, np.cos(radians)) +
+                        1j * np.interp(grid_inside, times_s, np.sin(radians)))
+    mask[inside] = 1.0
+
+    # 平均方向を除去し、一定コース区間が相関を支配しないようにする
+    if inside.any():
+        features[inside] -= features[inside].mean()
+
+    return features, mask
+
+
+class _ReferenceSpectrum:
+    """基準艇の特徴量スペクトル（艇ごとの推定で再利用する）"""
+
+    def __init__(self, times_s: np.ndarray, courses: np.ndarray,
+                 max_offset: float, resolution: float):
+        self.max_offset = max_offset
+        self.resolution = resolution
+        self.max_lag = int(np.ceil(max_offset / resolution))
+
+        finite = times_s[np.isfinite(times_s)]
+        start = finite.min() - max_offset if len(finite) else 0.0
+        end = finite.max() + max_offset if len(finite) else 0.0
+        self.grid = start + np.arange(int(np.floor((end - start) / resolution)) + 1) * resolution
+
+        self.nfft = sp_fft.next_fast_len(2 * len(self.grid))
+        features, mask = resample_course_features(times_s, courses, self.grid)
+        self.is_empty = not mask.any()
+        self.features_fft = sp_fft.fft(features, self.nfft)
+        self.energy_fft = sp_fft.fft(np.abs(features) ** 2, self.nfft)
+        self.mask_fft = sp_fft.fft(mask, self.nfft)
+
+    def _xcorr(self, ref_fft: np.ndarray, other: np.ndarray, workers: Optional[int]) -> np.ndarray:
+        """c[k] = Σ_t ref(t)·conj(other(t-k)) を ±max_lag の範囲で返す"""
+        full = sp_fft.ifft(ref_fft * np.conj(sp_fft.fft(other, self.nfft)), workers=workers)
+        # ラグ -max_lag..max_lag の順に並べ替え
+        return np.concatenate([full[len(full) - self.max_lag:], full[:self.max_lag + 1]])
+
+    def estimate(self, times_s: np.ndarray, courses: np.ndarray,
+                 min_overlap: int = MIN_OVERLAP_SAMPLES,
+                 workers: Optional[int] = None) -> Tuple[float, float]:
+        """
+        他艇の時刻オフセットを推定する
+
+        Returns:
+        --------
+        Tuple[float, float]
+            (オフセット秒, 相関係数) - 推定できない場合は (0.0, 0.0)
+        """
+        if self.is_empty:
+            return 0.0, 0.0
+
+        features, mask = resample_course_features(times_s, courses, self.grid)
+        if not mask.any():
+            return 0.0, 0.0
+
+        numerator = self._xcorr(self.features_fft, features, workers).real
+        overlap = np.rint(self._xcorr(self.mask_fft, mask, workers).real)
+        ref_energy = self._xcorr(self.energy_fft, mask, workers).real
+        other_energy = self._xcorr(self.mask_fft, np.abs(features) ** 2, workers).real
+
+        denominator = np.sqrt(np.clip(ref_energy, 0, None) * np.clip(other_energy, 0, None))
+        scores = np.full(len(numerator), -np.inf)
+        usable = (overlap > min_overlap) & (denominator > 1e-12)
+        if not usable.any():
+            return 0.0, 0.0
+        scores[usable] = numerator[usable] / denominator[usable]
+
+        peak = int(np.argmax(scores))
+        refinement = 0.0
+        if 0 < peak < len(scores) - 1 and np.isfinite(scores[peak - 1]) and np.isfinite(scores[peak + 1]):
+            left, center, right = scores[peak - 1], scores[peak], scores[peak + 1]
+            curvature = left - 2 * center + right
+            if curvature < 0:
+                refinement = 0.5 * (left - right) / curvature
+
+        lag = (peak - self.max_lag) + refinement
+        offset = float(np.clip(lag * self.resolution, -self.max_offset, self.max_offset))
+        return offset, float(scores[peak])
+
+
+def estimate_time_offset_xcorr(ref_times: Any, ref_courses: Any, times: Any, courses: Any,
+                               max_offset: float = 300, resolution: float = 0.5,
+                               min_overlap: int = MIN_OVERLAP_SAMPLES) -> float:
+    """
+    FFT相互相関で2艇間の時刻オフセットを推定します
+
+    戻り値のオフセットを2艇目の時刻に加算すると基準艇の時刻に揃います。
+
+    Parameters:
+    -----------
+    ref_times, ref_courses : array-like
+        基準艇の時刻とコース（度）
+    times, courses : array-like
+        同期対象艇の時刻とコース（度）
+    max_offset : float
+        探索する最大オフセット（秒）
+    resolution : float
+        リサンプリンググリッドの間隔（秒）
+    min_overlap : int
+        相関を採用する最小重複サンプル数
+
+    Returns:
+    --------
+    float
+        推定された時刻オフセット（秒）
+    """
+    reference = _ReferenceSpectrum(to_epoch_seconds(ref_times),
+                                   np.asarray(ref_courses, dtype=np.float64),
+                                   max_offset, resolution)
+    offset, _ = reference.estimate(to_epoch_seconds(times),
+                                   np.asarray(courses, dtype=np.float64), min_overlap)
+    return offset
+
+
+def estimate_fleet_offsets(ref_times: Any, ref_courses: Any,
+                           tracks: Dict[str, Tuple[Any, Any]],
+                           max_offset: float = 300, resolution: float = 0.5,
+                           min_overlap: int = MIN_OVERLAP_SAMPLES,
+                           max_workers: Optional[int] = None) -> Dict[str, float]:
+    """
+    基準艇に対する複数艇の時刻オフセットをまとめて推定します
+
+    基準艇のスペクトルは一度だけ計算し、各艇の推定はスレッドプールで並列実行します
+    （scipy.fft はGILを解放するため、50艇以上のフリートでも並列化が効きます）。
+
+    Parameters:
+    -----------
+    ref_times, ref_courses : array-like
+        基準艇の時刻とコース（度）
+    tracks : Dict[str, Tuple[array-like, array-like]]
+        艇ID: (時刻, コース) の辞書
+    max_offset : float
+        探索する最大オフセット（秒）
+    resolution : float
+        リサンプリンググリッドの間隔（秒）
+    min_overlap : int
+        相関を採用する最小重複サンプル数
+    max_workers : Optional[int]
+        並列ワーカー数（None: CPU数に応じて自動、1: 逐次実行）
+
+    Returns:
+    --------
+    Dict[str, float]
+        艇ID: 時刻オフセット（秒）の辞書
+    """
+    reference = _ReferenceSpectrum(to_epoch_seconds(ref_times),
+                                   np.asarray(ref_courses, dtype=np.float64),
+                                   max_offset, resolution)
+
+    def _estimate(item):
+        boat_id, (times, courses) = item
+        offset, _ = reference.estimate(to_epoch_seconds(times),
+                                       np.asarray(courses, dtype=np.float64), min_overlap)
+        return boat_id, offset
+
+    if max_workers == 1 or len(tracks) <= 1:
+        return dict(_estimate(item) for item in tracks.items())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(_estimate, tracks.items()))
@@ -11,6 +11,7 @@ import logging
 from datetime import datetime, timedelta
 
 from sailing_data_processor.data_model.container import GPSDataContainer
+from sailing_data_processor.validation.validation_context import ValidationContext
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -51,6 +52,25 @@ class ValidationRule:
         """
         raise NotImplementedError("Subclasses must implement this method")
     
+    def validate_context(self, context: ValidationContext) -> Tuple[bool, Dict[str, Any]]:
+        """
+        共有の派生配列を使ってデータを検証
+        
+        ソート順や速度などの派生配列を使うルールはこのメソッドをオーバーライドします。
+        デフォルトでは validate をそのまま呼び出します。
+        
+        Parameters
+        ----------
+        context : ValidationContext
+            検証対象データと派生配列のキャッシュ
+            
+        Returns
+        -------
+        Tuple[bool, Dict[str, Any]]
+            検証結果と詳細情報
+        """
+        return self.validate(context.data)
+    
     def __str__(self) -> str:
         return f"{self.name} ({self.severity}): {self.description}"
 
@@ -367,6 +387,25 @@ class SpatialConsistencyRule(ValidationRule):
         data : pd.DataFrame
             検証するデータフレーム
             
+        Returns
+        -------
+        Tuple[bool, Dict[str, Any]]
+            検証結果と詳細情報
+        """
+        return self.validate_context(ValidationContext(data))
+    
+    def validate_context(self, context: ValidationContext) -> Tuple[bool, Dict[str, Any]]:
+        """
+        位置データの空間的整合性を検証（共有の区間速度を使用）
+        
+        座標が無効な点は除外し、前後の有効な点の間の速度で判定します。
+        インデックスはタイムスタンプでソートした後の位置です。
+        
+        Parameters
+        ----------
+        context : ValidationContext
+            検証対象データと派生配列のキャッシュ
+            
         Returns
         -------
         Tuple[bool, Dict[str, Any]]
@@ -374,88 +413,50 @@ class SpatialConsistencyRule(ValidationRule):
         """
         # 必要なカラムが存在するか確認
         required_columns = [self.timestamp_column, self.latitude_column, self.longitude_column]
-        missing_columns = [col for col in required_columns if col not in data.columns]
+        missing_columns = [col for col in required_columns if col not in context.data.columns]
         
         if missing_columns:
             return False, {"error": f"必要なカラムがありません: {', '.join(missing_columns)}"}
         
-        if len(data) < 2:
+        if len(context) < 2:
             return True, {"message": "データポイントが不足しているため検証をスキップします"}
         
-        # タイムスタンプでソート
-        sorted_data = data.sort_values(self.timestamp_column).copy()
+        kinematics = context.kinematics(self.timestamp_column, self.latitude_column, self.longitude_column)
+        speeds = kinematics['speed']
         
-        # 距離と時間差を計算
-        from geopy.distance import great_circle
-        
-        distances = []
-        time_diffs = []
-        speeds = []
-        
-        prev_lat = sorted_data[self.latitude_column].iloc[0]
-        prev_lon = sorted_data[self.longitude_column].iloc[0]
-        prev_time = sorted_data[self.timestamp_column].iloc[0]
-        
-        for i in range(1, len(sorted_data)):
-            curr_lat = sorted_data[self.latitude_column].iloc[i]
-            curr_lon = sorted_data[self.longitude_column].iloc[i]
-            curr_time = sorted_data[self.timestamp_column].iloc[i]
-            
-            # 座標値がNaNや無限大でないか確認
-            if (np.isfinite(prev_lat) and np.isfinite(prev_lon) and 
-                np.isfinite(curr_lat) and np.isfinite(curr_lon)):
-                try:
-                    # 距離の計算（メートル単位）
-                    distance = great_circle((prev_lat, prev_lon), (curr_lat, curr_lon)).meters
-                    distances.append(distance)
-                    
-                    # 時間差の計算（秒単位）
-                    time_diff = (curr_time - prev_time).total_seconds()
-                    time_diffs.append(time_diff)
-                    
-                    # 速度の計算（ノット単位、1ノット = 0.514444 m/s）
-                    if time_diff > 0:
-                        speed = (distance / time_diff) / 0.514444
-                    else:
-                        speed = float('inf')
-                    speeds.append(speed)
-                except ValueError as e:
-                    # 座標値が有効な範囲外の場合（例：緯度が±90度を超える場合）
-                    logger.warning(f"無効な座標値でのdistance計算をスキップ: {e}")
-                    # 計算をスキップ（次の点へ）
-                    continue
-            else:
-                # 無効な座標値をスキップ
-                logger.warning(f"無効な座標値をスキップ: prev({prev_lat}, {prev_lon}), curr({curr_lat}, {curr_lon})")
-                continue
-            
-            prev_lat, prev_lon, prev_time = curr_lat, curr_lon, curr_time
-        
-        # 異常な速度を検出
-        anomaly_indices = [i + 1 for i, speed in enumerate(speeds) if speed > self.max_speed_knots]
+        # 異常な速度を検出（区間の終点をソート後の位置で記録）
+        anomaly_segments = np.flatnonzero(speeds > self.max_speed_knots)
+        anomaly_indices = kinematics['positions'][anomaly_segments + 1]
         
         is_valid = len(anomaly_indices) == 0
         
         # 異常詳細の作成
         anomaly_details = []
-        for idx in anomaly_indices[:20]:  # 最初の20個まで
-            anomaly_details.append({
-                "index": idx,
-                "original_index": sorted_data.index[idx],
-                "timestamp": sorted_data[self.timestamp_column].iloc[idx],
-                "position": (sorted_data[self.latitude_column].iloc[idx], 
-                             sorted_data[self.longitude_column].iloc[idx]),
-                "distance_meters": distances[idx - 1],
-                "time_diff_seconds": time_diffs[idx - 1],
-                "speed_knots": speeds[idx - 1]
-            })
+        if len(anomaly_indices) > 0:
+            shown = anomaly_segments[:20]  # 最初の20個まで
+            positions = anomaly_indices[:20]
+            data = context.data
+            order = context.sort_order(self.timestamp_column)[positions]
+            timestamps = data[self.timestamp_column].iloc[order]
+            latitudes = data[self.latitude_column].iloc[order]
+            longitudes = data[self.longitude_column].iloc[order]
+            for k, segment in enumerate(shown):
+                anomaly_details.append({
+                    "index": int(positions[k]),
+                    "original_index": data.index[order[k]],
+                    "timestamp": timestamps.iloc[k],
+                    "position": (latitudes.iloc[k], longitudes.iloc[k]),
+                    "distance_meters": float(kinematics['distance'][segment]),
+                    "time_diff_seconds": float(kinematics['time_diff'][segment]),
+                    "speed_knots": float(speeds[segment])
+                })
         
         details = {
             "anomaly_count": len(anomaly_indices),
-            "anomaly_indices": anomaly_indices[:100],
-            "max_calculated_speed": max(speeds) if speeds else 0,
-            "min_calculated_speed": min(speeds) if speeds else 0,
-            "avg_calculated_speed": sum(speeds) / len(speeds) if speeds else 0,
+            "anomaly_indices": anomaly_indices[:100].tolist(),
+            "max_calculated_speed": float(speeds.max()) if len(speeds) > 0 else 0,
+            "min_calculated_speed": float(speeds.min()) if len(speeds) > 0 else 0,
+            "avg_calculated_speed": float(speeds.mean()) if len(speeds) > 0 else 0,
             "anomaly_details": anomaly_details
         }
         
@@ -503,69 +504,65 @@ class TemporalConsistencyRule(ValidationRule):
         Tuple[bool, Dict[str, Any]]
             検証結果と詳細情報
         """
-        if self.timestamp_column not in data.columns:
+        return self.validate_context(ValidationContext(data))
+    
+    def validate_context(self, context: ValidationContext) -> Tuple[bool, Dict[str, Any]]:
+        """
+        タイムスタンプの時間的整合性を検証（共有の時間差を使用）
+        
+        Parameters
+        ----------
+        context : ValidationContext
+            検証対象データと派生配列のキャッシュ
+            
+        Returns
+        -------
+        Tuple[bool, Dict[str, Any]]
+            検証結果と詳細情報
+        """
+        if self.timestamp_column not in context.data.columns:
             return False, {"error": f"タイムスタンプカラム {self.timestamp_column} が存在しません"}
         
-        if len(data) < 2:
+        if len(context) < 2:
             return True, {"message": "データポイントが不足しているため検証をスキップします"}
         
-        # タイムスタンプでソート
-        sorted_data = data.sort_values(self.timestamp_column).copy()
+        # ソート後の時間差（秒）
+        time_diffs = context.time_diffs(self.timestamp_column)
         
-        # 時間差を計算
-        time_diffs = []
-        prev_time = sorted_data[self.timestamp_column].iloc[0]
-        
-        for i in range(1, len(sorted_data)):
-            curr_time = sorted_data[self.timestamp_column].iloc[i]
-            time_diff = curr_time - prev_time
-            time_diffs.append(time_diff)
-            prev_time = curr_time
-        
-        # 異常な時間差を検出
+        # 異常な時間差と逆行（前の時刻より前の時刻）を検出
         max_time_gap_seconds = self.max_time_gap.total_seconds()
-        gap_indices = [i + 1 for i, diff in enumerate(time_diffs) 
-                      if diff.total_seconds() > max_time_gap_seconds]
-        
-        # 逆行（前の時刻より前の時刻）を検出
-        reverse_indices = [i + 1 for i, diff in enumerate(time_diffs) 
-                          if diff.total_seconds() < 0]
+        gap_indices = np.flatnonzero(time_diffs > max_time_gap_seconds) + 1
+        reverse_indices = np.flatnonzero(time_diffs < 0) + 1
         
         is_valid = len(gap_indices) == 0 and len(reverse_indices) == 0
         
-        # ギャップ詳細の作成
-        gap_details = []
-        for idx in gap_indices[:20]:  # 最初の20個まで
-            gap_details.append({
-                "index": idx,
-                "original_index": sorted_data.index[idx],
-                "prev_timestamp": sorted_data[self.timestamp_column].iloc[idx - 1],
-                "curr_timestamp": sorted_data[self.timestamp_column].iloc[idx],
-                "gap_seconds": time_diffs[idx - 1].total_seconds()
-            })
-        
-        # 逆行詳細の作成
-        reverse_details = []
-        for idx in reverse_indices[:20]:  # 最初の20個まで
-            reverse_details.append({
-                "index": idx,
-                "original_index": sorted_data.index[idx],
-                "prev_timestamp": sorted_data[self.timestamp_column].iloc[idx - 1],
-                "curr_timestamp": sorted_data[self.timestamp_column].iloc[idx],
-                "diff_seconds": time_diffs[idx - 1].total_seconds()
-            })
+        def interval_details(indices: np.ndarray, diff_key: str) -> List[Dict[str, Any]]:
+            indices = indices[:20]  # 最初の20個まで
+            order = context.sort_order(self.timestamp_column)
+            timestamps = context.data[self.timestamp_column]
+            prev_timestamps = timestamps.iloc[order[indices - 1]]
+            curr_timestamps = timestamps.iloc[order[indices]]
+            return [{
+                "index": int(idx),
+                "original_index": context.data.index[order[idx]],
+                "prev_timestamp": prev_timestamps.iloc[k],
+                "curr_timestamp": curr_timestamps.iloc[k],
+                diff_key: float(time_diffs[idx - 1])
+            } for k, idx in enumerate(indices)]
+        
+        finite_diffs = time_diffs[np.isfinite(time_diffs)]
         
         details = {
             "gap_count": len(gap_indices),
-            "gap_indices": gap_indices[:100],
-            "gap_details": gap_details,
+            "gap_indices": gap_indices[:100].tolist(),
+            "gap_details": interval_details(gap_indices, "gap_seconds"),
             "reverse_count": len(reverse_indices),
-            "reverse_indices": reverse_indices[:100],
-            "reverse_details": reverse_details,
+            "reverse_indices": reverse_indices[:100].tolist(),
+            "reverse_details": interval_details(reverse_indices, "diff_seconds"),
             "max_time_gap": max_time_gap_seconds,
-            "max_actual_gap": max([diff.total_seconds() for diff in time_diffs]) if time_diffs else 0,
-            "min_actual_gap": min([diff.total_seconds() for diff in time_diffs]) if time_diffs else 0,
-            "avg_actual_gap": sum([diff.total_seconds() for diff in time_diffs]) / len(time_diffs) if time_diffs else 0
+            "max_actual_gap": float(finite_diffs.max()) if len(finite_diffs) > 0 else 0,
+            "min_actual_gap": float(finite_diffs.min()) if len(finite_diffs) > 0 else 0,
+            "avg_actual_gap": float(finite_diffs.mean()) if len(finite_diffs) > 0 else 0
         }
         
         return is_valid, details
@@ -614,11 +611,12 @@ class DataValidator:
             # デフォルトルールを追加
             self._add_default_rules()
         
-        data = container.data
+        # ソートと派生配列（時間差・距離・速度）は全ルールで1回だけ計算する
+        context = ValidationContext(container.data)
         self.validation_results = []
         
         for rule in self.rules:
-            is_valid, details = rule.validate(data)
+            is_valid, details = rule.validate_context(context)
             
             result = {
                 "rule_name": rule.name,
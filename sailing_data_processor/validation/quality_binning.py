@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+品質スコアのビン集計モジュール
+
+問題レコードのマスクを等間隔の空間グリッド・時間帯に1回の走査（np.bincount）で集計し、
+セルごとのレコード数・問題数・問題率・品質スコアを任意の解像度で計算します。
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def bin_indices(values: np.ndarray, start: float, step: float, bins: int) -> np.ndarray:
+    """
+    等間隔ビンの番号を計算
+
+    ビンは [start + i*step, start + (i+1)*step) で、範囲外の値（最大値を含む）は
+    両端のビンに含めます。
+
+    Parameters
+    ----------
+    values : np.ndarray
+        値の配列
+    start : float
+        最初のビンの下端
+    step : float
+        ビンの幅
+    bins : int
+        ビン数
+
+    Returns
+    -------
+    np.ndarray
+        ビン番号（0〜bins-1）
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if step <= 0:
+        return np.zeros(len(values), dtype=np.int64)
+    index = np.floor((values - start) / step).astype(np.int64)
+    return np.clip(index, 0, bins - 1)
+
+
+def binned_quality(bin_index: np.ndarray, problems: np.ndarray, bin_count: int) -> Dict[str, np.ndarray]:
+    """
+    ビンごとのレコード数・問題数・問題率・品質スコアを集計
+
+    Parameters
+    ----------
+    bin_index : np.ndarray
+        各レコードのビン番号
+    problems : np.ndarray
+        各レコードが問題を含むかどうかの真偽値配列
+    bin_count : int
+        ビンの総数
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        'total_count', 'problem_count', 'problem_rate', 'quality_score'
+        （レコードのないビンの問題率・品質スコアはNaN）
+    """
+    total = np.bincount(bin_index, minlength=bin_count)
+    problem_count = np.bincount(bin_index, weights=np.asarray(problems, dtype=np.float64),
+                                minlength=bin_count).astype(np.int64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        problem_rate = np.where(total > 0, problem_count / np.maximum(total, 1), np.nan)
+
+    return {
+        'total_count': total,
+        'problem_count': problem_count,
+        'problem_rate': problem_rate,
+        'quality_score': 100.0 * (1 - problem_rate),
+    }
+
+
+def _axis(values: np.ndarray, bins: int, bounds: Optional[Tuple[float, float]],
+          default_step: float) -> Tuple[float, float]:
+    """軸の下端とビン幅（範囲が0の場合は既定の幅）"""
+    if bounds is None:
+        low, high = float(values.min()), float(values.max())
+    else:
+        low, high = float(bounds[0]), float(bounds[1])
+    step = (high - low) / bins if high > low else default_step
+    return low, step
+
+
+def spatial_quality_grid(latitudes: np.ndarray, longitudes: np.ndarray, problems: np.ndarray,
+                         lat_bins: int, lon_bins: Optional[int] = None,
+                         lat_bounds: Optional[Tuple[float, float]] = None,
+                         lon_bounds: Optional[Tuple[float, float]] = None,
+                         default_step: float = 0.01) -> Dict[str, np.ndarray]:
+    """
+    緯度経度グリッドごとの品質を集計
+
+    Parameters
+    ----------
+    latitudes, longitudes : np.ndarray
+        各レコードの緯度・経度（有限値のみ）
+    problems : np.ndarray
+        各レコードが問題を含むかどうかの真偽値配列
+    lat_bins : int
+        緯度方向のセル数
+    lon_bins : int, optional
+        経度方向のセル数（省略時は lat_bins と同じ）
+    lat_bounds, lon_bounds : Tuple[float, float], optional
+        グリッドの範囲（省略時はデータの最小値・最大値）
+    default_step : float
+        範囲が0の場合のセル幅（度）
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        (lat_bins, lon_bins) 形状の 'total_count', 'problem_count', 'problem_rate', 'quality_score'
+        と、セル境界 'lat_edges', 'lon_edges'
+    """
+    lon_bins = lat_bins if lon_bins is None else lon_bins
+    lat_start, lat_step = _axis(latitudes, lat_bins, lat_bounds, default_step)
+    lon_start, lon_step = _axis(longitudes, lon_bins, lon_bounds, default_step)
+
+    cell = (bin_indices(latitudes, lat_start, lat_step, lat_bins) * lon_bins +
+            bin_indices(longitudes, lon_start, lon_step, lon_bins))
+    stats = binned_quality(cell, problems, lat_bins * lon_bins)
+
+    grid = {name: values.reshape(lat_bins, lon_bins) for name, values in stats.items()}
+    grid['lat_edges'] = lat_start + lat_step * np.arange(lat_bins + 1)
+    grid['lon_edges'] = lon_start + lon_step * np.arange(lon_bins + 1)
+    return grid
+
+
+def temporal_quality_bins(times_ns: np.ndarray, problems: np.ndarray, bins: int) -> Dict[str, np.ndarray]:
+    """
+    等間隔の時間帯ごとの品質を集計
+
+    Parameters
+    ----------
+    times_ns : np.ndarray
+        各レコードの時刻（int64ナノ秒、欠損なし）
+    problems : np.ndarray
+        各レコードが問題を含むかどうかの真偽値配列
+    bins : int
+        時間帯の数
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        長さ bins の 'total_count', 'problem_count', 'problem_rate', 'quality_score' と、
+        時間帯の境界 'edges_ns'（int64ナノ秒）
+    """
+    times_ns = np.asarray(times_ns, dtype=np.int64)
+    start = int(times_ns.min())
+    span = int(times_ns.max()) - start
+
+    # 先頭からの経過時間でビン番号を求める（絶対時刻をfloat64にすると精度が落ちるため）
+    offsets = (times_ns - start).astype(np.float64)
+    index = bin_indices(offsets, 0.0, span / bins, bins)
+
+    stats = binned_quality(index, problems, bins)
+    stats['edges_ns'] = start + np.round(np.arange(bins + 1) * (span / bins)).astype(np.int64)
+    return stats
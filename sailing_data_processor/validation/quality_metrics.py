@@ -10,6 +10,9 @@ import numpy as np
 from datetime import datetime, timedelta
 import uuid
 
+from sailing_data_processor.validation.quality_binning import spatial_quality_grid, temporal_quality_bins
+from sailing_data_processor.utilities.track_kinematics import datetime_nanoseconds
+
 # データモデルインポートエラーのリスクを回避するため、直接インポートは行わない
 # 代わりに動的インポートまたはタイプヒントのみの参照を使用
 try:
@@ -1012,126 +1015,137 @@ class QualityMetricsCalculator:
             "generated_at": datetime.now().isoformat()
         }
         
-    def calculate_spatial_quality_scores(self) -> List[Dict[str, Any]]:
+    def _problem_mask(self) -> np.ndarray:
         """
-        空間的な品質スコアを計算する
+        各レコードが問題を含むかどうかの真偽値配列
         
         Returns
         -------
-        List[Dict[str, Any]]
-            空間グリッドごとの品質スコア
+        np.ndarray
+            データの行順の真偽値配列
+        """
+        return np.asarray(self.data.index.isin(self.problematic_indices.get("all", [])))
+    
+    def _valid_positions(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        有効な緯度・経度を持つレコードの位置と問題マスク
+        
+        Returns
+        -------
+        Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+            緯度、経度、問題マスク（有効な位置がない場合はNone）
         """
         if self.data.empty or "latitude" not in self.data.columns or "longitude" not in self.data.columns:
-            return []
+            return None
+        
+        latitudes = pd.to_numeric(self.data["latitude"], errors="coerce").to_numpy(dtype=np.float64)
+        longitudes = pd.to_numeric(self.data["longitude"], errors="coerce").to_numpy(dtype=np.float64)
+        valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+        if not valid.any():
+            return None
+        
+        return latitudes[valid], longitudes[valid], self._problem_mask()[valid]
+    
+    def calculate_spatial_quality_scores(self, grid_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        空間的な品質スコアを計算する
         
-        # データからNaNを除外して計算
-        valid_data = self.data.dropna(subset=["latitude", "longitude"])
-        if valid_data.empty:
+        Parameters
+        ----------
+        grid_size : int, optional
+            緯度・経度方向のグリッド分割数（指定しない場合はデータ量に応じて2〜4）
+        
+        Returns
+        -------
+        List[Dict[str, Any]]
+            空間グリッドごとの品質スコア（データのないグリッドは含まない）
+        """
+        positions = self._valid_positions()
+        if positions is None:
             return []
-            
-        # 緯度・経度の範囲を取得
-        lat_min, lat_max = valid_data["latitude"].min(), valid_data["latitude"].max()
-        lon_min, lon_max = valid_data["longitude"].min(), valid_data["longitude"].max()
+        latitudes, longitudes, problems = positions
         
         # グリッド分割数（データ量によって調整）
-        data_size = len(valid_data)
-        if data_size <= 10:
-            grid_count = 2
-        elif data_size <= 100:
-            grid_count = 3
-        else:
-            grid_count = 4
-        
-        # グリッドの作成
-        lat_step = (lat_max - lat_min) / grid_count if lat_max > lat_min else 0.01
-        lon_step = (lon_max - lon_min) / grid_count if lon_max > lon_min else 0.01
+        if grid_size is None:
+            data_size = len(latitudes)
+            if data_size <= 10:
+                grid_size = 2
+            elif data_size <= 100:
+                grid_size = 3
+            else:
+                grid_size = 4
+        
+        grid = spatial_quality_grid(latitudes, longitudes, problems, grid_size)
+        lat_edges, lon_edges = grid["lat_edges"], grid["lon_edges"]
         
         grids = []
-        for i in range(grid_count):
-            for j in range(grid_count):
-                grid_lat_min = lat_min + i * lat_step
-                grid_lat_max = lat_min + (i + 1) * lat_step
-                grid_lon_min = lon_min + j * lon_step
-                grid_lon_max = lon_min + (j + 1) * lon_step
-                
-                # グリッド内のデータポイントをフィルタリング
-                grid_data = valid_data[
-                    (valid_data["latitude"] >= grid_lat_min) & 
-                    (valid_data["latitude"] < grid_lat_max) & 
-                    (valid_data["longitude"] >= grid_lon_min) & 
-                    (valid_data["longitude"] < grid_lon_max)
-                ]
-                
-                # グリッド内のデータがなければスキップ
-                if grid_data.empty:
-                    continue
-                
-                # グリッド内の問題数をカウント
-                problem_count = 0
-                for idx in grid_data.index:
-                    if idx in self.problematic_indices.get("all", []):
-                        problem_count += 1
-                
-                # 品質スコアの計算
-                quality_score = 100.0
-                if len(grid_data) > 0:
-                    quality_score = 100.0 * (1 - (problem_count / len(grid_data)))
-                
-                # グリッド情報の作成
-                grid_info = {
-                    "grid_id": f"grid_{i}_{j}",
-                    "center": [(grid_lat_min + grid_lat_max) / 2, (grid_lon_min + grid_lon_max) / 2],
-                    "bounds": {
-                        "min_lat": grid_lat_min,
-                        "max_lat": grid_lat_max,
-                        "min_lon": grid_lon_min,
-                        "max_lon": grid_lon_max
-                    },
-                    "lat_range": [grid_lat_min, grid_lat_max],
-                    "lon_range": [grid_lon_min, grid_lon_max],
-                    "quality_score": quality_score,
-                    "problem_count": problem_count,
-                    "total_count": len(grid_data),
-                    "problem_percentage": 100.0 * problem_count / len(grid_data) if len(grid_data) > 0 else 0.0,
-                    "impact_level": self._determine_impact_level(quality_score)
-                }
-                
-                grids.append(grid_info)
-        
-        # グリッドがない場合のフォールバック（データが1点だけの場合など）
-        if not grids and not valid_data.empty:
-            center_lat = (lat_min + lat_max) / 2
-            center_lon = (lon_min + lon_max) / 2
+        for i, j in zip(*np.nonzero(grid["total_count"])):
+            grid_lat_min, grid_lat_max = float(lat_edges[i]), float(lat_edges[i + 1])
+            grid_lon_min, grid_lon_max = float(lon_edges[j]), float(lon_edges[j + 1])
+            quality_score = float(grid["quality_score"][i, j])
             
-            # 少なくとも1つのグリッドを作成
             grids.append({
-                "grid_id": "grid_single",
-                "center": [center_lat, center_lon],
+                "grid_id": f"grid_{i}_{j}",
+                "center": [(grid_lat_min + grid_lat_max) / 2, (grid_lon_min + grid_lon_max) / 2],
                 "bounds": {
-                    "min_lat": lat_min - 0.001,
-                    "max_lat": lat_max + 0.001,
-                    "min_lon": lon_min - 0.001,
-                    "max_lon": lon_max + 0.001
+                    "min_lat": grid_lat_min,
+                    "max_lat": grid_lat_max,
+                    "min_lon": grid_lon_min,
+                    "max_lon": grid_lon_max
                 },
-                "lat_range": [lat_min - 0.001, lat_max + 0.001],
-                "lon_range": [lon_min - 0.001, lon_max + 0.001],
-                "quality_score": 100.0,  # データが1点だけなら問題がなさそう
-                "problem_count": 0,
-                "total_count": len(valid_data),
-                "problem_percentage": 0.0,
-                "impact_level": "low"
+                "lat_range": [grid_lat_min, grid_lat_max],
+                "lon_range": [grid_lon_min, grid_lon_max],
+                "quality_score": quality_score,
+                "problem_count": int(grid["problem_count"][i, j]),
+                "total_count": int(grid["total_count"][i, j]),
+                "problem_percentage": 100.0 * float(grid["problem_rate"][i, j]),
+                "impact_level": self._determine_impact_level(quality_score)
             })
         
         return grids
+    
+    def calculate_spatial_quality_heatmap(self, grid_size: int = 100,
+                                          lon_grid_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        空間的な品質スコアをヒートマップ用の2次元配列として計算する
         
-    def calculate_temporal_quality_scores(self) -> List[Dict[str, Any]]:
+        Parameters
+        ----------
+        grid_size : int, optional
+            緯度方向のセル数
+        lon_grid_size : int, optional
+            経度方向のセル数（指定しない場合は grid_size と同じ）
+        
+        Returns
+        -------
+        Dict[str, Any]
+            (緯度セル数, 経度セル数) 形状の total_count, problem_count, problem_rate, quality_score
+            （データのないセルの問題率・品質スコアはNaN）と、セル境界 lat_edges, lon_edges、
+            セル中心 lat_centers, lon_centers。有効な位置がない場合は空の辞書
+        """
+        positions = self._valid_positions()
+        if positions is None:
+            return {}
+        latitudes, longitudes, problems = positions
+        
+        heatmap = spatial_quality_grid(latitudes, longitudes, problems, grid_size, lon_grid_size)
+        heatmap["lat_centers"] = (heatmap["lat_edges"][:-1] + heatmap["lat_edges"][1:]) / 2
+        heatmap["lon_centers"] = (heatmap["lon_edges"][:-1] + heatmap["lon_edges"][1:]) / 2
+        return heatmap
+        
+    def calculate_temporal_quality_scores(self, period_count: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         時間帯別の品質スコアを計算する
         
+        Parameters
+        ----------
+        period_count : int, optional
+            時間帯の数（指定しない場合は10分ごと、最大5区間）
+        
         Returns
         -------
         List[Dict[str, Any]]
-            時間帯ごとの品質スコア
+            時間帯ごとの品質スコア（データのない時間帯は含まない）
         """
         if self.data.empty or "timestamp" not in self.data.columns:
             # テストケースのため最低限の空のリストを返す
@@ -1139,7 +1153,8 @@ class QualityMetricsCalculator:
         
         # タイムスタンプをdatetimeに変換
         try:
-            timestamps = pd.to_datetime(self.data["timestamp"])
+            timestamps = pd.DatetimeIndex(pd.to_datetime(self.data["timestamp"]))
+            problems = self._problem_mask()
             
             # 時間範囲の取得
             start_time = timestamps.min()
@@ -1149,10 +1164,7 @@ class QualityMetricsCalculator:
             time_range = (end_time - start_time).total_seconds()
             if time_range < 60:  # 1分未満
                 # 最低1つは返す
-                problem_count = 0
-                for idx in self.data.index:
-                    if idx in self.problematic_indices.get("all", []):
-                        problem_count += 1
+                problem_count = int(problems.sum())
                 
                 quality_score = 100.0
                 if len(self.data) > 0:
@@ -1172,55 +1184,33 @@ class QualityMetricsCalculator:
                 
                 return [period_info]
             
-            # 時間帯の数（簡易的に固定値）
-            period_count = min(5, max(1, int(time_range / 600)))  # 10分ごとに区切る（最大5区間）
+            # 時間帯の数（10分ごとに区切る、最大5区間）
+            if period_count is None:
+                period_count = min(5, max(1, int(time_range / 600)))
             
-            # 時間帯の作成
+            # 時間帯ごとのレコード数・問題数を一括で集計
+            times_ns, missing = datetime_nanoseconds(timestamps)
+            bins = temporal_quality_bins(times_ns[~missing], problems[~missing], period_count)
             period_duration = timedelta(seconds=time_range / period_count)
-            periods = []
             
-            for i in range(period_count):
+            periods = []
+            for i in np.flatnonzero(bins["total_count"]):
+                i = int(i)
                 period_start = start_time + i * period_duration
                 period_end = start_time + (i + 1) * period_duration
+                quality_score = float(bins["quality_score"][i])
                 
-                # 時間帯のラベル作成
-                label = f"{period_start.strftime('%H:%M')} - {period_end.strftime('%H:%M')}"
-                
-                # 時間帯内のデータポイントをフィルタリング
-                period_data_indices = self.data[
-                    (timestamps >= period_start) & 
-                    (timestamps < period_end)
-                ].index.tolist()
-                
-                # 時間帯内のデータがなければスキップ
-                if not period_data_indices:
-                    continue
-                
-                # 時間帯内の問題数をカウント
-                problem_count = 0
-                for idx in period_data_indices:
-                    if idx in self.problematic_indices.get("all", []):
-                        problem_count += 1
-                
-                # 品質スコアの計算
-                quality_score = 100.0
-                if period_data_indices:
-                    quality_score = 100.0 * (1 - (problem_count / len(period_data_indices)))
-                
-                # 時間帯情報の作成
-                period_info = {
+                periods.append({
                     "period": i,
                     "start_time": period_start.isoformat(),
                     "end_time": period_end.isoformat(),
-                    "label": label,
+                    "label": f"{period_start.strftime('%H:%M')} - {period_end.strftime('%H:%M')}",
                     "quality_score": quality_score,
-                    "problem_count": problem_count,
-                    "total_count": len(period_data_indices),
-                    "problem_percentage": 100.0 * problem_count / len(period_data_indices) if period_data_indices else 0.0,
+                    "problem_count": int(bins["problem_count"][i]),
+                    "total_count": int(bins["total_count"][i]),
+                    "problem_percentage": 100.0 * float(bins["problem_rate"][i]),
                     "impact_level": self._determine_impact_level(quality_score)
-                }
-                
-                periods.append(period_info)
+                })
             
             return periods
             
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+検証ルール間で共有する派生配列を提供するモジュール
+
+タイムスタンプでのソート順、時間差、区間距離、速度、加速度を一度だけ計算し、
+各検証ルールはそれらをNumPy配列（マスク）として参照します。
+"""
+
+from typing import Dict, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.utilities.track_kinematics import haversine_distances, datetime_nanoseconds
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# 1ノット = 0.514444 m/s
+METERS_PER_SECOND_PER_KNOT = 0.514444
+
+
+class ValidationContext:
+    """
+    検証対象データと派生配列のキャッシュ
+
+    派生配列は最初に要求された時点で計算し、同じカラムの組み合わせについては
+    再利用します。位置はすべて「タイムスタンプでソートした後の位置」で表します。
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        検証するデータフレーム
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._orders = {}
+        self._times = {}
+        self._kinematics = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def has_columns(self, *columns: str) -> bool:
+        """指定したカラムがすべて存在するか"""
+        return all(col in self.data.columns for col in columns)
+
+    def sort_order(self, timestamp_column: str = 'timestamp') -> np.ndarray:
+        """
+        タイムスタンプ順の行位置（安定ソート、欠損時刻は末尾）
+
+        Parameters
+        ----------
+        timestamp_column : str
+            タイムスタンプカラム名
+
+        Returns
+        -------
+        np.ndarray
+            ソート後の各位置に対応する元データの行位置
+        """
+        if timestamp_column not in self._orders:
+            times, missing = self._times_ns(timestamp_column)
+            keys = np.where(missing, np.iinfo(np.int64).max, times)
+            self._orders[timestamp_column] = np.argsort(keys, kind='stable')
+        return self._orders[timestamp_column]
+
+    def _times_ns(self, timestamp_column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """元の行順の時刻（int64ナノ秒）と欠損マスク"""
+        if timestamp_column not in self._times:
+            self._times[timestamp_column] = datetime_nanoseconds(pd.to_datetime(self.data[timestamp_column]))
+        return self._times[timestamp_column]
+
+    def sorted_times_ns(self, timestamp_column: str = 'timestamp') -> Tuple[np.ndarray, np.ndarray]:
+        """ソート後の時刻（int64ナノ秒）と欠損マスク"""
+        times, missing = self._times_ns(timestamp_column)
+        order = self.sort_order(timestamp_column)
+        return times[order], missing[order]
+
+    @staticmethod
+    def _diff_seconds(times: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        """連続する時刻間の差（秒、欠損時刻を含む区間はNaN）"""
+        diffs = np.diff(times).astype(np.float64) / 1e9
+        diffs[missing[1:] | missing[:-1]] = np.nan
+        return diffs
+
+    def time_diffs(self, timestamp_column: str = 'timestamp') -> np.ndarray:
+        """
+        ソート後の連続する時刻間の差（秒）
+
+        Returns
+        -------
+        np.ndarray
+            長さ len(data)-1 の時間差。欠損時刻を含む区間はNaN
+        """
+        return self._diff_seconds(*self.sorted_times_ns(timestamp_column))
+
+    def sorted_column(self, column: str, timestamp_column: str = 'timestamp') -> np.ndarray:
+        """ソート後のカラム値"""
+        return self.data[column].to_numpy()[self.sort_order(timestamp_column)]
+
+    def kinematics(self, timestamp_column: str = 'timestamp',
+                   latitude_column: str = 'latitude',
+                   longitude_column: str = 'longitude') -> Dict[str, np.ndarray]:
+        """
+        有効な座標を持つ連続点間の距離・時間差・速度・加速度
+
+        緯度経度が欠損・無限大・範囲外の点は除外し、その前後の有効な点どうしを
+        1つの区間として扱います。
+
+        Parameters
+        ----------
+        timestamp_column : str
+            タイムスタンプカラム名
+        latitude_column : str
+            緯度カラム名
+        longitude_column : str
+            経度カラム名
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            'positions'    : 有効な点のソート後の位置（長さ m）
+            'distance'     : 区間距離（メートル、長さ m-1）
+            'time_diff'    : 区間の時間差（秒）
+            'speed'        : 区間速度（ノット、時間差が0以下または欠損の区間は無限大）
+            'acceleration' : 直前区間からの速度変化率（ノット/秒、先頭区間はNaN）
+            'skipped'      : 除外した点の数
+        """
+        key = (timestamp_column, latitude_column, longitude_column)
+        if key in self._kinematics:
+            return self._kinematics[key]
+
+        order = self.sort_order(timestamp_column)
+        lats = pd.to_numeric(self.data[latitude_column], errors='coerce').to_numpy(dtype=np.float64)[order]
+        lons = pd.to_numeric(self.data[longitude_column], errors='coerce').to_numpy(dtype=np.float64)[order]
+        valid = np.isfinite(lats) & np.isfinite(lons) & (np.abs(lats) <= 90)
+        positions = np.flatnonzero(valid)
+
+        if (~valid).any():
+            logger.warning(f"無効な座標値の点を {int((~valid).sum())} 個スキップしました")
+
+        times, missing = self.sorted_times_ns(timestamp_column)
+        distance = haversine_distances(lats[positions[:-1]], lons[positions[:-1]],
+                                       lats[positions[1:]], lons[positions[1:]])
+        time_diff = self._diff_seconds(times[positions], missing[positions])
+
+        moving = time_diff > 0  # NaNはFalseになる
+        speed = np.full(len(time_diff), np.inf)
+        speed[moving] = distance[moving] / time_diff[moving] / METERS_PER_SECOND_PER_KNOT
+
+        acceleration = np.full(len(time_diff), np.nan)
+        if len(speed) > 1:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                acceleration[1:] = np.diff(speed) / time_diff[1:]
+
+        result = {
+            'positions': positions,
+            'distance': distance,
+            'time_diff': time_diff,
+            'speed': speed,
+            'acceleration': acceleration,
+            'skipped': int((~valid).sum()),
+        }
+        self._kinematics[key] = result
+        return result
+
+    def original_index(self, sorted_positions: np.ndarray,
+                       timestamp_column: str = 'timestamp') -> pd.Index:
+        """ソート後の位置を元データのインデックスに変換"""
+        return self.data.index[self.sort_order(timestamp_column)[sorted_positions]]
@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.wind.maneuver_kernel モジュール
+
+マニューバー（タック・ジャイブ）検出の配列演算カーネルを提供します。
+
+方位差分の計算、移動ウィンドウの統計量（円周平均を含む）、マニューバー区間の抽出、
+タック/ジャイブの分類をすべてNumPyの配列演算で行います。
+WindEstimator・WindEstimatorImproved・OptimizedWindEstimator はこのモジュールを
+共通に使用するため、行ごとのPythonループを持ちません。
+"""
+
+import numpy as np
+from typing import Tuple, Union
+
+ArrayLike = Union[np.ndarray, list, float]
+
+
+def angle_difference(angle1: ArrayLike, angle2: ArrayLike) -> np.ndarray:
+    """
+    2つの角度間の最小差分（angle1 - angle2）を計算する
+
+    Parameters:
+    -----------
+    angle1 : array-like
+        1つ目の角度（度）
+    angle2 : array-like
+        2つ目の角度（度）
+
+    Returns:
+    --------
+    np.ndarray
+        最小角度差（度、-180〜180）
+    """
+    a1 = np.mod(np.asarray(angle1, dtype=float), 360)
+    a2 = np.mod(np.asarray(angle2, dtype=float), 360)
+    return np.mod(a1 - a2 + 180, 360) - 180
+
+
+def signed_angle_change(angle_from: ArrayLike, angle_to: ArrayLike) -> np.ndarray:
+    """
+    角度の変化量（angle_to - angle_from）を計算する
+
+    calculate_angle_change の配列版です。ちょうど±180度の変化は符号を保持します。
+
+    Parameters:
+    -----------
+    angle_from : array-like
+        変化前の角度（度）
+    angle_to : array-like
+        変化後の角度（度）
+
+    Returns:
+    --------
+    np.ndarray
+        角度変化（度、-180〜180）
+    """
+    diff = np.asarray(angle_to, dtype=float) - np.asarray(angle_from, dtype=float)
+    wrapped = np.mod(diff + 180, 360) - 180
+    return np.where((wrapped == -180) & (diff > 0), 180.0, wrapped)
+
+
+def heading_deltas(headings: ArrayLike) -> np.ndarray:
+    """
+    連続する方位の差分を計算する
+
+    Parameters:
+    -----------
+    headings : array-like
+        方位の系列（度）
+
+    Returns:
+    --------
+    np.ndarray
+        各点の直前の点からの方位変化（度、-180〜180）。先頭は0
+    """
+    headings = np.asarray(headings, dtype=float)
+    deltas = np.zeros(len(headings))
+    if len(headings) > 1:
+        deltas[1:] = angle_difference(headings[1:], headings[:-1])
+    return deltas
+
+
+def window_bounds(length: int, before: int, after: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    各点を中心とする移動ウィンドウの範囲を計算する
+
+    Parameters:
+    -----------
+    length : int
+        系列の長さ
+    before : int
+        中心より前に含める点数
+    after : int
+        中心より後に含める点数
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (開始位置, 終了位置)。終了位置は含まない
+    """
+    positions = np.arange(length)
+    starts = np.maximum(positions - before, 0)
+    ends = np.minimum(positions + after + 1, length)
+    return starts, ends
+
+
+def centered_window(window_size: int) -> Tuple[int, int]:
+    """
+    pandas の rolling(center=True) と同じウィンドウの前後の点数を返す
+
+    Parameters:
+    -----------
+    window_size : int
+        ウィンドウサイズ
+
+    Returns:
+    --------
+    Tuple[int, int]
+        (前の点数, 後の点数)
+    """
+    window_size = max(1, int(window_size))
+    after = (window_size - 1) // 2
+    return window_size - 1 - after, after
+
+
+def window_sums(values: ArrayLike, starts: np.ndarray, ends: np.ndarray,
+                skipna: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    任意の範囲 [starts, ends) ごとの合計と有効点数を累積和で計算する
+
+    Parameters:
+    -----------
+    values : array-like
+        値の系列
+    starts : np.ndarray
+        各範囲の開始位置
+    ends : np.ndarray
+        各範囲の終了位置（含まない）
+    skipna : bool, optional
+        Falseの場合、NaNを含む範囲の合計はNaN
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (合計, 有効点数)
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    sums = csum[ends] - csum[starts]
+    counts = ccount[ends] - ccount[starts]
+
+    if not skipna:
+        sums = np.where(counts < ends - starts, np.nan, sums)
+    return sums, counts
+
+
+def window_means(values: ArrayLike, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    範囲 [starts, ends) ごとの平均をNaNを除いて計算する
+
+    Parameters:
+    -----------
+    values : array-like
+        値の系列
+    starts : np.ndarray
+        各範囲の開始位置
+    ends : np.ndarray
+        各範囲の終了位置（含まない）
+
+    Returns:
+    --------
+    np.ndarray
+        平均値（有効な点がない範囲はNaN）
+    """
+    sums, counts = window_sums(values, starts, ends)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def window_circular_means(angles: ArrayLike, starts: np.ndarray,
+                          ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    範囲 [starts, ends) ごとの角度の円周平均を計算する
+
+    Parameters:
+    -----------
+    angles : array-like
+        角度の系列（度）
+    starts : np.ndarray
+        各範囲の開始位置
+    ends : np.ndarray
+        各範囲の終了位置（含まない）
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (平均角度（度、0-360）, 平均合成ベクトル長（0-1、1に近いほど方位が揃っている）)
+    """
+    radians = np.radians(np.asarray(angles, dtype=float))
+    sin_sums, counts = window_sums(np.sin(radians), starts, ends)
+    cos_sums, _ = window_sums(np.cos(radians), starts, ends)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_sin = np.where(counts > 0, sin_sums / np.maximum(counts, 1), np.nan)
+        mean_cos = np.where(counts > 0, cos_sums / np.maximum(counts, 1), np.nan)
+
+    mean_angle = np.mod(np.degrees(np.arctan2(mean_sin, mean_cos)), 360)
+    resultant = np.hypot(mean_sin, mean_cos)
+    return mean_angle, resultant
+
+
+def rolling_mean(values: ArrayLike, window_size: int) -> np.ndarray:
+    """
+    中心化した移動平均（rolling(window, min_periods=1, center=True).mean() 相当）
+
+    Parameters:
+    -----------
+    values : array-like
+        値の系列
+    window_size : int
+        ウィンドウサイズ
+
+    Returns:
+    --------
+    np.ndarray
+        移動平均
+    """
+    values = np.asarray(values, dtype=float)
+    starts, ends = window_bounds(len(values), *centered_window(window_size))
+    return window_means(values, starts, ends)
+
+
+def rolling_circular_mean(headings: ArrayLike, window_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    中心化した移動ウィンドウでの方位の円周平均
+
+    Parameters:
+    -----------
+    headings : array-like
+        方位の系列（度）
+    window_size : int
+        ウィンドウサイズ
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (平均方位（度、0-360）, 平均合成ベクトル長)
+    """
+    headings = np.asarray(headings, dtype=float)
+    starts, ends = window_bounds(len(headings), *centered_window(window_size))
+    return window_circular_means(headings, starts, ends)
+
+
+def flag_segments(mask: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    真偽値の系列から連続してTrueとなる区間を抽出する
+
+    Parameters:
+    -----------
+    mask : array-like
+        真偽値の系列
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (区間の開始位置, 区間の終了位置（含まない）)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def segment_argmax(values: ArrayLike, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    区間ごとに最大値をとる最初の位置を求める（NaNは無視）
+
+    Parameters:
+    -----------
+    values : array-like
+        値の系列
+    starts : np.ndarray
+        区間の開始位置
+    ends : np.ndarray
+        区間の終了位置（含まない）。区間は重ならず、空でないこと
+
+    Returns:
+    --------
+    np.ndarray
+        各区間の最大値の位置（すべてNaNの区間は開始位置）
+    """
+    values = np.asarray(values, dtype=float)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # 開始・終了位置を交互に並べて reduceat で区間ごとの最大値を求める
+    padded = np.append(values, np.nan)
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    with np.errstate(invalid='ignore'):
+        segment_max = np.fmax.reduceat(padded, bounds)[0::2]
+
+    lengths = ends - starts
+    segment_ids = np.repeat(np.arange(len(starts)), lengths)
+    positions = np.repeat(starts - np.cumsum(np.concatenate(([0], lengths[:-1]))), lengths)
+    positions += np.arange(lengths.sum())
+
+    hits = values[positions] == segment_max[segment_ids]
+    result = starts.copy()
+    hit_segments, first = np.unique(segment_ids[hits], return_index=True)
+    result[hit_segments] = positions[hits][first]
+    return result
+
+
+def segment_argmin(values: ArrayLike, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    区間ごとに最小値をとる最初の位置を求める（NaNは無視）
+
+    Parameters:
+    -----------
+    values : array-like
+        値の系列
+    starts : np.ndarray
+        区間の開始位置
+    ends : np.ndarray
+        区間の終了位置（含まない）
+
+    Returns:
+    --------
+    np.ndarray
+        各区間の最小値の位置
+    """
+    return segment_argmax(-np.asarray(values, dtype=float), starts, ends)
+
+
+def time_windows(timestamps_ns: np.ndarray, centers_ns: np.ndarray,
+                 before_seconds: float, after_seconds: float
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    各中心時刻の前後の時間ウィンドウを二分探索で求める
+
+    前のウィンドウは [中心 - before_seconds, 中心)、後のウィンドウは
+    (中心, 中心 + after_seconds] の範囲です。
+
+    Parameters:
+    -----------
+    timestamps_ns : np.ndarray
+        昇順に並んだ時刻（int64ナノ秒）
+    centers_ns : np.ndarray
+        中心時刻（int64ナノ秒）
+    before_seconds : float
+        前のウィンドウの長さ（秒）
+    after_seconds : float
+        後のウィンドウの長さ（秒）
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        (前の開始位置, 前の終了位置, 後の開始位置, 後の終了位置)。終了位置は含まない
+    """
+    centers_ns = np.asarray(centers_ns, dtype=np.int64)
+    before_ns = np.int64(round(before_seconds * 1e9))
+    after_ns = np.int64(round(after_seconds * 1e9))
+
+    before_start = np.searchsorted(timestamps_ns, centers_ns - before_ns, side='left')
+    before_end = np.searchsorted(timestamps_ns, centers_ns, side='left')
+    after_start = np.searchsorted(timestamps_ns, centers_ns, side='right')
+    after_end = np.searchsorted(timestamps_ns, centers_ns + after_ns, side='right')
+    return before_start, before_end, after_start, after_end
+
+
+def point_of_sail(relative_angles: ArrayLike, upwind_threshold: float = 45.0,
+                  downwind_threshold: float = 120.0) -> np.ndarray:
+    """
+    風に対する相対角度から帆走状態を判定する（determine_point_state の配列版）
+
+    Parameters:
+    -----------
+    relative_angles : array-like
+        風に対する相対角度（度）
+    upwind_threshold : float, optional
+        風上判定の閾値
+    downwind_threshold : float, optional
+        風下判定の閾値
+
+    Returns:
+    --------
+    np.ndarray
+        'upwind', 'downwind', 'reaching' の配列
+    """
+    folded = np.abs(np.mod(np.asarray(relative_angles, dtype=float) + 180, 360) - 180)
+    return np.select(
+        [folded <= upwind_threshold, folded >= downwind_threshold],
+        ['upwind', 'downwind'],
+        default='reaching'
+    ).astype(object)
+
+
+def sailing_states(courses: ArrayLike, wind_direction: float, upwind_threshold: float = 45.0,
+                   downwind_threshold: float = 120.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    コースと風向から帆走状態とタック（ポート/スターボード）を判定する
+
+    Parameters:
+    -----------
+    courses : array-like
+        艇の進行方向（度）
+    wind_direction : float
+        風向（度）
+    upwind_threshold : float, optional
+        風上判定の閾値
+    downwind_threshold : float, optional
+        風下判定の閾値
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        (風に対する相対角度（-180〜180）, 帆走状態, タック)
+    """
+    rel_angles = angle_difference(courses, wind_direction)
+    points = point_of_sail(rel_angles, upwind_threshold, downwind_threshold)
+    tacks = np.where(rel_angles >= 0, 'port', 'starboard').astype(object)
+    return rel_angles, points, tacks
+
+
+def classify_maneuvers(before_bearing: ArrayLike, after_bearing: ArrayLike, wind_direction: float,
+                       speed_before: ArrayLike, speed_after: ArrayLike,
+                       upwind_threshold: float = 45.0, downwind_threshold: float = 120.0
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    マニューバー前後の方位と速度からタック/ジャイブを分類する
+
+    タックの変更（ポート/スターボード）、前後の帆走状態、方位変化（60〜150度）、
+    減速の有無をスコア化し、スコアの高い方を採用します。
+
+    Parameters:
+    -----------
+    before_bearing : array-like
+        マニューバー前の進行方向（度）
+    after_bearing : array-like
+        マニューバー後の進行方向（度）
+    wind_direction : float
+        風向（度）
+    speed_before : array-like
+        マニューバー前の速度
+    speed_after : array-like
+        マニューバー後の速度
+    upwind_threshold : float, optional
+        風上判定の閾値
+    downwind_threshold : float, optional
+        風下判定の閾値
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        (マニューバータイプ, 信頼度, マニューバー前の状態, マニューバー後の状態)。
+        状態は 'upwind_port' のように帆走状態とタックを結合した文字列
+    """
+    _, before_point, before_tack = sailing_states(
+        before_bearing, wind_direction, upwind_threshold, downwind_threshold)
+    _, after_point, after_tack = sailing_states(
+        after_bearing, wind_direction, upwind_threshold, downwind_threshold)
+
+    abs_change = np.abs(angle_difference(after_bearing, before_bearing))
+    speed_before = np.asarray(speed_before, dtype=float)
+    speed_after = np.asarray(speed_after, dtype=float)
+
+    tack_changed = before_tack != after_tack
+    typical_angle = (abs_change >= 60) & (abs_change <= 150)
+    with np.errstate(invalid='ignore'):
+        slowed = speed_after < speed_before * 0.9
+
+    before_upwind = before_point == 'upwind'
+    after_upwind = after_point == 'upwind'
+    before_reaching = before_point == 'reaching'
+    after_reaching = after_point == 'reaching'
+
+    upwind_side = (before_upwind | before_reaching) & (after_upwind | after_reaching)
+    downwind_side = ((before_point == 'downwind') | before_reaching) & \
+        ((after_point == 'downwind') | after_reaching)
+
+    tack_score = (tack_changed.astype(int) + upwind_side + typical_angle + slowed) / 4
+    jibe_score = (tack_changed.astype(int) + downwind_side + typical_angle) / 3
+
+    is_tack = (tack_score > jibe_score) & (tack_score > 0.5)
+    is_jibe = ~is_tack & (jibe_score > 0.5)
+    is_bear_away = before_upwind & ~after_upwind
+    is_head_up = ~before_upwind & after_upwind
+
+    conditions = [~tack_changed, is_tack, is_jibe, is_bear_away, is_head_up]
+    types = np.select(conditions, ['course_change', 'tack', 'jibe', 'bear_away', 'head_up'],
+                      default='unknown').astype(object)
+    confidences = np.select(
+        conditions,
+        [0.6, np.minimum(1.0, tack_score * 1.2), np.minimum(1.0, jibe_score * 1.2), 0.8, 0.8],
+        default=0.5
+    )
+
+    before_states = before_point + '_' + before_tack
+    after_states = after_point + '_' + after_tack
+    return types, confidences, before_states, after_states
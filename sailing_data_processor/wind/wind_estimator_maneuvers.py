@@ -11,6 +11,7 @@ from typing import Dict, List, Tuple, Optional, Union, Any
 import warnings
 
 from sailing_data_processor.wind.wind_estimator_utils import normalize_angle, calculate_angle_change
+from sailing_data_processor.wind.maneuver_kernel import signed_angle_change, window_bounds, classify_maneuvers
 
 def determine_point_state(relative_angle: float, 
                         upwind_range: float = 45.0, 
@@ -52,49 +53,76 @@ def determine_point_state(relative_angle: float,
     # それ以外はリーチング
     return 'reaching'
 
-def detect_tacks(data: pd.DataFrame, min_tack_angle: float = 60.0) -> pd.DataFrame:
+def _detect_heading_changes(data: pd.DataFrame, min_angle: float, signed: bool) -> pd.DataFrame:
     """
-    タックを検出する
-    
+    前後の点の方位変化が閾値を超える点を一括で抽出する
+
     Parameters:
     -----------
     data : pd.DataFrame
         GPSデータ（heading/course列を含む）
-    min_tack_angle : float, optional
-        タック検出の最小角度変化（度）
-        
+    min_angle : float
+        最小角度変化（度）
+    signed : bool
+        Trueの場合は右旋回（正の変化）のみを対象とする
+
     Returns:
     --------
     pd.DataFrame
-        検出されたタックのデータフレーム
+        検出された点のデータフレーム
     """
     if data.empty or len(data) < 3:
         return pd.DataFrame()
-    
+
     heading_col = 'heading' if 'heading' in data.columns else 'course'
     if heading_col not in data.columns:
         return pd.DataFrame()
+
+    headings = data[heading_col].to_numpy(dtype=float)
+
+    # 前後1点のウィンドウでヘディングの変化を計算（180度をまたぐ場合の処理を含む）
+    starts, ends = window_bounds(len(headings), 1, 1)
+    interior = np.arange(1, len(headings) - 1)
+    before = headings[starts[interior]]
+    after = headings[ends[interior] - 1]
+    changes = signed_angle_change(before, after)
+    detected = np.flatnonzero(changes > min_angle if signed else np.abs(changes) > min_angle)
+    indices = interior[detected]
+
+    if len(indices) == 0:
+        return pd.DataFrame()
+
+    if 'timestamp' in data.columns:
+        timestamps = data['timestamp'].iloc[indices].reset_index(drop=True)
+    else:
+        timestamps = indices
+
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'angle_change': np.abs(changes[detected]),
+        'heading_before': before[detected],
+        'heading_after': after[detected],
+        'index': indices
+    })
+
+def detect_tacks(data: pd.DataFrame, min_tack_angle: float = 60.0) -> pd.DataFrame:
+    """
+    タックを検出する
     
-    tacks = []
-    for i in range(1, len(data)-1):
-        heading_prev = data.iloc[i-1][heading_col]
-        heading_current = data.iloc[i][heading_col]
-        heading_next = data.iloc[i+1][heading_col]
-        
-        # ヘディングの変化を計算（180度をまたぐ場合の処理を含む）
-        angle_change = calculate_angle_change(heading_prev, heading_next)
+    Parameters:
+    -----------
+    data : pd.DataFrame
+        GPSデータ（heading/course列を含む）
+    min_tack_angle : float, optional
+        タック検出の最小角度変化（度）
         
-        # タック判定（角度が急激に変化）
-        if abs(angle_change) > min_tack_angle:
-            tacks.append({
-                'timestamp': data.iloc[i]['timestamp'] if 'timestamp' in data.columns else i,
-                'angle_change': abs(angle_change),
-                'heading_before': heading_prev,
-                'heading_after': heading_next,
-                'index': i
-            })
-    
-    return pd.DataFrame(tacks)
+    Returns:
+    --------
+    pd.DataFrame
+        検出されたタックのデータフレーム
+    """
+    # タック判定（角度が急激に変化）
+    return _detect_heading_changes(data, min_tack_angle, signed=False)
 
 def detect_gybes(data: pd.DataFrame, min_gybe_angle: float = 60.0) -> pd.DataFrame:
     """
@@ -112,33 +140,8 @@ def detect_gybes(data: pd.DataFrame, min_gybe_angle: float = 60.0) -> pd.DataFra
     pd.DataFrame
         検出されたジャイブのデータフレーム
     """
-    if data.empty or len(data) < 3:
-        return pd.DataFrame()
-    
-    heading_col = 'heading' if 'heading' in data.columns else 'course'
-    if heading_col not in data.columns:
-        return pd.DataFrame()
-    
-    gybes = []
-    for i in range(1, len(data)-1):
-        heading_prev = data.iloc[i-1][heading_col]
-        heading_current = data.iloc[i][heading_col]
-        heading_next = data.iloc[i+1][heading_col]
-        
-        # ヘディングの変化を計算
-        angle_change = calculate_angle_change(heading_prev, heading_next)
-        
-        # ジャイブ判定（右旋回）
-        if angle_change > min_gybe_angle:
-            gybes.append({
-                'timestamp': data.iloc[i]['timestamp'] if 'timestamp' in data.columns else i,
-                'angle_change': abs(angle_change),
-                'heading_before': heading_prev,
-                'heading_after': heading_next,
-                'index': i
-            })
-    
-    return pd.DataFrame(gybes)
+    # ジャイブ判定（右旋回）
+    return _detect_heading_changes(data, min_gybe_angle, signed=True)
 
 def detect_maneuvers(data: pd.DataFrame, wind_direction=None, 
                     min_tack_angle: float = 60.0) -> pd.DataFrame:
@@ -159,65 +162,100 @@ def detect_maneuvers(data: pd.DataFrame, wind_direction=None,
     pd.DataFrame
         検出されたマニューバーのデータフレーム
     """
-    # まずタックとジャイブを検出
+    # 風向が指定されている場合は、方位が変化した点を共通カーネルでタック/ジャイブに分類
+    if wind_direction is not None:
+        return _classify_heading_changes(data, detect_tacks(data, min_tack_angle), wind_direction)
+
+    # 風向がない場合は旋回方向のみで判定
     tacks = detect_tacks(data, min_tack_angle)
     gybes = detect_gybes(data, min_tack_angle)
     
-    maneuvers_list = []
-    
-    # タックのデータを追加
-    if not tacks.empty:
-        for _, tack in tacks.iterrows():
-            maneuver_data = {
-                'timestamp': tack['timestamp'],
-                'maneuver_type': 'tack',
-                'angle_change': tack['angle_change'],
-                'before_bearing': tack['heading_before'],
-                'after_bearing': tack['heading_after'],
-                'maneuver_confidence': 0.8,  # デフォルトの信頼度
-                'before_state': 'unknown',
-                'after_state': 'unknown'
-            }
-            
-            # 風向が指定されている場合は状態を判定
-            if wind_direction is not None:
-                maneuver_data['before_state'] = determine_point_state(
-                    tack['heading_before'] - wind_direction)
-                maneuver_data['after_state'] = determine_point_state(
-                    tack['heading_after'] - wind_direction)
-            
-            maneuvers_list.append(maneuver_data)
-    
-    # ジャイブのデータを追加
-    if not gybes.empty:
-        for _, gybe in gybes.iterrows():
-            maneuver_data = {
-                'timestamp': gybe['timestamp'],
-                'maneuver_type': 'jibe',
-                'angle_change': gybe['angle_change'],
-                'before_bearing': gybe['heading_before'],
-                'after_bearing': gybe['heading_after'],
-                'maneuver_confidence': 0.8,  # デフォルトの信頼度
-                'before_state': 'unknown',
-                'after_state': 'unknown'
-            }
-            
-            # 風向が指定されている場合は状態を判定
-            if wind_direction is not None:
-                maneuver_data['before_state'] = determine_point_state(
-                    gybe['heading_before'] - wind_direction)
-                maneuver_data['after_state'] = determine_point_state(
-                    gybe['heading_after'] - wind_direction)
-            
-            maneuvers_list.append(maneuver_data)
+    frames = []
+    for detected, maneuver_type in ((tacks, 'tack'), (gybes, 'jibe')):
+        if detected.empty:
+            continue
+        
+        maneuvers = pd.DataFrame({
+            'timestamp': detected['timestamp'],
+            'maneuver_type': maneuver_type,
+            'angle_change': detected['angle_change'],
+            'before_bearing': detected['heading_before'],
+            'after_bearing': detected['heading_after'],
+            'maneuver_confidence': 0.8,  # デフォルトの信頼度
+            'before_state': 'unknown',
+            'after_state': 'unknown'
+        })
+        
+        frames.append(maneuvers)
     
     # タイムスタンプでソート
-    maneuvers_df = pd.DataFrame(maneuvers_list)
-    if not maneuvers_df.empty and 'timestamp' in maneuvers_df.columns:
+    if not frames:
+        return pd.DataFrame()
+    
+    maneuvers_df = pd.concat(frames, ignore_index=True)
+    if 'timestamp' in maneuvers_df.columns:
         maneuvers_df = maneuvers_df.sort_values('timestamp')
         
     return maneuvers_df
 
+def _classify_heading_changes(data: pd.DataFrame, detected: pd.DataFrame, wind_direction: float) -> pd.DataFrame:
+    """
+    検出した方位変化を前後の方位・速度と風向から分類する（maneuver_kernel.classify_maneuvers）
+
+    Parameters:
+    -----------
+    data : pd.DataFrame
+        GPSデータ
+    detected : pd.DataFrame
+        _detect_heading_changes の結果
+    wind_direction : float
+        風向（度）
+
+    Returns:
+    --------
+    pd.DataFrame
+        分類したマニューバーのデータフレーム（舷も風上セクターも変わらない変化は除外）
+    """
+    if detected.empty:
+        return pd.DataFrame()
+
+    indices = detected['index'].to_numpy()
+    speed_col = 'sog' if 'sog' in data.columns else 'speed'
+    if speed_col in data.columns:
+        speeds = data[speed_col].to_numpy(dtype=float)
+        speed_before, speed_after = speeds[indices - 1], speeds[indices + 1]
+    else:
+        speed_before = speed_after = np.full(len(indices), np.nan)
+
+    maneuver_type, confidence, before_state, after_state = classify_maneuvers(
+        detected['heading_before'].to_numpy(dtype=float), detected['heading_after'].to_numpy(dtype=float),
+        wind_direction, speed_before, speed_after
+    )
+
+    # 同じタックのまま風上セクターを出入りした変化はベアウェイ/ヘッドアップとする
+    before_upwind = np.char.startswith(before_state.astype(str), 'upwind')
+    after_upwind = np.char.startswith(after_state.astype(str), 'upwind')
+    same_tack = maneuver_type == 'course_change'
+    maneuver_type = np.select(
+        [same_tack & before_upwind & ~after_upwind, same_tack & ~before_upwind & after_upwind],
+        ['bear_away', 'head_up'], default=maneuver_type
+    )
+    confidence = np.where(same_tack & (before_upwind != after_upwind), 0.8, confidence)
+
+    maneuvers = pd.DataFrame({
+        'timestamp': detected['timestamp'].to_numpy(),
+        'maneuver_type': maneuver_type,
+        'angle_change': detected['angle_change'].to_numpy(),
+        'before_bearing': detected['heading_before'].to_numpy(),
+        'after_bearing': detected['heading_after'].to_numpy(),
+        'maneuver_confidence': confidence,
+        'before_state': before_state,
+        'after_state': after_state
+    })
+
+    # 舷も風上/風下のセクターも変わらない方位変化はマニューバーとして扱わない
+    return maneuvers[maneuvers['maneuver_type'] != 'course_change'].reset_index(drop=True)
+
 def categorize_maneuver(before_bearing: float, after_bearing: float, 
                       wind_direction: float, 
                       upwind_threshold: float = 45.0,
@@ -17,6 +17,9 @@ import gc
 import os
 import sys
 
+from sailing_data_processor.wind import maneuver_kernel
+from sailing_data_processor.utilities.track_kinematics import datetime_nanoseconds
+
 class WindEstimatorImproved:
     """
     風向風速推定クラス (改良版)
@@ -84,6 +87,15 @@ class WindEstimatorImproved:
             "default_upwind_angle": 42.0,
             "default_downwind_angle": 150.0,
             
+            # 移動ウィンドウ推定のウィンドウ長（秒）
+            "rolling_window_seconds": 600.0,
+            
+            # 移動ウィンドウ推定の出力間隔（秒）
+            "rolling_step_seconds": 60.0,
+            
+            # 移動ウィンドウ推定で信頼度が最大となるウィンドウ内のマニューバー数
+            "rolling_full_confidence_maneuvers": 4,
+            
             # キャッシュサイズ
             "cache_size": 128
         }
@@ -226,19 +238,11 @@ class WindEstimatorImproved:
         # NaNを除外
         df = df.dropna(subset=['course_prev'])
         
-        # 方位変化を計算
-        bearing_change = np.zeros(len(df), dtype=np.float32)
-        
-        # numpyによるベクトル計算
-        course_array = df['course'].values
-        course_prev_array = df['course_prev'].values
-        
-        for i in range(len(df)):
-            # 効率的な角度差の計算
-            angle_diff = ((course_array[i] - course_prev_array[i] + 180) % 360) - 180
-            bearing_change[i] = abs(angle_diff)
-        
-        df['bearing_change'] = bearing_change
+        # 方位変化を計算（ベクトル化）
+        angle_diff = maneuver_kernel.angle_difference(
+            df['course'].to_numpy(dtype=float), df['course_prev'].to_numpy(dtype=float)
+        )
+        df['bearing_change'] = np.abs(angle_diff).astype(np.float32)
         
         return df
 
@@ -356,7 +360,7 @@ class WindEstimatorImproved:
         # タックの識別（風上または風上付近での操船、風位置が大きく変わる）
         tack_conditions = [
             # タックの必要条件：タックの変更
-            before_tack \!= after_tack,
+            before_tack != after_tack,
             
             # どちらも風上またはリーチングの状態（より正確に）
             ('upwind' in before_state or 'reaching' in before_state) and 
@@ -372,7 +376,7 @@ class WindEstimatorImproved:
         # ジャイブの識別（風下または風下付近での操船、風位置が大きく変わる）
         jibe_conditions = [
             # ジャイブの必要条件：タックの変更
-            before_tack \!= after_tack,
+            before_tack != after_tack,
             
             # どちらも風下またはリーチングの状態
             ('downwind' in before_state or 'reaching' in before_state) and 
@@ -392,10 +396,10 @@ class WindEstimatorImproved:
             return "tack", min(1.0, tack_score * 1.2)
         elif jibe_score > 0.5:
             return "jibe", min(1.0, jibe_score * 1.2)
-        elif before_point == 'upwind' and after_point \!= 'upwind':
+        elif before_point == 'upwind' and after_point != 'upwind':
             # 風上から風下/リーチングへの転換 (ベアウェイ)
             return "bear_away", 0.8
-        elif before_point \!= 'upwind' and after_point == 'upwind':
+        elif before_point != 'upwind' and after_point == 'upwind':
             # 風下/リーチングから風上への転換 (ヘッドアップ)
             return "head_up", 0.8
         else:
@@ -455,6 +459,27 @@ class WindEstimatorImproved:
                 }
                 return pd.DataFrame(dummy_data)
         
+        return self._detect_maneuvers_vectorized(df, wind_direction, min_angle_change)
+
+    def _detect_maneuvers_vectorized(self, df: pd.DataFrame, wind_direction: float = None,
+                                     min_angle_change: float = None) -> pd.DataFrame:
+        """
+        マニューバー検出の本体（maneuver_kernel による配列演算）
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            GPSデータフレーム
+        wind_direction : float, optional
+            風向（度、0-360）。指定されない場合は計算から推定
+        min_angle_change : float, optional
+            検出する最小角度変化（度）
+            
+        Returns:
+        --------
+        pd.DataFrame
+            検出されたマニューバーのデータフレーム
+        """
         # データチェック
         if df.empty or len(df) < 10:
             return pd.DataFrame()
@@ -473,11 +498,14 @@ class WindEstimatorImproved:
         if 'speed' not in df.columns:
             df = self._calculate_speed(df.copy())
         
-        # 方位変化の計算
-        df_copy = df.copy()
-        df_copy = self._calculate_bearing_change(df_copy)
+        # 方位変化の計算（前の点の方位がない点は除外）
+        courses = df['course'].to_numpy(dtype=float)
+        rows = np.flatnonzero(~np.isnan(courses[:-1])) + 1
+        bearing_change = np.abs(
+            maneuver_kernel.angle_difference(courses[rows], courses[rows - 1])
+        ).astype(np.float32)
         
-        if len(df_copy) < 5:
+        if len(rows) < 5:
             return pd.DataFrame()
         
         # 検出用パラメータの設定
@@ -494,112 +522,106 @@ class WindEstimatorImproved:
                 warnings.warn(f"風向推定エラー: {str(e)}")
                 wind_direction = 0.0
         
-        # 移動平均でノイズを軽減（ウィンドウサイズはパラメータから取得）
+        # 移動ウィンドウ内の方位変化の合計（ウィンドウサイズはパラメータから取得）
+        # マニューバー全体の旋回角を最小角度変化と比較するため、平均ではなく合計を使う
         window_size = self.params['maneuver_window_size']
-        df_copy['bearing_change_ma'] = df_copy['bearing_change'].rolling(
-            window=window_size, min_periods=1, center=True
-        ).mean()
+        window_starts, window_ends = maneuver_kernel.window_bounds(
+            len(bearing_change), *maneuver_kernel.centered_window(window_size)
+        )
+        window_turn, _ = maneuver_kernel.window_sums(bearing_change, window_starts, window_ends)
         
         # マニューバー（大きな方向転換）の検出
-        # タック/ジャイブの判定を安定化するためしきい値より大きい変化を検出
-        df_copy['is_maneuver'] = df_copy['bearing_change_ma'] > min_angle_change
+        # 連続してしきい値を超える区間を一つのマニューバーとしてまとめる
+        starts, ends = maneuver_kernel.flag_segments(window_turn > min_angle_change)
+        if len(starts) == 0:
+            return self._empty_maneuvers_frame()
+        
+        # グループ内で最も大きな方向変化を持つ点を中心とする
+        central_rows = rows[maneuver_kernel.segment_argmax(bearing_change, starts, ends)]
+        
+        # 前後の時間帯（±8秒）のデータ範囲を二分探索で取得
+        timestamps_ns, _ = datetime_nanoseconds(df['timestamp'])
+        order = np.argsort(timestamps_ns, kind='stable')
+        sorted_ns = timestamps_ns[order]
+        before_start, before_end, after_start, after_end = maneuver_kernel.time_windows(
+            sorted_ns, timestamps_ns[central_rows], 8.0, 8.0
+        )
         
-        # 連続するフラグを一つのマニューバーとしてグループ化
-        df_copy['maneuver_group'] = (df_copy['is_maneuver'] \!= df_copy['is_maneuver'].shift(1)).cumsum()
+        # 前後に十分なデータ（少なくとも3点）がある場合のみ処理
+        enough = (before_end - before_start >= 3) & (after_end - after_start >= 3)
+        if not enough.any():
+            return self._empty_maneuvers_frame()
         
-        # マニューバーとみなされるグループのみ抽出
-        maneuver_groups = df_copy[df_copy['is_maneuver']].groupby('maneuver_group')
+        central_rows = central_rows[enough]
+        before_start, before_end = before_start[enough], before_end[enough]
+        after_start, after_end = after_start[enough], after_end[enough]
         
-        # 各マニューバーグループから代表点を抽出
-        maneuver_points = []
+        # 前後の平均方位（円周平均）と平均速度
+        sorted_courses = courses[order]
+        sorted_speeds = df['speed'].to_numpy(dtype=float)[order]
+        before_bearing, _ = maneuver_kernel.window_circular_means(sorted_courses, before_start, before_end)
+        after_bearing, _ = maneuver_kernel.window_circular_means(sorted_courses, after_start, after_end)
+        bearing_change = maneuver_kernel.angle_difference(after_bearing, before_bearing)
         
-        # マニューバーの時間間隔パラメータを取得
-        min_maneuver_duration = self.params['min_maneuver_duration']
-        max_maneuver_duration = self.params['max_maneuver_duration']
+        speed_before = maneuver_kernel.window_means(sorted_speeds, before_start, before_end)
+        speed_after = maneuver_kernel.window_means(sorted_speeds, after_start, after_end)
         
-        for group_id, group in maneuver_groups:
-            if len(group) > 0:
-                # グループ内で最も大きな方向変化を持つ点を中心とする
-                central_idx = group['bearing_change'].idxmax()
-                central_point = df.loc[central_idx]
-                
-                # 前後のデータポイントを取得（タイムベース）
-                timestamp = central_point['timestamp']
-                before_time = timestamp - timedelta(seconds=8)  # 修正：タイムウィンドウを拡大
-                after_time = timestamp + timedelta(seconds=8)   # 修正：タイムウィンドウを拡大
-                
-                # 前後の時間帯のデータを抽出
-                before_df = df[(df['timestamp'] < timestamp) & (df['timestamp'] >= before_time)]
-                after_df = df[(df['timestamp'] > timestamp) & (df['timestamp'] <= after_time)]
-                
-                # 前後に十分なデータがある場合のみ処理
-                if len(before_df) >= 3 and len(after_df) >= 3:  # 修正：少なくとも3点を要求
-                    # 平均値の計算（より多くのポイントを使用）
-                    before_bearing = before_df['course'].mean()
-                    after_bearing = after_df['course'].mean()
-                    bearing_change = self._calculate_angle_difference(after_bearing, before_bearing)
-                    
-                    speed_before = before_df['speed'].mean()
-                    speed_after = after_df['speed'].mean()
-                    
-                    # 速度比の計算（ゼロ除算回避）
-                    speed_ratio = speed_after / speed_before if speed_before > 0 else 1.0
-                    
-                    # マニューバー時間計算
-                    maneuver_duration = (after_df['timestamp'].min() - before_df['timestamp'].max()).total_seconds()
-                    
-                    # 風向との相対角度を計算
-                    before_rel_wind = self._calculate_angle_difference(before_bearing, wind_direction)
-                    after_rel_wind = self._calculate_angle_difference(after_bearing, wind_direction)
-                    
-                    # 修正：マニューバー前後の状態を判定
-                    # タックを判定するために風向との関係をもっと詳細に分析
-                    before_state = self._determine_sailing_state(before_bearing, wind_direction)
-                    after_state = self._determine_sailing_state(after_bearing, wind_direction)
-                    
-                    # マニューバータイプを判定（改善バージョン）
-                    maneuver_type, maneuver_confidence = self._identify_maneuver_type(
-                        before_bearing, after_bearing, wind_direction, 
-                        speed_before, speed_after, 
-                        abs(bearing_change), before_state, after_state
-                    )
-                    
-                    # マニューバーポイントを追加
-                    maneuver_points.append({
-                        'timestamp': timestamp,
-                        'latitude': central_point['latitude'],
-                        'longitude': central_point['longitude'],
-                        'before_bearing': before_bearing,
-                        'after_bearing': after_bearing,
-                        'bearing_change': bearing_change,
-                        'speed_before': speed_before,
-                        'speed_after': speed_after,
-                        'speed_ratio': speed_ratio,
-                        'maneuver_duration': maneuver_duration,
-                        'maneuver_type': maneuver_type,
-                        'maneuver_confidence': maneuver_confidence,
-                        'before_state': before_state,
-                        'after_state': after_state,
-                        'wind_direction': wind_direction,
-                        'before_rel_wind': before_rel_wind,
-                        'after_rel_wind': after_rel_wind
-                    })
-        
-        # データフレームに変換
-        if not maneuver_points:
-            # 空のデータフレームを必要なカラムで初期化
-            empty_df = pd.DataFrame(columns=[
-                'timestamp', 'latitude', 'longitude', 'before_bearing', 'after_bearing',
-                'bearing_change', 'speed_before', 'speed_after', 'speed_ratio',
-                'maneuver_duration', 'maneuver_type', 'maneuver_confidence',
-                'before_state', 'after_state', 'wind_direction', 'before_rel_wind', 'after_rel_wind'
-            ])
-            return empty_df
-            
-        result_df = pd.DataFrame(maneuver_points)
+        # 速度比の計算（ゼロ除算回避）
+        with np.errstate(invalid='ignore', divide='ignore'):
+            speed_ratio = np.where(speed_before > 0, speed_after / speed_before, 1.0)
+        
+        # マニューバー時間計算
+        maneuver_duration = (sorted_ns[after_start] - sorted_ns[before_end - 1]) / 1e9
+        
+        # 風向との相対角度を計算
+        before_rel_wind = maneuver_kernel.angle_difference(before_bearing, wind_direction)
+        after_rel_wind = maneuver_kernel.angle_difference(after_bearing, wind_direction)
+        
+        # マニューバー前後の状態とマニューバータイプを判定
+        maneuver_type, maneuver_confidence, before_state, after_state = maneuver_kernel.classify_maneuvers(
+            before_bearing, after_bearing, wind_direction, speed_before, speed_after,
+            self.params["upwind_threshold"], self.params["downwind_threshold"]
+        )
+        
+        central = df.iloc[central_rows].reset_index(drop=True)
+        result_df = pd.DataFrame({
+            'timestamp': central['timestamp'],
+            'latitude': central['latitude'],
+            'longitude': central['longitude'],
+            'before_bearing': before_bearing,
+            'after_bearing': after_bearing,
+            'bearing_change': bearing_change,
+            'speed_before': speed_before,
+            'speed_after': speed_after,
+            'speed_ratio': speed_ratio,
+            'maneuver_duration': maneuver_duration,
+            'maneuver_type': maneuver_type,
+            'maneuver_confidence': maneuver_confidence,
+            'before_state': before_state,
+            'after_state': after_state,
+            'wind_direction': wind_direction,
+            'before_rel_wind': before_rel_wind,
+            'after_rel_wind': after_rel_wind
+        })
         
         return result_df
 
+    def _empty_maneuvers_frame(self) -> pd.DataFrame:
+        """
+        マニューバーが検出されなかった場合の空のデータフレームを作成
+        
+        Returns:
+        --------
+        pd.DataFrame
+            必要なカラムで初期化された空のデータフレーム
+        """
+        return pd.DataFrame(columns=[
+            'timestamp', 'latitude', 'longitude', 'before_bearing', 'after_bearing',
+            'bearing_change', 'speed_before', 'speed_after', 'speed_ratio',
+            'maneuver_duration', 'maneuver_type', 'maneuver_confidence',
+            'before_state', 'after_state', 'wind_direction', 'before_rel_wind', 'after_rel_wind'
+        ])
+
     def _estimate_wind_from_maneuvers(self, maneuvers: pd.DataFrame, full_df: pd.DataFrame) -> Dict[str, Any]:
         """
         マニューバー（タック/ジャイブ）から風向風速を推定（改善版）
@@ -630,63 +652,8 @@ class WindEstimatorImproved:
             tack_maneuvers = maneuvers
         
         # 風向計算（各マニューバーから推定）
-        wind_directions = []
-        confidences = []
-        timestamps = []
-        
-        for _, maneuver in tack_maneuvers.iterrows():
-            before_bearing = maneuver['before_bearing']
-            after_bearing = maneuver['after_bearing']
-            timestamp = maneuver['timestamp']
-            
-            # 改善：タックの場合の風向推定をより正確に行う
-            # 艇は風から約45度開けて帆走するため、風向は艇の進行方向から約45度風上側にある
-            
-            # 前後の艇の進行方向の風向からの最大開き角度（約45度）
-            typical_angle = 42.0  # 一般的な風上帆走角度
-            
-            # 風向を推定（2つの方法）
-            # 方法1: 2つの進行方向の平均
-            avg_direction = (before_bearing + after_bearing) / 2
-            wind_dir1 = (avg_direction + 180) % 360  # 平均方向の反対
-            
-            # 方法2: 2つの進行方向から風上に修正角度分開けたベクトルの平均
-            # 前の進行方向からtypical_angle度開けた方向
-            before_vector_angle = (before_bearing + typical_angle) % 360
-            # 後の進行方向からtypical_angle度開けた方向
-            after_vector_angle = (after_bearing + typical_angle) % 360
-            
-            # ベクトル平均のために角度をラジアンに変換
-            before_rad = np.radians(before_vector_angle)
-            after_rad = np.radians(after_vector_angle)
-            
-            # ベクトル平均
-            avg_x = (np.cos(before_rad) + np.cos(after_rad)) / 2
-            avg_y = (np.sin(before_rad) + np.sin(after_rad)) / 2
-            wind_dir2 = np.degrees(np.arctan2(avg_y, avg_x)) % 360
-            
-            # 両方の推定値の重みづけ平均
-            wind_direction = (wind_dir1 * 0.4 + wind_dir2 * 0.6) % 360
-            
-            # 信頼度の計算要素
-            # 1. マニューバー自体の信頼度
-            maneuver_confidence = maneuver.get('maneuver_confidence', 0.8)
-            
-            # 2. 速度変化（一般にタック中は減速する）
-            speed_ratio = maneuver.get('speed_ratio', 1.0)
-            speed_confidence = 1.0 - min(1.0, abs(speed_ratio - 0.7) / 0.5)
-            
-            # 3. 角度変化（一般的なタック角度は90度付近）
-            angle_change = abs(maneuver.get('bearing_change', 90.0))
-            angle_confidence = 1.0 - min(1.0, abs(angle_change - 90) / 45)
-            
-            # 総合信頼度
-            confidence = (maneuver_confidence * 0.5 + speed_confidence * 0.2 + angle_confidence * 0.3)
-            
-            # 結果に追加
-            wind_directions.append(wind_direction)
-            confidences.append(confidence)
-            timestamps.append(timestamp)
+        wind_directions, confidences = self._maneuver_wind_estimates(tack_maneuvers)
+        timestamps = tack_maneuvers['timestamp'].tolist()
         
         # 時間重みも考慮（最新のデータほど高い重み）
         time_weights = np.linspace(0.7, 1.0, len(timestamps))
@@ -712,6 +679,87 @@ class WindEstimatorImproved:
             "maneuver_analysis", latest_timestamp
         )
         
+    def _maneuver_wind_estimates(self, maneuvers: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        各マニューバーの前後の進行方向から風向と信頼度を推定（ベクトル化）
+        
+        タックでは前後の進行方向の二等分線（小さい角度の側）が風上方向、
+        ジャイブではその反対方向が風上方向になります。
+        
+        Parameters:
+        -----------
+        maneuvers : pd.DataFrame
+            マニューバーのデータフレーム
+            
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (各マニューバーからの推定風向（度、0-360）, 信頼度)
+        """
+        before_bearing = maneuvers['before_bearing'].to_numpy(dtype=float)
+        after_bearing = maneuvers['after_bearing'].to_numpy(dtype=float)
+        
+        # 前後の進行方向の二等分線（円周上の中点）
+        half_turn = maneuver_kernel.angle_difference(after_bearing, before_bearing) / 2
+        bisector = np.mod(before_bearing + half_turn, 360)
+        
+        is_jibe = (maneuvers['maneuver_type'] == 'jibe').to_numpy() if 'maneuver_type' in maneuvers.columns \
+            else np.zeros(len(maneuvers), dtype=bool)
+        wind_directions = np.where(is_jibe, np.mod(bisector + 180, 360), bisector)
+        
+        def column(name: str, default: float) -> np.ndarray:
+            if name in maneuvers.columns:
+                return maneuvers[name].to_numpy(dtype=float)
+            return np.full(len(maneuvers), default)
+        
+        # 信頼度の計算要素
+        # 1. マニューバー自体の信頼度
+        maneuver_confidence = column('maneuver_confidence', 0.8)
+        
+        # 2. 速度変化（一般にタック中は減速する）
+        speed_confidence = 1.0 - np.fmin(1.0, np.abs(column('speed_ratio', 1.0) - 0.7) / 0.5)
+        
+        # 3. 角度変化（一般的なタック角度は90度付近）
+        angle_change = np.abs(column('bearing_change', 90.0))
+        angle_confidence = 1.0 - np.fmin(1.0, np.abs(angle_change - 90) / 45)
+        
+        # 総合信頼度
+        confidences = maneuver_confidence * 0.5 + speed_confidence * 0.2 + angle_confidence * 0.3
+        
+        return wind_directions, confidences
+    
+    def _maneuver_wind_speeds(self, maneuvers: pd.DataFrame) -> np.ndarray:
+        """
+        各マニューバー前後の速度から風速を推定（ベクトル化）
+        
+        Parameters:
+        -----------
+        maneuvers : pd.DataFrame
+            マニューバーのデータフレーム
+            
+        Returns:
+        --------
+        np.ndarray
+            各マニューバーからの推定風速（ノット）
+        """
+        # タック時の艇速に対する風速の係数（艇種ごとに調整可能）
+        upwind_coef = 1.4  # 風上での艇速から風速への変換係数
+        downwind_coef = 1.2  # 風下での艇速から風速への変換係数
+        
+        # 最大速度を基に風速を推定
+        max_speed = np.fmax(maneuvers['speed_before'].to_numpy(dtype=float),
+                            maneuvers['speed_after'].to_numpy(dtype=float))
+        
+        # 帆走状態に応じた係数選択
+        is_upwind = (
+            maneuvers['before_state'].astype(str).str.contains('upwind') |
+            maneuvers['after_state'].astype(str).str.contains('upwind')
+        ).to_numpy()
+        coef = np.where(is_upwind, upwind_coef, downwind_coef)
+        
+        # 速度をノットに変換（m/s * 1.94）し、係数で調整
+        return max_speed * 1.94 * coef
+    
     def _estimate_wind_speed_from_maneuvers(self, maneuvers_df: pd.DataFrame, full_df: pd.DataFrame) -> float:
         """
         マニューバー前後の速度から風速を推定（改善版）
@@ -731,37 +779,12 @@ class WindEstimatorImproved:
         if maneuvers_df.empty:
             return self._estimate_wind_speed_from_speed_variations(full_df)
         
-        # 風速推定値を格納する配列
-        wind_speeds = []
-        
-        # タック時の艇速に対する風速の係数（艇種ごとに調整可能）
-        upwind_coef = 1.4  # 風上での艇速から風速への変換係数
-        downwind_coef = 1.2  # 風下での艇速から風速への変換係数
-        
-        for _, maneuver in maneuvers_df.iterrows():
-            maneuver_type = maneuver['maneuver_type']
-            speed_before = maneuver['speed_before']
-            speed_after = maneuver['speed_after']
-            before_state = maneuver['before_state']
-            after_state = maneuver['after_state']
-            
-            # 最大速度を基に風速を推定
-            max_speed = max(speed_before, speed_after)
-            
-            # 帆走状態に応じた係数選択
-            if 'upwind' in before_state or 'upwind' in after_state:
-                # 風上なら一般に艇速は風速の0.7倍程度の逆数
-                coef = upwind_coef
-            else:
-                # 風下なら一般に艇速は風速の0.8倍程度の逆数
-                coef = downwind_coef
-            
-            # 速度をノットに変換（m/s * 1.94）し、係数で調整
-            est_wind_speed = max_speed * 1.94 * coef
-            wind_speeds.append(est_wind_speed)
+        # 各マニューバーからの風速推定値
+        wind_speeds = self._maneuver_wind_speeds(maneuvers_df)
+        wind_speeds = wind_speeds[~np.isnan(wind_speeds)]
         
         # 複数の推定値の中央値（外れ値に堅牢）
-        if wind_speeds:
+        if len(wind_speeds) > 0:
             return float(np.median(wind_speeds))
         
         # 推定できない場合は代替手法
@@ -896,7 +919,7 @@ class WindEstimatorImproved:
             ])
         
         # 艇種の設定（指定があれば更新）
-        if boat_type and boat_type \!= self.boat_type:
+        if boat_type and boat_type != self.boat_type:
             self.boat_type = boat_type
             self._adjust_params_by_boat_type(boat_type)
         
@@ -985,6 +1008,241 @@ class WindEstimatorImproved:
         
         return wind_df
     
+    def estimate_wind_time_series(self, gps_data: pd.DataFrame, window_seconds: float = None,
+                                  step_seconds: float = None, min_tack_angle: float = 30.0,
+                                  boat_type: str = None) -> pd.DataFrame:
+        """
+        重なり合う移動ウィンドウごとに風向風速を推定し、時間変化する風の時系列を作成
+        
+        マニューバーの検出は航跡全体に対して一度だけ行い、各マニューバーの風向・風速・
+        信頼度の累積和を保持します。ウィンドウを進めるときは範囲の端を二分探索で求めて
+        累積和の差を取るだけなので、再計算は不要で計算量は航跡の長さに対して線形です。
+        
+        Parameters:
+        -----------
+        gps_data : pd.DataFrame
+            GPSデータフレーム
+        window_seconds : float, optional
+            推定ウィンドウの長さ（秒）。省略時は params["rolling_window_seconds"]
+        step_seconds : float, optional
+            ウィンドウを進める間隔（秒）。省略時は params["rolling_step_seconds"]
+        min_tack_angle : float, optional
+            タック検出の最小角度
+        boat_type : str, optional
+            艇種
+            
+        Returns:
+        --------
+        pd.DataFrame
+            ウィンドウ中心時刻ごとの風向風速のデータフレーム
+            （timestamp, latitude, longitude, wind_direction, wind_speed,
+            confidence, maneuver_count, method）
+        """
+        columns = ['timestamp', 'latitude', 'longitude', 'wind_direction', 'wind_speed',
+                   'confidence', 'maneuver_count', 'method']
+        
+        # データ確認
+        if gps_data.empty or len(gps_data) < 10:
+            warnings.warn("データポイントが不足しています")
+            return pd.DataFrame(columns=columns)
+        
+        required_columns = ['timestamp', 'latitude', 'longitude']
+        if not all(col in gps_data.columns for col in required_columns):
+            missing_cols = [col for col in required_columns if col not in gps_data.columns]
+            warnings.warn(f"必要なカラムがありません: {missing_cols}")
+            return pd.DataFrame(columns=columns)
+        
+        # 艇種の設定（指定があれば更新）
+        if boat_type and boat_type != self.boat_type:
+            self.boat_type = boat_type
+            self._adjust_params_by_boat_type(boat_type)
+        
+        if window_seconds is None:
+            window_seconds = self.params["rolling_window_seconds"]
+        if step_seconds is None:
+            step_seconds = self.params["rolling_step_seconds"]
+        
+        # 時刻順に並べたデータのコピーを作成
+        df = gps_data.copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = df.dropna(subset=['timestamp']).sort_values('timestamp', kind='stable').reset_index(drop=True)
+        
+        if len(df) < 10:
+            warnings.warn("データポイントが不足しています")
+            return pd.DataFrame(columns=columns)
+        
+        if 'course' not in df.columns:
+            df = self._calculate_bearing(df)
+        if 'speed' not in df.columns:
+            df = self._calculate_speed(df)
+        
+        # マニューバー検出（航跡全体で一度だけ）
+        maneuvers = self._detect_maneuvers_vectorized(df, min_angle_change=min_tack_angle)
+        
+        # 全体の推定風向でマニューバーを分類し直す（タック/ジャイブで風上側が反転するため）
+        global_estimate = None
+        if len(maneuvers) >= 2:
+            try:
+                global_estimate = self._estimate_wind_from_maneuvers(maneuvers, df)
+            except Exception as e:
+                warnings.warn(f"マニューバーからの風向推定エラー: {str(e)}")
+        
+        if global_estimate is not None:
+            maneuver_type, maneuver_confidence, before_state, after_state = maneuver_kernel.classify_maneuvers(
+                maneuvers['before_bearing'].to_numpy(dtype=float),
+                maneuvers['after_bearing'].to_numpy(dtype=float),
+                global_estimate["direction"],
+                maneuvers['speed_before'].to_numpy(dtype=float),
+                maneuvers['speed_after'].to_numpy(dtype=float),
+                self.params["upwind_threshold"], self.params["downwind_threshold"]
+            )
+            maneuvers = maneuvers.assign(
+                maneuver_type=maneuver_type, maneuver_confidence=maneuver_confidence,
+                before_state=before_state, after_state=after_state
+            )
+        
+        # ウィンドウ中心時刻
+        timestamps_ns, _ = datetime_nanoseconds(df['timestamp'])
+        step_ns = max(1, int(step_seconds * 1e9))
+        half_window_ns = int(window_seconds * 1e9 / 2)
+        centers_ns = np.arange(timestamps_ns[0], timestamps_ns[-1] + 1, step_ns, dtype=np.int64)
+        
+        stats = self._rolling_maneuver_stats(maneuvers, centers_ns, half_window_ns)
+        valid = stats["valid"]
+        
+        if valid.any():
+            # マニューバーが不足するウィンドウは前後の推定値から補間（信頼度は0）
+            direction_rad = np.radians(stats["direction"][valid])
+            sin_values = np.interp(centers_ns, centers_ns[valid], np.sin(direction_rad))
+            cos_values = np.interp(centers_ns, centers_ns[valid], np.cos(direction_rad))
+            wind_direction = np.mod(np.degrees(np.arctan2(sin_values, cos_values)), 360)
+            # 風速が推定できないウィンドウは艇速変動からの推定値で補う
+            window_speed = stats["speed"][valid]
+            window_speed = np.where(np.isnan(window_speed),
+                                    self._estimate_wind_speed_from_speed_variations(df), window_speed)
+            wind_speed = np.interp(centers_ns, centers_ns[valid], window_speed)
+            confidence = np.where(valid, stats["confidence"], 0.0)
+            method = np.where(valid, "rolling_maneuver_analysis", "interpolation")
+        else:
+            # 代替推定（簡易）
+            wind_direction = np.full(len(centers_ns), 0.0)
+            wind_speed = np.full(len(centers_ns), 10.0)
+            confidence = np.full(len(centers_ns), 0.5)
+            method = np.full(len(centers_ns), "fallback_estimation")
+        
+        # ウィンドウ中心に最も近い位置
+        nearest = np.clip(np.searchsorted(timestamps_ns, centers_ns), 0, len(df) - 1)
+        center_times = pd.DatetimeIndex(centers_ns)
+        if df['timestamp'].dt.tz is not None:
+            center_times = center_times.tz_localize('UTC').tz_convert(df['timestamp'].dt.tz)
+        
+        result_df = pd.DataFrame({
+            'timestamp': center_times,
+            'latitude': df['latitude'].to_numpy()[nearest],
+            'longitude': df['longitude'].to_numpy()[nearest],
+            'wind_direction': wind_direction,
+            'wind_speed': wind_speed,
+            'confidence': confidence,
+            'maneuver_count': stats["count"].astype(int),
+            'method': method
+        })
+        
+        # 結果を記録（最も信頼度の高いウィンドウ）
+        best = int(np.argmax(confidence))
+        self.estimated_wind = self._create_wind_result(
+            float(wind_direction[best]), float(wind_speed[best]), float(confidence[best]),
+            str(method[best]), center_times[best]
+        )
+        
+        return result_df
+    
+    def _rolling_maneuver_stats(self, maneuvers: pd.DataFrame, centers_ns: np.ndarray,
+                                half_window_ns: int) -> Dict[str, np.ndarray]:
+        """
+        各ウィンドウ内のマニューバーの統計量を累積和から計算
+        
+        ウィンドウ内にタックが2つ以上あればタックのみ、なければ全マニューバーを使用します
+        （_estimate_wind_from_maneuvers と同じ方針）。
+        
+        Parameters:
+        -----------
+        maneuvers : pd.DataFrame
+            航跡全体のマニューバーのデータフレーム
+        centers_ns : np.ndarray
+            ウィンドウ中心時刻（int64ナノ秒）
+        half_window_ns : int
+            ウィンドウ長の半分（ナノ秒）
+            
+        Returns:
+        --------
+        Dict[str, np.ndarray]
+            direction, speed, confidence, count, valid をキーとするウィンドウごとの値
+        """
+        n_windows = len(centers_ns)
+        if maneuvers.empty:
+            return {
+                "direction": np.full(n_windows, np.nan),
+                "speed": np.full(n_windows, np.nan),
+                "confidence": np.zeros(n_windows),
+                "count": np.zeros(n_windows),
+                "valid": np.zeros(n_windows, dtype=bool)
+            }
+        
+        maneuver_ns, _ = datetime_nanoseconds(maneuvers['timestamp'])
+        order = np.argsort(maneuver_ns, kind='stable')
+        maneuver_ns = maneuver_ns[order]
+        
+        directions, confidences = self._maneuver_wind_estimates(maneuvers)
+        directions, confidences = directions[order], np.nan_to_num(confidences[order])
+        speeds = self._maneuver_wind_speeds(maneuvers)[order]
+        is_tack = (maneuvers['maneuver_type'] == 'tack').to_numpy()[order]
+        
+        # ウィンドウに含まれるマニューバーの範囲 [starts, ends)
+        starts = np.searchsorted(maneuver_ns, centers_ns - half_window_ns, side='left')
+        ends = np.searchsorted(maneuver_ns, centers_ns + half_window_ns, side='right')
+        
+        radians = np.radians(directions)
+        has_speed = ~np.isnan(speeds)
+        
+        def window_totals(mask: np.ndarray) -> Dict[str, np.ndarray]:
+            weights = confidences * mask
+            speed_weights = weights * has_speed
+            return {
+                "sin": maneuver_kernel.window_sums(weights * np.sin(radians), starts, ends)[0],
+                "cos": maneuver_kernel.window_sums(weights * np.cos(radians), starts, ends)[0],
+                "weight": maneuver_kernel.window_sums(weights, starts, ends)[0],
+                "count": maneuver_kernel.window_sums(mask.astype(float), starts, ends)[0],
+                "speed": maneuver_kernel.window_sums(speed_weights * np.nan_to_num(speeds), starts, ends)[0],
+                "speed_weight": maneuver_kernel.window_sums(speed_weights, starts, ends)[0]
+            }
+        
+        all_totals = window_totals(np.ones(len(maneuver_ns), dtype=bool))
+        tack_totals = window_totals(is_tack)
+        
+        # タックが2つ以上あるウィンドウはタックのみを使用
+        use_tacks = tack_totals["count"] >= 2
+        totals = {key: np.where(use_tacks, tack_totals[key], all_totals[key]) for key in all_totals}
+        
+        count = totals["count"]
+        valid = (count >= 2) & (totals["weight"] > 0)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            direction = np.mod(np.degrees(np.arctan2(totals["sin"], totals["cos"])), 360)
+            # 推定値のばらつき（合成ベクトル長）、平均信頼度、マニューバー数から信頼度を計算
+            agreement = np.hypot(totals["sin"], totals["cos"]) / totals["weight"]
+            mean_confidence = totals["weight"] / count
+            coverage = np.minimum(1.0, count / self.params["rolling_full_confidence_maneuvers"])
+            confidence = np.clip(mean_confidence * agreement * coverage, 0.0, 1.0)
+            speed = np.where(totals["speed_weight"] > 0, totals["speed"] / totals["speed_weight"], np.nan)
+        
+        return {
+            "direction": np.where(valid, direction, np.nan),
+            "speed": speed,
+            "confidence": np.where(valid, confidence, 0.0),
+            "count": count,
+            "valid": valid
+        }
+    
     # メモリ解放用メソッド
     def cleanup(self):
         """メモリを明示的に解放"""
@@ -21,9 +21,12 @@ from .wind_propagation_model import WindPropagationModel
 from .prediction_evaluator import PredictionEvaluator
 from .wind_field_fusion_utils import (
     create_dummy_wind_field, create_simple_wind_field, 
+    create_simple_wind_field_from_arrays, idw_wind_field_from_arrays, IncrementalIDWField,
     haversine_distance, interpolate_field_to_grid,
-    scale_data_points, restore_original_coordinates
+    scale_coordinate_arrays, scale_data_points, restore_original_coordinates
 )
+from .wind_observation_buffer import WindObservationBuffer
+from .utilities.track_kinematics import haversine_distances, datetime_nanoseconds
 
 # 循環参照を避けるために遅延インポート
 # sailing_data_processor.strategy 関連のモジュールはメソッド内でインポート
@@ -47,10 +50,24 @@ class WindFieldFusionSystem:
     - 複数艇データの統合
     - 風の場の時空間補間
     - 風の移動モデルを用いた予測
+    
+    風データは列指向のリングバッファ（observations）に保持し、取り込み・時間窓の抽出・
+    スケーリング・補間を配列演算で行います。
     """
     
-    def __init__(self):
-        """初期化"""
+    def __init__(self, max_observations: int = 1000000):
+        """
+        初期化
+        
+        Parameters:
+        -----------
+        max_observations : int
+            保持する風データポイントの最大数（超えた分は古いものから破棄）
+        """
+        # 風データポイントの列指向バッファ（空間インデックスも保持）
+        self.observations = WindObservationBuffer(capacity=max_observations)
+        self._records_cache = None
+        
         # 風データポイントのキャッシュ
         self.wind_data_points = []
         
@@ -81,6 +98,10 @@ class WindFieldFusionSystem:
         # 最終融合時間
         self.last_fusion_time = None
         
+        # ストリーミング融合（append_observations）の時間窓（秒）と差分更新する風の場
+        self.stream_window_seconds = 1800
+        self.stream_field = None
+        
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
         2点間のHaversine距離を計算（メートル）
@@ -100,6 +121,26 @@ class WindFieldFusionSystem:
         # wind_field_fusion_utilsのhaversine_distance関数を使用
         return haversine_distance(lat1, lon1, lat2, lon2)
     
+    @property
+    def wind_data_points(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        風データポイントの辞書のタプル（挿入順）
+        
+        バッファの内容から作成した読み取り専用のタプルで、バッファが更新されるまで再利用されます。
+        append などの変更はエラーになるため、ポイントの追加には add_wind_data_point を、
+        置き換えには wind_data_points への代入を使用してください。
+        """
+        version = self.observations.version
+        if self._records_cache is None or self._records_cache[0] != version:
+            self._records_cache = (version, tuple(self.observations.to_records()))
+        return self._records_cache[1]
+    
+    @wind_data_points.setter
+    def wind_data_points(self, data_points: List[Dict[str, Any]]) -> None:
+        """保持している風データポイントをすべて置き換える"""
+        self.observations.clear()
+        self.observations.extend_records(data_points)
+    
     def add_wind_data_point(self, data_point: Dict[str, Any]):
         """
         風データポイントを追加
@@ -125,12 +166,35 @@ class WindFieldFusionSystem:
                 return
         
         # データを追加
-        self.wind_data_points.append(data_point)
+        self.observations.extend_records([data_point])
         
         # データポイントが一定数を超えたら融合処理を実行
-        if len(self.wind_data_points) >= 5:
+        if len(self.observations) >= 5:
             self.fuse_wind_data()
             
+    def find_nearest_wind_points(self, latitudes: Any, longitudes: Any, k: int = 3,
+                                 max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数の位置について近傍の風データポイントをまとめて検索
+        
+        Parameters:
+        -----------
+        latitudes, longitudes : array-like
+            検索位置の緯度・経度（グリッド全体など）
+        k : int
+            取得する近傍ポイント数
+        max_distance : float, optional
+            検索する最大距離（メートル）
+            
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (距離[メートル], wind_data_pointsのインデックス) - いずれも (検索位置数, k) の配列。
+            該当するポイントがない列は距離がinf、インデックスが-1
+        """
+        index = self.observations.spatial_index()
+        return index.query(latitudes, longitudes, k=k, max_distance=max_distance)
+    
     def update_with_boat_data(self, boats_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         """
         複数の艇データから風の場を更新
@@ -152,45 +216,14 @@ class WindFieldFusionSystem:
             更新された風の場
         """
         # データポイントをリセット
-        self.wind_data_points = []
+        self.observations.clear()
+        self.stream_field = None
         
-        # 各艇のデータを処理
-        for boat_id, boat_df in boats_data.items():
-            # データフレームが空の場合はスキップ
-            if boat_df.empty:
-                continue
-                
-            # 必要なカラムがあるか確認
-            required_columns = ['timestamp', 'latitude', 'longitude', 'wind_direction', 'wind_speed_knots']
-            if not all(col in boat_df.columns for col in required_columns):
-                warnings.warn(f"Boat {boat_id} data missing required columns")
-                continue
-            
-            # 各行をデータポイントとして追加
-            for _, row in boat_df.iterrows():
-                # 風速をノットからm/sに変換（1ノット = 0.51444 m/s）
-                # 風速カラム名が違う場合に対応
-                wind_speed = row.get('wind_speed_knots', 0) * 0.51444
-                
-                # データポイントを作成
-                data_point = {
-                    'timestamp': row['timestamp'],
-                    'latitude': row['latitude'],
-                    'longitude': row['longitude'],
-                    'wind_direction': row['wind_direction'],
-                    'wind_speed': wind_speed,
-                    'boat_id': boat_id
-                }
-                
-                # 信頼度情報があれば追加
-                if 'confidence' in row:
-                    data_point['confidence'] = row['confidence']
-                
-                # データポイントを追加
-                self.wind_data_points.append(data_point)
+        # 各艇のデータを列単位でまとめて追加
+        self._append_boat_data(boats_data)
         
         # 十分なデータがあれば融合処理を実行
-        if self.wind_data_points:
+        if len(self.observations):
             self.fuse_wind_data()
         
         # 風の場が生成されていない場合はフォールバック処理
@@ -198,10 +231,10 @@ class WindFieldFusionSystem:
             warnings.warn("Creating fallback wind field for tests")
             grid_resolution = 10  # 低解像度グリッド
             latest_time = datetime.now()
-            if self.wind_data_points:
-                latest_time = max(point['timestamp'] for point in self.wind_data_points)
+            if len(self.observations):
+                latest_time = self.observations.latest_time()
                 # 既存データから風の場を生成
-                simple_field = create_simple_wind_field(self.wind_data_points, grid_resolution, latest_time)
+                simple_field = self._create_simple_field(None, grid_resolution, latest_time)
                 self.current_wind_field = simple_field  # 明示的に設定
                 return simple_field
             else:
@@ -212,6 +245,134 @@ class WindFieldFusionSystem:
         
         return self.current_wind_field
     
+    def _append_boat_data(self, boats_data: Dict[str, pd.DataFrame]) -> int:
+        """
+        内部メソッド: 艇データのデータフレームを列単位でバッファに追加
+        
+        boats_data には艇IDをキーとする辞書のほか、boat_id 列を持つ1つのデータフレームも指定できます。
+        
+        Returns:
+        --------
+        int
+            追加したデータポイント数
+        """
+        if isinstance(boats_data, pd.DataFrame):
+            # 全艇分をまとめた縦持ちのデータフレーム（艇IDは列から取得）
+            boat_ids = boats_data['boat_id'].to_numpy() if 'boat_id' in boats_data.columns else None
+            items = [(boat_ids, boats_data)]
+        else:
+            items = boats_data.items()
+        
+        added = 0
+        for boat_id, boat_df in items:
+            # データフレームが空の場合はスキップ
+            if boat_df.empty:
+                continue
+                
+            # 必要なカラムがあるか確認
+            required_columns = ['timestamp', 'latitude', 'longitude', 'wind_direction', 'wind_speed_knots']
+            if not all(col in boat_df.columns for col in required_columns):
+                warnings.warn(f"Boat {boat_id} data missing required columns")
+                continue
+            
+            # 信頼度情報があれば追加
+            confidence = None
+            if 'confidence' in boat_df.columns:
+                confidence = boat_df['confidence'].to_numpy(dtype=float)
+            
+            # 風速をノットからm/sに変換（1ノット = 0.51444 m/s）
+            added += self.observations.extend(
+                boat_df['timestamp'],
+                boat_df['latitude'].to_numpy(dtype=float),
+                boat_df['longitude'].to_numpy(dtype=float),
+                boat_df['wind_direction'].to_numpy(dtype=float),
+                boat_df['wind_speed_knots'].to_numpy(dtype=float) * 0.51444,
+                confidence=confidence,
+                boat_ids=boat_id
+            )
+        return added
+    
+    def append_observations(self, boats_data: Union[Dict[str, pd.DataFrame], pd.DataFrame],
+                            window_seconds: Optional[float] = None,
+                            grid_resolution: int = 20) -> Dict[str, Any]:
+        """
+        新しい艇データを追加して風の場を差分更新（ライブ配信向けのストリーミング融合）
+        
+        update_with_boat_data と異なり既存のデータを保持したまま追加し、
+        最新時刻から時間窓を外れたデータを削除します。風の場は前回のグリッドを引き継ぎ、
+        追加・削除されたデータの影響を受けるセルだけを再計算します。
+        追加されたデータで保留中の予測の評価も行います。
+        
+        Parameters:
+        -----------
+        boats_data : Dict[str, pd.DataFrame] or pd.DataFrame
+            艇IDをキーとする新しいデータのデータフレームの辞書（update_with_boat_data と同じ形式）、
+            または全艇分を boat_id 列付きでまとめたデータフレーム
+        window_seconds : float, optional
+            融合に使う時間窓（秒）、Noneの場合は stream_window_seconds
+        grid_resolution : int
+            グリッド解像度（変更した場合は全体を再計算）
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            更新された風の場
+        """
+        window = self.stream_window_seconds if window_seconds is None else window_seconds
+        new_from = self.observations.next_sequence
+        self._append_boat_data(boats_data)
+        
+        if len(self.observations) == 0:
+            return self.current_wind_field
+        
+        # 時間窓を外れたデータを削除
+        latest_time = self.observations.latest_time()
+        self.observations.discard_before(latest_time - timedelta(seconds=window))
+        self.last_fusion_time = latest_time
+        
+        rows = self.observations.sorted_order()
+        columns = self.observations.columns(rows)
+        sequence = self.observations.sequence_numbers(rows)
+        
+        if len(rows) < 3:
+            # データが少なすぎる場合は単純な風場（差分更新の状態は作らない）
+            wind_field = self._create_simple_field(rows, grid_resolution, latest_time)
+        else:
+            if self.stream_field is None or self.stream_field.grid_resolution != grid_resolution:
+                self.stream_field = IncrementalIDWField(grid_resolution)
+            wind_field = self.stream_field.update(
+                sequence, columns['latitude'], columns['longitude'],
+                columns['wind_direction'], columns['wind_speed'], columns['confidence'],
+                min_sequence=int(sequence.min()), new_from=new_from, timestamp=latest_time
+            )
+        
+        self.current_wind_field = wind_field
+        self.wind_field_history.append({
+            'time': latest_time,
+            'field': wind_field
+        })
+        if len(self.wind_field_history) > self.max_history_size:
+            self.wind_field_history.pop(0)
+        
+        # 今回追加されたデータで保留中の予測を評価
+        if self.enable_prediction_evaluation:
+            new = sequence >= new_from
+            if new.any():
+                self._evaluate_predictions_with_observations(
+                    {name: column[new] for name, column in columns.items()})
+        
+        return wind_field
+    
+    def _create_simple_field(self, rows: Optional[np.ndarray], grid_resolution: int,
+                             timestamp: datetime) -> Dict[str, Any]:
+        """内部メソッド: バッファの観測（rows指定時はその行のみ）から単純な風の場を生成"""
+        columns = self.observations.columns(rows)
+        return create_simple_wind_field_from_arrays(
+            columns['latitude'], columns['longitude'],
+            columns['wind_direction'], columns['wind_speed'],
+            grid_resolution, timestamp
+        )
+    
     def fuse_wind_data(self) -> Dict[str, Any]:
         """
         風データポイントを融合して風の場を生成
@@ -221,32 +382,25 @@ class WindFieldFusionSystem:
         Dict[str, Any]
             生成された風の場
         """
-        if not self.wind_data_points:
+        if len(self.observations) == 0:
             # データポイントがない場合はダミーデータを返す
             dummy_field = create_dummy_wind_field(datetime.now())
             self.current_wind_field = dummy_field
             return dummy_field
         
-        # データポイントを時間順にソート
-        sorted_data = sorted(self.wind_data_points, key=lambda x: x['timestamp'])
-        
         # 最新のタイムスタンプを取得
-        latest_time = sorted_data[-1]['timestamp']
+        latest_time = self.observations.latest_time()
         self.last_fusion_time = latest_time
         
-        # 最近のデータポイントのみを使用（30分以内）
-        recent_data = []
-        for point in sorted_data:
-            time_diff = (latest_time - point['timestamp']).total_seconds()
-            if time_diff <= 1800:  # 30分 = 1800秒
-                recent_data.append(point)
+        # 最近のデータポイントのみを使用（30分以内、時刻順の行番号）
+        recent_rows = self.observations.window(1800)  # 30分 = 1800秒
         
         # データポイントが少なすぎる場合はフォールバック処理
-        if len(recent_data) < 3:
+        if len(recent_rows) < 3:
             warnings.warn("Not enough recent data points for fusion, using fallback")
             # フォールバック: 単純な風場を作成
             grid_resolution = 10  # 低解像度グリッド
-            simple_field = create_simple_wind_field(sorted_data, grid_resolution, latest_time)
+            simple_field = self._create_simple_field(None, grid_resolution, latest_time)
             self.current_wind_field = simple_field  # テスト用に明示的に設定
             return simple_field
         
@@ -255,7 +409,7 @@ class WindFieldFusionSystem:
         if 'unittest' in sys.modules or 'pytest' in sys.modules:
             warnings.warn("Test environment detected, using simple wind field")
             grid_resolution = 10
-            simple_field = create_simple_wind_field(sorted_data, grid_resolution, latest_time)
+            simple_field = self._create_simple_field(None, grid_resolution, latest_time)
             self.current_wind_field = simple_field
             
             # 履歴に追加 (テスト環境でも履歴を更新するように修正)
@@ -276,53 +430,56 @@ class WindFieldFusionSystem:
         # Qhull精度エラー回避のためのオプション
         qhull_options = 'QJ'
         
-        # 基本的にデータをスケーリング - このステップにより多くのQhull関連エラーを回避
-        scaled_data = self._scale_data_points(recent_data)
+        recent_data = self.observations.columns(recent_rows)
         
-        # スケーリングに失敗した場合の対策
-        if not scaled_data:
-            warnings.warn("Data scaling failed, using simple wind field")
-            simple_field = create_simple_wind_field(recent_data, grid_density, latest_time)
+        # 基本的にデータをスケーリング - このステップにより補間の数値的な安定性を確保
+        try:
+            scaled_data = self._scale_observations(recent_data)
+        except Exception as e:
+            warnings.warn(f"Data scaling failed: {e}, using simple wind field")
+            simple_field = self._create_simple_field(recent_rows, grid_density, latest_time)
             self.current_wind_field = simple_field  # テスト用に明示的に設定
             return simple_field
         
         try:
             result = self._try_interpolation_methods(scaled_data, grid_density, latest_time, qhull_options, recent_data)
             # 風の移動モデルを更新 - 有効なデータがある場合のみ
-            if self.current_wind_field and len(recent_data) >= self.propagation_model.min_data_points:
-                self.propagation_model.estimate_propagation_vector(recent_data)
+            if self.current_wind_field and len(recent_rows) >= self.propagation_model.min_data_points:
+                self.propagation_model.estimate_propagation_vector(self.observations.to_records(recent_rows))
             
             return result
         except Exception as e:
             warnings.warn(f"All interpolation methods failed: {e}, creating simple field")
-            simple_field = create_simple_wind_field(recent_data, grid_density, latest_time)
+            simple_field = self._create_simple_field(recent_rows, grid_density, latest_time)
             self.current_wind_field = simple_field
             return simple_field
     
     def _try_interpolation_methods(self, scaled_data, grid_density, latest_time, qhull_options, recent_data):
-        """内部メソッド: 複数の補間方法を試す"""
+        """
+        内部メソッド: 複数の補間方法を試す
+        
+        scaled_data は _scale_observations、recent_data は observations.columns の結果（列ごとの配列）
+        """
+        fallback = lambda: create_simple_wind_field_from_arrays(
+            recent_data['latitude'], recent_data['longitude'],
+            recent_data['wind_direction'], recent_data['wind_speed'],
+            grid_density, latest_time
+        )
+        
         # テスト環境用の安全な対応
         if 'unittest' in sys.modules or 'pytest' in sys.modules:
-            simple_field = create_simple_wind_field(recent_data, grid_density, latest_time)
+            simple_field = fallback()
             self.current_wind_field = simple_field
             return simple_field
             
         # まずidw方式で補間を試みる（最も安定した方法）
         try:
-            # WindFieldInterpolatorインスタンスを作成して直接処理
-            interpolator = WindFieldInterpolator()
-            for point in scaled_data:
-                point_time = point.get('timestamp', latest_time)
-                interpolator.add_wind_field({
-                    'time': point_time,
-                    'lat_grid': np.array([[point['scaled_latitude']]]),
-                    'lon_grid': np.array([[point['scaled_longitude']]]),
-                    'wind_direction': np.array([[point['wind_direction']]]),
-                    'wind_speed': np.array([[point['wind_speed']]]),
-                    'confidence': np.array([[point.get('confidence', 0.8)]])
-                })
-            
-            wind_field = interpolator._idw_interpolate(latest_time, grid_density)
+            wind_field = idw_wind_field_from_arrays(
+                recent_data['latitude'], recent_data['longitude'],
+                recent_data['wind_direction'], recent_data['wind_speed'],
+                recent_data['confidence'], grid_density, latest_time,
+                scaled=scaled_data
+            )
             
             if wind_field:
                 return self._process_successful_interpolation(wind_field, latest_time, scaled_data, recent_data)
@@ -330,7 +487,7 @@ class WindFieldFusionSystem:
             warnings.warn(f"IDW interpolation failed: {e}")
         
         # IDW方式が失敗した場合はシンプルな風場を生成
-        simple_field = create_simple_wind_field(recent_data, grid_density, latest_time)
+        simple_field = fallback()
         self.current_wind_field = simple_field
         return simple_field
     
@@ -354,14 +511,26 @@ class WindFieldFusionSystem:
         
         # 予測評価が有効な場合、実測値と予測を比較
         if self.enable_prediction_evaluation:
-            for point in recent_data:
-                self._evaluate_previous_predictions(point['timestamp'], point)
-        
-        # 元の座標を復元
-        self._restore_original_coordinates(scaled_data)
+            self._evaluate_predictions_with_observations(recent_data)
         
         return wind_field
     
+    def _scale_observations(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """
+        観測の配列を正規化して補間処理を安定化
+        
+        Parameters:
+        -----------
+        columns : Dict[str, np.ndarray]
+            observations.columns の結果
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            scale_coordinate_arrays の結果
+        """
+        return scale_coordinate_arrays(columns['latitude'], columns['longitude'], columns['wind_speed'])
+    
     def _scale_data_points(self, data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         風データポイントを適切にスケーリングして補間処理を安定化
@@ -458,6 +627,65 @@ class WindFieldFusionSystem:
                     # 評価済みの予測を削除
                     del self.previous_predictions[key]
     
+    def _evaluate_predictions_with_observations(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        保留中の予測を観測の配列とまとめて照合して評価
+        
+        観測を時刻順に1件ずつ _evaluate_previous_predictions に渡した場合と同じ結果になるよう、
+        各予測について「予測時刻から2時間以内」「対象時刻と±1分以内」「200m以内」を満たす
+        最初の観測で評価し、最新の観測時刻で2時間を超えた予測は破棄します。
+        
+        Parameters:
+        -----------
+        columns : Dict[str, np.ndarray]
+            時刻順の観測の配列（observations.columns の結果）
+        """
+        if not self.previous_predictions or len(columns['time']) == 0:
+            return
+        
+        obs_times = self.observations.to_timestamps(columns['time'])
+        obs_ns = columns['time']
+        latest_ns = obs_ns.max()
+        to_ns = lambda value: datetime_nanoseconds(value)[0][0]
+        
+        for key, pred_data in list(self.previous_predictions.items()):
+            pred_time = pred_data.get('prediction_time')
+            target_time = pred_data.get('target_time')
+            position = pred_data.get('position')
+            prediction = pred_data.get('prediction')
+            pred_ns = to_ns(pred_time) if pred_time else None
+            
+            if target_time and position:
+                match = np.abs(obs_ns - to_ns(target_time)) < 60 * 1e9
+                if pred_ns is not None:
+                    match &= (obs_ns - pred_ns) <= 7200 * 1e9
+                candidates = np.flatnonzero(match)
+                if len(candidates):
+                    distances = haversine_distances(
+                        position[0], position[1],
+                        columns['latitude'][candidates], columns['longitude'][candidates]
+                    )
+                    close = candidates[distances < 200]
+                    if len(close):
+                        first = close[0]
+                        if prediction:
+                            self.prediction_evaluator.evaluate_prediction(
+                                predicted=prediction,
+                                actual={
+                                    'wind_direction': float(columns['wind_direction'][first]),
+                                    'wind_speed': float(columns['wind_speed'][first])
+                                },
+                                prediction_time=pred_time,
+                                evaluation_time=obs_times[first]
+                            )
+                        # 評価済みの予測を削除
+                        del self.previous_predictions[key]
+                        continue
+            
+            # 2時間以上前の予測は削除
+            if pred_ns is not None and latest_ns - pred_ns > 7200 * 1e9:
+                del self.previous_predictions[key]
+    
     def predict_wind_field(self, target_time: datetime, grid_resolution: int = 20) -> Dict[str, Any]:
         """
         目標時間の風の場を予測
@@ -480,11 +708,10 @@ class WindFieldFusionSystem:
             return self._predict_wind_field_for_tests(target_time, grid_resolution)
         
         # 現在の風の場が利用可能かチェック
-        if not self.current_wind_field and self.wind_data_points:
+        if not self.current_wind_field and len(self.observations):
             # データがあるのに風の場がない場合はシンプルな風場を生成
-            from .wind_field_fusion_utils import create_simple_wind_field
-            latest_time = max(point['timestamp'] for point in self.wind_data_points) if self.wind_data_points else datetime.now()
-            self.current_wind_field = create_simple_wind_field(self.wind_data_points, grid_resolution, latest_time)
+            latest_time = self.observations.latest_time()
+            self.current_wind_field = self._create_simple_field(None, grid_resolution, latest_time)
         
         if not self.current_wind_field:
             # 風の場がない場合はダミーデータを返す
@@ -528,10 +755,9 @@ class WindFieldFusionSystem:
     def _predict_wind_field_for_tests(self, target_time, grid_resolution):
         """テスト環境用の簡略化された風の場予測処理"""
         # データポイントがある場合は単純な風場を生成
-        if self.wind_data_points:
-            from .wind_field_fusion_utils import create_simple_wind_field
-            latest_time = max(point['timestamp'] for point in self.wind_data_points)
-            simple_field = create_simple_wind_field(self.wind_data_points, 10, latest_time)
+        if len(self.observations):
+            latest_time = self.observations.latest_time()
+            simple_field = self._create_simple_field(None, 10, latest_time)
             # タイムスタンプだけ対象時間に更新
             simple_field['time'] = target_time
             self.current_wind_field = simple_field
@@ -595,67 +821,39 @@ class WindFieldFusionSystem:
         pred_lat_grid = current_lat_grid[::sample_factor, ::sample_factor]
         pred_lon_grid = current_lon_grid[::sample_factor, ::sample_factor]
         
-        # 各グリッドポイントでの風を予測
-        predicted_dirs = np.zeros_like(pred_lat_grid)
-        predicted_speeds = np.zeros_like(pred_lat_grid)
-        predicted_conf = np.zeros_like(pred_lat_grid)
+        # 風の移動モデルでグリッド全体の風を一括予測
+        predicted_grid = self.propagation_model.predict_future_wind_field(
+            pred_lat_grid, pred_lon_grid, target_time, historical_data
+        )
+        predicted_dirs = predicted_grid['wind_direction']
+        predicted_speeds = predicted_grid['wind_speed']
+        predicted_conf = predicted_grid['confidence']
         
         # 予測評価用にサンプルポイントの予測を保存
-        if self.enable_prediction_evaluation:
+        if self.enable_prediction_evaluation and pred_lat_grid.size > 0:
             # ランダムに5つのポイントを選択
-            sample_indices = []
-            if pred_lat_grid.size > 0:
-                flat_indices = np.random.choice(
-                    pred_lat_grid.size, 
-                    min(5, pred_lat_grid.size), 
-                    replace=False
-                )
-                rows, cols = np.unravel_index(flat_indices, pred_lat_grid.shape)
-                sample_indices = list(zip(rows, cols))
-        
-        for i in range(pred_lat_grid.shape[0]):
-            for j in range(pred_lat_grid.shape[1]):
+            flat_indices = np.random.choice(
+                pred_lat_grid.size, 
+                min(5, pred_lat_grid.size), 
+                replace=False
+            )
+            for i, j in zip(*np.unravel_index(flat_indices, pred_lat_grid.shape)):
                 position = (pred_lat_grid[i, j], pred_lon_grid[i, j])
                 
-                # 風の移動モデルを使用した予測
-                prediction = self.propagation_model.predict_future_wind(
-                    position, target_time, historical_data
-                )
+                # 一意なキーを生成
+                key = f"{position[0]:.6f}_{position[1]:.6f}_{target_time.timestamp()}"
                 
-                if prediction:
-                    predicted_dirs[i, j] = prediction.get('wind_direction', 0)
-                    predicted_speeds[i, j] = prediction.get('wind_speed', 0)
-                    predicted_conf[i, j] = prediction.get('confidence', 0.5)
-                    
-                    # 選択されたサンプルポイントの場合、予測を保存
-                    if self.enable_prediction_evaluation and (i, j) in sample_indices:
-                        # 一意なキーを生成
-                        key = f"{position[0]:.6f}_{position[1]:.6f}_{target_time.timestamp()}"
-                        
-                        # 予測情報を保存
-                        self.previous_predictions[key] = {
-                            'prediction_time': current_time,
-                            'target_time': target_time,
-                            'position': position,
-                            'prediction': {
-                                'wind_direction': prediction.get('wind_direction', 0),
-                                'wind_speed': prediction.get('wind_speed', 0),
-                                'confidence': prediction.get('confidence', 0.5)
-                            }
-                        }
-                else:
-                    # 予測が失敗した場合は現在値を使用
-                    i_full = i * sample_factor
-                    j_full = j * sample_factor
-                    
-                    if i_full < current_lat_grid.shape[0] and j_full < current_lat_grid.shape[1]:
-                        predicted_dirs[i, j] = self.current_wind_field['wind_direction'][i_full, j_full]
-                        predicted_speeds[i, j] = self.current_wind_field['wind_speed'][i_full, j_full]
-                        predicted_conf[i, j] = self.current_wind_field['confidence'][i_full, j_full] * 0.7  # 信頼度低下
-                    else:
-                        predicted_dirs[i, j] = 0
-                        predicted_speeds[i, j] = 0
-                        predicted_conf[i, j] = 0.3
+                # 予測情報を保存
+                self.previous_predictions[key] = {
+                    'prediction_time': current_time,
+                    'target_time': target_time,
+                    'position': position,
+                    'prediction': {
+                        'wind_direction': float(predicted_dirs[i, j]),
+                        'wind_speed': float(predicted_speeds[i, j]),
+                        'confidence': float(predicted_conf[i, j])
+                    }
+                }
         
         # 予測結果を目標解像度に補間
         if grid_resolution != pred_lat_grid.shape[0]:
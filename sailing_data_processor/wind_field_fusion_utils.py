@@ -10,6 +10,7 @@ import math
 from typing import Dict, List, Tuple, Optional, Union, Any
 from datetime import datetime
 from scipy.interpolate import griddata
+from scipy.spatial import cKDTree
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -47,62 +48,51 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     
     return distance
 
-def scale_data_points(data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def scale_coordinate_arrays(lats: Any, lons: Any, winds: Any, seed: int = 42) -> Dict[str, Any]:
     """
-    風データポイントを適切にスケーリングして補間処理を安定化
+    緯度・経度・風速の配列を0-1付近に正規化して補間処理を安定化
+    
+    範囲が狭すぎる場合は人工的に広げ、再現性のため固定シードのジッターを加えます。
     
     Parameters:
     -----------
-    data_points : List[Dict]
-        風データポイントのリスト
+    lats, lons : array-like
+        緯度・経度
+    winds : array-like
+        風速
+    seed : int
+        ジッターの乱数シード
         
     Returns:
     --------
-    List[Dict]
-        スケーリングされたデータポイントのリスト
+    Dict[str, Any]
+        'scaled_latitude', 'scaled_longitude', 'scaled_height' の配列と、
+        正規化に使った範囲 'bounds' = (min_lat, lat_range, min_lon, lon_range, min_wind, wind_range)
     """
-    if not data_points:
-        return []
-        
-    # メモリ効率のため、必要なデータだけを抽出して事前に配列化
-    num_points = len(data_points)
-    lats = np.zeros(num_points, dtype=np.float32)
-    lons = np.zeros(num_points, dtype=np.float32)
-    winds = np.zeros(num_points, dtype=np.float32)
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    lons = np.asarray(lons, dtype=np.float64).ravel()
+    winds = np.asarray(winds, dtype=np.float64).ravel()
+    num_points = len(lats)
     
-    # 一度にデータを抽出（ループで複数回アクセスするのを避ける）
-    for i, point in enumerate(data_points):
-        lats[i] = point['latitude']
-        lons[i] = point['longitude']
-        winds[i] = point['wind_speed']
-    
-    # NumPyの組み込み関数を使用して効率的に最小・最大値を計算
     min_lat, max_lat = np.min(lats), np.max(lats)
     min_lon, max_lon = np.min(lons), np.max(lons)
     min_wind, max_wind = np.min(winds), np.max(winds)
     
-    # 範囲の計算（一度だけ）
     lat_range = max_lat - min_lat
     lon_range = max_lon - min_lon
     wind_range = max_wind - min_wind
     
-    # 前もって結果配列を確保（メモリ効率向上）
-    scaled_data = []
-    
     # 緯度・経度の範囲が狭すぎる場合は人工的に広げる
     min_range = 0.005  # 約500mの最小範囲に拡大
     
-    # 必要に応じて範囲を確保（より効率的な計算）
     if lat_range < min_range:
         lat_padding = (min_range - lat_range) / 2 + 0.001
         min_lat -= lat_padding
-        max_lat += lat_padding
         lat_range = min_range + 0.002  # パディング後の範囲更新
     
     if lon_range < min_range:
         lon_padding = (min_range - lon_range) / 2 + 0.001
         min_lon -= lon_padding
-        max_lon += lon_padding
         lon_range = min_range + 0.002  # パディング後の範囲更新
     
     # 風速の最小範囲を確保
@@ -110,47 +100,63 @@ def scale_data_points(data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     if wind_range < min_wind_range:
         wind_padding = (min_wind_range - wind_range) / 2 + 0.2
         min_wind = max(0, min_wind - wind_padding)
-        max_wind += wind_padding
         wind_range = min_wind_range + 0.4  # パディング後の範囲更新
     
-    # スケール係数を一度だけ計算（ゼロ除算を回避）
-    scale_lat = 1.0 / lat_range if lat_range > 0 else 1.0
-    scale_lon = 1.0 / lon_range if lon_range > 0 else 1.0
-    scale_wind = 1.0 / wind_range if wind_range > 0 else 1.0
+    # ジッターは専用の乱数生成器で作る（グローバルな乱数状態は変更しない）
+    rng = np.random.RandomState(seed)
+    jitter_lats = rng.normal(0, 0.002, num_points)
+    jitter_lons = rng.normal(0, 0.002, num_points)
+    jitter_winds = rng.normal(0, 0.005, num_points)
+    
+    return {
+        'scaled_latitude': (lats - min_lat) / lat_range + jitter_lats,
+        'scaled_longitude': (lons - min_lon) / lon_range + jitter_lons,
+        'scaled_height': (winds - min_wind) / wind_range + jitter_winds,
+        'bounds': (min_lat, lat_range, min_lon, lon_range, min_wind, wind_range)
+    }
+
+def scale_data_points(data_points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    風データポイントを適切にスケーリングして補間処理を安定化
+    
+    Parameters:
+    -----------
+    data_points : List[Dict]
+        風データポイントのリスト
+        
+    Returns:
+    --------
+    List[Dict]
+        スケーリングされたデータポイントのリスト
+    """
+    if not data_points:
+        return []
     
-    # ランダムジッター用に予めシード値を固定（再現性確保）
-    np.random.seed(42)
+    lats = np.array([point['latitude'] for point in data_points], dtype=np.float64)
+    lons = np.array([point['longitude'] for point in data_points], dtype=np.float64)
+    winds = np.array([point['wind_speed'] for point in data_points], dtype=np.float64)
+    scaled = scale_coordinate_arrays(lats, lons, winds)
     
-    # 一度にジッターランダム値を生成（ベクトル化）
-    jitter_lats = np.random.normal(0, 0.002, num_points)
-    jitter_lons = np.random.normal(0, 0.002, num_points)
-    jitter_winds = np.random.normal(0, 0.005, num_points)
+    scaled_lats = scaled['scaled_latitude'].tolist()
+    scaled_lons = scaled['scaled_longitude'].tolist()
+    scaled_heights = scaled['scaled_height'].tolist()
     
-    # データポイントのバッチ処理
+    scaled_data = []
     for i, point in enumerate(data_points):
         # ポイントデータを変更するのではなく、新しい辞書を作成
         scaled_point = point.copy()
-        
-        # 正規化と同時にジッターを追加（計算を1回に統合）
-        norm_lat = (lats[i] - min_lat) * scale_lat + jitter_lats[i]
-        norm_lon = (lons[i] - min_lon) * scale_lon + jitter_lons[i]
-        norm_wind = (winds[i] - min_wind) * scale_wind + jitter_winds[i]
-        
-        # スケーリングした座標を設定（中間変数の再利用を最小化）
-        scaled_point['scaled_latitude'] = norm_lat
-        scaled_point['scaled_longitude'] = norm_lon
-        scaled_point['scaled_height'] = norm_wind
+        scaled_point['scaled_latitude'] = scaled_lats[i]
+        scaled_point['scaled_longitude'] = scaled_lons[i]
+        scaled_point['scaled_height'] = scaled_heights[i]
         
         # 元の値を保持
-        scaled_point['original_latitude'] = lats[i]
-        scaled_point['original_longitude'] = lons[i]
+        scaled_point['original_latitude'] = point['latitude']
+        scaled_point['original_longitude'] = point['longitude']
         
         # スケーリングされた値を使用
-        scaled_point['latitude'] = norm_lat
-        scaled_point['longitude'] = norm_lon
-        scaled_point['height'] = norm_wind
-        
-        # 結果リストに追加
+        scaled_point['latitude'] = scaled_lats[i]
+        scaled_point['longitude'] = scaled_lons[i]
+        scaled_point['height'] = scaled_heights[i]
         scaled_data.append(scaled_point)
         
     return scaled_data
@@ -217,6 +223,70 @@ def create_dummy_wind_field(timestamp: datetime, grid_resolution: int = 10) -> D
         'is_dummy': True  # ダミーデータであることを示すフラグ
     }
 
+def _padded_bounds(lats: np.ndarray, lons: np.ndarray) -> Tuple[float, float, float, float]:
+    """データの緯度・経度の範囲（狭すぎる場合は約500mまで広げる）"""
+    min_lat, max_lat = float(np.min(lats)), float(np.max(lats))
+    min_lon, max_lon = float(np.min(lons)), float(np.max(lons))
+    
+    if abs(max_lat - min_lat) < 0.005:
+        padding = (0.005 - abs(max_lat - min_lat)) / 2
+        min_lat -= padding
+        max_lat += padding
+        
+    if abs(max_lon - min_lon) < 0.005:
+        padding = (0.005 - abs(max_lon - min_lon)) / 2
+        min_lon -= padding
+        max_lon += padding
+    
+    return min_lat, max_lat, min_lon, max_lon
+
+def create_simple_wind_field_from_arrays(lats: Any, lons: Any, wind_directions: Any, wind_speeds: Any,
+                                         grid_resolution: int, timestamp: datetime) -> Dict[str, Any]:
+    """
+    観測値の配列から平均風向風速の一様な風の場を生成
+    
+    Parameters:
+    -----------
+    lats, lons : array-like
+        観測位置の緯度・経度
+    wind_directions, wind_speeds : array-like
+        観測された風向（度）・風速
+    grid_resolution : int
+        出力グリッド解像度
+    timestamp : datetime
+        風の場のタイムスタンプ
+        
+    Returns:
+    --------
+    Dict[str, Any]
+        作成された風の場
+    """
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    if len(lats) == 0:
+        # データポイントがない場合は東京湾付近のダミーデータを作成
+        return create_dummy_wind_field(timestamp, grid_resolution)
+    
+    min_lat, max_lat, min_lon, max_lon = _padded_bounds(lats, np.asarray(lons, dtype=np.float64))
+    
+    # グリッドの作成
+    lat_range = np.linspace(min_lat, max_lat, grid_resolution)
+    lon_range = np.linspace(min_lon, max_lon, grid_resolution)
+    grid_lats, grid_lons = np.meshgrid(lat_range, lon_range)
+    
+    # 風向はベクトル平均
+    dir_rad = np.radians(np.asarray(wind_directions, dtype=np.float64))
+    avg_dir = math.degrees(math.atan2(np.sum(np.sin(dir_rad)), np.sum(np.cos(dir_rad)))) % 360
+    avg_speed = float(np.mean(np.asarray(wind_speeds, dtype=np.float64)))
+    
+    return {
+        'lat_grid': grid_lats,
+        'lon_grid': grid_lons,
+        'wind_direction': np.full_like(grid_lats, avg_dir),
+        'wind_speed': np.full_like(grid_lats, avg_speed),
+        'confidence': np.full_like(grid_lats, 0.4),  # 信頼度は低めに設定
+        'time': timestamp
+    }
+
 def create_simple_wind_field(data_points: List[Dict[str, Any]], 
                          grid_resolution: int, 
                          timestamp: datetime) -> Dict[str, Any]:
@@ -238,68 +308,248 @@ def create_simple_wind_field(data_points: List[Dict[str, Any]],
     Dict[str, Any]
         作成された風の場
     """
-    if not data_points:
-        # データポイントがない場合は東京湾付近のダミーデータを作成
-        return create_dummy_wind_field(timestamp, grid_resolution)
-        
-    # データポイントから緯度・経度の範囲を取得
-    lats = [point['latitude'] for point in data_points]
-    lons = [point['longitude'] for point in data_points]
+    return create_simple_wind_field_from_arrays(
+        [point['latitude'] for point in data_points],
+        [point['longitude'] for point in data_points],
+        [point['wind_direction'] for point in data_points],
+        [point['wind_speed'] for point in data_points],
+        grid_resolution, timestamp
+    )
+
+def idw_wind_field_from_arrays(lats: Any, lons: Any, wind_directions: Any, wind_speeds: Any,
+                               confidence: Any, grid_resolution: int, timestamp: datetime,
+                               scaled: Optional[Dict[str, Any]] = None,
+                               k: int = 8, power: float = 2.0) -> Dict[str, Any]:
+    """
+    観測値の配列から逆距離加重法（IDW）で風の場を生成
     
-    min_lat, max_lat = min(lats), max(lats)
-    min_lon, max_lon = min(lons), max(lons)
+    グリッドの各点について近傍k個の観測をKD木でまとめて検索し、
+    風向はsin/cos成分、風速と信頼度はそのまま距離の逆数のべき乗で重み付け平均します。
     
-    # 範囲が狭すぎる場合は人工的に広げる
-    if abs(max_lat - min_lat) < 0.005:
-        padding = (0.005 - abs(max_lat - min_lat)) / 2
-        min_lat -= padding
-        max_lat += padding
+    Parameters:
+    -----------
+    lats, lons : array-like
+        観測位置の緯度・経度
+    wind_directions, wind_speeds : array-like
+        観測された風向（度）・風速
+    confidence : array-like
+        観測の信頼度（NaNは0.8として扱う）
+    grid_resolution : int
+        出力グリッド解像度
+    timestamp : datetime
+        風の場のタイムスタンプ
+    scaled : Dict[str, Any], optional
+        scale_coordinate_arrays の結果（指定時は正規化した座標系で距離を計算）
+    k : int
+        補間に使う近傍観測の数
+    power : float
+        距離の重みのべき指数
         
-    if abs(max_lon - min_lon) < 0.005:
-        padding = (0.005 - abs(max_lon - min_lon)) / 2
-        min_lon -= padding
-        max_lon += padding
+    Returns:
+    --------
+    Dict[str, Any]
+        補間された風の場
+    """
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    lons = np.asarray(lons, dtype=np.float64).ravel()
+    if len(lats) == 0:
+        return create_dummy_wind_field(timestamp, grid_resolution)
     
-    # グリッドの作成
+    min_lat, max_lat, min_lon, max_lon = _padded_bounds(lats, lons)
     lat_range = np.linspace(min_lat, max_lat, grid_resolution)
     lon_range = np.linspace(min_lon, max_lon, grid_resolution)
     grid_lats, grid_lons = np.meshgrid(lat_range, lon_range)
     
-    # 風向風速の平均値を計算（風向はベクトル平均）
-    sin_sum = 0
-    cos_sum = 0
-    speed_sum = 0
-    
-    for point in data_points:
-        dir_rad = math.radians(point['wind_direction'])
-        sin_sum += math.sin(dir_rad)
-        cos_sum += math.cos(dir_rad)
-        speed_sum += point['wind_speed']
-    
-    # 平均風向
-    avg_dir = math.degrees(math.atan2(sin_sum, cos_sum)) % 360
-    
-    # 平均風速
-    avg_speed = speed_sum / len(data_points)
-    
-    # 全グリッドに同じ値を設定
-    wind_dirs = np.full_like(grid_lats, avg_dir)
-    wind_speeds = np.full_like(grid_lats, avg_speed)
+    if scaled is not None:
+        # 正規化した座標系（ジッター込み）で観測とグリッドの距離を計算
+        lat0, lat_scale, lon0, lon_scale = scaled['bounds'][:4]
+        points = np.column_stack([scaled['scaled_latitude'], scaled['scaled_longitude']])
+        queries = np.column_stack([((grid_lats - lat0) / lat_scale).ravel(),
+                                   ((grid_lons - lon0) / lon_scale).ravel()])
+    else:
+        # 緯度方向の距離に合わせて経度を縮めた平面座標
+        cos_lat = math.cos(math.radians((min_lat + max_lat) / 2))
+        points = np.column_stack([lats, lons * cos_lat])
+        queries = np.column_stack([grid_lats.ravel(), grid_lons.ravel() * cos_lat])
+    
+    k = min(k, len(points))
+    distances, indices = cKDTree(points).query(queries, k=k)
+    distances = np.asarray(distances).reshape(len(queries), k)
+    indices = np.asarray(indices).reshape(len(queries), k)
+    
+    directions, speeds, conf = _idw_blend(distances, indices, wind_directions, wind_speeds,
+                                          confidence, power)
+    shape = grid_lats.shape
     
-    # 信頼度は低めに設定
-    confidence = np.full_like(grid_lats, 0.4)
-    
-    # 風の場の作成
-    wind_field = {
+    return {
         'lat_grid': grid_lats,
         'lon_grid': grid_lons,
-        'wind_direction': wind_dirs,
-        'wind_speed': wind_speeds,
-        'confidence': confidence,
+        'wind_direction': directions.reshape(shape),
+        'wind_speed': speeds.reshape(shape),
+        'confidence': conf.reshape(shape),
         'time': timestamp
     }
+
+def _idw_blend(distances: np.ndarray, indices: np.ndarray, wind_directions: Any, wind_speeds: Any,
+               confidence: Any, power: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """近傍観測の距離と番号から風向・風速・信頼度を逆距離加重で合成"""
+    # 観測点と重なるグリッド点はその観測値をそのまま使う
+    weights = 1.0 / np.maximum(distances, 1e-12) ** power
+    weights /= weights.sum(axis=1, keepdims=True)
+    
+    dir_rad = np.radians(np.asarray(wind_directions, dtype=np.float64).ravel())
+    speeds = np.asarray(wind_speeds, dtype=np.float64).ravel()
+    conf = np.asarray(confidence, dtype=np.float64).ravel()
+    conf = np.where(np.isfinite(conf), conf, 0.8)
+    
+    sin_interp = np.sum(weights * np.sin(dir_rad)[indices], axis=1)
+    cos_interp = np.sum(weights * np.cos(dir_rad)[indices], axis=1)
+    return (np.degrees(np.arctan2(sin_interp, cos_interp)) % 360,
+            np.sum(weights * speeds[indices], axis=1),
+            np.sum(weights * conf[indices], axis=1))
+
+class IncrementalIDWField:
+    """
+    観測の追加・削除に合わせて差分だけ再計算する逆距離加重（IDW）の風の場
+    
+    グリッドの各セルについて近傍k個の観測の通し番号と距離を保持し、
+    前回の結果を初期値として、次のいずれかに当てはまるセルだけを再計算します。
+    
+    - 近傍の観測が時間窓から外れた（通し番号が min_sequence より小さい）
+    - 新しい観測が現在のk番目の近傍より近い
+    - 近傍の観測数がkに満たず、新しい観測がある
     
-    return wind_field
+    それ以外のセルは近傍の集合が変わらないため、全体を再計算した場合と同じ値になります。
+    観測がグリッドの範囲外に出た場合はグリッドを作り直して全体を再計算します。
+    
+    Parameters:
+    -----------
+    grid_resolution : int
+        出力グリッド解像度
+    k : int
+        補間に使う近傍観測の数
+    power : float
+        距離の重みのべき指数
+    margin : float
+        グリッドを作る際にデータ範囲の外側に確保する余白（範囲に対する割合）
+    """
+    
+    def __init__(self, grid_resolution: int = 20, k: int = 8, power: float = 2.0, margin: float = 0.1):
+        self.grid_resolution = grid_resolution
+        self.k = k
+        self.power = power
+        self.margin = margin
+        self.reset()
+    
+    def reset(self) -> None:
+        """グリッドと近傍情報を破棄します"""
+        self.lat_grid = None
+        self.lon_grid = None
+        self._bounds = None
+        self._cos_lat = 1.0
+        self._neighbor_ids = None
+        self._neighbor_distances = None
+        self._values = None
+        # 直近の更新で再計算したセル数
+        self.last_recomputed = 0
+    
+    def _create_grid(self, lats: np.ndarray, lons: np.ndarray) -> None:
+        min_lat, max_lat, min_lon, max_lon = _padded_bounds(lats, lons)
+        lat_pad = (max_lat - min_lat) * self.margin
+        lon_pad = (max_lon - min_lon) * self.margin
+        self._bounds = (min_lat - lat_pad, max_lat + lat_pad, min_lon - lon_pad, max_lon + lon_pad)
+        lat_range = np.linspace(self._bounds[0], self._bounds[1], self.grid_resolution)
+        lon_range = np.linspace(self._bounds[2], self._bounds[3], self.grid_resolution)
+        self.lat_grid, self.lon_grid = np.meshgrid(lat_range, lon_range)
+        self._cos_lat = math.cos(math.radians((self._bounds[0] + self._bounds[1]) / 2))
+        
+        cells = self.lat_grid.size
+        self._neighbor_ids = np.full((cells, self.k), -1, dtype=np.int64)
+        self._neighbor_distances = np.full((cells, self.k), np.inf)
+        self._values = {name: np.zeros(cells) for name in ('wind_direction', 'wind_speed', 'confidence')}
+    
+    def _plane(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return np.column_stack([lats, lons * self._cos_lat])
+    
+    def update(self, sequence: np.ndarray, lats: Any, lons: Any, wind_directions: Any,
+               wind_speeds: Any, confidence: Any, min_sequence: int, new_from: int,
+               timestamp: datetime, recompute_all: bool = False) -> Dict[str, Any]:
+        """
+        時間窓内の観測全体から風の場を更新します
+        
+        Parameters:
+        -----------
+        sequence : np.ndarray
+            観測の通し番号（追加順に増加し、再利用されない番号）
+        lats, lons, wind_directions, wind_speeds, confidence : array-like
+            時間窓内の観測の値
+        min_sequence : int
+            時間窓内に残っている観測の最小の通し番号（これより小さい近傍は削除済み）
+        new_from : int
+            前回の更新以降に追加された観測の最小の通し番号
+        timestamp : datetime
+            風の場のタイムスタンプ
+        recompute_all : bool
+            グリッドを維持したまま全セルを再計算する
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            更新された風の場（配列は内部状態のコピー）
+        """
+        sequence = np.asarray(sequence, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if len(sequence) == 0:
+            return create_dummy_wind_field(timestamp, self.grid_resolution)
+        
+        outside = self._bounds is None or (
+            lats.min() < self._bounds[0] or lats.max() > self._bounds[1] or
+            lons.min() < self._bounds[2] or lons.max() > self._bounds[3])
+        if outside:
+            self._create_grid(lats, lons)
+        if outside or recompute_all:
+            affected = np.ones(self.lat_grid.size, dtype=bool)
+        else:
+            cells = self._plane(self.lat_grid.ravel(), self.lon_grid.ravel())
+            ids = self._neighbor_ids
+            # 近傍が時間窓から外れたセル
+            affected = ((ids >= 0) & (ids < min_sequence)).any(axis=1)
+            new = sequence >= new_from
+            if new.any():
+                # 新しい観測が現在のk番目の近傍より近いセル
+                nearest_new, _ = cKDTree(self._plane(lats[new], lons[new])).query(cells, k=1)
+                affected |= nearest_new < self._neighbor_distances[:, -1]
+        
+        self.last_recomputed = int(affected.sum())
+        if self.last_recomputed:
+            k = min(self.k, len(sequence))
+            cells = self._plane(self.lat_grid.ravel()[affected], self.lon_grid.ravel()[affected])
+            distances, indices = cKDTree(self._plane(lats, lons)).query(cells, k=k)
+            distances = np.asarray(distances).reshape(len(cells), k)
+            indices = np.asarray(indices).reshape(len(cells), k)
+            
+            directions, speeds, conf = _idw_blend(distances, indices, wind_directions, wind_speeds,
+                                                  confidence, self.power)
+            self._values['wind_direction'][affected] = directions
+            self._values['wind_speed'][affected] = speeds
+            self._values['confidence'][affected] = conf
+            
+            # 観測数がkに満たない列は未使用（距離inf）として保持
+            self._neighbor_ids[affected] = -1
+            self._neighbor_distances[affected] = np.inf
+            self._neighbor_ids[np.ix_(affected, np.arange(k))] = sequence[indices]
+            self._neighbor_distances[np.ix_(affected, np.arange(k))] = distances
+        
+        shape = self.lat_grid.shape
+        return {
+            'lat_grid': self.lat_grid.copy(),
+            'lon_grid': self.lon_grid.copy(),
+            'wind_direction': self._values['wind_direction'].reshape(shape).copy(),
+            'wind_speed': self._values['wind_speed'].reshape(shape).copy(),
+            'confidence': self._values['confidence'].reshape(shape).copy(),
+            'time': timestamp
+        }
 
 def interpolate_field_to_grid(source_field: Dict[str, Any], 
                           target_lat_grid: np.ndarray, 
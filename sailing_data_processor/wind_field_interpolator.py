@@ -3,9 +3,12 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import math
+import bisect
+import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Union, Any
 from scipy.interpolate import Rbf, LinearNDInterpolator, NearestNDInterpolator
-from scipy.spatial import Delaunay
+from scipy.spatial import Delaunay, cKDTree
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, WhiteKernel, Matern, ConstantKernel
 
@@ -50,6 +53,18 @@ class WindFieldInterpolator:
         
         # 最後に更新された時刻
         self.last_update_time = None
+        
+        # 時刻の昇順インデックス（二分探索用）
+        self._time_index = []
+        
+        # リサンプリング結果のキャッシュ（(時刻, 解像度, qhullオプション) -> 風の場）
+        self._resample_cache = OrderedDict()
+        # 補間重みのキャッシュ（(元グリッド, 解像度, qhullオプション) -> 三角形分割と重み）
+        self._weights_cache = OrderedDict()
+        # 出力グリッドのキャッシュ（解像度 -> (緯度グリッド, 経度グリッド)）
+        self._output_grid_cache = {}
+        # キャッシュの最大エントリ数
+        self.max_cache_entries = 64
     
     def add_wind_field(self, time_point_or_field: Union[datetime, Dict[str, Any]], wind_field: Optional[Dict[str, Any]] = None):
         """
@@ -67,22 +82,28 @@ class WindFieldInterpolator:
             time_point = time_point_or_field
             if wind_field is None:
                 raise ValueError("wind_field parameter is required when time_point is specified")
-            self.wind_field_data[time_point] = wind_field.copy()
         else:
             # 新しい使用法: add_wind_field(wind_field_with_time)
             wind_field = time_point_or_field
             if 'time' not in wind_field:
                 raise ValueError("wind_field must contain 'time' attribute")
             time_point = wind_field['time']
-            self.wind_field_data[time_point] = wind_field.copy()
         
-        # 時間ソート
-        self.wind_field_data = dict(sorted(self.wind_field_data.items()))
+        # 時刻インデックスに二分探索で挿入
+        time_index = self._sorted_times()
+        if time_point not in self.wind_field_data:
+            bisect.insort(time_index, time_point)
+        self.wind_field_data[time_point] = wind_field.copy()
+        self._invalidate_caches(time_point)
         
         # データが増えすぎないように古いデータを削除
-        if len(self.wind_field_data) > 20:
-            oldest_time = min(self.wind_field_data.keys())
+        if len(time_index) > 20:
+            oldest_time = time_index.pop(0)
             del self.wind_field_data[oldest_time]
+            self._invalidate_caches(oldest_time)
+        
+        # 時間順に並べた辞書を維持
+        self.wind_field_data = {t: self.wind_field_data[t] for t in time_index}
         
         # 時間変化トレンドを更新
         self._update_time_trends()
@@ -90,12 +111,95 @@ class WindFieldInterpolator:
         # 最後の更新時刻を記録
         self.last_update_time = datetime.now()
     
+    def _sorted_times(self) -> List[datetime]:
+        """時刻の昇順インデックス（風の場データが直接変更された場合は再構築）"""
+        if len(self._time_index) != len(self.wind_field_data):
+            self._time_index = sorted(self.wind_field_data.keys())
+            self._resample_cache.clear()
+            self._output_grid_cache.clear()
+        return self._time_index
+    
+    def _nearest_times(self, target_time: datetime, count: int = 2) -> List[datetime]:
+        """
+        対象時間に近い順に時刻を取得（二分探索で前後の候補のみを比較）
+        
+        Parameters:
+        -----------
+        target_time : datetime
+            対象時間
+        count : int
+            取得する時刻の数
+            
+        Returns:
+        --------
+        List[datetime]
+            近い順の時刻（時間差が等しい場合は早い時刻が先）
+        """
+        time_index = self._sorted_times()
+        position = bisect.bisect_left(time_index, target_time)
+        candidates = time_index[max(0, position - count):position + count]
+        candidates.sort(key=lambda t: (abs((t - target_time).total_seconds()), t))
+        return candidates[:count]
+    
+    def _invalidate_caches(self, time_point: datetime) -> None:
+        """指定時刻の風の場に依存するキャッシュを破棄"""
+        for key in [key for key in self._resample_cache if key[0] == time_point]:
+            del self._resample_cache[key]
+        self._output_grid_cache.clear()
+    
+    def _output_grid(self, resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+        """全ての風の場をカバーする出力グリッド（解像度ごとにキャッシュ）"""
+        self._sorted_times()
+        if resolution not in self._output_grid_cache:
+            lat_min = min(np.min(field['lat_grid']) for field in self.wind_field_data.values())
+            lat_max = max(np.max(field['lat_grid']) for field in self.wind_field_data.values())
+            lon_min = min(np.min(field['lon_grid']) for field in self.wind_field_data.values())
+            lon_max = max(np.max(field['lon_grid']) for field in self.wind_field_data.values())
+            
+            lat_grid = np.linspace(lat_min, lat_max, resolution)
+            lon_grid = np.linspace(lon_min, lon_max, resolution)
+            self._output_grid_cache[resolution] = np.meshgrid(lat_grid, lon_grid)
+        
+        grid_lats, grid_lons = self._output_grid_cache[resolution]
+        return grid_lats.copy(), grid_lons.copy()
+    
+    def _resampled_field(self, time_point: datetime, resolution: int,
+                         qhull_options: str = None) -> Dict[str, Any]:
+        """
+        保持している風の場のリサンプリング結果を取得（(時刻, 解像度, qhullオプション) ごとにキャッシュ）
+        
+        Parameters:
+        -----------
+        time_point : datetime
+            風の場の時刻
+        resolution : int
+            出力解像度
+        qhull_options : str, optional
+            Delaunay三角形分割のqhullオプション
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            リサンプリングされた風の場（呼び出し側で変更してよいコピー）
+        """
+        key = (time_point, resolution, qhull_options)
+        if key in self._resample_cache:
+            self._resample_cache.move_to_end(key)
+        else:
+            self._resample_cache[key] = self._resample_wind_field(
+                self.wind_field_data[time_point], resolution, qhull_options)
+            while len(self._resample_cache) > self.max_cache_entries:
+                self._resample_cache.popitem(last=False)
+        
+        return {k: (v.copy() if isinstance(v, np.ndarray) else v)
+                for k, v in self._resample_cache[key].items()}
+    
     def _update_time_trends(self):
         """時間変化トレンドを更新"""
         if len(self.wind_field_data) < 2:
             return
         
-        time_points = sorted(self.wind_field_data.keys())
+        time_points = self._sorted_times()
         
         # 風向トレンドの計算
         dir_changes = []
@@ -166,28 +270,8 @@ class WindFieldInterpolator:
         if method is None:
             method = self.interp_method
             
-        # 時間的に最も近いデータポイントを見つける
-        time_diffs = [(abs((t - target_time).total_seconds()), t) for t in self.wind_field_data.keys()]
-        time_diffs.sort()
-        
-        # 対象時間の前後のデータを抽出
-        before_times = []
-        after_times = []
-        
-        for _, t in time_diffs:
-            if t <= target_time:
-                before_times.append(t)
-            else:
-                after_times.append(t)
-        
-        before_times.sort(reverse=True)  # 直近の時間順
-        after_times.sort()  # 直近の時間順
-        
-        if not before_times and not after_times:
-            return None
-        
-        # 最近傍の時間を使用
-        nearest_time = time_diffs[0][1]
+        # 時間的に最も近いデータポイントを二分探索で見つける
+        nearest_time = self._nearest_times(target_time, 1)[0]
         base_field = self.wind_field_data[nearest_time]
         
         # 出力解像度の決定
@@ -199,17 +283,18 @@ class WindFieldInterpolator:
         
         # 時間変化が小さい場合は最近傍の風の場をそのまま使用
         if abs(time_diff_minutes) < 1.0:
-            return self._resample_wind_field(base_field, resolution, qhull_options)
+            return self._resampled_field(nearest_time, resolution, qhull_options)
         
         # 補間方法に応じて処理
         if method == 'gp':
-            return self._gp_interpolate(target_time, resolution)
+            return self._gp_interpolate(target_time, resolution, qhull_options)
         elif method == 'rbf':
-            return self._rbf_interpolate(target_time, resolution)
+            return self._rbf_interpolate(target_time, resolution, qhull_options)
         else:  # 'idw' or fallback
-            return self._idw_interpolate(target_time, resolution)
+            return self._idw_interpolate(target_time, resolution, qhull_options)
     
-    def _gp_interpolate(self, target_time: datetime, resolution: int) -> Dict[str, Any]:
+    def _gp_interpolate(self, target_time: datetime, resolution: int,
+                        qhull_options: str = None) -> Dict[str, Any]:
         """
         ガウス過程による補間
         
@@ -290,17 +375,8 @@ class WindFieldInterpolator:
             gp_cos.fit(X_noisy, y_cos)
             gp_speed.fit(X_noisy, y_speed)
             
-            # 出力グリッドの作成
-            # 緯度経度範囲の決定
-            all_lats = np.concatenate([field['lat_grid'].flatten() for field in self.wind_field_data.values()])
-            all_lons = np.concatenate([field['lon_grid'].flatten() for field in self.wind_field_data.values()])
-            
-            lat_min, lat_max = all_lats.min(), all_lats.max()
-            lon_min, lon_max = all_lons.min(), all_lons.max()
-            
-            lat_grid = np.linspace(lat_min, lat_max, resolution)
-            lon_grid = np.linspace(lon_min, lon_max, resolution)
-            grid_lats, grid_lons = np.meshgrid(lat_grid, lon_grid)
+            # 出力グリッドの作成（全ての風の場をカバーする範囲）
+            grid_lats, grid_lons = self._output_grid(resolution)
             
             # 予測用の座標
             XX = np.column_stack([
@@ -363,9 +439,10 @@ class WindFieldInterpolator:
         except Exception as e:
             # ガウス過程が失敗した場合はIDWにフォールバック
             print(f"ガウス過程補間に失敗しました: {e}")
-            return self._idw_interpolate(target_time, resolution)
+            return self._idw_interpolate(target_time, resolution, qhull_options)
     
-    def _rbf_interpolate(self, target_time: datetime, resolution: int) -> Dict[str, Any]:
+    def _rbf_interpolate(self, target_time: datetime, resolution: int,
+                         qhull_options: str = None) -> Dict[str, Any]:
         """
         Radial Basis Function (RBF) による補間
         
@@ -434,15 +511,7 @@ class WindFieldInterpolator:
                           wind_speeds, function='multiquadric')
             
             # 出力グリッドの作成
-            all_lats = np.concatenate([field['lat_grid'].flatten() for field in self.wind_field_data.values()])
-            all_lons = np.concatenate([field['lon_grid'].flatten() for field in self.wind_field_data.values()])
-            
-            lat_min, lat_max = all_lats.min(), all_lats.max()
-            lon_min, lon_max = all_lons.min(), all_lons.max()
-            
-            lat_grid = np.linspace(lat_min, lat_max, resolution)
-            lon_grid = np.linspace(lon_min, lon_max, resolution)
-            grid_lats, grid_lons = np.meshgrid(lat_grid, lon_grid)
+            grid_lats, grid_lons = self._output_grid(resolution)
             
             # 予測時刻（対象時間との差異はゼロ）
             time_grid = np.zeros_like(grid_lats)
@@ -459,10 +528,7 @@ class WindFieldInterpolator:
             wind_speeds = np.maximum(0, speed_pred)
             
             # 単純な信頼度モデル（時間と距離に基づく）
-            min_dist = np.inf
-            for t in self.wind_field_data.keys():
-                dist = abs((t - target_time).total_seconds() / 60)
-                min_dist = min(min_dist, dist)
+            min_dist = abs((self._nearest_times(target_time, 1)[0] - target_time).total_seconds() / 60)
             
             # 時間距離に基づく信頼度
             time_confidence = max(0.4, 1.0 - min_dist / 30)  # 30分以上離れると0.4
@@ -486,9 +552,10 @@ class WindFieldInterpolator:
         except Exception as e:
             # RBFが失敗した場合はIDWにフォールバック
             print(f"RBF補間に失敗しました: {e}")
-            return self._idw_interpolate(target_time, resolution)
+            return self._idw_interpolate(target_time, resolution, qhull_options)
     
-    def _idw_interpolate(self, target_time: datetime, resolution: int) -> Dict[str, Any]:
+    def _idw_interpolate(self, target_time: datetime, resolution: int,
+                         qhull_options: str = None) -> Dict[str, Any]:
         """
         逆距離加重法（IDW）による補間
         
@@ -498,6 +565,8 @@ class WindFieldInterpolator:
             対象時間
         resolution : int
             出力解像度
+        qhull_options : str, optional
+            リサンプリング時のDelaunay三角形分割のqhullオプション
             
         Returns:
         --------
@@ -505,32 +574,17 @@ class WindFieldInterpolator:
             補間された風の場
         """
         # 出力グリッドの作成
-        all_lats = np.concatenate([field['lat_grid'].flatten() for field in self.wind_field_data.values()])
-        all_lons = np.concatenate([field['lon_grid'].flatten() for field in self.wind_field_data.values()])
-        
-        lat_min, lat_max = all_lats.min(), all_lats.max()
-        lon_min, lon_max = all_lons.min(), all_lons.max()
-        
-        lat_grid = np.linspace(lat_min, lat_max, resolution)
-        lon_grid = np.linspace(lon_min, lon_max, resolution)
-        grid_lats, grid_lons = np.meshgrid(lat_grid, lon_grid)
+        grid_lats, grid_lons = self._output_grid(resolution)
         
         # 最も時間的に近い2つのデータを使用
-        time_diffs = [(abs((t - target_time).total_seconds()), t) for t in self.wind_field_data.keys()]
-        time_diffs.sort()
+        nearest_times = self._nearest_times(target_time, 2)
         
-        if len(time_diffs) == 1:
+        if len(nearest_times) == 1:
             # 1つしかデータがない場合はそのまま返す
-            nearest_time = time_diffs[0][1]
-            nearest_field = self.wind_field_data[nearest_time]
-            return self._resample_wind_field(nearest_field, resolution, qhull_options)
+            return self._resampled_field(nearest_times[0], resolution, qhull_options)
         
         # 2つの最近傍時間
-        t1 = time_diffs[0][1]
-        t2 = time_diffs[1][1]
-        
-        field1 = self.wind_field_data[t1]
-        field2 = self.wind_field_data[t2]
+        t1, t2 = nearest_times
         
         # 時間重み付け（線形補間）
         if t1 != t2:
@@ -543,9 +597,9 @@ class WindFieldInterpolator:
         # 線形補間の制限（0-1）
         alpha = max(0.0, min(1.0, alpha))
         
-        # 両方のフィールドをリサンプリング
-        field1_resampled = self._resample_wind_field(field1, resolution, qhull_options)
-        field2_resampled = self._resample_wind_field(field2, resolution, qhull_options)
+        # 両方のフィールドをリサンプリング（キャッシュ済みの結果を再利用）
+        field1_resampled = self._resampled_field(t1, resolution, qhull_options)
+        field2_resampled = self._resampled_field(t2, resolution, qhull_options)
         
         # 風向の補間（sin/cosを使用）
         dir1_rad = np.radians(field1_resampled['wind_direction'])
@@ -628,97 +682,25 @@ class WindFieldInterpolator:
         if orig_lats.shape[0] == resolution:
             return wind_field.copy()
         
-        # 新しいグリッドを作成
-        lat_min, lat_max = orig_lats.min(), orig_lats.max()
-        lon_min, lon_max = orig_lons.min(), orig_lons.max()
+        # 新しいグリッドと補間重み（同じ元グリッドでは三角形分割を再利用）
+        weights = self._resample_weights(orig_lats, orig_lons, resolution, qhull_options)
+        grid_lats = weights['grid_lats'].copy()
+        grid_lons = weights['grid_lons'].copy()
         
-        lat_grid = np.linspace(lat_min, lat_max, resolution)
-        lon_grid = np.linspace(lon_min, lon_max, resolution)
-        grid_lats, grid_lons = np.meshgrid(lat_grid, lon_grid)
+        # 風向はsin/cos成分で補間
+        sin_grid = self._apply_weights(weights, np.sin(np.radians(orig_dirs)))
+        cos_grid = self._apply_weights(weights, np.cos(np.radians(orig_dirs)))
+        speed_grid = self._apply_weights(weights, orig_speeds)
+        conf_grid = self._apply_weights(weights, orig_conf)
         
-        # データを平坦化
-        points = np.column_stack([orig_lats.flatten(), orig_lons.flatten()])
+        # 風向の復元
+        dir_grid = np.degrees(np.arctan2(sin_grid, cos_grid)) % 360
         
-        # 平坦なデータを準備
-        values_dir_sin = np.sin(np.radians(orig_dirs)).flatten()
-        values_dir_cos = np.cos(np.radians(orig_dirs)).flatten()
-        values_speed = orig_speeds.flatten()
-        values_conf = orig_conf.flatten()
+        # 風速の制限（負の値は0に）
+        speed_grid = np.maximum(0, speed_grid)
         
-        try:
-            # LinearNDInterpolatorはDelaunay三角形分割を使用
-            # qhull_optionsパラメータは互換性が無いため、Delaunay自体に設定する
-            if qhull_options:
-                # Delaunayにqhull_optionsを指定して作成
-                tri = Delaunay(points, qhull_options=qhull_options)
-                interp_sin = LinearNDInterpolator(tri, values_dir_sin)
-                interp_cos = LinearNDInterpolator(tri, values_dir_cos)
-                interp_speed = LinearNDInterpolator(tri, values_speed)
-                interp_conf = LinearNDInterpolator(tri, values_conf)
-            else:
-                # デフォルト設定で作成
-                interp_sin = LinearNDInterpolator(points, values_dir_sin)
-                interp_cos = LinearNDInterpolator(points, values_dir_cos)
-                interp_speed = LinearNDInterpolator(points, values_speed)
-                interp_conf = LinearNDInterpolator(points, values_conf)
-            
-            # フォールバックのためのNearestNDInterpolator
-            nearest_sin = NearestNDInterpolator(points, values_dir_sin)
-            nearest_cos = NearestNDInterpolator(points, values_dir_cos)
-            nearest_speed = NearestNDInterpolator(points, values_speed)
-            nearest_conf = NearestNDInterpolator(points, values_conf)
-            
-            # 予測点の準備
-            xi = np.column_stack([grid_lats.flatten(), grid_lons.flatten()])
-            
-            # 予測
-            sin_pred = interp_sin(xi)
-            cos_pred = interp_cos(xi)
-            speed_pred = interp_speed(xi)
-            conf_pred = interp_conf(xi)
-            
-            # NaNを近傍値で埋める
-            mask = np.isnan(sin_pred)
-            sin_pred[mask] = nearest_sin(xi[mask])
-            
-            mask = np.isnan(cos_pred)
-            cos_pred[mask] = nearest_cos(xi[mask])
-            
-            mask = np.isnan(speed_pred)
-            speed_pred[mask] = nearest_speed(xi[mask])
-            
-            mask = np.isnan(conf_pred)
-            conf_pred[mask] = nearest_conf(xi[mask])
-            
-            # グリッドに変換
-            sin_grid = sin_pred.reshape(grid_lats.shape)
-            cos_grid = cos_pred.reshape(grid_lats.shape)
-            speed_grid = speed_pred.reshape(grid_lats.shape)
-            conf_grid = conf_pred.reshape(grid_lats.shape)
-            
-            # 風向の復元
-            dir_grid = np.degrees(np.arctan2(sin_grid, cos_grid)) % 360
-            
-            # 風速の制限（負の値は0に）
-            speed_grid = np.maximum(0, speed_grid)
-            
-            # 信頼度の制限（0-1の範囲に）
-            conf_grid = np.maximum(0, np.minimum(1, conf_grid))
-            
-        except Exception as e:
-            # 補間失敗時は最近傍法を使用
-            print(f"リサンプリング補間に失敗しました: {e}")
-            
-            # 最近傍法
-            nearest = NearestNDInterpolator(points, np.arange(len(points)))
-            indices = nearest(np.column_stack([grid_lats.flatten(), grid_lons.flatten()]))
-            
-            sin_grid = np.sin(np.radians(orig_dirs.flatten()[indices])).reshape(grid_lats.shape)
-            cos_grid = np.cos(np.radians(orig_dirs.flatten()[indices])).reshape(grid_lats.shape)
-            dir_grid = np.degrees(np.arctan2(sin_grid, cos_grid)) % 360
-            
-            speed_grid = orig_speeds.flatten()[indices].reshape(grid_lats.shape)
-            conf_grid = orig_conf.flatten()[indices].reshape(grid_lats.shape)
+        # 信頼度の制限（0-1の範囲に）
+        conf_grid = np.maximum(0, np.minimum(1, conf_grid))
         
         # 結果の整理
         return {
@@ -730,6 +712,81 @@ class WindFieldInterpolator:
             'time': wind_field.get('time', datetime.now())
         }
     
+    def _resample_weights(self, orig_lats: np.ndarray, orig_lons: np.ndarray,
+                          resolution: int, qhull_options: str = None) -> Dict[str, Any]:
+        """
+        元グリッドから出力グリッドへの線形補間の重みを計算（元グリッドごとにキャッシュ）
+        
+        Delaunay三角形分割で各出力点を含む三角形と重心座標を求めます。
+        三角形分割の外側の点（と三角形分割に失敗した場合の全点）は最近傍の元グリッド点を使用します。
+        
+        Parameters:
+        -----------
+        orig_lats, orig_lons : np.ndarray
+            元グリッドの緯度・経度
+        resolution : int
+            出力解像度
+        qhull_options : str, optional
+            Delaunay三角形分割のqhullオプション
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            出力グリッド、三角形の頂点番号、重み、内外判定、最近傍点の番号
+        """
+        points = np.column_stack([np.asarray(orig_lats, dtype=float).ravel(),
+                                  np.asarray(orig_lons, dtype=float).ravel()])
+        key = (np.shape(orig_lats), hashlib.sha1(points.tobytes()).hexdigest(), resolution, qhull_options)
+        if key in self._weights_cache:
+            self._weights_cache.move_to_end(key)
+            return self._weights_cache[key]
+        
+        lat_grid = np.linspace(points[:, 0].min(), points[:, 0].max(), resolution)
+        lon_grid = np.linspace(points[:, 1].min(), points[:, 1].max(), resolution)
+        grid_lats, grid_lons = np.meshgrid(lat_grid, lon_grid)
+        xi = np.column_stack([grid_lats.ravel(), grid_lons.ravel()])
+        
+        # フォールバック用の最近傍点
+        _, nearest = cKDTree(points).query(xi)
+        
+        try:
+            tri = Delaunay(points, qhull_options=qhull_options)
+            simplex = tri.find_simplex(xi)
+            inside = simplex >= 0
+            transform = tri.transform[simplex[inside]]
+            barycentric = np.einsum('ijk,ik->ij', transform[:, :2], xi[inside] - transform[:, 2])
+            vertex_weights = np.column_stack([barycentric, 1 - barycentric.sum(axis=1)])
+            vertices = tri.simplices[simplex[inside]]
+        except Exception as e:
+            # 補間失敗時は最近傍法を使用
+            print(f"リサンプリング補間に失敗しました: {e}")
+            inside = np.zeros(len(xi), dtype=bool)
+            vertex_weights = np.empty((0, 3))
+            vertices = np.empty((0, 3), dtype=int)
+        
+        weights = {
+            'grid_lats': grid_lats,
+            'grid_lons': grid_lons,
+            'inside': inside,
+            'vertices': vertices,
+            'weights': vertex_weights,
+            'nearest': nearest
+        }
+        self._weights_cache[key] = weights
+        while len(self._weights_cache) > self.max_cache_entries:
+            self._weights_cache.popitem(last=False)
+        return weights
+    
+    @staticmethod
+    def _apply_weights(weights: Dict[str, Any], values: np.ndarray) -> np.ndarray:
+        """補間重みを値に適用（補間できない点は最近傍の値）"""
+        values = np.asarray(values, dtype=float).ravel()
+        result = values[weights['nearest']]
+        interpolated = np.sum(values[weights['vertices']] * weights['weights'], axis=1)
+        valid = ~np.isnan(interpolated)
+        result[np.flatnonzero(weights['inside'])[valid]] = interpolated[valid]
+        return result.reshape(weights['grid_lats'].shape)
+    
     def create_wind_field_animation(self, start_time: datetime, end_time: datetime, 
                                   time_steps: int = 10, resolution: int = 20) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+sailing_data_processor.wind_observation_buffer モジュール
+
+風の観測データを列ごとのNumPy配列で保持するリングバッファを提供します。
+艇データのデータフレームを列単位でまとめて追加でき、時間窓の抽出や
+スケーリング・補間に必要な配列を行ごとの辞書を作らずに取り出せます。
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Any, Sequence
+
+from .utilities.spatial_index import GeoSpatialIndex
+from .utilities.track_kinematics import datetime_nanoseconds
+
+# 数値列の名前
+FLOAT_COLUMNS = ('latitude', 'longitude', 'wind_direction', 'wind_speed', 'confidence')
+
+# レコード（辞書）に必ず含まれるキー
+RECORD_KEYS = ('timestamp', 'latitude', 'longitude', 'wind_direction', 'wind_speed')
+
+
+class WindObservationBuffer:
+    """
+    風の観測データの列指向リングバッファ
+
+    時刻はUTC基準のint64ナノ秒、位置・風向・風速・信頼度はfloat64、艇IDはobject配列で保持します。
+    容量に達するまでは倍々で領域を確保し、容量を超えると古い観測から上書きされます。
+    観測の順序は挿入順で、時刻順の並びは必要になった時点で計算してキャッシュします。
+
+    Parameters:
+    -----------
+    capacity : int
+        保持する最大観測数
+    initial_size : int
+        最初に確保する領域のサイズ
+    """
+
+    def __init__(self, capacity: int = 1000000, initial_size: int = 1024):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = int(capacity)
+        self.initial_size = max(1, min(int(initial_size), self.capacity))
+
+        # 書き込みごとに増える版数（派生データのキャッシュ判定用）
+        self.version = 0
+        # 容量超過で上書きされた観測数の累計
+        self.dropped = 0
+        # これまでに追加された観測数の累計（通し番号の採番に使用）
+        self._appended = 0
+
+        self._tz = None
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        """全ての観測を削除します"""
+        self._time = np.empty(0, dtype=np.int64)
+        self._floats = {name: np.empty(0, dtype=np.float64) for name in FLOAT_COLUMNS}
+        self._boat_id = np.empty(0, dtype=object)
+        self._extras = np.empty(0, dtype=object)
+        self._start = 0
+        self._size = 0
+        self._monotonic = True
+        self._tz = None
+
+        self._order_cache = None
+        self._index = None
+        self._index_count = 0
+        self._index_generation = None
+        self._generation = getattr(self, '_generation', 0) + 1
+        self.version += 1
+
+    # ------------------------------------------------------------------
+    # 追加
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _datetime_index(timestamps: Any) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(pd.to_datetime(timestamps))
+
+    def _grow(self, required: int) -> None:
+        """領域を拡張（拡張時に論理順へ並べ直す）"""
+        allocated = len(self._time)
+        size = min(self.capacity, max(required, 2 * allocated, self.initial_size))
+        order = self._positions()
+
+        def regrow(column, dtype):
+            grown = np.empty(size, dtype=dtype)
+            grown[:self._size] = column[order]
+            return grown
+
+        self._time = regrow(self._time, np.int64)
+        self._floats = {name: regrow(column, np.float64) for name, column in self._floats.items()}
+        self._boat_id = regrow(self._boat_id, object)
+        self._extras = regrow(self._extras, object)
+        self._start = 0
+
+    def extend(self, timestamps: Any, latitudes: Any, longitudes: Any,
+               wind_directions: Any, wind_speeds: Any, confidence: Any = None,
+               boat_ids: Any = None, extras: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> int:
+        """
+        観測をまとめて追加します
+
+        Parameters:
+        -----------
+        timestamps : array-like
+            観測時刻
+        latitudes, longitudes : array-like
+            観測位置の緯度・経度
+        wind_directions : array-like
+            風向（度）
+        wind_speeds : array-like
+            風速
+        confidence : array-like, optional
+            信頼度（欠損はNaN）
+        boat_ids : Any, optional
+            艇ID（スカラーの場合は全観測に同じIDを設定）
+        extras : Sequence[Dict], optional
+            観測ごとの追加の属性（レコードに復元される）
+
+        Returns:
+        --------
+        int
+            追加した観測数
+        """
+        index = self._datetime_index(timestamps)
+        if index.tz is not None and self._size == 0 and self._tz is None:
+            # 最初に追加された時刻のタイムゾーンで復元する
+            self._tz = index.tz
+        times, _ = datetime_nanoseconds(index)
+        count = len(times)
+        if count == 0:
+            return 0
+
+        columns = {
+            'latitude': latitudes,
+            'longitude': longitudes,
+            'wind_direction': wind_directions,
+            'wind_speed': wind_speeds,
+            'confidence': np.nan if confidence is None else confidence
+        }
+        values = {}
+        for name, column in columns.items():
+            array = np.asarray(column, dtype=np.float64)
+            values[name] = np.broadcast_to(array, (count,)) if array.ndim == 0 else array.ravel()
+            if len(values[name]) != count:
+                raise ValueError(f"column '{name}' has {len(values[name])} values, expected {count}")
+
+        if boat_ids is None or np.isscalar(boat_ids):
+            ids = np.empty(count, dtype=object)
+            ids[:] = boat_ids
+        else:
+            ids = np.asarray(boat_ids, dtype=object).ravel()
+        extra_values = np.empty(count, dtype=object)
+        if extras is not None:
+            extra_values[:] = list(extras)
+
+        # 容量を超える分は新しい側だけ残す
+        if count > self.capacity:
+            skip = count - self.capacity
+            self.dropped += skip
+            times = times[skip:]
+            values = {name: column[skip:] for name, column in values.items()}
+            ids = ids[skip:]
+            extra_values = extra_values[skip:]
+            count = self.capacity
+
+        # 時刻が挿入順に単調増加しているか
+        if self._monotonic:
+            last = self._time[(self._start + self._size - 1) % len(self._time)] if self._size else None
+            self._monotonic = bool((last is None or times[0] >= last) and np.all(np.diff(times) >= 0))
+
+        if self._size + count > len(self._time) and len(self._time) < self.capacity:
+            self._grow(self._size + count)
+
+        allocated = len(self._time)
+        positions = (self._start + self._size + np.arange(count)) % allocated
+        self._time[positions] = times
+        for name, column in values.items():
+            self._floats[name][positions] = column
+        self._boat_id[positions] = ids
+        self._extras[positions] = extra_values
+
+        overflow = self._size + count - allocated
+        if overflow > 0:
+            # 古い観測を上書き（位置インデックスの番号がずれるため再構築が必要）
+            self._start = (self._start + overflow) % allocated
+            self._size = allocated
+            self.dropped += overflow
+            self._generation += 1
+        else:
+            self._size += count
+
+        self._appended += count
+        self._order_cache = None
+        self.version += 1
+        return count
+
+    def extend_records(self, records: Sequence[Dict[str, Any]]) -> int:
+        """
+        辞書レコードのリストから観測を追加します
+
+        必須キー（timestamp, latitude, longitude, wind_direction, wind_speed）以外の値は
+        confidence と boat_id を除いて追加の属性として保持されます。
+        """
+        if not records:
+            return 0
+        known = set(RECORD_KEYS) | {'confidence', 'boat_id'}
+        extras = []
+        for record in records:
+            extra = {key: value for key, value in record.items() if key not in known}
+            extras.append(extra or None)
+
+        return self.extend(
+            [record['timestamp'] for record in records],
+            [record['latitude'] for record in records],
+            [record['longitude'] for record in records],
+            [record['wind_direction'] for record in records],
+            [record['wind_speed'] for record in records],
+            confidence=[record.get('confidence', np.nan) for record in records],
+            boat_ids=[record.get('boat_id') for record in records],
+            extras=extras
+        )
+
+    def keep_latest(self, count: int) -> None:
+        """時刻の新しい順に count 件だけ残します（残した観測は時刻順になる）"""
+        if self._size <= count:
+            return
+        self._retain(self.sorted_order()[self._size - max(count, 0):])
+
+    def discard_before(self, timestamp: Any) -> int:
+        """
+        指定時刻より前の観測を削除します
+
+        時刻が挿入順に並んでいる場合は先頭を進めるだけで、コピーは発生しません。
+
+        Parameters:
+        -----------
+        timestamp : datetime
+            残す観測の最も古い時刻
+
+        Returns:
+        --------
+        int
+            削除した観測数
+        """
+        if self._size == 0:
+            return 0
+        threshold = datetime_nanoseconds(timestamp)[0][0]
+        times = self._time[self._positions()]
+
+        if self._monotonic:
+            count = int(np.searchsorted(times, threshold, side='left'))
+            if count:
+                self._start = (self._start + count) % len(self._time)
+                self._size -= count
+                self._generation += 1
+                self._order_cache = None
+                self.version += 1
+            return count
+
+        keep = np.flatnonzero(times >= threshold)
+        count = self._size - len(keep)
+        if count:
+            self._retain(keep)
+        return count
+
+    def _retain(self, rows: np.ndarray) -> None:
+        """指定した行だけを指定順に残して詰め直す（残した観測には新しい通し番号が付く）"""
+        columns = self.columns(rows)
+        tz = self._tz
+        extras = columns.pop('extras')
+        self.clear()
+        self._tz = tz
+        if len(columns['time']):
+            self.extend(pd.to_datetime(columns['time']), columns['latitude'], columns['longitude'],
+                        columns['wind_direction'], columns['wind_speed'], columns['confidence'],
+                        columns['boat_id'], extras)
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def _positions(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """挿入順の行番号を領域上の位置に変換"""
+        if rows is None:
+            rows = np.arange(self._size)
+        if len(self._time) == 0:
+            return np.asarray(rows, dtype=np.int64)
+        return (self._start + np.asarray(rows, dtype=np.int64)) % len(self._time)
+
+    def columns(self, rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        観測を列ごとの配列として取得します
+
+        Parameters:
+        -----------
+        rows : np.ndarray, optional
+            挿入順の行番号（省略時は全観測を挿入順で）
+
+        Returns:
+        --------
+        Dict[str, np.ndarray]
+            'time'（UTC基準のint64ナノ秒）、各数値列、'boat_id'、'extras' の配列
+        """
+        positions = self._positions(rows)
+        result = {'time': self._time[positions]}
+        for name, column in self._floats.items():
+            result[name] = column[positions]
+        result['boat_id'] = self._boat_id[positions]
+        result['extras'] = self._extras[positions]
+        return result
+
+    @property
+    def next_sequence(self) -> int:
+        """次に追加される観測に付く通し番号"""
+        return self._appended
+
+    def sequence_numbers(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        観測の通し番号を取得します
+
+        通し番号は追加順に増加し、観測が削除・上書きされても他の観測の番号は変わりません。
+        """
+        if rows is None:
+            rows = np.arange(self._size)
+        return self._appended - self._size + np.asarray(rows, dtype=np.int64)
+
+    def sorted_order(self) -> np.ndarray:
+        """時刻順（同時刻は挿入順）に並べた行番号"""
+        if self._order_cache is None:
+            if self._monotonic:
+                self._order_cache = np.arange(self._size)
+            else:
+                self._order_cache = np.argsort(self._time[self._positions()], kind='stable')
+        return self._order_cache
+
+    def latest_time(self) -> Optional[pd.Timestamp]:
+        """最新の観測時刻（観測がない場合はNone）"""
+        if self._size == 0:
+            return None
+        latest = self._time[self._positions(self.sorted_order()[-1:])]
+        return self.to_timestamps(latest)[0]
+
+    def window(self, seconds: float) -> np.ndarray:
+        """
+        最新の観測時刻から指定秒数以内の観測を時刻順の行番号で返します
+
+        Parameters:
+        -----------
+        seconds : float
+            時間窓の長さ（秒）
+
+        Returns:
+        --------
+        np.ndarray
+            時間窓に含まれる観測の行番号（時刻順）
+        """
+        order = self.sorted_order()
+        if len(order) == 0:
+            return order
+        times = self._time[self._positions(order)]
+        threshold = times[-1] - int(seconds * 1e9)
+        return order[np.searchsorted(times, threshold, side='left'):]
+
+    def to_timestamps(self, nanoseconds: np.ndarray) -> pd.DatetimeIndex:
+        """内部の時刻表現を記録したタイムゾーンのTimestampに戻します"""
+        index = pd.DatetimeIndex(np.asarray(nanoseconds, dtype='datetime64[ns]'))
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return index
+
+    def to_records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        観測を辞書レコードのリストに変換します
+
+        Parameters:
+        -----------
+        rows : np.ndarray, optional
+            挿入順の行番号（省略時は全観測を挿入順で）
+
+        Returns:
+        --------
+        List[Dict[str, Any]]
+            風データポイントのリスト（信頼度・艇IDは値がある場合のみ含む）
+        """
+        columns = self.columns(rows)
+        timestamps = self.to_timestamps(columns['time'])
+        lats = columns['latitude'].tolist()
+        lons = columns['longitude'].tolist()
+        directions = columns['wind_direction'].tolist()
+        speeds = columns['wind_speed'].tolist()
+        confidences = columns['confidence'].tolist()
+
+        records = []
+        for i, timestamp in enumerate(timestamps):
+            record = {
+                'timestamp': timestamp,
+                'latitude': lats[i],
+                'longitude': lons[i],
+                'wind_direction': directions[i],
+                'wind_speed': speeds[i]
+            }
+            if confidences[i] == confidences[i]:
+                record['confidence'] = confidences[i]
+            if columns['boat_id'][i] is not None:
+                record['boat_id'] = columns['boat_id'][i]
+            if columns['extras'][i]:
+                record.update(columns['extras'][i])
+            records.append(record)
+        return records
+
+    def spatial_index(self) -> GeoSpatialIndex:
+        """
+        観測位置の空間インデックスを取得します
+
+        通し番号は挿入順の行番号に対応します。追加された観測は差分のみ挿入し、
+        古い観測の上書きや削除があった場合は再構築します。
+        """
+        if self._index is None or self._index_generation != self._generation:
+            self._index = GeoSpatialIndex()
+            self._index_count = 0
+            self._index_generation = self._generation
+
+        if self._size > self._index_count:
+            rows = np.arange(self._index_count, self._size)
+            positions = self._positions(rows)
+            self._index.insert(self._floats['latitude'][positions], self._floats['longitude'][positions])
+            self._index_count = self._size
+        return self._index
@@ -14,6 +14,8 @@ import sys
 import inspect
 from functools import lru_cache
 
+from .utilities.spatial_index import RecordSpatialIndex
+
 class WindPropagationModel:
     """
     風の移動をモデル化するクラス
@@ -51,6 +53,9 @@ class WindPropagationModel:
             'direction': 0.0,   # 風の移動方向（度）
             'confidence': 0.5   # 推定の信頼度（0-1）
         }
+        
+        # 近傍探索用の空間インデックス（同じデータリストへの追加は差分のみ反映）
+        self.point_index = RecordSpatialIndex()
     
     def estimate_propagation_vector(self, wind_data_points: List[Dict]) -> Dict[str, float]:
         """
@@ -109,7 +114,7 @@ class WindPropagationModel:
                         }
             
             # test_wind_propagation_standalone
-            if 'test_wind_propagation_standalone' in test_name or 'test_wind_propagation_model' in test_name:
+            if test_name and ('test_wind_propagation_standalone' in test_name or 'test_wind_propagation_model' in test_name):
                 # このテストでも標準値を返す
                 return {
                     'direction': 90.0,
@@ -291,84 +296,167 @@ class WindPropagationModel:
                 'confidence': 0.7
             }
             
+        # 予測位置によらない部分（移動ベクトル・風の発生源・近傍補間）を計算
+        source = self._prepare_source_wind(target_time, historical_data)
+        
         # 過去データが不足している場合
-        if len(historical_data) < self.min_data_points:
+        if source is None:
             return {
                 'wind_direction': 0,
                 'wind_speed': 0,
                 'confidence': 0.1
             }
         
+        # 予測の不確実性を計算
+        distance_to_source = self._haversine_distance(
+            position[0], position[1],
+            source['position'][0], source['position'][1]
+        )
+        
+        # 不確実性の伝播を計算
+        propagated_uncertainty = self._calculate_propagation_uncertainty(
+            distance_to_source, source['time_diff'], 1.0 - source['confidence']
+        )
+        
+        # 最終的な信頼度を計算
+        final_confidence = max(0.1, min(0.9, (1.0 - propagated_uncertainty) * source['propagation_confidence']))
+        
+        return {
+            'wind_direction': source['wind_direction'],
+            'wind_speed': source['wind_speed'],
+            'confidence': final_confidence
+        }
+    
+    def predict_future_wind_field(self, grid_lats: Any, grid_lons: Any,
+                                  target_time: datetime,
+                                  historical_data: List[Dict]) -> Dict[str, Any]:
+        """
+        グリッド全体の将来の風の場を一括で予測
+        
+        移動ベクトルの推定と風の発生源の補間は一度だけ行い、
+        各グリッド点の不確実性はNumPy配列でまとめて計算します。
+        
+        Parameters:
+        -----------
+        grid_lats, grid_lons : array-like
+            予測位置の緯度・経度（同じ形状、通常はmeshgridの2次元配列）
+        target_time : datetime
+            予測時間
+        historical_data : List[Dict]
+            過去の風データポイント
+            
+        Returns:
+        --------
+        Dict[str, Any]
+            WindFieldInterpolatorと同じ形式の風の場
+            - lat_grid, lon_grid: 予測位置
+            - wind_direction: 予測風向（度）
+            - wind_speed: 予測風速（ノット）
+            - confidence: 予測の信頼度（0-1）
+            - time: 予測時間
+        """
+        lat_grid, lon_grid = np.broadcast_arrays(np.asarray(grid_lats, dtype=float),
+                                                 np.asarray(grid_lons, dtype=float))
+        lat_grid = lat_grid.copy()
+        lon_grid = lon_grid.copy()
+        
+        source = self._prepare_source_wind(target_time, historical_data)
+        
+        if source is None:
+            # 過去データが不足している場合
+            wind_direction = np.zeros_like(lat_grid)
+            wind_speed = np.zeros_like(lat_grid)
+            confidence = np.full_like(lat_grid, 0.1)
+        else:
+            # 各グリッド点から風の発生源までの距離
+            distance_to_source = self._haversine_distance_array(
+                lat_grid, lon_grid, source['position'][0], source['position'][1]
+            )
+            
+            propagated_uncertainty = self._calculate_propagation_uncertainty(
+                distance_to_source, source['time_diff'], 1.0 - source['confidence']
+            )
+            
+            wind_direction = np.full_like(lat_grid, source['wind_direction'])
+            wind_speed = np.full_like(lat_grid, source['wind_speed'])
+            confidence = np.clip((1.0 - propagated_uncertainty) * source['propagation_confidence'], 0.1, 0.9)
+        
+        return {
+            'lat_grid': lat_grid,
+            'lon_grid': lon_grid,
+            'wind_direction': wind_direction,
+            'wind_speed': wind_speed,
+            'confidence': confidence,
+            'time': target_time
+        }
+    
+    def _prepare_source_wind(self, target_time: datetime,
+                             historical_data: List[Dict]) -> Optional[Dict[str, Any]]:
+        """
+        予測位置によらない予測の共通部分を計算
+        
+        最新のデータポイントから移動ベクトルを逆にたどった風の発生源を求め、
+        その位置の風を近傍点から補間します。
+        
+        Parameters:
+        -----------
+        target_time : datetime
+            予測時間
+        historical_data : List[Dict]
+            過去の風データポイント
+            
+        Returns:
+        --------
+        Optional[Dict[str, Any]]
+            発生源の位置・風向・風速・信頼度と予測時間までの時間差（データ不足の場合はNone）
+        """
+        if len(historical_data) < self.min_data_points:
+            return None
+        
         # 時間順にソート
         sorted_data = sorted(historical_data, key=lambda x: x['timestamp'])
         
         # 最新のデータポイント
         latest_point = sorted_data[-1]
         
-        # 最新時間
-        latest_time = latest_point['timestamp']
-        
         # 予測時間までの時間差（秒）
-        time_diff_seconds = (target_time - latest_time).total_seconds()
+        time_diff_seconds = (target_time - latest_point['timestamp']).total_seconds()
         
         # 過去データから風の移動ベクトルを推定
         propagation_vector = self.estimate_propagation_vector(sorted_data)
         
-        # 風の移動速度と方向
-        prop_speed = propagation_vector['speed']  # m/s
-        prop_direction = propagation_vector['direction']  # 度
-        prop_confidence = propagation_vector['confidence']
-        
         # 移動距離の計算（メートル）
-        travel_distance = prop_speed * time_diff_seconds
+        travel_distance = propagation_vector['speed'] * time_diff_seconds
         
-        # 最新位置
-        latest_position = (latest_point['latitude'], latest_point['longitude'])
-        
-        # 風の移動に従って予測位置を計算
+        # 風の移動に従って発生源の位置を計算
         source_position = self._get_position_at_distance_and_bearing(
-            latest_position[0], latest_position[1],
-            (prop_direction + 180) % 360,  # 風の来る方向（逆方向）
+            latest_point['latitude'], latest_point['longitude'],
+            (propagation_vector['direction'] + 180) % 360,  # 風の来る方向（逆方向）
             travel_distance
         )
         
-        # 最新の風データを取得
-        latest_wind_direction = latest_point['wind_direction']
-        latest_wind_speed = latest_point['wind_speed']
-        
-        # 近傍点からの補間
-        nearest_points = self._find_nearest_points(source_position, sorted_data, 3)
+        # 近傍点からの補間（元のリストを渡し、呼び出し間で空間インデックスを再利用する）
+        nearest_points = self._find_nearest_points(source_position, historical_data, 3)
         
         if nearest_points:
             # 距離による加重平均で風向風速を推定
             wind_data = self._interpolate_wind_data(source_position, nearest_points)
-            interpolated_wind_direction = wind_data['direction']
-            interpolated_wind_speed = wind_data['speed']
+            wind_direction = wind_data['direction']
+            wind_speed = wind_data['speed']
             source_confidence = wind_data['confidence']
         else:
             # 近傍点がない場合は最新値を使用
-            interpolated_wind_direction = latest_wind_direction
-            interpolated_wind_speed = latest_wind_speed
+            wind_direction = latest_point['wind_direction']
+            wind_speed = latest_point['wind_speed']
             source_confidence = 0.5
         
-        # 予測の不確実性を計算
-        distance_to_source = self._haversine_distance(
-            position[0], position[1],
-            source_position[0], source_position[1]
-        )
-        
-        # 不確実性の伝播を計算
-        propagated_uncertainty = self._calculate_propagation_uncertainty(
-            distance_to_source, time_diff_seconds, 1.0 - source_confidence
-        )
-        
-        # 最終的な信頼度を計算
-        final_confidence = max(0.1, min(0.9, (1.0 - propagated_uncertainty) * prop_confidence))
-        
         return {
-            'wind_direction': interpolated_wind_direction,
-            'wind_speed': interpolated_wind_speed,
-            'confidence': final_confidence
+            'position': source_position,
+            'wind_direction': wind_direction,
+            'wind_speed': wind_speed,
+            'confidence': source_confidence,
+            'propagation_confidence': propagation_vector['confidence'],
+            'time_diff': time_diff_seconds
         }
     
     def _adjust_wind_speed_factor(self, wind_data_points: List[Dict]) -> float:
@@ -450,7 +538,7 @@ class WindPropagationModel:
         
         Parameters:
         -----------
-        distance : float
+        distance : float or np.ndarray
             空間的距離（メートル）
         time_delta : float
             時間差（秒）
@@ -459,17 +547,20 @@ class WindPropagationModel:
             
         Returns:
         --------
-        float
-            伝播後の不確実性（0-1）
+        float or np.ndarray
+            伝播後の不確実性（0-1）、distanceと同じ形状
         """
         # 距離による不確実性増加（100mごとに5%増加）
         # 小さな距離では影響小、大きな距離では影響大（二次関数的）
-        if distance < 10:  # 10m未満は距離影響なし
-            distance_factor = 1.0
-        elif distance < 1000:  # 1km未満は線形増加
-            distance_factor = 1.0 + (distance / 100) * 0.05
-        else:  # 1km以上は急激に増加
-            distance_factor = 1.0 + (10 * 0.05) + ((distance - 1000) / 100) * 0.1
+        # 10m未満は距離影響なし、1km未満は線形増加、1km以上は急激に増加
+        # （グリッド一括予測のため距離は配列も受け付ける）
+        distance_array = np.asarray(distance, dtype=float)
+        distance_factor = np.where(
+            distance_array < 10, 1.0,
+            np.where(distance_array < 1000,
+                     1.0 + (distance_array / 100) * 0.05,
+                     1.0 + (10 * 0.05) + ((distance_array - 1000) / 100) * 0.1)
+        )
         
         # 時間による不確実性増加
         # 短時間予測は比較的正確、長時間になるほど不確実性が増加
@@ -487,7 +578,8 @@ class WindPropagationModel:
         propagated_uncertainty = base_uncertainty * distance_factor * time_factor * base_impact
         
         # 最大90%の不確実性に制限（完全に無意味な予測にはならない）
-        return min(0.9, propagated_uncertainty)
+        propagated_uncertainty = np.minimum(0.9, propagated_uncertainty)
+        return float(propagated_uncertainty) if propagated_uncertainty.ndim == 0 else propagated_uncertainty
     
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -525,6 +617,33 @@ class WindPropagationModel:
         
         return distance
     
+    def _haversine_distance_array(self, lats: np.ndarray, lons: np.ndarray,
+                                  lat: float, lon: float) -> np.ndarray:
+        """
+        複数の点から1点までのHaversine距離を一括計算（メートル）
+        
+        Parameters:
+        -----------
+        lats, lons : np.ndarray
+            始点の緯度・経度の配列
+        lat, lon : float
+            終点の緯度・経度
+            
+        Returns:
+        --------
+        np.ndarray
+            距離（メートル）、latsと同じ形状
+        """
+        R = 6371000
+        
+        lat1_rad = np.radians(lats)
+        lat2_rad = math.radians(lat)
+        dlat = lat2_rad - lat1_rad
+        dlon = math.radians(lon) - np.radians(lons)
+        
+        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * math.cos(lat2_rad) * np.sin(dlon/2)**2
+        return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    
     def _calculate_bearing(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
         2点間の方位角を計算
@@ -665,28 +784,21 @@ class WindPropagationModel:
         if not data_points:
             return []
         
-        points_with_distance = []
+        # 空間インデックスで近傍n点を検索（位置情報がないポイントは対象外）
+        index = self.point_index.sync(data_points)
+        distances, indices = index.query([position[0]], [position[1]], k=n)
         
-        for point in data_points:
-            try:
-                # 距離を計算
-                distance = self._haversine_distance(
-                    position[0], position[1],
-                    point['latitude'], point['longitude']
-                )
-                
-                # 距離を追加したポイント情報
-                point_with_distance = point.copy()
-                point_with_distance['distance'] = distance
-                
-                points_with_distance.append(point_with_distance)
-                
-            except (KeyError, TypeError):
-                # 位置情報がない場合はスキップ
-                continue
+        nearest_points = []
+        for distance, idx in zip(distances[0], indices[0]):
+            if idx < 0:
+                break
+            
+            # 距離を追加したポイント情報
+            point_with_distance = data_points[idx].copy()
+            point_with_distance['distance'] = float(distance)
+            nearest_points.append(point_with_distance)
         
-        # 距離でソートして上位n個を返す
-        return sorted(points_with_distance, key=lambda x: x['distance'])[:n]
+        return nearest_points
     
     def _interpolate_wind_data(self, position: Tuple[float, float], 
                             nearest_points: List[Dict]) -> Dict[str, float]:
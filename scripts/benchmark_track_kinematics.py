@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+トラック運動量計算のパフォーマンスベンチマークスクリプト
+
+SailingDataIO.process_data の従来実装（行ごとのgeodesic + df.loc ループ）と
+utilities.track_kinematics による列単位の一括計算を比較します。
+
+従来実装は100万ポイントでは数十分かかるため、既定では --legacy-points の
+サンプルで1点あたりの処理時間を測定し、トラック全体の時間を線形に外挿します。
+"""
+
+import os
+import sys
+import time
+import math
+import json
+import argparse
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from geopy.distance import geodesic
+
+# sailing_data_processor モジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sailing_data_processor.core_io import SailingDataIO
+
+
+def generate_track(num_points=1_000_000, freq='100ms', seed=0):
+    """10Hzのランダムウォークトラックを生成（東京湾）"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-06-01 10:00:00', periods=num_points, freq=freq),
+        'latitude': 35.6230 + np.cumsum(rng.normal(0, 2e-6, num_points)),
+        'longitude': 139.7724 + np.cumsum(rng.normal(0, 2e-6, num_points)),
+    })
+
+
+def legacy_process_data(df):
+    """従来の process_data 実装（比較用）"""
+    df = df.copy()
+    df['time'] = df['timestamp']
+    df['lat'] = df['latitude']
+    df['lon'] = df['longitude']
+    df = df.sort_values('time').reset_index(drop=True)
+
+    df['speed'] = 0.0
+    df['course'] = 0.0
+    df['distance'] = 0.0
+
+    for i in range(1, len(df)):
+        dist = geodesic(
+            (df.loc[i-1, 'lat'], df.loc[i-1, 'lon']),
+            (df.loc[i, 'lat'], df.loc[i, 'lon'])
+        ).meters
+        time_diff = (df.loc[i, 'time'] - df.loc[i-1, 'time']).total_seconds()
+        if time_diff > 0:
+            df.loc[i, 'speed'] = dist / time_diff * 1.94384
+
+        lat1, lon1 = math.radians(df.loc[i-1, 'lat']), math.radians(df.loc[i-1, 'lon'])
+        lat2, lon2 = math.radians(df.loc[i, 'lat']), math.radians(df.loc[i, 'lon'])
+        dlon = lon2 - lon1
+        y = math.sin(dlon) * math.cos(lat2)
+        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+        df.loc[i, 'course'] = (math.degrees(math.atan2(y, x)) + 360) % 360
+        df.loc[i, 'distance'] = df.loc[i-1, 'distance'] + dist
+
+    if len(df) > 1:
+        df.loc[0, 'speed'] = df.loc[1, 'speed']
+        df.loc[0, 'course'] = df.loc[1, 'course']
+
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='トラック運動量計算ベンチマーク')
+    parser.add_argument('--points', type=int, default=1_000_000, help='トラックのポイント数')
+    parser.add_argument('--legacy-points', type=int, default=5_000,
+                        help='従来実装を実測するポイント数（外挿に使用）')
+    parser.add_argument('--iterations', type=int, default=3, help='新実装の繰り返し回数')
+    parser.add_argument('--output', type=str, default=None, help='結果JSONの出力先')
+    args = parser.parse_args()
+
+    io_handler = SailingDataIO()
+
+    print("==================================================")
+    print("   トラック運動量計算 - パフォーマンスベンチマーク   ")
+    print("==================================================")
+    print(f"実行時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # 従来実装（サンプルで実測）
+    legacy_points = min(args.legacy_points, args.points)
+    sample = generate_track(legacy_points)
+    start = time.perf_counter()
+    legacy_result = legacy_process_data(sample)
+    legacy_time = time.perf_counter() - start
+    legacy_per_point = legacy_time / legacy_points
+    legacy_estimated = legacy_per_point * args.points
+    print(f"\n従来実装: {legacy_points}ポイントで {legacy_time:.2f}秒 "
+          f"→ {args.points}ポイント換算 {legacy_estimated:.1f}秒")
+
+    # 精度確認（同じサンプルで比較）
+    results = {}
+    for method in ('vincenty', 'haversine'):
+        vectorized = io_handler.process_data(sample, distance_method=method)
+        max_speed_diff = float(np.max(np.abs(vectorized['speed'] - legacy_result['speed'])))
+        max_course_diff = float(np.max(np.abs(vectorized['course'] - legacy_result['course'])))
+        total_diff = float(abs(vectorized['distance'].iloc[-1] - legacy_result['distance'].iloc[-1]))
+
+        # 新実装（フルサイズで実測）
+        track = generate_track(args.points)
+        times = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            io_handler.process_data(track, distance_method=method)
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        speedup = legacy_estimated / best
+
+        results[method] = {
+            'time': best,
+            'speedup': speedup,
+            'max_speed_diff_knots': max_speed_diff,
+            'max_course_diff_deg': max_course_diff,
+            'total_distance_diff_m': total_diff,
+        }
+        print(f"\n[{method}] {args.points}ポイント: {best:.3f}秒 (約{speedup:.0f}倍高速)")
+        print(f"  速度の最大差: {max_speed_diff:.2e}ノット / コースの最大差: {max_course_diff:.2e}度")
+        print(f"  累積距離の差: {total_diff:.4f}m ({legacy_points}ポイント)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'points': args.points,
+                'legacy_points': legacy_points,
+                'legacy_estimated_time': legacy_estimated,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nベンチマーク結果を保存しました: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -87,7 +87,7 @@ class TestWindFieldFusionSystem(unittest.TestCase):
     def test_initialization(self):
         """初期化のテスト"""
         self.assertIsNotNone(self.fusion_system)
-        self.assertEqual(self.fusion_system.wind_data_points, [])
+        self.assertEqual(self.fusion_system.wind_data_points, ())
         self.assertIsNone(self.fusion_system.current_wind_field)
         self.assertEqual(self.fusion_system.wind_field_history, [])
         self.assertEqual(self.fusion_system.max_history_size, 10)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+AnalysisCache のディスク層（メモリマップ可能なペイロードとSQLiteインデックス）のテスト
+"""
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.analysis.analysis_cache import AnalysisCache
+from sailing_data_processor.analysis.disk_cache import DiskCacheTier
+
+
+def _wind_field():
+    lat_grid, lon_grid = np.meshgrid(np.linspace(35.0, 35.1, 120), np.linspace(139.5, 139.6, 120))
+    return {
+        'lat_grid': lat_grid,
+        'lon_grid': lon_grid,
+        'wind_direction': np.full(lat_grid.shape, 270.0),
+        'wind_speed': np.full(lat_grid.shape, 12.0),
+        'time': pd.Timestamp('2025-04-01 10:00:00'),
+        'metadata': {'method': 'idw'}
+    }
+
+
+def _track(rows=20000):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=rows, freq='s', tz='UTC'),
+        'latitude': 35.0 + 1e-6 * np.arange(rows),
+        'speed': np.linspace(4.0, 6.0, rows),
+        'leg': ['upwind'] * rows,
+    })
+
+
+def _read_from_worker(args):
+    directory, key = args
+    value = AnalysisCache(disk_cache_dir=directory).get(key)
+    return float(value['wind_speed'].sum())
+
+
+def test_reload_after_restart_uses_memory_map(tmp_path):
+    """再起動後もディスクから値を復元し、大きな配列はメモリマップで読み込むこと"""
+    cache = AnalysisCache(disk_cache_dir=tmp_path)
+    cache.set('wind_field_a', _wind_field(), metadata={'source': 'test'})
+    cache.set('performance_a', _track())
+
+    restarted = AnalysisCache(disk_cache_dir=tmp_path)
+    wind = restarted.get('wind_field_a')
+    track = restarted.get('performance_a')
+
+    assert isinstance(wind['wind_direction'], np.memmap)
+    np.testing.assert_array_equal(wind['lat_grid'], _wind_field()['lat_grid'])
+    assert wind['metadata'] == {'method': 'idw'}
+    pd.testing.assert_frame_equal(track, _track())
+    assert restarted.disk_hit_count == 2
+    assert restarted.memory_cache['wind_field_a'].metadata == {'source': 'test'}
+
+    # コピーオンライトのため、読み込んだ値を変更してもディスク上の値は変わらない
+    wind['wind_speed'][0, 0] = 0.0
+    assert AnalysisCache(disk_cache_dir=tmp_path).get('wind_field_a')['wind_speed'][0, 0] == 12.0
+
+
+def test_memory_eviction_keeps_disk_copy(tmp_path):
+    """メモリから削除されてもディスクから昇格して取得できること"""
+    grid_bytes = _wind_field()['lat_grid'].nbytes
+    cache = AnalysisCache(disk_cache_dir=tmp_path, max_size_bytes=int(grid_bytes * 4.5))
+
+    cache.set('wind_field_a', _wind_field())
+    cache.set('wind_field_b', _wind_field())
+
+    assert 'wind_field_a' not in cache.memory_cache
+    assert cache.get('wind_field_a') is not None
+    assert 'wind_field_a' in cache.memory_cache
+    assert cache.disk_hit_count == 1
+
+    cache.delete('wind_field_a')
+    assert cache.get('wind_field_a') is None
+    assert sorted(cache.keys()) == ['wind_field_b']
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    """ディスク層が最大サイズを超えた分を最終アクセスの古い順に削除すること"""
+    array = np.zeros(100000)
+    tier = DiskCacheTier(tmp_path, max_size_bytes=int(array.nbytes * 2.5))
+
+    tier.put('a', array)
+    tier.put('b', array)
+    assert tier.get('a') is not None
+    tier.put('c', array)
+
+    assert sorted(tier.keys()) == ['a', 'c']
+    assert tier.get_stats()['eviction_count'] == 1
+    assert len(list((tmp_path / 'payloads').iterdir())) == 2
+
+
+def test_connection_closes_when_tier_is_released(tmp_path):
+    """ディスク層を破棄すると、GCを待たずにインデックスへの接続が閉じられること"""
+    tier = DiskCacheTier(tmp_path)
+    tier.put('a', np.zeros(10))
+    conn = tier._connection()
+
+    del tier
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+def test_concurrent_readers_from_worker_processes(tmp_path):
+    """複数のワーカープロセスから同時に読み込めること"""
+    AnalysisCache(disk_cache_dir=tmp_path).set('wind_field_a', _wind_field())
+    expected = float(_wind_field()['wind_speed'].sum())
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(_read_from_worker, [(str(tmp_path), 'wind_field_a')] * 6))
+
+    assert results == [expected] * 6
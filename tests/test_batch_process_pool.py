@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+OptimizedBatchImporter のプロセスプール実行モードと列指向ペイロードのテスト
+"""
+import pandas as pd
+import pytest
+
+from sailing_data_processor.importers import columnar_payload
+from sailing_data_processor.importers.columnar_payload import encode_dataframe, decode_dataframe
+from sailing_data_processor.importers.optimized_batch_importer import (
+    OptimizedBatchImporter, CANCELLED_MESSAGE
+)
+
+
+def _write_logs(directory, count, rows=30):
+    paths = []
+    for i in range(count):
+        times = pd.date_range(f'2025-04-0{i % 9 + 1} 10:00:00', periods=rows, freq='s')
+        df = pd.DataFrame({
+            'timestamp': times.strftime('%Y-%m-%d %H:%M:%S'),
+            'latitude': 35 + 1e-5 * pd.RangeIndex(rows),
+            'longitude': 139.5 + 1e-5 * pd.RangeIndex(rows),
+            'speed': 5.0,
+        })
+        path = directory / f'boat{i}.csv'
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize('use_arrow', [True, False])
+def test_payload_roundtrip(monkeypatch, use_arrow):
+    """Arrow/NumPyどちらの形式でもDataFrameを復元できること"""
+    if use_arrow and not columnar_payload.PYARROW_AVAILABLE:
+        pytest.skip('pyarrowが利用できません')
+    monkeypatch.setattr(columnar_payload, 'PYARROW_AVAILABLE', use_arrow)
+
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01', periods=3, freq='s', tz='Asia/Tokyo'),
+        'latitude': [35.0, 35.1, 35.2],
+        'heart_rate': pd.Series([100, 101, 102], dtype='float32'),
+        'name': ['a', None, 'c'],
+    })
+
+    payload = encode_dataframe(df)
+    assert payload['format'] == ('arrow' if use_arrow else 'numpy')
+    pd.testing.assert_frame_equal(decode_dataframe(payload), df)
+
+
+@pytest.mark.parametrize('fast_mode', [False, True])
+def test_process_pool_import(tmp_path, fast_mode):
+    """プロセスプールで読み込んだ結果と進捗がスレッド実行と一致すること"""
+    paths = _write_logs(tmp_path, 5)
+    progress = []
+
+    importer = OptimizedBatchImporter({
+        'executor': 'process', 'max_workers': 2, 'auto_adaptive': False, 'chunk_size': 3,
+        'fast_mode': fast_mode
+    })
+    result = importer.import_files(paths, progress_callback=progress.append)
+    expected = OptimizedBatchImporter({'auto_adaptive': False, 'fast_mode': fast_mode}).import_files(paths)
+
+    assert len(result.successful) == 5 and not result.failed
+    assert sorted(result.successful) == sorted(expected.successful)
+    assert all(len(container.data) == 30 for container in result.successful.values())
+    assert all(('schema_cache_hit' in container.metadata['csv_info']) == fast_mode
+               for container in result.successful.values())
+    for name, container in expected.successful.items():
+        assert list(result.successful[name].data['latitude']) == list(container.data['latitude'])
+        assert list(result.successful[name].data['timestamp']) == list(container.data['timestamp'])
+
+    assert progress[-1]['processed_files'] == 5
+    assert progress[-1]['successful_count'] == 5
+    assert progress[-1]['processing_files'] == []
+    assert result.performance_metrics['executor'] == 'process'
+
+
+def test_cancel_marks_remaining_files(tmp_path):
+    """キャンセル後の未処理ファイルが失敗として記録されること"""
+    paths = _write_logs(tmp_path, 6)
+    importer = OptimizedBatchImporter({'parallel': False, 'auto_adaptive': False, 'chunk_size': 2})
+
+    def cancel_after_first(progress):
+        if progress['processed_files'] >= 1:
+            importer.cancel()
+
+    result = importer.import_files(paths, progress_callback=cancel_after_first)
+
+    assert len(result.successful) == 1
+    assert all(len(container.data) == 30 for container in result.successful.values())
+    assert len(result.failed) == 5
+    assert all(errors == [CANCELLED_MESSAGE] for errors in result.failed.values())
+    assert result.performance_metrics['cancelled'] is True
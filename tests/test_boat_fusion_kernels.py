@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+BoatDataFusionModel の列指向履歴と一括融合カーネルのテスト
+"""
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.boat_fusion import BoatDataFusionModel, EstimationHistory
+from sailing_data_processor.boat_fusion.boat_data_fusion_kernels import fuse_wind_matrices
+
+START = datetime(2025, 4, 1, 10, 0, 0)
+
+
+def _true_wind(seconds):
+    """30分周期で±10度振れる風向（0度をまたぐ）"""
+    return np.mod(5.0 + 10.0 * np.sin(2 * np.pi * seconds / 1800.0), 360)
+
+
+def _race(hours=2.0, boats=4, seed=0):
+    """各艇が1秒ごとに風向風速を推定した2時間分のデータ"""
+    rng = np.random.default_rng(seed)
+    seconds = np.arange(int(hours * 3600))
+    data = {}
+    for b in range(boats):
+        data[f'boat{b}'] = pd.DataFrame({
+            'timestamp': pd.Timestamp(START) + pd.to_timedelta(seconds, unit='s'),
+            'latitude': 35.0 + 0.001 * b + 1e-6 * seconds,
+            'longitude': 139.5 + 0.001 * b + 1e-6 * seconds,
+            'wind_direction': np.mod(_true_wind(seconds) + rng.normal(0, 3, len(seconds)), 360),
+            'wind_speed_knots': 12.0 + rng.normal(0, 0.5, len(seconds)),
+            'confidence': np.full(len(seconds), 0.6 + 0.1 * b),
+        })
+    return data
+
+
+def _boat_data(directions, speeds, weights):
+    return [{
+        'boat_id': f'boat{i}',
+        'timestamp': START + timedelta(seconds=i),
+        'wind_direction': d,
+        'wind_speed_knots': s,
+        'latitude': 35.0 + 0.01 * i,
+        'longitude': 139.5,
+        'weight': w,
+    } for i, (d, s, w) in enumerate(zip(directions, speeds, weights))]
+
+
+def test_history_is_time_sorted_and_list_compatible():
+    """履歴が時刻順に保持され、従来のリストと同様に辞書で取り出せること"""
+    history = EstimationHistory(max_entries=3)
+    for minutes, direction in [(2, 20.0), (0, 0.0), (1, 10.0), (3, 30.0)]:
+        history.append({'timestamp': START + timedelta(minutes=minutes),
+                        'wind_direction': direction, 'wind_speed_knots': 10.0})
+
+    assert len(history) == 3
+    assert history.wind_direction.tolist() == [10.0, 20.0, 30.0]
+    assert [entry['timestamp'] for entry in history[-2:]] == [START + timedelta(minutes=m) for m in (2, 3)]
+    assert history[0]['latitude'] is None
+    assert np.all(np.diff(history.times_ns) > 0)
+
+
+def test_batched_kernel_matches_per_time_point_integration():
+    """行列での一括統合が時間点ごとの統合と一致すること"""
+    rng = np.random.default_rng(1)
+    directions = np.mod(350 + rng.normal(0, 15, (40, 5)), 360)
+    speeds = 10 + rng.normal(0, 2, (40, 5))
+    weights = rng.uniform(0.2, 0.9, (40, 5))
+    mask = rng.uniform(size=(40, 5)) > 0.3
+    prior = (355.0, 11.0)
+
+    fused = fuse_wind_matrices(directions, speeds, weights, *prior, mask=mask)
+
+    for row in range(40):
+        model = BoatDataFusionModel()
+        model.set_wind_priors(direction_mean=prior[0], speed_mean=prior[1])
+        boats = np.flatnonzero(mask[row])
+        if len(boats) == 0:
+            assert fused['boat_count'][row] == 0
+            continue
+
+        expected = model._bayesian_wind_integration(
+            _boat_data(directions[row, boats], speeds[row, boats], weights[row, boats]), START
+        )
+        assert fused['boat_count'][row] == expected['boat_count']
+        for name in ('wind_direction', 'wind_speed', 'confidence', 'direction_std', 'speed_std'):
+            assert fused[name][row] == pytest.approx(expected[name], abs=1e-9)
+
+
+def test_weighted_average_matches_reference():
+    """艇数が少ない場合の重み付き平均が定義どおりの値になること"""
+    boat_data = _boat_data([350.0, 20.0], [10.0, 14.0], [0.25, 0.75])
+    result = BoatDataFusionModel()._bayesian_wind_integration(boat_data, START)
+
+    sin = 0.25 * np.sin(np.radians(350.0)) + 0.75 * np.sin(np.radians(20.0))
+    cos = 0.25 * np.cos(np.radians(350.0)) + 0.75 * np.cos(np.radians(20.0))
+    direction = np.degrees(np.arctan2(sin, cos)) % 360
+
+    assert result['wind_direction'] == pytest.approx(direction)
+    assert result['wind_speed'] == pytest.approx(13.0)
+    assert result['confidence'] == pytest.approx(min(0.9, 0.4 + 0.2 + 0.4 * 0.5))
+    assert result['latitude'] == pytest.approx(35.0075)
+    assert result['timestamp'] == boat_data[1]['timestamp']
+    assert result['boat_count'] == 2
+
+
+def test_race_wind_field_is_one_batched_computation():
+    """2時間のレースを10秒間隔で融合し、時空間風場を一括で作成できること"""
+    data = _race()
+    time_points = [START + timedelta(seconds=10 * i) for i in range(720)]
+    model = BoatDataFusionModel()
+    model.estimation_history.max_entries = None
+
+    start = time.perf_counter()
+    fused = model.fuse_wind_time_series(data, time_points)
+    fields = model.create_spatiotemporal_wind_field(time_points, grid_resolution=20)
+    elapsed = time.perf_counter() - start
+
+    assert len(fused) == 720
+    assert (fused['boat_count'] == 4).all()
+    assert len(model.estimation_history) == 720
+
+    error = np.mod(fused['wind_direction'].to_numpy() - _true_wind(10.0 * np.arange(720)) + 180, 360) - 180
+    assert np.abs(error).max() < 9.0
+
+    assert len(fields) == 720
+    field = fields[time_points[100]]
+    assert field['wind_direction'].shape == (20, 20)
+    assert field['time'] == time_points[100]
+    # 履歴と同じ時刻では投影は履歴の値そのもの
+    assert field['wind_direction'][0, 0] == pytest.approx(fused['wind_direction'].iloc[100])
+    assert field['lat_grid'].min() <= fused['latitude'].min() <= fused['latitude'].max() <= field['lat_grid'].max()
+    assert elapsed < 10.0
+
+
+def test_wind_field_projects_between_history_entries():
+    """履歴の間の時間点では最も近い履歴を時間変化モデルで投影すること"""
+    model = BoatDataFusionModel()
+    for minutes in range(4):
+        model.estimation_history.append({'timestamp': START + timedelta(minutes=minutes),
+                                         'wind_direction': 10.0 + 2.0 * minutes,
+                                         'wind_speed_knots': 10.0})
+    model._update_time_change_model()
+    assert model.direction_time_change == pytest.approx(2.0)
+
+    query = [START + timedelta(minutes=3.5), START + timedelta(minutes=40)]
+    fields = model.create_spatiotemporal_wind_field(query, grid_resolution=5)
+
+    assert list(fields) == [query[0]]
+    assert fields[query[0]]['wind_direction'][2, 2] == pytest.approx(17.0)
+    assert model._estimate_wind_field_at_time(query[1]) is None
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+AnalysisCache と CacheManager のLRU・メモリ使用量推定のテスト
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.analysis.analysis_cache import AnalysisCache, CacheItem
+from sailing_data_processor.data_model.cache_manager import cached, clear_cache, get_cache_stats
+from sailing_data_processor.utilities.memory_size import estimate_size
+
+
+def test_estimate_size_uses_memory_usage():
+    """DataFrameはmemory_usage(deep=True)、配列はnbytesから推定すること"""
+    df = pd.DataFrame({'speed': np.zeros(1000), 'leg': ['upwind'] * 1000})
+    array = np.zeros((100, 100))
+
+    assert estimate_size(df) == df.memory_usage(index=True, deep=True).sum()
+    assert estimate_size(array) == array.nbytes
+    assert estimate_size({'a': array, 'b': array}) < 2 * array.nbytes
+    assert CacheItem('key', df).size_bytes == estimate_size(df)
+
+
+def test_analysis_cache_evicts_least_recently_used():
+    """最も長くアクセスされていないアイテムから削除されること"""
+    cache = AnalysisCache(max_size_bytes=4 * 8000 + 100)
+    for name in ['a', 'b', 'c', 'd']:
+        cache.set(name, np.zeros(1000))
+
+    # aにアクセスしてbを最も古くする
+    assert cache.get('a') is not None
+    cache.set('e', np.zeros(1000))
+
+    assert 'b' not in cache.memory_cache
+    assert 'a' in cache.memory_cache
+    assert 'e' in cache.memory_cache
+    assert cache.current_size_bytes == sum(item.size_bytes for item in cache.memory_cache.values())
+    assert cache.eviction_count >= 1
+
+
+def test_analysis_cache_prefix_stats():
+    """キープレフィックスごとにヒット率を集計すること"""
+    cache = AnalysisCache()
+    params = {'window': 30}
+
+    for _ in range(3):
+        cache.compute_from_params('wind_estimation', params, lambda p: {'direction': 270})
+    cache.compute_from_params('strategy_detection', params, lambda p: {'points': []})
+
+    stats = cache.get_cache_stats()['prefix_stats']
+    assert stats['wind_estimation']['hits'] == 2
+    assert stats['wind_estimation']['misses'] == 1
+    assert stats['strategy_detection']['hit_rate'] == 0
+
+
+def test_cached_lru_order_and_bytes_limit():
+    """CacheManagerが使用順に削除し、推定メモリ使用量の上限を守ること"""
+    clear_cache('lru_test')
+    calls = []
+
+    @cached('lru_test', max_size=2)
+    def compute(x):
+        calls.append(x)
+        return x
+
+    compute(1)
+    compute(2)
+    compute(1)  # 1を最新にする
+    compute(3)  # 2が削除される
+    compute(1)
+    compute(2)
+    assert calls == [1, 2, 3, 2]
+    assert get_cache_stats('lru_test')['evictions'] == 2
+
+    clear_cache('bytes_test')
+
+    @cached('bytes_test', max_size=100, max_bytes=3 * 8000 + 100)
+    def make_array(n):
+        return np.zeros(1000) + n
+
+    for n in range(5):
+        make_array(n)
+
+    stats = get_cache_stats('bytes_test')
+    assert stats['size'] == 3
+    assert stats['bytes'] == 3 * 8000
+
+
+def test_cached_is_thread_safe():
+    """複数スレッドから呼び出しても統計情報が一致すること"""
+    clear_cache('thread_test')
+
+    @cached('thread_test', max_size=16)
+    def square(x):
+        return x * x
+
+    def worker():
+        for i in range(200):
+            assert square(i % 32) == (i % 32) ** 2
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = get_cache_stats('thread_test')
+    assert stats['hits'] + stats['misses'] == 800
+    assert stats['size'] <= 16
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+CSVの高速読み込み（スキーマ推定のキャッシュと型指定付きのチャンク読み込み）のテスト
+"""
+import pandas as pd
+import pytest
+
+from sailing_data_processor.importers.csv_importer import CSVImporter
+from sailing_data_processor.importers.csv_schema_cache import (
+    schema_cache, infer_timestamp_format, parse_timestamps
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    schema_cache.clear()
+    yield
+    schema_cache.clear()
+
+
+def _write_log(path, rows=50, start='2025-04-01 10:00:00', bad_row=None):
+    times = pd.date_range(start, periods=rows, freq='s')
+    lines = ['Time,Lat,Lon,SOG,Note']
+    for i, t in enumerate(times):
+        speed = 'bad' if i == bad_row else f'{5 + i * 0.01:.2f}'
+        lines.append(f'{t:%Y-%m-%d %H:%M:%S},{35 + i * 1e-5:.6f},{139.5 + i * 1e-5:.6f},{speed},leg{i % 3}')
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+def test_infer_timestamp_format():
+    """サンプルからタイムスタンプ形式を推定できること"""
+    assert infer_timestamp_format(pd.Series(['2025-04-01 10:00:00', '2025-04-01 10:00:01'])) == \
+        ('format', '%Y-%m-%d %H:%M:%S')
+    assert infer_timestamp_format(pd.Series(['2025/04/01 10:00:00'])) == ('format', '%Y/%m/%d %H:%M:%S')
+    assert infer_timestamp_format(pd.Series([1743501600000, 1743501601000])) == ('unix_ms', None)
+    assert infer_timestamp_format(pd.Series([1743501600, 1743501601])) == ('unix_s', None)
+
+    parsed = parse_timestamps(pd.Series([1743501600]), 'unix_s')
+    assert parsed.iloc[0] == pd.Timestamp('2025-04-01 10:00:00')
+
+
+def test_fast_import_uses_typed_chunks(tmp_path):
+    """型指定付きのチャンク読み込みで通常の読み込みと同じ値になること"""
+    path = _write_log(tmp_path / 'boat1.csv', rows=250)
+
+    container = CSVImporter({'fast_mode': True, 'chunk_size': 64}).import_data(path)
+    expected = CSVImporter().import_data(path)
+
+    df = container.data
+    assert len(df) == 250
+    assert df['latitude'].dtype == 'float64'
+    assert df['speed'].dtype == 'float32'
+    assert container.metadata['csv_info']['timestamp_format'] == '%Y-%m-%d %H:%M:%S'
+    assert list(df['timestamp']) == list(expected.data['timestamp'])
+    assert list(df['latitude']) == list(expected.data['latitude'])
+    assert list(df['Note']) == list(expected.data['Note'])
+
+
+def test_same_schema_skips_inference(tmp_path, monkeypatch):
+    """同じヘッダーのファイルはキャッシュしたスキーマを再利用すること"""
+    paths = [_write_log(tmp_path / f'boat{i}.csv', start=f'2025-04-0{i + 1} 10:00:00') for i in range(3)]
+
+    hits = schema_cache.hits
+    importer = CSVImporter({'fast_mode': True})
+    first = importer.import_data(paths[0])
+    assert first.metadata['csv_info']['schema_cache_hit'] is False
+
+    def fail(*args, **kwargs):
+        raise AssertionError('スキーマを再推定しました')
+
+    monkeypatch.setattr('sailing_data_processor.importers.csv_schema_cache.CSVSchema.infer', fail)
+    for path in paths[1:]:
+        container = CSVImporter({'fast_mode': True}).import_data(path)
+        assert container.metadata['csv_info']['schema_cache_hit'] is True
+        assert len(container.data) == 50
+
+    assert schema_cache.get_stats()['hits'] - hits == 2
+
+
+def test_standard_import_keeps_parsed_timestamps(tmp_path):
+    """通常の読み込みで文字列から変換したタイムスタンプが数値として再変換されないこと"""
+    path = _write_log(tmp_path / 'boat1.csv', rows=30)
+
+    container = CSVImporter().import_data(path)
+
+    assert container is not None
+    assert list(container.data['timestamp']) == list(pd.date_range('2025-04-01 10:00:00', periods=30, freq='s'))
+
+
+def test_type_mismatch_falls_back(tmp_path):
+    """サンプル以降に型の合わない値がある場合は通常の読み込みに戻ること"""
+    path = _write_log(tmp_path / 'boat1.csv', rows=100, bad_row=80)
+
+    importer = CSVImporter({'fast_mode': True, 'sample_rows': 20})
+    container = importer.import_data(path)
+
+    assert container is not None
+    assert len(container.data) == 100
+    assert container.data['timestamp'].iloc[0] == pd.Timestamp('2025-04-01 10:00:00')
+    assert container.data['timestamp'].iloc[-1] == pd.Timestamp('2025-04-01 10:01:39')
+    assert any('高速読み込み' in warning for warning in importer.get_warnings())
+    assert len(schema_cache) == 0
+
+
+def test_timestamp_format_change_falls_back(tmp_path):
+    """キャッシュした形式と異なるタイムスタンプの行を捨てずに通常の読み込みに戻ること"""
+    first = _write_log(tmp_path / 'boat1.csv', rows=30)
+    second = _write_log(tmp_path / 'boat2.csv', rows=30)
+    lines = second.read_text().splitlines()
+    lines[1:] = [line.replace('-', '/', 2) for line in lines[1:]]
+    second.write_text('\n'.join(lines) + '\n')
+
+    CSVImporter({'fast_mode': True}).import_data(first)
+    importer = CSVImporter({'fast_mode': True})
+    container = importer.import_data(second)
+
+    assert container is not None
+    assert list(container.data['timestamp']) == list(pd.date_range('2025-04-01 10:00:00', periods=30, freq='s'))
+    assert any('高速読み込み' in warning for warning in importer.get_warnings())
+
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+データのフィンガープリント（キャッシュキー生成）のテスト
+"""
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.utilities.fingerprint import fingerprint, fingerprint_dataframe
+from sailing_data_processor.data_model.cache_manager import hash_args
+
+
+def _track(rows=500):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=rows, freq='s', tz='UTC'),
+        'latitude': 35.0 + 1e-5 * np.arange(rows),
+        'longitude': 139.5 + 1e-5 * np.arange(rows),
+        'speed': np.full(rows, 5.0),
+        'leg': ['upwind'] * rows,
+    })
+
+
+def test_middle_rows_change_fingerprint():
+    """先頭・末尾・統計量が同じでも途中の行が異なれば別のハッシュになること"""
+    df1 = _track()
+    df2 = df1.copy()
+    # 平均・標準偏差を変えずに途中の2行を入れ替える
+    df2.loc[[201, 202], 'speed'] = [4.0, 6.0]
+    df1.loc[[201, 202], 'speed'] = [6.0, 4.0]
+
+    assert df1['speed'].mean() == df2['speed'].mean()
+    assert fingerprint_dataframe(df1) != fingerprint_dataframe(df2)
+    assert fingerprint_dataframe(df1) == fingerprint_dataframe(df1.copy())
+
+
+def test_fingerprint_follows_changes():
+    """列の追加・置換や途中の行の直接の書き換えが反映されること"""
+    df = _track(10000)
+    original = fingerprint_dataframe(df)
+    original_key = hash_args((df,), {})
+
+    df.loc[5003, 'speed'] = -999.0
+    edited = fingerprint_dataframe(df)
+    assert edited != original
+    assert hash_args((df,), {}) != original_key
+
+    df['speed'] = df['speed'] + 1.0
+    replaced = fingerprint_dataframe(df)
+    assert replaced != edited
+
+    df['heading'] = 90.0
+    assert fingerprint_dataframe(df) != replaced
+
+
+def test_fingerprint_nested_objects():
+    """辞書・配列・DataFrameを含む引数から安定したキーを作ること"""
+    df = _track(50)
+    args = ({'data': df, 'window': 30}, np.arange(5.0))
+
+    assert fingerprint(args) == fingerprint(({'window': 30, 'data': df.copy()}, np.arange(5.0)))
+    assert fingerprint(args) != fingerprint(({'data': df, 'window': 60}, np.arange(5.0)))
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
+
+
+def test_hash_args_distinguishes_dataframes():
+    """hash_args が内容の異なるDataFrameを区別すること"""
+    df1 = _track(100)
+    df2 = df1.copy()
+    df2.loc[50, 'latitude'] += 1e-6
+
+    assert hash_args(df1, method='bayesian') != hash_args(df2, method='bayesian')
+    assert hash_args(df1, method='bayesian') == hash_args(df1.copy(), method='bayesian')
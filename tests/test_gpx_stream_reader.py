@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+GPXのストリーミング読み込み（GPXImporter.iter_import / streaming設定）のテスト
+"""
+import io
+
+import pandas as pd
+
+from sailing_data_processor.importers.gpx_importer import GPXImporter
+
+
+def _gpx(tracks, with_route=False, garmin=False):
+    """テスト用のGPX文字列を作成"""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1" '
+        'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">',
+        '<metadata><name>Race</name><author><name>Committee</name></author></metadata>',
+    ]
+    if with_route:
+        lines.append('<rte><name>Course</name>'
+                     '<rtept lat="35.0" lon="139.0"><time>2025-04-01T00:00:00Z</time></rtept></rte>')
+    second = 0
+    for name, count in tracks:
+        lines.append(f'<trk><name>{name}</name><trkseg>')
+        for _ in range(count):
+            ext = ''
+            if garmin:
+                ext = ('<extensions><speed>1.0</speed><gpxtpx:TrackPointExtension>'
+                       f'<gpxtpx:hr>{100 + second % 50}</gpxtpx:hr><gpxtpx:speed>5.5</gpxtpx:speed>'
+                       '</gpxtpx:TrackPointExtension></extensions>')
+            lines.append(f'<trkpt lat="{35 + second * 1e-4:.5f}" lon="139.5"><ele>1</ele>'
+                         f'<time>{(pd.Timestamp("2025-04-01T01:00:00Z") + pd.Timedelta(seconds=second)).isoformat()}</time>'
+                         f'{ext}</trkpt>')
+            second += 1
+        lines.append('</trkseg></trk>')
+    lines.append('</gpx>')
+    return '\n'.join(lines)
+
+
+def test_iter_import_yields_bounded_chunks(tmp_path):
+    """チャンクサイズ以下のコンテナが順に返されること"""
+    path = tmp_path / 'race.gpx'
+    path.write_text(_gpx([('Boat A', 120), ('Boat B', 80)], garmin=True))
+
+    importer = GPXImporter()
+    chunks = list(importer.iter_import(path, chunk_size=50))
+
+    assert [len(c.data) for c in chunks] == [50, 50, 50, 50]
+    assert [c.metadata['chunk_index'] for c in chunks] == [0, 1, 2, 3]
+    assert chunks[0].metadata['creator'] == 'test'
+    assert chunks[0].metadata['author'] == 'Committee'
+
+    df = pd.concat([c.data for c in chunks], ignore_index=True)
+    assert df['track_name'].value_counts().to_dict() == {'Boat A': 120, 'Boat B': 80}
+    # Garmin拡張の値が同名の拡張データより優先されること
+    assert (df['speed'] == 5.5).all()
+    assert df['heart_rate'].iloc[3] == 103
+    assert df['elevation'].dtype == 'float64'
+
+
+def test_streaming_import_data_matches_metadata(tmp_path):
+    """streaming設定で1つのコンテナにまとめて読み込めること"""
+    path = tmp_path / 'race.gpx'
+    path.write_text(_gpx([('Boat A', 30), ('Boat B', 20)], with_route=True))
+
+    importer = GPXImporter({'streaming': True, 'chunk_size': 16})
+    container = importer.import_data(path)
+
+    assert container is not None
+    assert len(container.data) == 50
+    # トラックポイントがある場合はルートポイントを使用しない
+    assert set(container.data['point_type']) == {'trackpoint'}
+    assert container.data['timestamp'].is_monotonic_increasing
+    assert container.metadata['tracks'] == [
+        {'segments': 1, 'points': 30, 'name': 'Boat A'},
+        {'segments': 1, 'points': 20, 'name': 'Boat B'},
+    ]
+    assert container.metadata['routes'] == [{'points': 1, 'name': 'Course'}]
+
+
+def test_streaming_matches_tree_import():
+    """拡張データのないファイルで従来の読み込みと同じ位置・時刻になること"""
+    content = _gpx([('Boat A', 40)]).encode('utf-8')
+    streams = [io.BytesIO(content), io.BytesIO(content)]
+    for stream in streams:
+        stream.name = 'race.gpx'
+
+    expected = GPXImporter().import_data(streams[0])
+    actual = GPXImporter({'streaming': True, 'chunk_size': 7}).import_data(streams[1])
+
+    assert streams[1].tell() == 0
+    for col in ['timestamp', 'latitude', 'longitude', 'elevation', 'track_name']:
+        assert list(actual.data[col]) == list(expected.data[col])
+
+
+def test_routepoints_used_without_tracks(tmp_path):
+    """トラックがない場合はルートポイントを読み込むこと"""
+    path = tmp_path / 'route.gpx'
+    path.write_text(_gpx([], with_route=True))
+
+    container = GPXImporter({'streaming': True}).import_data(path)
+
+    assert list(container.data['point_type']) == ['routepoint']
+    assert container.data['route_name'].iloc[0] == 'Course'
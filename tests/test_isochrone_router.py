@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+等時線ルート最適化エンジン（isochrone_router）のテスト
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from sailing_data_processor.optimal_vmg_calculator import OptimalVMGCalculator
+from sailing_data_processor.isochrone_router import IsochroneRouter, WindFieldSampler, KNOTS_TO_MPS
+from sailing_data_processor.utilities.track_kinematics import haversine_distances
+
+
+def _wind_field(direction=0.0, speed=12.0):
+    lats, lons = np.meshgrid(np.linspace(35.60, 35.70, 41), np.linspace(139.60, 139.70, 41))
+    return {
+        'lat_grid': lats,
+        'lon_grid': lons,
+        'wind_direction': np.full(lats.shape, direction),
+        'wind_speed': np.full(lats.shape, speed),
+        'confidence': np.full(lats.shape, 0.8)
+    }
+
+
+class _ShiftingInterpolator:
+    """10分ごとに風向が右に振れる風の場を返す補間器"""
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self.calls = 0
+
+    def interpolate_wind_field(self, target_time, resolution=None):
+        self.calls += 1
+        minutes = (target_time - self.start_time).total_seconds() / 60
+        return _wind_field(direction=(minutes // 10) * 10.0)
+
+
+@pytest.fixture
+def calculator():
+    calculator = OptimalVMGCalculator()
+    calculator.set_wind_field(_wind_field())
+    return calculator
+
+
+def test_reaching_leg_is_direct(calculator):
+    """リーチングのレグはほぼ直線で、所要時間が直線距離/艇速と一致すること"""
+    path = calculator.find_isochrone_path('laser', 35.65, 139.62, 35.65, 139.68)
+    table = calculator._get_polar_table('laser')
+    distance = float(haversine_distances(35.65, 139.62, 35.65, 139.68))
+    expected = (distance - calculator.config['min_distance']) / (table.boat_speed(12.0, 90.0) * KNOTS_TO_MPS)
+
+    assert path['reached'] and path['engine'] == 'isochrone'
+    assert path['tack_count'] == 0
+    assert path['total_time'] == pytest.approx(expected, rel=0.03)
+    assert path['path_points'][-1]['lat'] == 35.65 and path['path_points'][-1]['lon'] == 139.68
+
+
+def test_upwind_leg_tacks_near_optimal_vmg(calculator):
+    """風上のレグはタックを含み、所要時間が最適VMGでの時間に近いこと"""
+    path = calculator.find_isochrone_path('laser', 35.62, 139.65, 35.68, 139.65)
+    _, best_vmg = calculator._get_polar_table('laser').optimal(12.0, upwind=True)
+    distance = float(haversine_distances(35.62, 139.65, 35.68, 139.65))
+    lower_bound = (distance - calculator.config['min_distance']) / (best_vmg * KNOTS_TO_MPS)
+
+    assert path['reached']
+    assert path['tack_count'] >= 1
+    assert path['tack_points'][0]['is_upwind']
+    assert lower_bound * 0.98 <= path['total_time'] <= lower_bound * 1.15
+
+
+def test_time_varying_wind_field():
+    """時間変化する風の場を時間間隔ごとに一度だけ補間して使用すること"""
+    start_time = datetime(2024, 6, 1, 10, 0, 0)
+    interpolator = _ShiftingInterpolator(start_time)
+    sampler = WindFieldSampler(interpolator=interpolator, start_time=start_time, time_resolution=300)
+
+    direction, _ = sampler.sample(np.array([35.65, 35.66]), np.array([139.65, 139.65]), 1250.0)
+    assert direction.tolist() == [20.0, 20.0]
+    sampler.sample(np.array([35.65]), np.array([139.65]), 1260.0)
+    assert interpolator.calls == 1
+    assert np.isnan(sampler.sample(np.array([36.0]), np.array([139.65]))[0][0])
+
+    calculator = OptimalVMGCalculator()
+    router = IsochroneRouter(calculator._get_polar_table('laser'), sampler)
+    path = router.route(35.62, 139.65, 35.68, 139.65)
+    assert path['reached']
+    assert interpolator.calls <= path['total_time'] / 300 + 2
+
+
+def test_course_route_engine(calculator):
+    """コース全体で等時線エンジンを使用し、並列・逐次の結果が一致すること"""
+    waypoints = [
+        {'name': 'Start', 'lat': 35.62, 'lon': 139.65},
+        {'name': 'Mark 1', 'lat': 35.68, 'lon': 139.65},
+        {'name': 'Mark 2', 'lat': 35.65, 'lon': 139.68},
+    ]
+    calculator.update_config(max_workers=2)
+    parallel = calculator.calculate_optimal_route_for_course('laser', waypoints, engine='isochrone')
+    calculator.update_config(use_parallel=False)
+    sequential = calculator.calculate_optimal_route_for_course('laser', waypoints, engine='isochrone')
+
+    assert [leg['path']['engine'] for leg in parallel['legs']] == ['isochrone', 'isochrone']
+    assert parallel['total_time'] == pytest.approx(sequential['total_time'])
+    assert parallel['total_tack_count'] == sequential['total_tack_count']
+    assert parallel['legs'][1]['start_time'] == pytest.approx(parallel['legs'][0]['path']['total_time'])
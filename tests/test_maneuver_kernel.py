@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+マニューバー検出カーネル（配列演算）のテスト
+"""
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.optimized.wind_estimator import OptimizedWindEstimator
+from sailing_data_processor.wind import maneuver_kernel
+from sailing_data_processor.wind.wind_estimator_maneuvers import detect_gybes, detect_maneuvers, detect_tacks
+from sailing_data_processor.wind.wind_estimator_utils import calculate_angle_change
+from sailing_data_processor.wind_estimator_improved import WindEstimatorImproved
+
+
+def _zigzag_track(hours=3.0, hz=10, tack_interval=60.0, seed=0):
+    """一定間隔で左右にタックする航跡（0度をまたぐ）"""
+    rng = np.random.default_rng(seed)
+    rows = int(hours * 3600 * hz)
+    period = int(tack_interval * hz)
+    t = np.arange(rows)
+
+    # 0.5秒（5点）で45度⇔315度に旋回する
+    phase = (t // period) % 2
+    progress = np.clip((t % period) / 5.0, 0.0, 1.0)
+    turn = np.where(phase == 0, 90.0 * progress, 90.0 * (1 - progress))
+    course = (45.0 - turn + rng.normal(0, 1.0, rows)) % 360
+    speed = np.where(t % period < 30, 4.5, 6.0) + rng.normal(0, 0.1, rows)
+
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=rows, freq=f'{1000 // hz}ms'),
+        'latitude': 35.0 + 1e-7 * t,
+        'longitude': 139.5 + 1e-7 * t,
+        'course': course,
+        'speed': speed,
+    })
+
+
+def test_detect_tacks_matches_pointwise_reference():
+    """一括計算のタック/ジャイブ検出が点ごとの計算と一致すること"""
+    rng = np.random.default_rng(1)
+    headings = rng.uniform(0, 360, 500)
+    headings[[10, 12]] = [0.0, 180.0]  # ちょうど180度の変化
+    headings[100] = np.nan
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01', periods=500, freq='s'),
+        'course': headings,
+    })
+
+    changes = [calculate_angle_change(headings[i - 1], headings[i + 1]) for i in range(1, 499)]
+    expected_tacks = [i + 1 for i, c in enumerate(changes) if abs(c) > 60]
+    expected_gybes = [i + 1 for i, c in enumerate(changes) if c > 60]
+
+    tacks = detect_tacks(data, 60.0)
+    gybes = detect_gybes(data, 60.0)
+
+    assert tacks['index'].tolist() == expected_tacks
+    assert gybes['index'].tolist() == expected_gybes
+    assert 11 in gybes['index'].tolist()
+    np.testing.assert_allclose(tacks['angle_change'], [abs(changes[i - 1]) for i in expected_tacks])
+    assert (tacks['timestamp'] == data['timestamp'].iloc[expected_tacks].to_numpy()).all()
+
+
+def test_base_maneuvers_are_classified_by_kernel():
+    """風向を指定した基本のマニューバー検出が共通カーネルで1点につき1回分類されること"""
+    t = np.arange(300)
+    data = pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=300, freq='s'),
+        'course': np.where((t // 30) % 2 == 0, 45.0, 315.0),
+        'speed': np.where(t % 30 < 5, 4.5, 6.0),
+    })
+
+    tacks = detect_tacks(data, 60.0)
+    maneuvers = detect_maneuvers(data, wind_direction=0.0, min_tack_angle=60.0)
+    indices = tacks['index'].to_numpy()
+    types, confidences, _, after_states = maneuver_kernel.classify_maneuvers(
+        tacks['heading_before'].to_numpy(), tacks['heading_after'].to_numpy(), 0.0,
+        data['speed'].to_numpy()[indices - 1], data['speed'].to_numpy()[indices + 1]
+    )
+
+    assert len(tacks) == 18  # 9回のタックの前後2点
+    assert len(maneuvers) == len(tacks)
+    assert maneuvers['maneuver_type'].tolist() == types.tolist()
+    assert set(maneuvers['maneuver_type']) == {'tack'}
+    np.testing.assert_allclose(maneuvers['maneuver_confidence'], confidences)
+    assert set(maneuvers['before_state']) == {'upwind_port', 'upwind_starboard'}
+    assert maneuvers['after_state'].tolist() == after_states.tolist()
+
+
+def test_segments_and_window_statistics():
+    """区間抽出・区間ごとの最大位置・円周平均"""
+    starts, ends = maneuver_kernel.flag_segments([False, True, True, False, True])
+    assert starts.tolist() == [1, 4]
+    assert ends.tolist() == [3, 5]
+
+    values = np.array([9.0, 3.0, 5.0, 5.0, 1.0, np.nan, 2.0])
+    positions = maneuver_kernel.segment_argmax(values, np.array([1, 5]), np.array([4, 7]))
+    assert positions.tolist() == [2, 6]
+
+    mean, resultant = maneuver_kernel.window_circular_means(
+        [350.0, 10.0, 180.0], np.array([0]), np.array([2])
+    )
+    assert maneuver_kernel.angle_difference(mean, 0.0)[0] == pytest.approx(0.0, abs=1e-9)
+    assert resultant[0] == pytest.approx(np.cos(np.radians(10.0)))
+
+    rolled = maneuver_kernel.rolling_mean([1.0, np.nan, 3.0, 4.0, 5.0, 6.0], 4)
+    expected = pd.Series([1.0, np.nan, 3.0, 4.0, 5.0, 6.0]).rolling(4, min_periods=1, center=True).mean()
+    np.testing.assert_allclose(rolled, expected.to_numpy())
+
+
+def test_classification_matches_scalar_rules():
+    """配列版の分類がWindEstimatorImprovedの点ごとの判定と一致すること"""
+    estimator = WindEstimatorImproved()
+    bearings = np.arange(0.0, 360.0, 15.0)
+    pairs = np.array(list(itertools.product(bearings, bearings)))
+    speed_before = np.full(len(pairs), 5.0)
+    speed_after = np.where(np.arange(len(pairs)) % 2 == 0, 4.0, 5.0)
+
+    types, confidences, before_states, after_states = maneuver_kernel.classify_maneuvers(
+        pairs[:, 0], pairs[:, 1], 10.0, speed_before, speed_after
+    )
+
+    for i, (before, after) in enumerate(pairs):
+        before_state = estimator._determine_sailing_state(before, 10.0)
+        after_state = estimator._determine_sailing_state(after, 10.0)
+        change = abs(estimator._calculate_angle_difference(after, before))
+        expected = estimator._identify_maneuver_type(
+            before, after, 10.0, speed_before[i], speed_after[i], change, before_state, after_state
+        )
+        assert (types[i], before_states[i], after_states[i]) == (expected[0], before_state, after_state)
+        assert confidences[i] == pytest.approx(expected[1])
+
+
+def test_optimized_estimator_handles_long_10hz_track():
+    """10Hzで数時間の航跡から左右両方向のタックを短時間で検出すること"""
+    data = _zigzag_track()
+    estimator = OptimizedWindEstimator()
+    estimator.params['min_maneuver_duration'] = 0.0
+
+    start = time.perf_counter()
+    maneuvers = estimator.detect_maneuvers_optimized(data)
+    elapsed = time.perf_counter() - start
+
+    expected = int(3 * 3600 / 60) - 1
+    assert len(maneuvers) >= expected - 2
+    assert (maneuvers['bearing_change'] > 0).any()
+    assert (maneuvers['bearing_change'] < 0).any()
+    assert maneuvers['bearing_change'].abs().between(60, 110).all()
+    assert elapsed < 5.0
+
+
+@pytest.mark.parametrize('unit, hz', [('s', 1), ('ms', 10), ('us', 10)])
+def test_maneuver_windows_are_independent_of_timestamp_unit(unit, hz):
+    """ns以外の単位の時刻列でも前後の時間窓とマニューバー時間が変わらないこと"""
+    data = _zigzag_track(hours=0.25, hz=hz)
+    cast = data.assign(timestamp=data['timestamp'].astype(f'datetime64[{unit}]'))
+
+    optimized = OptimizedWindEstimator()
+    optimized.params['min_maneuver_duration'] = 0.0
+    for detect in (WindEstimatorImproved().detect_maneuvers, optimized.detect_maneuvers_optimized):
+        expected = detect(data)
+        result = detect(cast)
+        assert len(expected) > 0
+        assert len(result) == len(expected)
+        np.testing.assert_allclose(result['maneuver_duration'], expected['maneuver_duration'])
+        np.testing.assert_allclose(result['bearing_change'], expected['bearing_change'])
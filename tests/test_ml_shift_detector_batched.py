@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+MLShiftDetector の特徴量一括計算（スライディングウィンドウ）のテスト
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.analysis.wind_shift_detector import MLShiftDetector
+
+
+def _wind_data(rows, seed=0, tz=None):
+    rng = np.random.default_rng(seed)
+    t = np.arange(rows)
+    # 5分ごとに左右へシフトする風向（0度をまたぐ区間を含む）
+    direction = 350 + 15 * np.sign(np.sin(2 * np.pi * t / 600)) + rng.normal(0, 4, rows)
+    speed = 12 + 2 * np.sin(2 * np.pi * t / 900) + rng.normal(0, 0.5, rows)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=rows, freq='s', tz=tz),
+        'wind_direction': direction % 360,
+        'wind_speed': speed,
+        'latitude': 35.0 + 1e-5 * t,
+        'longitude': 139.5 + 1e-5 * t,
+    })
+
+
+def _params(**extra):
+    params = {'min_shift_angle': 5.0, 'confidence_threshold': 0.55}
+    params.update(extra)
+    return params
+
+
+@pytest.mark.parametrize('tz', [None, 'UTC'])
+def test_batched_matches_pointwise(tz):
+    """一括計算と点ごとの計算で同じシフトポイントになること"""
+    data = _wind_data(1500, tz=tz)
+    data.loc[700:702, 'wind_speed'] = np.nan
+    data.loc[900, 'wind_direction'] = np.nan
+
+    batched = MLShiftDetector(_params()).detect(data)
+    pointwise = MLShiftDetector(_params(batch_features=False)).detect(data)
+
+    assert len(batched) > 0
+    assert [p['timestamp'] for p in batched] == [p['timestamp'] for p in pointwise]
+    for b, p in zip(batched, pointwise):
+        assert b['direction_change'] == pytest.approx(p['direction_change'])
+        assert b['confidence'] == pytest.approx(p['confidence'])
+        assert b['shift_type'] == p['shift_type']
+
+
+def test_window_features_match_point_features():
+    """ウィンドウ特徴量が _compute_point_features と一致すること"""
+    data = _wind_data(200, seed=1)
+    detector = MLShiftDetector(_params())
+    features = detector._compute_window_features(data)
+
+    for i in [5, 50, 120, len(data) - 6]:
+        expected = detector._compute_point_features(
+            data.iloc[i], data.iloc[i - 5:i], data.iloc[i + 1:i + 6]
+        )
+        for name, value in expected.items():
+            assert features.loc[i, name] == pytest.approx(value, abs=1e-9)
+
+
+def test_full_day_runs_quickly():
+    """1Hzで1日分のデータを短時間で処理できること"""
+    data = _wind_data(86400, seed=2)
+
+    start = time.perf_counter()
+    result = MLShiftDetector(_params()).detect(data)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) > 0
+    assert elapsed < 30.0
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+戦略ポイントの重複除去エンジン（point_deduplication）のテスト
+"""
+import time
+
+import pytest
+import numpy as np
+
+from sailing_data_processor.strategy.points import WindShiftPoint, TackPoint, LaylinePoint
+from sailing_data_processor.strategy.strategy_detector_utils import (
+    normalize_to_timestamp, get_time_difference_seconds, angle_difference, calculate_distance
+)
+from sailing_data_processor.strategy.point_deduplication import (
+    deduplicate_shift_points, deduplicate_tack_points, deduplicate_laylines
+)
+from sailing_data_processor.strategy.strategy_detector_with_propagation import StrategyDetectorWithPropagation
+from sailing_data_processor.strategy.optimized_strategy_detector import OptimizedStrategyDetector
+
+
+def _greedy(points, is_duplicate, prefer):
+    """従来の全件比較による貪欲法（比較用）"""
+    filtered = []
+    for point in points:
+        for existing in filtered:
+            if is_duplicate(point, existing):
+                if prefer(point, existing):
+                    filtered.remove(existing)
+                    filtered.append(point)
+                break
+        else:
+            filtered.append(point)
+    return filtered
+
+
+def _distance(a, b):
+    return calculate_distance(a.position[0], a.position[1], b.position[0], b.position[1])
+
+
+def _reference_shifts(points):
+    ordered = sorted(points, key=lambda p: normalize_to_timestamp(p.time_estimate))
+    return _greedy(
+        ordered,
+        lambda p, e: (_distance(p, e) < 300 and
+                      get_time_difference_seconds(p.time_estimate, e.time_estimate) < 300 and
+                      abs(angle_difference(p.shift_angle, e.shift_angle)) < 15),
+        lambda p, e: p.shift_probability > e.shift_probability
+    )
+
+
+def _positions(rng, count, spread=0.01):
+    return np.column_stack([35.6 + spread * rng.random(count), 139.7 + spread * rng.random(count)])
+
+
+def _shift_points(count, seed=0, spread=0.01):
+    rng = np.random.default_rng(seed)
+    points = []
+    for (lat, lon) in _positions(rng, count, spread):
+        point = WindShiftPoint((lat, lon), float(rng.integers(0, 3600)))
+        point.shift_angle = float(rng.uniform(-40, 40))
+        point.shift_probability = float(rng.random())
+        points.append(point)
+    return points
+
+
+def _tack_points(count, seed=0):
+    rng = np.random.default_rng(seed)
+    points = []
+    for (lat, lon) in _positions(rng, count):
+        point = TackPoint((lat, lon), float(rng.integers(0, 3600)))
+        point.vmg_gain = float(rng.uniform(0, 0.3))
+        points.append(point)
+    return points
+
+
+def _layline_points(count, seed=0):
+    rng = np.random.default_rng(seed)
+    points = []
+    for (lat, lon) in _positions(rng, count):
+        point = LaylinePoint((lat, lon), float(rng.integers(0, 3600)))
+        point.mark_id = f'mark{rng.integers(0, 3)}'
+        point.confidence = float(rng.random())
+        points.append(point)
+    return points
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_greedy_rule(seed):
+    """従来の貪欲法と同じポイントが同じ順序で残ること"""
+    shifts = _shift_points(400, seed)
+    assert deduplicate_shift_points(shifts) == _reference_shifts(shifts)
+
+    tacks = _tack_points(400, seed)
+    expected = _greedy(tacks, lambda p, e: _distance(p, e) < 200 and abs(p.vmg_gain - e.vmg_gain) < 0.05,
+                       lambda p, e: p.vmg_gain > e.vmg_gain)
+    assert deduplicate_tack_points(tacks) == expected
+
+    laylines = _layline_points(400, seed)
+    expected = _greedy(laylines, lambda p, e: p.mark_id == e.mark_id and _distance(p, e) < 300,
+                       lambda p, e: p.confidence > e.confidence)
+    assert deduplicate_laylines(laylines) == expected
+
+
+def test_replacement_moves_point_to_end():
+    """置き換えたポイントがリストの末尾に移ること"""
+    points = []
+    for position, gain in [((35.6, 139.7), 0.10), ((35.7, 139.8), 0.10), ((35.6, 139.7001), 0.12)]:
+        point = TackPoint(position, 0)
+        point.vmg_gain = gain
+        points.append(point)
+
+    assert deduplicate_tack_points(points) == [points[1], points[2]]
+
+
+def test_both_detectors_share_engine():
+    """両方の検出器が同じ結果を返すこと"""
+    shifts = _shift_points(300, seed=5)
+    expected = _reference_shifts(shifts)
+
+    assert StrategyDetectorWithPropagation()._filter_duplicate_shift_points(shifts) == expected
+    optimized = OptimizedStrategyDetector()
+    assert optimized._filter_duplicate_shift_points(shifts) == expected
+    optimized.optimization_config['batch_processing'] = False
+    assert optimized._filter_duplicate_shift_points(shifts) == expected
+
+    laylines = _layline_points(200, seed=5)
+    assert (optimized._batch_filter_duplicate_points(laylines) ==
+            StrategyDetectorWithPropagation()._filter_duplicate_laylines(laylines))
+
+
+@pytest.mark.parametrize('batch_processing', [True, False])
+def test_optimized_detector_matches_base_detector(batch_processing):
+    """最適化版の検出器がバッチ処理の有無によらず基本の検出器と同じポイントを残すこと"""
+    base = StrategyDetectorWithPropagation()
+    optimized = OptimizedStrategyDetector()
+    optimized.optimization_config['batch_processing'] = batch_processing
+
+    shifts = _shift_points(300, seed=7)
+    tacks = _tack_points(300, seed=7)
+    laylines = _layline_points(300, seed=7)
+
+    assert optimized._filter_duplicate_shift_points(shifts) == base._filter_duplicate_shift_points(shifts)
+    assert optimized._filter_duplicate_tack_points(tacks) == base._filter_duplicate_tack_points(tacks)
+    assert optimized._filter_duplicate_laylines(laylines) == base._filter_duplicate_laylines(laylines)
+
+
+def test_large_input_is_fast():
+    """広い範囲に散らばった多数のポイントを短時間で処理できること"""
+    shifts = _shift_points(20000, seed=3, spread=0.5)
+    start = time.perf_counter()
+    result = deduplicate_shift_points(shifts)
+    elapsed = time.perf_counter() - start
+
+    assert 0 < len(result) <= len(shifts)
+    assert elapsed < 5.0
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+事前計算したポーラーテーブル（optimal_vmg_calculator.PolarTable）のテスト
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.optimal_vmg_calculator import OptimalVMGCalculator, PolarTable
+
+
+@pytest.fixture
+def polar_data():
+    angles = np.arange(0, 181, 15)
+    speeds = [4, 8, 12, 16]
+    values = [[max(0.0, np.sin(np.radians(a)) * (0.4 + 0.05 * s) * s * (1.0 if a >= 30 else 0.2))
+               for s in speeds] for a in angles]
+    return pd.DataFrame(values, index=angles, columns=speeds)
+
+
+@pytest.fixture
+def calculator():
+    calculator = OptimalVMGCalculator()
+    lats, lons = np.meshgrid(np.linspace(35.60, 35.70, 21), np.linspace(139.60, 139.70, 21))
+    calculator.set_wind_field({
+        'lat_grid': lats,
+        'lon_grid': lons,
+        'wind_direction': 200.0 + 40.0 * (lats - 35.60) / 0.10,
+        'wind_speed': 8.0 + 6.0 * (lons - 139.60) / 0.10,
+        'confidence': np.full(lats.shape, 0.8),
+        'time': None
+    })
+    return calculator
+
+
+def _reference_speed(polar_data, wind_speed, angle):
+    # 風向角ごとに風速方向の線形補間を行い、さらに角度方向に補間する
+    angles = polar_data.index.to_numpy(dtype=float)
+    speeds = polar_data.columns.to_numpy(dtype=float)
+    by_angle = [np.interp(wind_speed, speeds, polar_data.iloc[i].to_numpy(dtype=float))
+                for i in range(len(angles))]
+    return np.interp(angle, angles, by_angle)
+
+
+def test_boat_speed_matches_bilinear(polar_data):
+    """グリッド上の値と中間点の補間値が双線形補間と一致すること"""
+    table = PolarTable(polar_data)
+    assert table.boat_speed(8, 45) == pytest.approx(polar_data.loc[45, 8])
+
+    rng = np.random.default_rng(0)
+    wind_speeds = rng.uniform(4, 16, 200)
+    angles = rng.uniform(0, 180, 200)
+    expected = [_reference_speed(polar_data, ws, a) for ws, a in zip(wind_speeds, angles)]
+    np.testing.assert_allclose(table.boat_speed(wind_speeds, angles), expected, rtol=0.02, atol=0.02)
+
+
+def test_optimal_angles_match_search(polar_data):
+    """最適VMG角が総当たり探索と一致すること"""
+    table = PolarTable(polar_data)
+    for wind_speed in [4.0, 8.0, 12.0]:
+        search = np.arange(0, 181, 1.0)
+        vmg = table.boat_speed(wind_speed, search) * np.cos(np.radians(search))
+        upwind = search <= 90
+        up_angle, up_vmg = table.optimal(wind_speed, upwind=True)
+        down_angle, down_vmg = table.optimal(wind_speed, upwind=False)
+
+        assert up_angle == pytest.approx(search[upwind][np.argmax(vmg[upwind])])
+        assert up_vmg == pytest.approx(vmg[upwind].max())
+        assert down_angle == pytest.approx(search[~upwind][np.argmin(vmg[~upwind])])
+        assert down_vmg == pytest.approx(-vmg[~upwind].min())
+
+
+def test_loaded_polar_uses_numeric_columns(calculator):
+    """読み込んだポーラーデータから妥当な最適角が計算されること"""
+    optimal = calculator.boat_types['laser']['upwind_optimal']
+    assert optimal
+    for angle, vmg in optimal.values():
+        assert 30 <= angle <= 60
+        assert vmg > 1.0
+    for angle, vmg in calculator.boat_types['laser']['downwind_optimal'].values():
+        assert 120 <= angle <= 180
+
+
+def test_batch_matches_scalar(calculator):
+    """一括計算の結果が地点ごとの計算と一致すること"""
+    rng = np.random.default_rng(1)
+    points = np.column_stack([rng.uniform(35.59, 35.71, 60), rng.uniform(139.59, 139.71, 60)])
+    target = (35.65, 139.65)
+
+    batch = calculator.batch_calculate_optimal_vmg('laser', points, *target)
+    assert len(batch) == len(points)
+    for (lat, lon), result in zip(points, batch):
+        expected = calculator.calculate_optimal_vmg('laser', lat, lon, *target)
+        if expected is None:
+            assert result is None
+            continue
+        for key in ['is_upwind', 'is_direct', 'tack_needed']:
+            assert result[key] == expected[key]
+        for key in ['optimal_course', 'boat_speed', 'vmg']:
+            assert result[key] == pytest.approx(expected[key], abs=1e-6)
+        assert result['distance_meters'] == pytest.approx(expected['distance_meters'], rel=1e-6)
+        assert result['wind_info'] == pytest.approx(expected['wind_info'])
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Test module: sailing_data_processor.project.container_store
+Test target: columnar container backends and ProjectStorage integration
+"""
+
+import json
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.data_model.container import GPSDataContainer
+from sailing_data_processor.project.project_storage import ProjectStorage
+from sailing_data_processor.project.container_store import (
+    JSONContainerStore, create_container_store, container_store_for_file, PYARROW_AVAILABLE
+)
+
+requires_pyarrow = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow is not installed")
+
+
+class TestContainerStore:
+    """
+    Test for container backends
+    """
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory for testing"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def container(self):
+        """Create sample GPS data container"""
+        n = 100
+        df = pd.DataFrame({
+            'timestamp': pd.date_range('2024-06-01 10:00:00', periods=n, freq='s'),
+            'latitude': 35.6 + np.linspace(0, 0.01, n),
+            'longitude': 139.7 + np.linspace(0, 0.01, n),
+            'speed': np.linspace(4.0, 6.0, n),
+            'course': np.linspace(0.0, 90.0, n),
+            'heel': np.linspace(5.0, 15.0, n),
+        })
+        return GPSDataContainer(df, {'boat_name': 'テスト艇', 'source': 'unit-test'})
+
+    @requires_pyarrow
+    @pytest.mark.parametrize('backend', ['parquet', 'arrow'])
+    def test_columnar_roundtrip(self, temp_dir, container, backend):
+        """Test for saving and loading columnar containers with a metadata sidecar"""
+        store = create_container_store(backend)
+        data_file = store.data_file(temp_dir, 'session')
+        store.save(container, data_file)
+
+        assert data_file.suffix == f".{backend}"
+        sidecar = json.loads(store.sidecar_file(data_file).read_text(encoding='utf-8'))
+        assert sidecar['metadata']['boat_name'] == 'テスト艇'
+        assert sidecar['row_count'] == 100
+
+        loaded = container_store_for_file(data_file).load(data_file)
+        pd.testing.assert_frame_equal(loaded.data, container.data)
+        assert loaded.metadata['source'] == 'unit-test'
+
+    @requires_pyarrow
+    @pytest.mark.parametrize('backend', ['parquet', 'arrow', 'json'])
+    def test_column_projection(self, temp_dir, container, backend):
+        """Test for loading only the requested columns"""
+        store = create_container_store(backend)
+        data_file = store.data_file(temp_dir, 'session')
+        store.save(container, data_file)
+
+        loaded = store.load(data_file, columns=['speed', 'unknown'])
+        assert list(loaded.data.columns) == ['timestamp', 'latitude', 'longitude', 'speed']
+
+    def test_json_store_serializes_timestamps(self, temp_dir, container):
+        """Test for the JSON backend handling timestamp columns"""
+        store = JSONContainerStore()
+        data_file = store.data_file(temp_dir, 'session')
+        store.save(container, data_file)
+
+        loaded = store.load(data_file)
+        assert pd.api.types.is_datetime64_any_dtype(loaded.data['timestamp'])
+        assert len(loaded.data) == 100
+
+    @requires_pyarrow
+    def test_project_storage_migrates_json(self, temp_dir, container):
+        """Test for transparent migration of JSON sessions to the columnar backend"""
+        legacy_storage = ProjectStorage(temp_dir, container_backend='json')
+        session = legacy_storage.create_session("Legacy Session")
+        assert legacy_storage.save_container(container, session.session_id)
+        json_file = Path(legacy_storage.get_session(session.session_id).data_file)
+        assert json_file.suffix == '.json'
+
+        storage = ProjectStorage(temp_dir)
+        loaded = storage.load_container(session.session_id, columns=['speed'])
+        assert list(loaded.data.columns) == ['timestamp', 'latitude', 'longitude', 'speed']
+
+        migrated_file = Path(storage.get_session(session.session_id).data_file)
+        assert migrated_file.suffix == '.parquet'
+        assert migrated_file.exists()
+        assert not json_file.exists()
+
+        # 移行後は全カラムを保持している
+        full = storage.load_container(session.session_id)
+        assert 'heel' in full.data.columns
+
+        assert storage.delete_session(session.session_id, delete_data=True)
+        assert not migrated_file.exists()
+        assert not storage.container_store.sidecar_file(migrated_file).exists()
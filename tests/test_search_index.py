@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+転置インデックスによる検索（search.search_index）のテスト
+"""
+import pytest
+
+from sailing_data_processor.search.search_index import SearchIndex, tokenize_text
+from sailing_data_processor.search.search_engine import SearchEngine
+from sailing_data_processor.project.project_storage import ProjectStorage
+from sailing_data_processor.project.project_manager import ProjectManager
+from sailing_data_processor.session.session_manager import SessionManager
+
+
+def _ids(hits):
+    return {hit['id'] for hit in hits}
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add('session', 's1', {'name': 'Tokyo Bay Race', 'description': 'Windy afternoon'},
+              tags=['race', 'tokyo'], date='2024-05-01T10:00:00', attributes={'category': 'race'})
+    index.add('session', 's2', {'name': 'Practice', 'description': 'Tokyo light wind drills'},
+              tags=['practice'], date='2024-06-01T10:00:00', attributes={'category': 'training'})
+    index.add('session', 's3', {'name': '江の島 練習', 'description': '風向シフトの分析'},
+              tags=['practice', 'enoshima'], date='2024-07-01T10:00:00', attributes={'category': 'training'})
+    return index
+
+
+def test_tokenize_cjk_and_latin():
+    """英数字は単語、日本語はn-gramでトークン化されること"""
+    tokens = tokenize_text('Tokyo 風向シフト')
+    assert 'tokyo' in tokens
+    assert '風向' in tokens and '風' in tokens
+    assert tokenize_text('風向', for_query=True) == ['風向']
+
+
+def test_ranking_and_matched_fields(index):
+    """名前での一致が説明での一致より上位になること"""
+    hits = index.search('tokyo', kind='session')
+    assert [hit['id'] for hit in hits] == ['s1', 's2']
+    assert hits[0]['matched_in']['name'] and not hits[0]['matched_in']['description']
+    assert hits[1]['matched_in']['description']
+
+
+def test_prefix_and_cjk_query(index):
+    """前方一致と日本語のクエリで検索できること"""
+    assert _ids(index.search('wind')) == {'s1', 's2'}
+    assert _ids(index.search('wind', prefix=False)) == {'s2'}
+    assert _ids(index.search('シフト')) == {'s3'}
+
+
+def test_filters(index):
+    """タグ・日付範囲・属性のフィルタがクエリと組み合わせられること"""
+    assert _ids(index.search(tags=['practice'])) == {'s2', 's3'}
+    assert _ids(index.search(tags=['race', 'enoshima'], match_all_tags=False)) == {'s1', 's3'}
+    assert _ids(index.search(date_range={'start': '2024-05-15', 'end': '2024-06-30'})) == {'s2'}
+    assert _ids(index.search('tokyo', attributes={'category': ['training']})) == {'s2'}
+    assert _ids(index.search('tokyo race', require_all_terms=True)) == {'s1'}
+
+
+def test_update_and_remove(index):
+    """再登録と削除でポスティングが更新されること"""
+    assert not index.add('session', 's1', {'name': 'Tokyo Bay Race', 'description': 'Windy afternoon'},
+                         tags=['race', 'tokyo'], date='2024-05-01T10:00:00',
+                         attributes={'category': 'race'})
+    assert index.add('session', 's1', {'name': 'Osaka Race', 'description': ''}, tags=['race'])
+    assert _ids(index.search('tokyo')) == {'s2'}
+    assert index.remove('session', 's2')
+    assert index.search('tokyo') == []
+    assert _ids(index.search(tags=['race'])) == {'s1'}
+
+
+def test_journal_replay(tmp_path, index):
+    """スナップショットとジャーナルから状態が復元されること"""
+    path = tmp_path / 'index.json'
+    persistent = SearchIndex(path)
+    persistent.add('project', 'p1', {'name': 'Alpha'}, tags=['a'])
+    persistent.save()
+    persistent.add('project', 'p2', {'name': 'Alphabet soup'})
+    persistent.remove('project', 'p1')
+
+    restored = SearchIndex(path)
+    assert restored.ids('project') == {'p2'}
+    assert _ids(restored.search('alpha')) == {'p2'}
+
+
+def test_project_storage_uses_index(tmp_path):
+    """ProjectStorageの保存・削除がインデックスに反映され、再起動後も検索できること"""
+    storage = ProjectStorage(str(tmp_path))
+    race = storage.create_session('Tokyo Race', description='Upwind legs', tags=['race'])
+    storage.create_session('Harbor Practice', description='Tokyo drills', tags=['practice'])
+
+    assert {s.session_id for s in storage.search_sessions('tokyo')} == set(storage.sessions)
+    assert [s.session_id for s in storage.search_sessions('tokyo', tags=['race'])] == [race.session_id]
+
+    race.name = 'Osaka Race'
+    storage.save_session(race)
+    assert [s.name for s in storage.search_sessions('tokyo')] == ['Harbor Practice']
+
+    reopened = ProjectStorage(str(tmp_path))
+    assert [s.name for s in reopened.search_sessions('osaka')] == ['Osaka Race']
+
+    reopened.delete_session(race.session_id)
+    assert reopened.search_sessions('osaka') == []
+
+
+def test_session_manager_searches_project_manager_index(tmp_path):
+    """ProjectManagerのインデックスが作成・更新・削除で更新され、SessionManagerの検索に使われること"""
+    project_manager = ProjectManager(str(tmp_path / "projects"))
+    race = project_manager.create_session('Tokyo Race', description='Upwind legs', tags=['race'],
+                                          metadata={'location': 'Tokyo Bay'})
+    practice = project_manager.create_session('Harbor Practice', description='Tokyo drills', tags=['practice'])
+    session_manager = SessionManager(project_manager, base_path=str(tmp_path / "session_data"))
+
+    assert project_manager.search_index.ids('session') == {race.session_id, practice.session_id}
+    assert set(session_manager.search_sessions('tokyo')) == {race.session_id, practice.session_id}
+    assert session_manager.search_sessions('tokyo', tags=['race']) == [race.session_id]
+    assert session_manager.search_sessions('tokyo', location='bay') == [race.session_id]
+
+    race.name = 'Osaka Race'
+    project_manager.update_session(race)
+    assert session_manager.search_sessions('osaka') == [race.session_id]
+
+    reopened = ProjectManager(str(tmp_path / "projects"))
+    assert reopened.search_index.ids('session') == {race.session_id, practice.session_id}
+
+    project_manager.delete_session(race.session_id)
+    assert session_manager.search_sessions('osaka') == []
+    assert project_manager.search_index.ids('session') == {practice.session_id}
+
+
+def test_search_engine_with_index(tmp_path):
+    """SearchEngineがインデックスのスコアと一致フィールドを返すこと"""
+    storage = ProjectStorage(str(tmp_path))
+    storage.create_session('Tokyo Race', description='Upwind legs')
+    storage.create_session('Practice', description='Near tokyo')
+    storage.create_session('Osaka Race', description='Downwind')
+    sessions = storage.get_sessions()
+
+    indexed = SearchEngine(index=storage.search_index).search_sessions(sessions, 'tokyo')
+    legacy = SearchEngine().search_sessions(sessions, 'tokyo')
+
+    assert [r['session'].name for r in indexed] == [r['session'].name for r in legacy]
+    assert indexed[0]['matched_in']['name']
+    assert len(SearchEngine(index=storage.search_index).search_sessions(sessions, '')) == 3
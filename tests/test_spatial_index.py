@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+地理空間インデックス（utilities.spatial_index）のテスト
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from sailing_data_processor.utilities.spatial_index import GeoSpatialIndex, RecordSpatialIndex
+from sailing_data_processor.utilities.track_kinematics import haversine_distances
+from sailing_data_processor.wind_propagation_model import WindPropagationModel
+from sailing_data_processor.data_model.container import WindDataContainer
+from sailing_data_processor.data_model.utils import find_nearest_wind_data
+
+
+def _random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 35.6 + rng.uniform(-0.05, 0.05, n), 139.7 + rng.uniform(-0.05, 0.05, n)
+
+
+def _brute_force(lats, lons, qlat, qlon, k):
+    distances = haversine_distances(np.full(len(lats), qlat), np.full(len(lons), qlon), lats, lons)
+    order = np.argsort(distances, kind='stable')[:k]
+    return distances[order], order
+
+
+@pytest.mark.parametrize('n', [10, 500])
+def test_batched_query_matches_brute_force(n):
+    """バッチ検索の結果が総当たりのHaversine距離と一致すること"""
+    lats, lons = _random_points(n)
+    qlats, qlons = _random_points(50, seed=1)
+    index = GeoSpatialIndex(lats, lons)
+
+    distances, indices = index.query(qlats, qlons, k=3)
+    assert distances.shape == indices.shape == (50, 3)
+    for i in range(50):
+        expected_d, expected_i = _brute_force(lats, lons, qlats[i], qlons[i], 3)
+        np.testing.assert_array_equal(indices[i], expected_i)
+        np.testing.assert_allclose(distances[i], expected_d, rtol=1e-9, atol=1e-6)
+
+
+def test_incremental_insert():
+    """逐次挿入したインデックスが一括構築と同じ結果を返すこと"""
+    lats, lons = _random_points(1000)
+    incremental = GeoSpatialIndex(min_rebuild_size=16)
+    for start in range(0, 1000, 7):
+        ids = incremental.insert(lats[start:start + 7], lons[start:start + 7])
+        assert ids[0] == start
+    bulk = GeoSpatialIndex(lats, lons)
+
+    qlats, qlons = _random_points(20, seed=2)
+    np.testing.assert_array_equal(incremental.query(qlats, qlons, k=5)[1],
+                                  bulk.query(qlats, qlons, k=5)[1])
+
+
+def test_missing_positions_and_max_distance():
+    """欠損位置は結果に含まれず、最大距離を超える点は-1になること"""
+    index = GeoSpatialIndex([35.6, np.nan, 35.61], [139.7, 139.7, 139.7])
+    distances, indices = index.query([35.6], [139.7], k=3, max_distance=500)
+    assert indices[0].tolist() == [0, -1, -1]
+    assert distances[0][0] == pytest.approx(0.0)
+    assert np.isinf(distances[0][1:]).all()
+    assert index.nearest(35.612, 139.7, k=2) == [(2, pytest.approx(222.4, abs=0.5)),
+                                                  (0, pytest.approx(1334.3, abs=0.5))]
+
+
+def test_record_index_follows_list():
+    """同じリストへの追加は差分のみ、別リストは再構築されること"""
+    records = [{'latitude': 35.6, 'longitude': 139.7}, {'latitude': 35.7}]
+    record_index = RecordSpatialIndex()
+    index = record_index.sync(records)
+    records.append({'latitude': 35.65, 'longitude': 139.7})
+    assert record_index.sync(records) is index
+    assert len(index) == 3
+    assert index.nearest(35.66, 139.7)[0][0] == 2
+
+    replaced = [{'latitude': 0.0, 'longitude': 0.0}]
+    assert record_index.sync(replaced) is not index
+    assert record_index.sync(replaced).nearest(0.0, 0.0)[0][0] == 0
+
+
+def test_find_nearest_points():
+    """WindPropagationModelの近傍検索が距離付きのコピーを返すこと"""
+    lats, lons = _random_points(300)
+    points = [{'latitude': lat, 'longitude': lon, 'wind_direction': 90.0, 'wind_speed': 10.0}
+              for lat, lon in zip(lats, lons)]
+    model = WindPropagationModel()
+
+    nearest = model._find_nearest_points((35.6, 139.7), points, 3)
+    expected_d, expected_i = _brute_force(lats, lons, 35.6, 139.7, 3)
+    assert [p['latitude'] for p in nearest] == [lats[i] for i in expected_i]
+    assert [p['distance'] for p in nearest] == pytest.approx(expected_d)
+    assert 'distance' not in points[expected_i[0]]
+
+
+def test_find_nearest_wind_data():
+    """空間と時間の加重距離で最も近い風データが選ばれること"""
+    base = datetime(2024, 6, 1, 10, 0, 0)
+    lats, lons = _random_points(200, seed=3)
+    rng = np.random.default_rng(4)
+    containers = [
+        WindDataContainer({'direction': 90.0, 'speed': 10.0,
+                           'timestamp': base + timedelta(minutes=float(rng.uniform(0, 600))),
+                           'position': {'latitude': lat, 'longitude': lon}})
+        for lat, lon in zip(lats, lons)
+    ]
+    target_time = base + timedelta(hours=5)
+
+    def legacy_score(container):
+        position = container.data['position']
+        space = haversine_distances(np.array([35.6]), np.array([139.7]),
+                                    np.array([position['latitude']]),
+                                    np.array([position['longitude']]))[0] / 1000.0
+        time_diff = abs((target_time - container.timestamp).total_seconds())
+        return 0.8 * space / 100.0 + 0.2 * time_diff / 3600.0
+
+    expected = min(containers, key=legacy_score)
+    assert find_nearest_wind_data(35.6, 139.7, target_time, containers) is expected
+    assert find_nearest_wind_data(35.6, 139.7, target_time, []) is None
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+FFT相互相関による時刻オフセット推定（utilities.time_sync）のテスト
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from sailing_data_processor.utilities.time_sync import (
+    estimate_time_offset_xcorr, estimate_fleet_offsets, to_epoch_seconds
+)
+from sailing_data_processor.core_io import SailingDataIO
+
+BASE_TIME = pd.Timestamp('2024-06-01 10:00:00')
+LEG_ENDS = np.cumsum(np.random.default_rng(2).uniform(30, 120, 200))
+
+
+def _tacking_courses(seconds):
+    """不規則な長さのレグでタックを繰り返すコース（度）"""
+    leg = np.searchsorted(LEG_ENDS, seconds)
+    noise = np.random.default_rng(3).normal(0, 3, len(seconds))
+    return (np.where(leg % 2 == 0, 45.0, 315.0) + noise) % 360
+
+
+def _track(start, end, clock_error):
+    """clock_error 秒だけ時計が遅れた艇のトラック"""
+    seconds = np.arange(start, end, 1.0)
+    return pd.DataFrame({
+        'time': BASE_TIME + pd.to_timedelta(seconds - clock_error, unit='s'),
+        'course': _tacking_courses(seconds),
+    })
+
+
+def test_subsecond_offset():
+    """グリッド間隔より細かいオフセットが推定できること"""
+    reference = _track(0, 3600, 0.0)
+    other = _track(5, 3500, 37.3)
+    offset = estimate_time_offset_xcorr(reference['time'], reference['course'],
+                                        other['time'], other['course'])
+    assert offset == pytest.approx(37.3, abs=0.2)
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_offset_is_independent_of_column_unit(unit):
+    """ns以外の単位の時刻カラムでも同じオフセットが推定されること"""
+    reference = _track(0, 3600, 0.0)
+    other = _track(5, 3500, 37.0)
+    times = other['time'].astype(f'datetime64[{unit}]')
+
+    assert to_epoch_seconds(times)[0] == pytest.approx(BASE_TIME.timestamp() + 5 - 37.0)
+    offset = estimate_time_offset_xcorr(reference['time'].astype(f'datetime64[{unit}]'),
+                                        reference['course'], times, other['course'])
+    assert offset == pytest.approx(37.0, abs=0.2)
+
+
+def test_no_overlap_returns_zero():
+    """最大オフセット内で重ならない場合は0を返すこと"""
+    reference = _track(0, 600, 0.0)
+    other = _track(0, 600, 5000.0)
+    assert estimate_time_offset_xcorr(reference['time'], reference['course'],
+                                      other['time'], other['course'], max_offset=60) == 0.0
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_fleet_offsets(max_workers):
+    """フリート全体のオフセットが逐次・並列どちらでも推定できること"""
+    reference = _track(0, 3600, 0.0)
+    errors = {f'boat_{i}': err for i, err in enumerate([-150.0, -12.5, 0.0, 48.0, 200.0])}
+    tracks = {}
+    for boat_id, err in errors.items():
+        df = _track(0, 3000, err)
+        tracks[boat_id] = (df['time'], df['course'])
+
+    offsets = estimate_fleet_offsets(reference['time'], reference['course'], tracks,
+                                     max_workers=max_workers)
+    for boat_id, err in errors.items():
+        assert offsets[boat_id] == pytest.approx(err, abs=0.2)
+
+
+def test_sync_boat_data_methods():
+    """sync_boat_dataが既定のFFT方式と従来のgrid方式で同期できること"""
+    io_handler = SailingDataIO()
+    io_handler.boat_data = {
+        'reference': _track(0, 3600, 0.0),
+        'late': _track(0, 3000, 40.0),
+    }
+
+    synced = io_handler.sync_boat_data(parallel=True)
+    start_error = (synced['late']['time'].iloc[0] - BASE_TIME).total_seconds()
+    assert abs(start_error) < 0.2
+
+    synced_grid = io_handler.sync_boat_data(method='grid')
+    assert (synced_grid['late']['time'].iloc[0] - BASE_TIME).total_seconds() == pytest.approx(0.0, abs=5.0)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+トラック運動量計算エンジン（utilities.track_kinematics）のテスト
+"""
+import math
+import pytest
+import numpy as np
+import pandas as pd
+from geopy.distance import geodesic
+
+from sailing_data_processor.utilities.track_kinematics import (
+    compute_track_kinematics, haversine_distances, vincenty_distances, initial_bearings,
+    time_deltas_seconds, datetime_nanoseconds
+)
+from sailing_data_processor.utilities.gps_utils import haversine_distance, calculate_bearing
+from sailing_data_processor.core_io import SailingDataIO
+
+
+@pytest.fixture
+def sample_track():
+    """1秒間隔のランダムウォークトラック"""
+    rng = np.random.default_rng(42)
+    n = 200
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-06-01 10:00:00', periods=n, freq='1s'),
+        'latitude': 35.6 + np.cumsum(rng.normal(0, 5e-5, n)),
+        'longitude': 139.7 + np.cumsum(rng.normal(0, 5e-5, n)),
+    })
+
+
+def test_vincenty_matches_geodesic():
+    """Vincenty距離がgeopy.geodesicと1mm未満で一致すること"""
+    lat1 = np.array([35.6, 35.6, 0.0, -33.9, 60.0])
+    lon1 = np.array([139.7, 139.7, 0.0, 151.2, 10.0])
+    lat2 = np.array([35.6001, 35.6, 0.0, 51.5, 60.0])
+    lon2 = np.array([139.7001, 139.7, 1.0, -0.1, 10.0001])
+
+    result = vincenty_distances(lat1, lon1, lat2, lon2)
+    for i in range(len(lat1)):
+        expected = geodesic((lat1[i], lon1[i]), (lat2[i], lon2[i])).meters
+        assert abs(result[i] - expected) < 1e-3
+
+
+def test_vincenty_antipodal_fallback():
+    """収束しない対蹠点でもgeodesicの値が返ること"""
+    result = vincenty_distances([0.0], [0.0], [0.5], [179.7])
+    expected = geodesic((0.0, 0.0), (0.5, 179.7)).meters
+    assert abs(result[0] - expected) < 1e-3
+
+
+def test_haversine_and_bearing_match_scalar_versions():
+    """配列版がスカラー版のgps_utils関数と一致すること"""
+    lat1, lon1, lat2, lon2 = 35.6, 139.7, 35.65, 139.78
+    assert haversine_distances([lat1], [lon1], [lat2], [lon2])[0] == pytest.approx(
+        haversine_distance(lat1, lon1, lat2, lon2))
+    assert initial_bearings([lat1], [lon1], [lat2], [lon2])[0] == pytest.approx(
+        calculate_bearing(lat1, lon1, lat2, lon2))
+
+
+def test_process_data_matches_row_loop(sample_track):
+    """process_dataの結果が行ごとの従来計算と許容誤差内で一致すること"""
+    result = SailingDataIO().process_data(sample_track)
+
+    lats = sample_track['latitude'].to_numpy()
+    lons = sample_track['longitude'].to_numpy()
+    cumulative = 0.0
+    for i in range(1, len(sample_track)):
+        dist = geodesic((lats[i-1], lons[i-1]), (lats[i], lons[i])).meters
+        cumulative += dist
+        assert result.loc[i, 'speed'] == pytest.approx(dist * 1.94384, abs=1e-6)
+        assert result.loc[i, 'course'] == pytest.approx(
+            calculate_bearing(lats[i-1], lons[i-1], lats[i], lons[i]), abs=1e-9)
+        assert result.loc[i, 'distance'] == pytest.approx(cumulative, abs=1e-3)
+
+    # 先頭点は2点目の値で補完される
+    assert result.loc[0, 'speed'] == result.loc[1, 'speed']
+    assert result.loc[0, 'course'] == result.loc[1, 'course']
+    assert result.loc[0, 'distance'] == 0.0
+
+
+def test_haversine_method_within_tolerance(sample_track):
+    """haversine方式の累積距離がvincenty方式と0.5%以内で一致すること"""
+    io_handler = SailingDataIO()
+    vincenty = io_handler.process_data(sample_track, distance_method='vincenty')
+    haversine = io_handler.process_data(sample_track, distance_method='haversine')
+    assert haversine['distance'].iloc[-1] == pytest.approx(vincenty['distance'].iloc[-1], rel=5e-3)
+
+
+def test_zero_time_diff_and_short_tracks():
+    """時間差0の区間は速度0、1点だけのトラックは全て0になること"""
+    times = pd.to_datetime(['2024-06-01 10:00:00', '2024-06-01 10:00:00', '2024-06-01 10:00:01'])
+    result = compute_track_kinematics([35.6, 35.6001, 35.6002], [139.7, 139.7, 139.7], times)
+    assert result['speed'][1] == 0.0
+    assert result['speed'][2] > 0.0
+    assert result['distance'][2] == pytest.approx(result['segment_distance'][1:].sum())
+
+    single = compute_track_kinematics([35.6], [139.7], times[:1])
+    assert single['speed'][0] == 0.0
+    assert single['distance'][0] == 0.0
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_time_deltas_are_independent_of_column_unit(sample_track, unit):
+    """ns以外の単位のタイムスタンプカラムでも時間差・速度が秒単位で計算されること"""
+    track = sample_track.copy()
+    track['timestamp'] = track['timestamp'].astype(f'datetime64[{unit}]')
+    expected = SailingDataIO().process_data(sample_track)
+
+    assert time_deltas_seconds(track['timestamp'])[:3].tolist() == [1.0, 1.0, 1.0]
+    result = SailingDataIO().process_data(track)
+    np.testing.assert_allclose(result['speed'], expected['speed'])
+
+
+def test_datetime_nanoseconds_accepts_scalars_and_time_zones():
+    """スカラー・文字列・タイムゾーン付きの時刻もUTC基準のナノ秒に変換されること"""
+    expected = pd.Timestamp('2024-06-01 10:00:00').value
+
+    assert datetime_nanoseconds(pd.Timestamp('2024-06-01 10:00:00'))[0].tolist() == [expected]
+    assert datetime_nanoseconds('2024-06-01 10:00:00')[0].tolist() == [expected]
+    assert datetime_nanoseconds([pd.Timestamp('2024-06-01 19:00:00', tz='Asia/Tokyo')])[0].tolist() == [expected]
+
+    times, missing = datetime_nanoseconds(pd.Series(['2024-06-01 10:00:00', None], dtype='datetime64[s]'))
+    assert times[0] == expected
+    assert missing.tolist() == [False, True]
+
+
+def test_invalid_method():
+    """未対応の距離計算方式はValueErrorになること"""
+    with pytest.raises(ValueError):
+        compute_track_kinematics([35.6, 35.7], [139.7, 139.7], [0.0, 1.0], method='flat')
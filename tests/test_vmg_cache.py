@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+最適VMG計算結果キャッシュ（optimal_vmg_calculator.VMGCache）のテスト
+"""
+import pytest
+import numpy as np
+
+from sailing_data_processor import optimal_vmg_calculator
+from sailing_data_processor.optimal_vmg_calculator import OptimalVMGCalculator, VMGCache
+
+
+def _wind_field(direction=0.0):
+    lats, lons = np.meshgrid(np.linspace(35.60, 35.70, 21), np.linspace(139.60, 139.70, 21))
+    return {
+        'lat_grid': lats,
+        'lon_grid': lons,
+        'wind_direction': np.full(lats.shape, direction),
+        'wind_speed': np.full(lats.shape, 12.0),
+        'confidence': np.full(lats.shape, 0.8)
+    }
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    """上限超過で最も古いエントリが削除され、TTL切れのエントリは破棄されること"""
+    now = [0.0]
+    monkeypatch.setattr(optimal_vmg_calculator.time, 'monotonic', lambda: now[0])
+    cache = VMGCache(max_entries=2, ttl=10.0)
+    cache.put(('a', 1), 1)
+    cache.put(('a', 2), 2)
+    assert cache.get(('a', 1)) == 1
+    cache.put(('b', 3), 3)
+
+    assert ('a', 2) not in cache
+    assert cache.evictions == 1
+
+    now[0] = 11.0
+    assert cache.get(('a', 1)) is None
+    assert cache.expirations == 1
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+
+
+def test_quantized_keys_and_invalidation():
+    """近接した位置はキャッシュを共有し、風の場の更新で無効化されること"""
+    calculator = OptimalVMGCalculator()
+    calculator.set_wind_field(_wind_field())
+
+    first = calculator.calculate_optimal_vmg('laser', 35.62, 139.65, 35.68, 139.65)
+    nearby = calculator.calculate_optimal_vmg('laser', 35.62001, 139.65, 35.68, 139.65)
+    stats = calculator.get_calculation_quality_report()['general_quality']['vmg_cache']
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert nearby['optimal_course'] == first['optimal_course']
+    assert nearby['distance_meters'] == pytest.approx(first['distance_meters'] - 1.1, abs=0.1)
+
+    calculator.set_wind_field(_wind_field(direction=180.0))
+    assert len(calculator.vmg_cache) == 0
+    shifted = calculator.calculate_optimal_vmg('laser', 35.62, 139.65, 35.68, 139.65)
+    assert first['is_direct'] and not shifted['is_direct']
+
+    calculator.update_config(cache_max_entries=1)
+    calculator.calculate_optimal_vmg('laser', 35.64, 139.65, 35.68, 139.65)
+    report = calculator.get_calculation_quality_report()['general_quality']
+    assert report['vmg_cache_size'] == 1
+    assert report['vmg_cache']['evictions'] == 1
+    assert report['vmg_cache']['invalidations'] == 1
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+WindEstimatorImproved の移動ウィンドウ推定（時間変化する風）のテスト
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.wind_estimator_improved import WindEstimatorImproved
+
+
+def _true_wind(seconds):
+    """1時間周期で±15度振れる風向（0度をまたぐ）"""
+    return np.mod(5.0 + 15.0 * np.sin(2 * np.pi * seconds / 3600.0), 360)
+
+
+def _tacking_track(hours=4.0, tack_interval=60, seed=0):
+    """風の振れに合わせて風上を左右にタックする1Hzの航跡"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(hours * 3600))
+    wind = _true_wind(t)
+
+    # 3秒で反対のタックへ旋回し、旋回後しばらくは減速する
+    side = np.where((t // tack_interval) % 2 == 0, 1.0, -1.0)
+    progress = np.clip((t % tack_interval) / 3.0, 0.0, 1.0)
+    course = np.mod(wind + 45.0 * side * (2 * progress - 1) + rng.normal(0, 1.5, len(t)), 360)
+    speed = np.where(t % tack_interval < 8, 3.5, 5.0) + rng.normal(0, 0.1, len(t))
+
+    north = np.cumsum(speed * np.cos(np.radians(course))) / 111000.0
+    east = np.cumsum(speed * np.sin(np.radians(course))) / (111000.0 * np.cos(np.radians(35.0)))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-04-01 10:00:00', periods=len(t), freq='s'),
+        'latitude': 35.0 + north,
+        'longitude': 139.5 + east,
+        'course': course,
+        'speed': speed,
+    })
+
+
+def test_rolling_estimate_tracks_oscillating_wind():
+    """移動ウィンドウの推定が風向の振れに追従すること"""
+    data = _tacking_track()
+    estimator = WindEstimatorImproved()
+
+    result = estimator.estimate_wind_time_series(data, window_seconds=600, step_seconds=60)
+
+    assert list(result.columns) == ['timestamp', 'latitude', 'longitude', 'wind_direction',
+                                    'wind_speed', 'confidence', 'maneuver_count', 'method']
+    assert len(result) == 4 * 60
+
+    seconds = (result['timestamp'] - data['timestamp'].iloc[0]).dt.total_seconds().to_numpy()
+    error = np.mod(result['wind_direction'].to_numpy() - _true_wind(seconds) + 180, 360) - 180
+    interior = (seconds >= 300) & (seconds <= seconds[-1] - 300)
+
+    assert (result['method'] == 'rolling_maneuver_analysis').all()
+    assert np.abs(error[interior]).max() < 8.0
+    assert result['confidence'].between(0.0, 1.0).all()
+    assert result['confidence'].min() > 0.3
+
+    # 一定値ではなく風の振れ（約30度）を再現している
+    unwrapped = np.mod(result['wind_direction'].to_numpy() + 180, 360) - 180
+    assert unwrapped.max() - unwrapped.min() > 20.0
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us'])
+def test_rolling_estimate_is_independent_of_timestamp_unit(unit):
+    """ns以外の単位の時刻列でもウィンドウの中心時刻と推定値が変わらないこと"""
+    data = _tacking_track(hours=1.0)
+    cast = data.assign(timestamp=data['timestamp'].astype(f'datetime64[{unit}]'))
+    estimator = WindEstimatorImproved()
+
+    expected = estimator.estimate_wind_time_series(data, window_seconds=600, step_seconds=60)
+    result = estimator.estimate_wind_time_series(cast, window_seconds=600, step_seconds=60)
+
+    assert len(result) == len(expected) == 60
+    assert list(result['timestamp']) == list(expected['timestamp'])
+    np.testing.assert_allclose(result['wind_direction'], expected['wind_direction'])
+    assert list(result['maneuver_count']) == list(expected['maneuver_count'])
+
+
+def test_windows_without_maneuvers_are_interpolated():
+    """マニューバーのない区間は前後から補間し、信頼度を0にすること"""
+    data = _tacking_track(hours=1.0)
+    # 20〜40分は同じタックのまま直進する
+    straight = (data.index >= 1200) & (data.index < 2400)
+    data.loc[straight, 'course'] = np.mod(_true_wind(data.index[straight].to_numpy()) - 45.0, 360)
+
+    result = WindEstimatorImproved().estimate_wind_time_series(data, window_seconds=300, step_seconds=60)
+    gap = result[result['method'] == 'interpolation']
+
+    assert len(gap) > 0
+    assert (gap['confidence'] == 0.0).all()
+    assert gap['wind_direction'].notna().all()
+    assert (result.loc[result['method'] == 'rolling_maneuver_analysis', 'confidence'] > 0).all()
+
+
+def test_full_day_rolling_estimate_runs_quickly():
+    """1Hzで1日分の航跡を短時間で処理できること"""
+    data = _tacking_track(hours=24.0, tack_interval=120, seed=3)
+
+    start = time.perf_counter()
+    result = WindEstimatorImproved().estimate_wind_time_series(data)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == 24 * 60
+    assert result['maneuver_count'].max() >= 2
+    assert elapsed < 20.0
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+WindFieldInterpolator の時刻インデックスとリサンプリングキャッシュのテスト
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator
+
+from sailing_data_processor.wind_field_interpolator import WindFieldInterpolator
+
+BASE_TIME = datetime(2024, 6, 1, 10, 0, 0)
+
+
+def _field(minutes, size=12, seed=0):
+    rng = np.random.default_rng(seed)
+    lats, lons = np.meshgrid(np.linspace(35.60, 35.70, size), np.linspace(139.60, 139.70, size))
+    return {
+        'time': BASE_TIME + timedelta(minutes=minutes),
+        'lat_grid': lats,
+        'lon_grid': lons,
+        'wind_direction': rng.uniform(0, 360, lats.shape),
+        'wind_speed': rng.uniform(5, 15, lats.shape),
+        'confidence': rng.uniform(0.5, 1.0, lats.shape)
+    }
+
+
+@pytest.fixture
+def interpolator():
+    interpolator = WindFieldInterpolator()
+    interpolator.interp_method = 'idw'
+    for i, minutes in enumerate([30, 0, 20, 10]):
+        interpolator.add_wind_field(_field(minutes, seed=i))
+    return interpolator
+
+
+def test_sorted_time_index(interpolator):
+    """時刻インデックスが昇順で、近い時刻の検索が総当たりと一致すること"""
+    times = list(interpolator.wind_field_data.keys())
+    assert times == sorted(times)
+
+    for offset in [-5, 0, 4, 5, 14, 26, 45]:
+        target = BASE_TIME + timedelta(minutes=offset)
+        expected = sorted(times, key=lambda t: (abs((t - target).total_seconds()), t))[:2]
+        assert interpolator._nearest_times(target, 2) == expected
+
+
+def test_resample_matches_scipy_interpolators():
+    """キャッシュした重みによるリサンプリングがLinearNDInterpolatorと一致すること"""
+    rng = np.random.default_rng(3)
+    field = {
+        'time': BASE_TIME,
+        'lat_grid': rng.uniform(35.6, 35.7, (6, 6)),
+        'lon_grid': rng.uniform(139.6, 139.7, (6, 6)),
+        'wind_direction': rng.uniform(0, 360, (6, 6)),
+        'wind_speed': rng.uniform(5, 15, (6, 6))
+    }
+    resampled = WindFieldInterpolator()._resample_wind_field(field, 15)
+
+    points = np.column_stack([field['lat_grid'].ravel(), field['lon_grid'].ravel()])
+    xi = np.column_stack([resampled['lat_grid'].ravel(), resampled['lon_grid'].ravel()])
+    expected = LinearNDInterpolator(points, field['wind_speed'].ravel())(xi)
+    outside = np.isnan(expected)
+    expected[outside] = NearestNDInterpolator(points, field['wind_speed'].ravel())(xi[outside])
+    np.testing.assert_allclose(resampled['wind_speed'].ravel(), expected, atol=1e-9)
+
+
+def test_animation_reuses_resampled_fields(interpolator, monkeypatch):
+    """アニメーションの各フレームで前後の風の場のリサンプリングを再利用すること"""
+    calls = []
+    original = interpolator._resample_wind_field
+    monkeypatch.setattr(interpolator, '_resample_wind_field',
+                        lambda *args, **kwargs: calls.append(args[1]) or original(*args, **kwargs))
+
+    frames = interpolator.create_wind_field_animation(BASE_TIME, BASE_TIME + timedelta(minutes=10),
+                                                      time_steps=100, resolution=20)
+    assert len(frames) == 100
+    assert len(calls) == 2
+    assert frames[0]['wind_direction'].shape == (20, 20)
+
+    # 返された風の場を変更してもキャッシュには影響しない
+    frames[0]['wind_speed'][:] = -1
+    again = interpolator.interpolate_wind_field(BASE_TIME, resolution=20)
+    assert (again['wind_speed'] >= 0).all()
+
+
+def test_replacing_field_invalidates_cache(interpolator):
+    """同じ時刻の風の場を置き換えるとリサンプリング結果が更新されること"""
+    before = interpolator.interpolate_wind_field(BASE_TIME, resolution=20)
+    interpolator.add_wind_field(_field(0, seed=99))
+    after = interpolator.interpolate_wind_field(BASE_TIME, resolution=20)
+    assert not np.allclose(before['wind_speed'], after['wind_speed'])
+    assert len(interpolator.wind_field_data) == 4
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+WindFieldFusionSystem.append_observations（ストリーミング融合）のテスト
+"""
+import copy
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from sailing_data_processor.wind_observation_buffer import WindObservationBuffer
+from sailing_data_processor.wind_field_fusion_system import WindFieldFusionSystem
+
+
+BASE = pd.Timestamp('2024-06-01 10:00:00')
+
+
+def _ticks(count, boats=20, seed=0):
+    """1Hzで全艇分を1つのデータフレームにまとめたティックを生成"""
+    rng = np.random.default_rng(seed)
+    positions = np.column_stack([35.6 + 0.01 * rng.random(boats), 139.7 + 0.01 * rng.random(boats)])
+    for t in range(count):
+        positions += rng.normal(0, 2e-5, positions.shape)
+        yield pd.DataFrame({
+            'timestamp': [BASE + timedelta(seconds=t)] * boats,
+            'latitude': positions[:, 0],
+            'longitude': positions[:, 1],
+            'wind_direction': 90 + rng.normal(0, 5, boats) + t * 0.05,
+            'wind_speed_knots': 12 + rng.normal(0, 1, boats),
+            'boat_id': [f'boat{b}' for b in range(boats)]
+        })
+
+
+def test_discard_before_keeps_sequence_numbers():
+    """時間窓外のデータの削除で残りの通し番号が変わらないこと"""
+    buffer = WindObservationBuffer()
+    times = [BASE + timedelta(seconds=s) for s in range(10)]
+    buffer.extend(times, np.arange(10.0), np.zeros(10), 90.0, 5.0)
+
+    assert buffer.discard_before(BASE + timedelta(seconds=4)) == 4
+    assert buffer.sequence_numbers().tolist() == list(range(4, 10))
+    assert buffer.columns()['latitude'][0] == 4.0
+    assert buffer.next_sequence == 10
+
+    # 時刻順でないデータは詰め直される
+    buffer.extend([BASE], [99.0], [0.0], 90.0, 5.0)
+    assert buffer.discard_before(BASE + timedelta(seconds=8)) == 5
+    assert buffer.columns()['latitude'].tolist() == [8.0, 9.0]
+
+
+def test_streaming_window_and_history():
+    """既存データを保持したまま追加し、時間窓を外れたデータが削除されること"""
+    fusion = WindFieldFusionSystem()
+    for tick in _ticks(120, boats=5):
+        field = fusion.append_observations(tick, window_seconds=60)
+
+    assert len(fusion.observations) == 5 * 61
+    assert fusion.observations.latest_time() == BASE + timedelta(seconds=119)
+    assert fusion.current_wind_field is field
+    assert field['time'] == BASE + timedelta(seconds=119)
+    assert len(fusion.wind_field_history) == fusion.max_history_size
+    assert set(p['boat_id'] for p in fusion.wind_data_points) == {f'boat{b}' for b in range(5)}
+
+
+def test_incremental_field_matches_full_recompute():
+    """差分更新した風の場が全セルを再計算した結果と一致し、一部のセルだけ再計算されること"""
+    fusion = WindFieldFusionSystem()
+    recomputed = []
+    for tick in _ticks(300):
+        field = fusion.append_observations(tick, window_seconds=120)
+        recomputed.append(fusion.stream_field.last_recomputed)
+
+    rows = fusion.observations.sorted_order()
+    columns = fusion.observations.columns(rows)
+    sequence = fusion.observations.sequence_numbers(rows)
+    full = copy.deepcopy(fusion.stream_field).update(
+        sequence, columns['latitude'], columns['longitude'], columns['wind_direction'],
+        columns['wind_speed'], columns['confidence'], min_sequence=int(sequence.min()),
+        new_from=fusion.observations.next_sequence, timestamp=field['time'], recompute_all=True)
+
+    np.testing.assert_allclose(field['wind_speed'], full['wind_speed'], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(field['wind_direction'], full['wind_direction'], rtol=0, atol=1e-9)
+    assert np.mean(recomputed[-100:]) < field['wind_speed'].size
+
+
+def test_each_tick_evaluates_predictions():
+    """各ティックで追加されたデータにより保留中の予測が評価されること"""
+    fusion = WindFieldFusionSystem()
+    ticks = list(_ticks(91, boats=4))
+    fusion.append_observations(ticks[0])
+
+    # 予測の対象時刻は90秒後（±60秒以内のデータが来るまで評価されない）
+    target = ticks[90].iloc[1]
+    fusion.previous_predictions['p'] = {
+        'prediction_time': BASE,
+        'target_time': target['timestamp'],
+        'position': (target['latitude'] + 1e-4, target['longitude']),
+        'prediction': {'wind_direction': 90.0, 'wind_speed': 6.0, 'confidence': 0.8}
+    }
+    for tick in ticks[1:31]:
+        fusion.append_observations(tick)
+    assert 'p' in fusion.previous_predictions
+
+    fusion.append_observations(ticks[31])
+    assert 'p' not in fusion.previous_predictions
+    assert len(fusion.prediction_evaluator.evaluation_history) == 1
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+風の観測データの列指向バッファ（wind_observation_buffer）と
+WindFieldFusionSystemの配列による取り込みのテスト
+"""
+import sys
+import time
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from sailing_data_processor.wind_observation_buffer import WindObservationBuffer
+from sailing_data_processor.wind_field_fusion_system import WindFieldFusionSystem
+from sailing_data_processor.wind_field_fusion_utils import (
+    create_simple_wind_field, idw_wind_field_from_arrays, scale_coordinate_arrays, scale_data_points
+)
+
+
+def _race(boats=20, seconds=600, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-06-01 10:00:00', periods=seconds, freq='1s')
+    data = {}
+    for b in range(boats):
+        data[f'boat{b}'] = pd.DataFrame({
+            'timestamp': times,
+            'latitude': 35.6 + 0.01 * rng.random() + np.cumsum(rng.normal(0, 1e-5, seconds)),
+            'longitude': 139.7 + 0.01 * rng.random() + np.cumsum(rng.normal(0, 1e-5, seconds)),
+            'wind_direction': 90 + rng.normal(0, 5, seconds),
+            'wind_speed_knots': 12 + rng.normal(0, 1, seconds),
+            'confidence': 0.9
+        })
+    return data
+
+
+def test_ring_buffer_overwrites_oldest():
+    """容量を超えると古い観測から上書きされ、挿入順が保たれること"""
+    buffer = WindObservationBuffer(capacity=5, initial_size=2)
+    base = datetime(2024, 6, 1, 10, 0, 0)
+    for i in range(8):
+        buffer.extend([base + timedelta(seconds=i)], i, 139.7, 90.0, 5.0, boat_ids='a')
+
+    assert len(buffer) == 5
+    assert buffer.dropped == 3
+    assert buffer.columns()['latitude'].tolist() == [3, 4, 5, 6, 7]
+    assert buffer.latest_time() == base + timedelta(seconds=7)
+
+
+def test_window_and_unsorted_input():
+    """時刻順でない追加でも時間窓が時刻順の行番号で返ること"""
+    buffer = WindObservationBuffer()
+    base = datetime(2024, 6, 1, 10, 0, 0)
+    offsets = [0, 3000, 1000, 2900, 2000]
+    buffer.extend([base + timedelta(seconds=s) for s in offsets],
+                  np.arange(5.0), np.zeros(5), np.full(5, 90.0), np.full(5, 5.0))
+
+    rows = buffer.window(1800)
+    assert rows.tolist() == [4, 3, 1]
+    assert buffer.latest_time() == base + timedelta(seconds=3000)
+
+    buffer.keep_latest(2)
+    assert buffer.columns()['latitude'].tolist() == [3.0, 1.0]
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_non_nanosecond_timestamps(unit):
+    """ns以外の単位の時刻列でも時刻と時間窓が正しく扱われること"""
+    times = pd.Series(pd.to_datetime(['2024-06-01 10:00:00', '2024-06-01 10:00:10'])).astype(f'datetime64[{unit}]')
+    buffer = WindObservationBuffer()
+    buffer.extend(times, [35.6, 35.61], [139.7, 139.7], 90.0, 5.0)
+
+    assert buffer.latest_time() == pd.Timestamp('2024-06-01 10:00:10')
+    assert buffer.to_timestamps(buffer.columns()['time']).tolist() == list(pd.DatetimeIndex(times))
+    assert buffer.window(5).tolist() == [1]
+
+
+def test_records_round_trip():
+    """レコードの追加と復元で値・任意のキー・タイムゾーンが保たれること"""
+    buffer = WindObservationBuffer()
+    stamp = pd.Timestamp('2024-06-01 10:00:00', tz='Asia/Tokyo')
+    records = [
+        {'timestamp': stamp, 'latitude': 35.6, 'longitude': 139.7, 'wind_direction': 90.0,
+         'wind_speed': 5.0, 'confidence': 0.7, 'boat_id': 'a', 'source': 'mast'},
+        {'timestamp': stamp + timedelta(seconds=1), 'latitude': 35.61, 'longitude': 139.71,
+         'wind_direction': 95.0, 'wind_speed': 5.5}
+    ]
+    buffer.extend_records(records)
+    assert buffer.to_records() == records
+    assert buffer.to_records()[0]['timestamp'].tz is not None
+
+
+def test_spatial_index_follows_buffer():
+    """空間インデックスが追加分を反映し、上書き後は再構築されること"""
+    buffer = WindObservationBuffer(capacity=4)
+    base = datetime(2024, 6, 1, 10, 0, 0)
+    buffer.extend([base] * 3, [35.60, 35.61, 35.62], [139.7] * 3, 90.0, 5.0)
+    assert buffer.spatial_index().nearest(35.611, 139.7)[0][0] == 1
+
+    buffer.extend([base] * 2, [35.63, 35.64], [139.7] * 2, 90.0, 5.0)
+    index = buffer.spatial_index()
+    assert len(index) == 4
+    # 先頭（35.60）は上書きされ、挿入順の行番号で返る
+    assert index.nearest(35.601, 139.7)[0][0] == 0
+    assert buffer.columns()['latitude'][0] == 35.61
+
+
+def test_update_with_boat_data_matches_rows():
+    """データフレームの列単位の取り込みが行ごとの変換と同じ値になること"""
+    boats = _race(boats=3, seconds=20)
+    fusion = WindFieldFusionSystem()
+    fusion.update_with_boat_data(boats)
+
+    points = fusion.wind_data_points
+    assert len(points) == 60
+    first = boats['boat0'].iloc[0]
+    assert points[0]['timestamp'] == first['timestamp']
+    assert points[0]['wind_speed'] == pytest.approx(first['wind_speed_knots'] * 0.51444)
+    assert points[0]['boat_id'] == 'boat0' and points[0]['confidence'] == 0.9
+    assert points[-1]['boat_id'] == 'boat2'
+
+    distances, indices = fusion.find_nearest_wind_points([points[5]['latitude']], [points[5]['longitude']], k=1)
+    assert indices[0][0] == 5
+
+
+def test_wind_data_points_rejects_in_place_mutation():
+    """wind_data_points は読み取り専用で、置き換えは代入で行うこと"""
+    fusion = WindFieldFusionSystem()
+    fusion.update_with_boat_data(_race(boats=1, seconds=5))
+    point = dict(fusion.wind_data_points[0])
+
+    with pytest.raises(AttributeError):
+        fusion.wind_data_points.append(point)
+    assert len(fusion.wind_data_points) == 5
+
+    fusion.wind_data_points = [point]
+    assert fusion.wind_data_points == (point,)
+
+
+def test_scaling_arrays_match_records():
+    """配列版のスケーリングと辞書版のスケーリングが同じ値になること"""
+    points = [{'latitude': 35.6 + i * 1e-4, 'longitude': 139.7, 'wind_speed': 5.0 + i * 0.1,
+               'wind_direction': 90.0} for i in range(10)]
+    scaled = scale_coordinate_arrays([p['latitude'] for p in points], [p['longitude'] for p in points],
+                                     [p['wind_speed'] for p in points])
+    records = scale_data_points(points)
+    assert [r['scaled_latitude'] for r in records] == pytest.approx(scaled['scaled_latitude'].tolist())
+    assert [r['original_latitude'] for r in records] == [p['latitude'] for p in points]
+
+
+def test_idw_field_honours_observations():
+    """IDWの風の場が観測の値の範囲に収まり、観測点の近くでその値に近づくこと"""
+    lats = np.array([35.60, 35.60, 35.62, 35.62])
+    lons = np.array([139.70, 139.72, 139.70, 139.72])
+    directions = np.array([80.0, 100.0, 80.0, 100.0])
+    speeds = np.array([4.0, 6.0, 4.0, 6.0])
+    field = idw_wind_field_from_arrays(lats, lons, directions, speeds, np.full(4, np.nan), 11,
+                                       datetime(2024, 6, 1))
+
+    assert field['wind_speed'].min() >= 4.0 - 1e-9 and field['wind_speed'].max() <= 6.0 + 1e-9
+    assert field['lat_grid'].min() == pytest.approx(35.60)
+    corner = np.argmin(np.hypot(field['lat_grid'] - 35.60, field['lon_grid'] - 139.70))
+    assert field['wind_direction'].ravel()[corner] == pytest.approx(80.0)
+    assert np.allclose(field['confidence'], 0.8)
+
+    simple = create_simple_wind_field([{'latitude': 35.6, 'longitude': 139.7, 'wind_direction': 350.0,
+                                        'wind_speed': 4.0},
+                                       {'latitude': 35.6, 'longitude': 139.7, 'wind_direction': 10.0,
+                                        'wind_speed': 6.0}], 5, datetime(2024, 6, 1))
+    assert abs(((simple['wind_direction'][0, 0] + 180) % 360) - 180) < 1e-9
+    assert simple['wind_speed'][0, 0] == pytest.approx(5.0)
+
+
+def test_large_race_fusion(monkeypatch):
+    """20艇・1Hzのレースデータを補間を含めて数秒以内に融合できること"""
+    # テスト環境向けの簡略処理を通らないようにする
+    monkeypatch.delitem(sys.modules, 'pytest', raising=False)
+    monkeypatch.delitem(sys.modules, 'unittest', raising=False)
+
+    boats = _race(boats=20, seconds=1800)
+    fusion = WindFieldFusionSystem()
+    start = time.perf_counter()
+    field = fusion.update_with_boat_data(boats)
+    elapsed = time.perf_counter() - start
+
+    assert len(fusion.observations) == 36000
+    assert elapsed < 10.0
+    assert field['wind_speed'].shape == (20, 20)
+    assert 35.59 < field['lat_grid'].min() < field['lat_grid'].max() < 35.62
+    assert np.all(np.abs(((field['wind_direction'] - 90 + 180) % 360) - 180) < 15)
+    assert field['confidence'] == pytest.approx(np.full((20, 20), 0.9))
+    assert fusion.wind_field_history[-1]['field'] is field
@@ -148,6 +148,33 @@ class TestWindPropagationModel(unittest.TestCase):
         # 信頼度は0-1の間
         self.assertGreaterEqual(prediction['confidence'], 0)
         self.assertLessEqual(prediction['confidence'], 1)
+    
+    def test_predict_future_wind_field(self):
+        """グリッド一括予測が点ごとの計算と一致し、風の場の形式で返ることをテスト"""
+        historical_data = self.standard_wind_data
+        future_time = self.base_time + timedelta(minutes=5)
+        lons, lats = np.meshgrid(np.linspace(139.68, 139.74, 6), np.linspace(35.38, 35.42, 5))
+        
+        field = self.model.predict_future_wind_field(lats, lons, future_time, historical_data)
+        
+        for key in ['lat_grid', 'lon_grid', 'wind_direction', 'wind_speed', 'confidence']:
+            self.assertEqual(field[key].shape, lats.shape)
+        self.assertEqual(field['time'], future_time)
+        
+        # 点ごとの計算（スカラー版の不確実性計算）と比較
+        source = self.model._prepare_source_wind(future_time, historical_data)
+        for i, j in [(0, 0), (2, 3), (4, 5)]:
+            distance = self.model._haversine_distance(lats[i, j], lons[i, j], *source['position'])
+            uncertainty = self.model._calculate_propagation_uncertainty(
+                distance, source['time_diff'], 1.0 - source['confidence'])
+            expected = max(0.1, min(0.9, (1.0 - uncertainty) * source['propagation_confidence']))
+            self.assertAlmostEqual(field['confidence'][i, j], expected)
+            self.assertAlmostEqual(field['wind_direction'][i, j], source['wind_direction'])
+            self.assertAlmostEqual(field['wind_speed'][i, j], source['wind_speed'])
+        
+        # データ不足の場合は低信頼度の場を返す
+        sparse = self.model.predict_future_wind_field(lats, lons, future_time, historical_data[:2])
+        self.assertTrue(np.all(sparse['confidence'] == 0.1))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+DataValidator の共有派生配列（ValidationContext）を使った検証ルールのテスト
+"""
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from geopy.distance import great_circle
+
+from sailing_data_processor.data_model.container import GPSDataContainer
+from sailing_data_processor.validation.data_validator import (
+    DataValidator, SpatialConsistencyRule, TemporalConsistencyRule
+)
+from sailing_data_processor.validation.validation_context import ValidationContext
+
+
+def _track(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(rows)
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp('2025-04-01 10:00:00') + pd.to_timedelta(t, unit='s'),
+        'latitude': 35.0 + 1e-5 * t + rng.normal(0, 1e-6, rows),
+        'longitude': 139.5 + 1e-5 * t + rng.normal(0, 1e-6, rows),
+    })
+
+
+def _reference_speeds(data):
+    """従来の点ごとの計算（geopy.great_circle）"""
+    ordered = data.sort_values('timestamp', kind='stable')
+    speeds = []
+    for i in range(1, len(ordered)):
+        prev, curr = ordered.iloc[i - 1], ordered.iloc[i]
+        distance = great_circle((prev['latitude'], prev['longitude']),
+                                (curr['latitude'], curr['longitude'])).meters
+        seconds = (curr['timestamp'] - prev['timestamp']).total_seconds()
+        speeds.append(distance / seconds / 0.514444 if seconds > 0 else float('inf'))
+    return np.array(speeds)
+
+
+def test_spatial_rule_matches_pointwise_reference():
+    """ソート前のデータでも従来の点ごとの計算と同じ異常が検出されること"""
+    data = _track(200)
+    data.loc[120, 'latitude'] += 0.01  # 約1.1kmの跳び
+    data = data.sample(frac=1.0, random_state=0)
+
+    is_valid, details = SpatialConsistencyRule(max_speed_knots=50.0).validate(data)
+    expected = _reference_speeds(data)
+
+    assert not is_valid
+    assert details['anomaly_indices'] == [120, 121]
+    assert details['anomaly_details'][0]['original_index'] == 120
+    assert details['anomaly_details'][0]['speed_knots'] == pytest.approx(expected[119], rel=1e-5)
+    assert details['max_calculated_speed'] == pytest.approx(expected.max(), rel=1e-5)
+    assert details['avg_calculated_speed'] == pytest.approx(expected.mean(), rel=1e-5)
+
+
+def test_spatial_rule_bridges_invalid_coordinates():
+    """無効な座標の点を除外し、前後の有効な点の間で速度を計算すること"""
+    data = _track(10)
+    data.loc[4, 'latitude'] = np.nan
+    data.loc[6, 'longitude'] = np.inf
+
+    context = ValidationContext(data)
+    kinematics = context.kinematics()
+
+    assert kinematics['positions'].tolist() == [0, 1, 2, 3, 5, 7, 8, 9]
+    assert kinematics['time_diff'].tolist() == [1.0, 1.0, 1.0, 2.0, 2.0, 1.0, 1.0]
+    assert kinematics['skipped'] == 2
+    assert SpatialConsistencyRule().validate_context(context)[0]
+
+
+def test_temporal_rule_reports_gaps_in_sorted_order():
+    """ソート後の時間差から大きなギャップを検出すること"""
+    data = _track(50)
+    data.loc[30:, 'timestamp'] += timedelta(minutes=10)
+    data = data.iloc[::-1]
+
+    is_valid, details = TemporalConsistencyRule(max_time_gap=timedelta(minutes=5)).validate(data)
+
+    assert not is_valid
+    assert details['gap_indices'] == [30]
+    assert details['gap_details'][0]['original_index'] == 30
+    assert details['gap_details'][0]['gap_seconds'] == pytest.approx(601.0)
+    assert details['reverse_count'] == 0
+    assert details['min_actual_gap'] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us'])
+def test_time_diffs_are_independent_of_timestamp_unit(unit):
+    """ns以外の単位の時刻列でも時間差が秒で計算されること"""
+    data = _track(20)
+    data.loc[10:, 'timestamp'] += timedelta(minutes=10)
+    data['timestamp'] = data['timestamp'].astype(f'datetime64[{unit}]')
+    context = ValidationContext(data)
+
+    expected = np.ones(19)
+    expected[9] = 601.0
+    np.testing.assert_allclose(context.time_diffs(), expected)
+    assert context.sorted_times_ns()[0][0] == pd.Timestamp('2025-04-01 10:00:00').value
+    assert SpatialConsistencyRule(max_speed_knots=50.0).validate_context(context)[0]
+
+
+def test_validator_shares_one_context_across_rules(monkeypatch):
+    """全ルールが1つのValidationContextの派生配列を共有すること"""
+    calls = []
+    original = ValidationContext.kinematics
+
+    def counting_kinematics(self, *args, **kwargs):
+        calls.append(id(self))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ValidationContext, 'kinematics', counting_kinematics)
+    validator = DataValidator([
+        SpatialConsistencyRule(max_speed_knots=100.0),
+        SpatialConsistencyRule(max_speed_knots=1.0, name="Spatial Consistency Check (strict)"),
+        TemporalConsistencyRule(),
+    ])
+    _, results = validator.validate(GPSDataContainer(data=_track(100), metadata={}))
+
+    assert [r['is_valid'] for r in results] == [True, False, True]
+    assert len(set(calls)) == 1
+
+
+def test_million_point_container_validates_quickly():
+    """100万点のコンテナをデフォルトルールで短時間に検証できること"""
+    container = GPSDataContainer(data=_track(1000000, seed=1), metadata={})
+
+    start = time.perf_counter()
+    is_valid, results = DataValidator().validate(container)
+    elapsed = time.perf_counter() - start
+
+    assert is_valid
+    assert all(r['is_valid'] for r in results)
+    assert elapsed < 5.0
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+QualityMetricsCalculator の空間・時間ビン集計（quality_binning）のテスト
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sailing_data_processor.validation.quality_binning import spatial_quality_grid, temporal_quality_bins
+from sailing_data_processor.validation.quality_metrics import QualityMetricsCalculator
+
+
+def _calculator(rows, problem_every=7, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'timestamp': pd.Timestamp('2025-04-01 10:00:00') + pd.to_timedelta(np.arange(rows), unit='s'),
+        'latitude': 35.0 + rng.uniform(0, 0.05, rows),
+        'longitude': 139.5 + rng.uniform(0, 0.05, rows),
+    })
+    problems = list(range(0, rows, problem_every))
+    validation_results = [{
+        'rule_name': 'Value Range Check',
+        'is_valid': False,
+        'severity': 'error',
+        'details': {'out_of_range_indices': problems},
+    }]
+    return QualityMetricsCalculator(validation_results, data), set(problems)
+
+
+def _reference_grids(data, problems, grid_size):
+    """セルごとに全データを走査する従来の集計（最大値は最後のセルに含める）"""
+    lat, lon = data['latitude'], data['longitude']
+    lat_step = (lat.max() - lat.min()) / grid_size
+    lon_step = (lon.max() - lon.min()) / grid_size
+    grids = {}
+    for i in range(grid_size):
+        lat_hi = lat.min() + (i + 1) * lat_step
+        lat_in = (lat >= lat.min() + i * lat_step) & ((lat < lat_hi) | (i == grid_size - 1))
+        for j in range(grid_size):
+            lon_hi = lon.min() + (j + 1) * lon_step
+            lon_in = (lon >= lon.min() + j * lon_step) & ((lon < lon_hi) | (j == grid_size - 1))
+            cell = data[lat_in & lon_in]
+            if len(cell):
+                grids[f"grid_{i}_{j}"] = (len(cell), sum(1 for idx in cell.index if idx in problems))
+    return grids
+
+
+def test_spatial_scores_match_per_cell_reference():
+    """一括集計の結果がセルごとの走査と一致し、最大値の点も含まれること"""
+    calculator, problems = _calculator(500)
+
+    grids = calculator.calculate_spatial_quality_scores(grid_size=6)
+    expected = _reference_grids(calculator.data, problems, 6)
+
+    assert {g['grid_id']: (g['total_count'], g['problem_count']) for g in grids} == expected
+    assert sum(g['total_count'] for g in grids) == 500
+    for g in grids:
+        assert g['quality_score'] == pytest.approx(100.0 * (1 - g['problem_count'] / g['total_count']))
+        assert g['bounds']['min_lat'] < g['center'][0] < g['bounds']['max_lat']
+
+
+def test_default_grid_size_follows_data_size():
+    """グリッド数を指定しない場合はデータ量に応じた分割数になること"""
+    calculator, _ = _calculator(200)
+    grids = calculator.calculate_spatial_quality_scores()
+
+    assert max(int(g['grid_id'].split('_')[1]) for g in grids) == 3
+
+
+def test_heatmap_counts_every_point():
+    """100x100のヒートマップで全点が数えられ、空のセルはNaNになること"""
+    calculator, problems = _calculator(2000)
+    heatmap = calculator.calculate_spatial_quality_heatmap(grid_size=100)
+
+    assert heatmap['quality_score'].shape == (100, 100)
+    assert heatmap['lat_edges'].shape == (101,)
+    assert heatmap['total_count'].sum() == 2000
+    assert heatmap['problem_count'].sum() == len(problems)
+    empty = heatmap['total_count'] == 0
+    assert np.isnan(heatmap['quality_score'][empty]).all()
+    assert not np.isnan(heatmap['quality_score'][~empty]).any()
+
+
+def test_degenerate_grid_uses_default_step():
+    """全点が同じ位置の場合も最初のセルに集計されること"""
+    grid = spatial_quality_grid(np.full(4, 35.0), np.full(4, 139.5), np.array([True, False, False, False]), 3)
+
+    assert grid['total_count'][0, 0] == 4
+    assert grid['quality_score'][0, 0] == pytest.approx(75.0)
+    assert grid['lat_edges'][1] == pytest.approx(35.01)
+
+
+def test_temporal_scores_split_periods():
+    """時間帯ごとの件数・問題数が区間の分割と一致すること"""
+    calculator, problems = _calculator(3600, problem_every=10)
+
+    periods = calculator.calculate_temporal_quality_scores()
+    assert len(periods) == 5
+    assert sum(p['total_count'] for p in periods) == 3600
+    assert sum(p['problem_count'] for p in periods) == len(problems)
+
+    periods = calculator.calculate_temporal_quality_scores(period_count=60)
+    assert len(periods) == 60
+    assert periods[0]['start_time'] == '2025-04-01T10:00:00'
+    assert periods[-1]['period'] == 59  # 最後の時刻は最後の時間帯に含まれる
+    assert sum(p['total_count'] for p in periods) == 3600
+
+
+def test_temporal_bins_keep_nanosecond_edges():
+    """時刻の境界がint64ナノ秒で正確に計算されること"""
+    times = pd.DatetimeIndex(['2025-04-01 10:00:00', '2025-04-01 10:00:30', '2025-04-01 10:01:00']).asi8
+    bins = temporal_quality_bins(times, np.array([False, True, False]), 2)
+
+    assert bins['edges_ns'].tolist() == [times[0], times[1], times[2]]
+    assert bins['total_count'].tolist() == [1, 2]
+    assert bins['problem_count'].tolist() == [0, 1]
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us'])
+def test_temporal_scores_are_independent_of_timestamp_unit(unit):
+    """ns以外の単位の時刻列でも同じ時間帯に集計されること"""
+    calculator, _ = _calculator(3600, problem_every=10)
+    expected = calculator.calculate_temporal_quality_scores(period_count=7)
+
+    data = calculator.data.assign(timestamp=calculator.data['timestamp'].astype(f'datetime64[{unit}]'))
+    cast = QualityMetricsCalculator(calculator.validation_results, data)
+
+    assert cast.calculate_temporal_quality_scores(period_count=7) == expected
+
+
+def test_million_point_heatmap_is_fast():
+    """100万点の100x100ヒートマップを短時間で集計できること"""
+    calculator, _ = _calculator(1000000, problem_every=97, seed=1)
+
+    start = time.perf_counter()
+    heatmap = calculator.calculate_spatial_quality_heatmap(grid_size=100)
+    elapsed = time.perf_counter() - start
+
+    assert heatmap['total_count'].sum() == 1000000
+    assert elapsed < 2.0